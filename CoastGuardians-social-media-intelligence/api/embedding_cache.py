@@ -0,0 +1,158 @@
+"""
+Coast Guardian Embedding Cache
+Two-tier (LRU + SQLite float32) cache for sentence-transformer embeddings.
+
+Uses the same key format (sha256 of model name + normalized text) and SQLite
+schema as the backend's app/services/embedding_cache.py, so pointing both
+services' EMBEDDING_CACHE_PATH at the same file lets posts already embedded
+by one side be reused by the other.
+"""
+
+import os
+import re
+import hashlib
+import logging
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (NFKC, collapsed whitespace)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def embedding_key(model_name: str, text: str) -> str:
+    """Cache key for a (model, normalized text) pair"""
+    return hashlib.sha256(f"{model_name}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Thread-safe LRU + SQLite embedding cache for a single model"""
+
+    def __init__(self, model_name: str, dim: int, max_memory_items: int = 10000, db_path: Optional[str] = None):
+        self.model_name = model_name
+        self.dim = dim
+        self.max_memory_items = max(0, max_memory_items)
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        if db_path:
+            try:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache unavailable ({db_path}): {e}")
+                self._conn = None
+
+    def _remember(self, key: str, vector: np.ndarray):
+        if self.max_memory_items == 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return vector
+
+        if self._conn is not None:
+            try:
+                row = self._conn.execute(
+                    "SELECT dim, vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache read failed: {e}")
+                row = None
+            if row and row[0] == self.dim:
+                vector = np.frombuffer(row[1], dtype='float32')
+                self._remember(key, vector)
+                self.stats["disk_hits"] += 1
+                return vector
+
+        self.stats["misses"] += 1
+        return None
+
+    def encode(self, texts: List[str], encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Return embeddings for texts, encoding only the (de-duplicated) misses"""
+        results: List[Optional[np.ndarray]] = []
+        missing: Dict[str, List[int]] = {}
+
+        with self._lock:
+            for i, text in enumerate(texts):
+                vector = self._lookup(embedding_key(self.model_name, text))
+                results.append(vector)
+                if vector is None:
+                    missing.setdefault(normalize_text(text), []).append(i)
+
+        if missing:
+            miss_texts = list(missing.keys())
+            encoded = np.asarray(encode_fn(miss_texts), dtype='float32').reshape(len(miss_texts), -1)
+            rows = []
+            with self._lock:
+                for text, vector in zip(miss_texts, encoded):
+                    key = embedding_key(self.model_name, text)
+                    vector = vector.copy()
+                    self._remember(key, vector)
+                    rows.append((key, self.model_name, self.dim, vector.tobytes()))
+                    for i in missing[text]:
+                        results[i] = vector
+                if self._conn is not None:
+                    try:
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO embeddings (key, model, dim, vector) VALUES (?, ?, ?, ?)",
+                            rows
+                        )
+                        self._conn.commit()
+                    except sqlite3.Error as e:
+                        logger.warning(f"Embedding disk cache write failed: {e}")
+
+        if not results:
+            return np.zeros((0, self.dim), dtype='float32')
+        return np.vstack(results).astype('float32', copy=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit-rate statistics"""
+        with self._lock:
+            lookups = sum(self.stats.values())
+            hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+            return {
+                **self.stats,
+                "memory_items": len(self._memory),
+                "disk_enabled": self._conn is not None,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def create_embedding_cache(model_name: str, dim: int) -> Optional[EmbeddingCache]:
+    """Create a cache from environment settings (None when disabled)"""
+    if os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    return EmbeddingCache(
+        model_name,
+        dim,
+        max_memory_items=int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", "20000")),
+        db_path=os.getenv("EMBEDDING_CACHE_PATH", "./models/embeddings.sqlite3") or None
+    )
@@ -15,6 +15,7 @@ import logging
 from sentence_transformers import SentenceTransformer
 
 from api.models import SocialMediaPost, DisasterType
+from api.embedding_cache import create_embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +48,9 @@ class CoastGuardianVectorDB:
         else:
             raise ValueError(f"Unsupported index type: {index_type}")
 
+        # Shared embedding cache (repeated posts/retweets skip the transformer)
+        self.embedding_cache = create_embedding_cache(model_name, embed_dim)
+
         # Storage for metadata
         self.labels = []  # disaster types
         self.texts = []   # original texts
@@ -118,9 +122,8 @@ class CoastGuardianVectorDB:
             texts = [item[0] for item in self.marine_training_data]
             labels = [item[1] for item in self.marine_training_data]
 
-            # Generate embeddings
-            embeddings = self.model.encode(texts, normalize_embeddings=True)
-            embeddings = embeddings.astype('float32')
+            # Generate embeddings (cached on disk after the first start)
+            embeddings = self.encode_texts(texts)
 
             # Add to index
             self.index.add(embeddings)
@@ -143,11 +146,20 @@ class CoastGuardianVectorDB:
             logger.error(f"Failed to initialize training data: {e}")
             raise
 
+    def _encode_uncached(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the sentence transformer"""
+        return self.model.encode(texts, normalize_embeddings=True).astype('float32')
+
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into vector embeddings, reusing cached ones"""
+        if self.embedding_cache is not None:
+            return self.embedding_cache.encode(texts, self._encode_uncached)
+        return self._encode_uncached(texts)
+
     def encode_text(self, text: str) -> np.ndarray:
         """Encode text into vector embedding"""
         try:
-            embedding = self.model.encode([text], normalize_embeddings=True)
-            return embedding[0].astype('float32')
+            return self.encode_texts([text])[0]
         except Exception as e:
             logger.error(f"Failed to encode text: {e}")
             raise
@@ -419,7 +431,8 @@ class CoastGuardianVectorDB:
                 "index_type": self.index_type,
                 "model_name": self.model_name,
                 "label_distribution": label_counts,
-                "is_trained": self.index.is_trained
+                "is_trained": self.index.is_trained,
+                "embedding_cache": self.embedding_cache.get_stats() if self.embedding_cache else {}
             }
         except Exception as e:
             logger.error(f"Failed to get statistics: {e}")
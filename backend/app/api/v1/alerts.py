@@ -18,6 +18,7 @@ from app.models.alert import (
 )
 from app.models.notification import NotificationType, NotificationSeverity
 from app.middleware.rbac import require_authority, require_admin
+from app.services.response_cache import TAG_ALERTS, get_response_cache, invalidate_responses
 from app.utils.audit import log_audit_event
 
 logger = logging.getLogger(__name__)
@@ -68,6 +69,7 @@ async def create_alert(
 
         # Insert into database
         await db.alerts.insert_one(alert.to_mongo())
+        await invalidate_responses(TAG_ALERTS)
 
         # Log audit event
         await log_audit_event(
@@ -304,6 +306,7 @@ async def update_alert(
                 {"alert_id": alert_id},
                 {"$set": update_dict}
             )
+            await invalidate_responses(TAG_ALERTS)
 
             if result.modified_count == 0:
                 raise HTTPException(
@@ -365,6 +368,7 @@ async def cancel_alert(
                 }
             }
         )
+        await invalidate_responses(TAG_ALERTS)
 
         if result.matched_count == 0:
             raise HTTPException(
@@ -409,6 +413,7 @@ async def delete_alert(
     """
     try:
         result = await db.alerts.delete_one({"alert_id": alert_id})
+        await invalidate_responses(TAG_ALERTS)
 
         if result.deleted_count == 0:
             raise HTTPException(
@@ -448,7 +453,7 @@ async def get_active_alerts_summary(
 
     Public endpoint
     """
-    try:
+    async def build_summary():
         # Get active alerts count by severity
         pipeline = [
             {
@@ -472,17 +477,8 @@ async def get_active_alerts_summary(
         async for doc in db.alerts.aggregate(pipeline):
             severity_counts[doc["_id"]] = doc["count"]
 
-        # Get total active alerts
-        total_active = await db.alerts.count_documents({
-            "status": "active",
-            "$or": [
-                {"expires_at": None},
-                {"expires_at": {"$gte": datetime.now(timezone.utc)}}
-            ]
-        })
-
         return {
-            "total_active": total_active,
+            "total_active": sum(severity_counts.values()),
             "by_severity": {
                 "critical": severity_counts.get("critical", 0),
                 "high": severity_counts.get("high", 0),
@@ -492,6 +488,12 @@ async def get_active_alerts_summary(
             }
         }
 
+    try:
+        # Expiring alerts drop out within RESPONSE_CACHE_TTL_SECONDS
+        return await get_response_cache().get_or_compute(
+            "alerts:active-summary", build_summary, tags=(TAG_ALERTS,)
+        )
+
     except Exception as e:
         logger.error(f"Error getting alert summary: {str(e)}")
         raise HTTPException(
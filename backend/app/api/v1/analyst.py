@@ -45,6 +45,7 @@ from app.middleware.rbac import (
 )
 from app.services.analytics_service import get_analytics_service
 from app.services.export_service import get_export_service
+from app.services.response_cache import TAG_REPORTS, get_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -85,6 +86,21 @@ def _get_report_images(report: dict) -> List[str]:
     return unique_images
 
 
+async def _cached_analytics(name: str, current_user: User, method, **kwargs):
+    """
+    Run an analytics query through the response cache.
+    Results are shared by callers with the same role and filters until
+    reports change (or RESPONSE_CACHE_TTL_SECONDS passes).
+    """
+    return await get_response_cache().get_or_compute(
+        f"analyst:analytics:{name}",
+        lambda: method(**kwargs),
+        params=kwargs,
+        role=current_user.role,
+        tags=(TAG_REPORTS,)
+    )
+
+
 # =============================================================================
 # DASHBOARD ENDPOINTS
 # =============================================================================
@@ -283,7 +299,8 @@ async def get_report_analytics(
     """
     try:
         analytics_service = get_analytics_service(db)
-        data = await analytics_service.get_report_analytics(
+        data = await _cached_analytics(
+            "reports", current_user, analytics_service.get_report_analytics,
             date_range=date_range,
             region=region,
             hazard_type=hazard_type,
@@ -317,7 +334,8 @@ async def get_trend_analytics(
     """
     try:
         analytics_service = get_analytics_service(db)
-        data = await analytics_service.get_trend_data(
+        data = await _cached_analytics(
+            "trends", current_user, analytics_service.get_trend_data,
             date_range=date_range,
             group_by=group_by,
             hazard_type=hazard_type,
@@ -353,7 +371,8 @@ async def get_geospatial_analytics(
     """
     try:
         analytics_service = get_analytics_service(db)
-        data = await analytics_service.get_geospatial_data(
+        data = await _cached_analytics(
+            "geo", current_user, analytics_service.get_geospatial_data,
             date_range=date_range,
             hazard_type=hazard_type,
             min_lat=min_lat,
@@ -661,7 +680,8 @@ async def get_nlp_insights(
     """
     try:
         analytics_service = get_analytics_service(db)
-        data = await analytics_service.get_nlp_insights(
+        data = await _cached_analytics(
+            "nlp", current_user, analytics_service.get_nlp_insights,
             date_range=date_range,
             hazard_type=hazard_type
         )
@@ -690,7 +710,10 @@ async def get_verification_metrics(
     """
     try:
         analytics_service = get_analytics_service(db)
-        data = await analytics_service.get_verification_metrics(date_range=date_range)
+        data = await _cached_analytics(
+            "verification", current_user, analytics_service.get_verification_metrics,
+            date_range=date_range
+        )
 
         return {
             "success": True,
@@ -716,7 +739,10 @@ async def get_hazard_type_analytics(
     """
     try:
         analytics_service = get_analytics_service(db)
-        data = await analytics_service.get_hazard_type_analytics(date_range=date_range)
+        data = await _cached_analytics(
+            "hazard-types", current_user, analytics_service.get_hazard_type_analytics,
+            date_range=date_range
+        )
 
         return {
             "success": True,
@@ -743,7 +769,8 @@ async def get_period_comparison(
     """
     try:
         analytics_service = get_analytics_service(db)
-        data = await analytics_service.get_period_comparison(
+        data = await _cached_analytics(
+            "comparison", current_user, analytics_service.get_period_comparison,
             current_range=date_range,
             hazard_type=hazard_type
         )
@@ -34,6 +34,7 @@ from app.services.otp import OTPService
 from app.services.email import EmailService
 from app.services.sms import SMSService
 from app.services.oauth import OAuthService
+from app.services.principal_cache import invalidate_principal
 from app.middleware.security import get_current_user
 
 logger = logging.getLogger(__name__)
@@ -242,6 +243,7 @@ async def login(
             {"user_id": user.user_id},
             {"$set": {"last_login": datetime.now(timezone.utc)}}
         )
+        await invalidate_principal(user.user_id)
 
         # Log successful login
         await AuditLogger.log_login_attempt(
@@ -470,6 +472,7 @@ async def verify_otp(
         {"user_id": user.user_id},
         {"$set": update_fields}
     )
+    await invalidate_principal(user.user_id)
 
     # Send welcome email after successful verification
     if otp_data.email:
@@ -709,6 +712,7 @@ async def logout(
                 {"token_id": token_id, "user_id": current_user.user_id},
                 {"$set": {"is_revoked": True}}
             )
+        await invalidate_principal(current_user.user_id)
 
         # Log logout
         await AuditLogger.log_logout(
@@ -911,14 +915,18 @@ async def change_password(
     - Updates to new password
     """
 
-    if not current_user.hashed_password:
+    # The cached principal carries no password hash; read it fresh
+    user_doc = await db.users.find_one({"user_id": current_user.user_id}, {"hashed_password": 1})
+    hashed_password = user_doc.get("hashed_password") if user_doc else None
+
+    if not hashed_password:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password change not available for OAuth users"
         )
 
     # Verify old password
-    if not verify_password(password_data.old_password, current_user.hashed_password):
+    if not verify_password(password_data.old_password, hashed_password):
         await AuditLogger.log_password_change(
             db=db,
             user_id=current_user.user_id,
@@ -942,6 +950,7 @@ async def change_password(
             "updated_at": datetime.now(timezone.utc)
         }}
     )
+    await invalidate_principal(current_user.user_id)
 
     # Revoke all refresh tokens (force re-login)
     await db.refresh_tokens.update_many(
@@ -1145,6 +1154,7 @@ async def reset_password(
             }
         }
     )
+    await invalidate_principal(user.user_id)
 
     # Verify the update was successful
     if update_result.modified_count == 0:
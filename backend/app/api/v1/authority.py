@@ -26,6 +26,7 @@ from app.middleware.rbac import (
 from app.utils.audit import log_audit_event
 from app.services.auto_ticket_service import get_auto_ticket_service
 from app.services.approval_service import ApprovalService
+from app.services.principal_cache import invalidate_principal
 
 logger = logging.getLogger(__name__)
 
@@ -1077,6 +1078,7 @@ async def ban_user(
                 }
             }
         )
+        await invalidate_principal(user_id)
 
         if result.modified_count == 0:
             raise HTTPException(
@@ -1136,6 +1138,7 @@ async def unban_user(
                 }
             }
         )
+        await invalidate_principal(user_id)
 
         if result.matched_count == 0:
             raise HTTPException(
@@ -1211,6 +1214,7 @@ async def assign_role(
                 }
             }
         )
+        await invalidate_principal(user_id)
 
         if result.modified_count == 0:
             raise HTTPException(
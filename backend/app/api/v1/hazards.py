@@ -6,8 +6,9 @@ API endpoints for hazard reporting and management
 import logging
 import os
 import uuid
+from dataclasses import asdict
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from fastapi import (
     APIRouter,
     Depends,
@@ -44,12 +45,15 @@ from app.utils.security import generate_user_id
 from app.utils.audit import AuditLogger
 from app.services.environmental_data_service import fetch_environmental_snapshot
 from app.services.report_hazard_classifier import classify_hazard_threat
-from app.services.verification_service import get_verification_service, VerificationService
-from app.services.auto_ticket_service import get_auto_ticket_service
+from app.services.verification_queue import get_verification_queue, verify_and_apply_report
+from app.services.map_index_service import get_map_index, window_start
+from app.services.response_cache import TAG_REPORTS, get_response_cache, invalidate_responses
 from app.services.approval_service import get_approval_service
-from app.models.verification import VerificationDecision, AIRecommendation
+from app.models.verification import AIRecommendation
 from app.models.hazard import ApprovalSource, TicketCreationStatus
 from app.services.s3_service import s3_service
+from app.services.image_processor import ProcessedImage, get_image_processor
+from app.utils.uploads import StoredUpload, UploadTooLargeError, save_upload_stream
 from pydantic import BaseModel, Field
 import json
 
@@ -85,9 +89,21 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 async def save_upload_file(
     upload_file: UploadFile,
     max_size: int,
-    allowed_types: List[str]
-) -> str:
-    """Save uploaded file and return the file path"""
+    allowed_types: List[str],
+    process_image: bool = False
+) -> Tuple[str, StoredUpload, Optional[ProcessedImage]]:
+    """
+    Stream uploaded file to disk.
+
+    With process_image, the stored image is rotated, resized and stripped of
+    EXIF on the image processing pool (best effort; the original is kept if
+    that fails).
+
+    Returns:
+        Tuple of (relative path for storage, stored upload with the sha256 of
+        the bytes received, processing result with the metadata read before
+        stripping or None)
+    """
 
     # Validate file type
     if upload_file.content_type not in allowed_types:
@@ -96,27 +112,30 @@ async def save_upload_file(
             detail=f"Invalid file type. Allowed types: {', '.join(allowed_types)}"
         )
 
-    # Read file content
-    content = await upload_file.read()
-
-    # Validate file size
-    if len(content) > max_size:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Maximum size: {max_size / 1024 / 1024}MB"
-        )
-
     # Generate unique filename
     file_extension = upload_file.filename.split(".")[-1]
     unique_filename = f"{uuid.uuid4()}.{file_extension}"
     file_path = os.path.join(UPLOAD_DIR, unique_filename)
 
-    # Save file
-    with open(file_path, "wb") as f:
-        f.write(content)
+    # Save file in chunks, aborting as soon as it exceeds the limit
+    try:
+        stored = await save_upload_stream(upload_file, file_path, max_size)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    logger.debug(f"Stored upload {file_path}: {stored.size} bytes, sha256={stored.sha256}")
+
+    processed = None
+    if process_image:
+        try:
+            processed = await get_image_processor().process_upload_file(file_path)
+        except Exception as e:
+            logger.warning(f"Image processing skipped for {file_path}: {e}")
 
     # Return relative path for storage
-    return f"/{file_path}"
+    return f"/{file_path}", stored, processed
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=HazardReportResponse)
@@ -151,12 +170,14 @@ async def create_hazard_report(
             )
 
         # Save image file
-        image_path = await save_upload_file(image, MAX_IMAGE_SIZE, ALLOWED_IMAGE_TYPES)
+        image_path, stored_image, processed_image = await save_upload_file(
+            image, MAX_IMAGE_SIZE, ALLOWED_IMAGE_TYPES, process_image=True
+        )
 
         # Save voice note if provided
         voice_note_path = None
         if voice_note:
-            voice_note_path = await save_upload_file(
+            voice_note_path, _, _ = await save_upload_file(
                 voice_note,
                 MAX_VOICE_SIZE,
                 ALLOWED_VOICE_TYPES
@@ -248,6 +269,8 @@ async def create_hazard_report(
             category=category_enum,
             description=description,
             image_url=image_path,
+            image_sha256=stored_image.sha256,
+            image_metadata=asdict(processed_image.metadata) if processed_image else None,
             voice_note_url=voice_note_path,
             location=location,
             weather=weather_data,
@@ -266,104 +289,30 @@ async def create_hazard_report(
         # Retrieve the created report
         created_report = await db.hazard_reports.find_one({"_id": result.inserted_id})
 
-        # Run 6-Layer Verification Pipeline
-        verification_result = None
-        try:
-            logger.info(f"Running verification pipeline for report {report_id}")
-            verification_service = get_verification_service(db)
-
-            if not verification_service._initialized:
-                await verification_service.initialize()
-
-            # Get absolute image path for vision model
-            abs_image_path = image_path.lstrip('/') if image_path else None
-
-            # Run verification
-            verification_result = await verification_service.verify_report(
-                hazard_report,
-                image_path=abs_image_path,
-                db=db
-            )
-
-            # Map verification decision to status (simplified - only 4 statuses)
-            decision_to_status = {
-                VerificationDecision.AUTO_APPROVED: VerificationStatus.VERIFIED,
-                VerificationDecision.MANUAL_REVIEW: VerificationStatus.NEEDS_MANUAL_REVIEW,
-                VerificationDecision.AI_RECOMMENDED: VerificationStatus.NEEDS_MANUAL_REVIEW,  # Legacy
-                VerificationDecision.REJECTED: VerificationStatus.REJECTED,
-                VerificationDecision.AUTO_REJECTED: VerificationStatus.AUTO_REJECTED
-            }
-            new_status = decision_to_status.get(
-                verification_result.decision,
-                VerificationStatus.NEEDS_MANUAL_REVIEW  # Default to needs review
-            )
+        # Show the new report on the map without waiting for the next index sync
+        get_map_index().upsert(created_report)
+        await invalidate_responses(TAG_REPORTS)
 
-            # Extract geofence data
-            geofence_result = next(
-                (lr for lr in verification_result.layer_results if lr.layer_name.value == "geofence"),
-                None
-            )
-            geofence_valid = geofence_result.status.value == "pass" if geofence_result else None
-            geofence_distance = None
-            if geofence_result and geofence_result.data:
-                geofence_distance = geofence_result.data.get("distance_to_coast_km")
-
-            # Extract vision classification
-            vision_result = next(
-                (lr for lr in verification_result.layer_results if lr.layer_name.value == "image"),
-                None
-            )
-            vision_classification = vision_result.data if vision_result else None
-
-            # Update report with verification results
-            await db.hazard_reports.update_one(
-                {"_id": result.inserted_id},
-                {
-                    "$set": {
-                        "verification_status": new_status.value,
-                        "verification_score": verification_result.composite_score,
-                        "verification_result": verification_result.model_dump(),
-                        "verification_id": verification_result.verification_id,
-                        "geofence_valid": geofence_valid,
-                        "geofence_distance_km": geofence_distance,
-                        "vision_classification": vision_classification,
-                        "verified_at": datetime.now(timezone.utc) if new_status == VerificationStatus.VERIFIED else None,
-                        "updated_at": datetime.now(timezone.utc)
-                    }
-                }
-            )
-
-            # Refresh created report with verification data
-            created_report = await db.hazard_reports.find_one({"_id": result.inserted_id})
+        # Run 6-Layer Verification Pipeline (queued by priority lane; inline when the queue is off)
+        verification_result = None
+        queued = False
+        if settings.VERIFICATION_QUEUE_ENABLED:
+            try:
+                await get_verification_queue().enqueue(created_report, db)
+                queued = True
+            except Exception as queue_error:
+                logger.warning(f"Could not queue verification for {report_id}, verifying inline: {queue_error}")
 
-            logger.info(
-                f"Verification complete for {report_id}: "
-                f"score={verification_result.composite_score:.1f}%, "
-                f"decision={verification_result.decision.value}"
-            )
+        if not queued:
+            try:
+                logger.info(f"Running verification pipeline for report {report_id}")
+                verification_result = await verify_and_apply_report(db, created_report)
 
-            # AUTO-GENERATE TICKET for AI-approved reports
-            if new_status == VerificationStatus.VERIFIED:
-                try:
-                    auto_ticket_service = get_auto_ticket_service(db)
-                    ticket_result = await auto_ticket_service.create_ticket_for_approved_report(
-                        report_doc=created_report,
-                        approver=None,  # No manual approver for AI-approval
-                        approval_type="auto",
-                        db=db
-                    )
-                    if ticket_result:
-                        ticket, _ = ticket_result
-                        logger.info(f"Auto-generated ticket {ticket.ticket_id} for AI-approved report {report_id}")
-                        # Refresh report to include ticket data
-                        created_report = await db.hazard_reports.find_one({"_id": result.inserted_id})
-                except Exception as ticket_error:
-                    logger.warning(f"Failed to auto-generate ticket for report {report_id}: {ticket_error}")
-                    # Non-blocking - report is still verified
-
-        except Exception as verify_error:
-            logger.warning(f"Verification pipeline failed (non-blocking): {verify_error}")
-            # Continue without verification - report remains in PENDING status
+                # Refresh created report with verification data
+                created_report = await db.hazard_reports.find_one({"_id": result.inserted_id})
+            except Exception as verify_error:
+                logger.warning(f"Verification pipeline failed (non-blocking): {verify_error}")
+                # Continue without verification - report remains in PENDING status
 
         # Log audit event
         await AuditLogger.log(
@@ -531,114 +480,28 @@ async def create_hazard_report_s3(
 
         created_report = await db.hazard_reports.find_one({"_id": result.inserted_id})
 
-        # Run 6-Layer Verification Pipeline
-        verification_result = None
-        temp_image_path = None  # Track temp file for cleanup
-        try:
-            logger.info(f"Running verification pipeline for report {report_id}")
-            verification_service = get_verification_service(db)
-
-            if not verification_service._initialized:
-                await verification_service.initialize()
-
-            # For S3 images, download to temp file for vision analysis
-            image_path = None
-            if s3_service.is_enabled and report_data.image_url:
-                logger.info(f"Downloading S3 image for verification: {report_data.image_url}")
-                temp_image_path = s3_service.download_from_url_to_temp(report_data.image_url)
-                if temp_image_path:
-                    image_path = temp_image_path
-                    logger.info(f"S3 image downloaded to: {temp_image_path}")
-                else:
-                    logger.warning(f"Failed to download S3 image, skipping image verification")
-
-            verification_result = await verification_service.verify_report(
-                hazard_report,
-                image_path=image_path,
-                db=db
-            )
-
-            decision_to_status = {
-                VerificationDecision.AUTO_APPROVED: VerificationStatus.VERIFIED,
-                VerificationDecision.MANUAL_REVIEW: VerificationStatus.NEEDS_MANUAL_REVIEW,
-                VerificationDecision.AI_RECOMMENDED: VerificationStatus.NEEDS_MANUAL_REVIEW,
-                VerificationDecision.REJECTED: VerificationStatus.REJECTED,
-                VerificationDecision.AUTO_REJECTED: VerificationStatus.AUTO_REJECTED
-            }
-            new_status = decision_to_status.get(
-                verification_result.decision,
-                VerificationStatus.NEEDS_MANUAL_REVIEW
-            )
-
-            geofence_result = next(
-                (lr for lr in verification_result.layer_results if lr.layer_name.value == "geofence"),
-                None
-            )
-            geofence_valid = geofence_result.status.value == "pass" if geofence_result else None
-            geofence_distance = None
-            if geofence_result and geofence_result.data:
-                geofence_distance = geofence_result.data.get("distance_to_coast_km")
-
-            vision_result = next(
-                (lr for lr in verification_result.layer_results if lr.layer_name.value == "image"),
-                None
-            )
-            vision_classification = vision_result.data if vision_result else None
-
-            await db.hazard_reports.update_one(
-                {"_id": result.inserted_id},
-                {
-                    "$set": {
-                        "verification_status": new_status.value,
-                        "verification_score": verification_result.composite_score,
-                        "verification_result": verification_result.model_dump(),
-                        "verification_id": verification_result.verification_id,
-                        "geofence_valid": geofence_valid,
-                        "geofence_distance_km": geofence_distance,
-                        "vision_classification": vision_classification,
-                        "verified_at": datetime.now(timezone.utc) if new_status == VerificationStatus.VERIFIED else None,
-                        "updated_at": datetime.now(timezone.utc)
-                    }
-                }
-            )
-
-            created_report = await db.hazard_reports.find_one({"_id": result.inserted_id})
+        # Show the new report on the map without waiting for the next index sync
+        get_map_index().upsert(created_report)
+        await invalidate_responses(TAG_REPORTS)
 
-            logger.info(
-                f"Verification complete for {report_id}: "
-                f"score={verification_result.composite_score:.1f}%, "
-                f"decision={verification_result.decision.value}"
-            )
+        # Run 6-Layer Verification Pipeline (queued by priority lane; inline when the queue is off)
+        verification_result = None
+        queued = False
+        if settings.VERIFICATION_QUEUE_ENABLED:
+            try:
+                await get_verification_queue().enqueue(created_report, db)
+                queued = True
+            except Exception as queue_error:
+                logger.warning(f"Could not queue verification for {report_id}, verifying inline: {queue_error}")
 
-            # AUTO-GENERATE TICKET for AI-approved reports
-            if new_status == VerificationStatus.VERIFIED:
-                try:
-                    auto_ticket_service = get_auto_ticket_service(db)
-                    ticket_result = await auto_ticket_service.create_ticket_for_approved_report(
-                        report_doc=created_report,
-                        approver=None,
-                        approval_type="auto",
-                        db=db
-                    )
-                    if ticket_result:
-                        ticket, _ = ticket_result
-                        logger.info(f"Auto-generated ticket {ticket.ticket_id} for AI-approved report {report_id}")
-                        created_report = await db.hazard_reports.find_one({"_id": result.inserted_id})
-                except Exception as ticket_error:
-                    logger.warning(f"Failed to auto-generate ticket for report {report_id}: {ticket_error}")
-
-        except Exception as verify_error:
-            logger.warning(f"Verification pipeline failed (non-blocking): {verify_error}")
-        finally:
-            # Clean up temporary S3 download file
-            if temp_image_path:
-                try:
-                    import os
-                    if os.path.exists(temp_image_path):
-                        os.remove(temp_image_path)
-                        logger.debug(f"Cleaned up temp file: {temp_image_path}")
-                except Exception as cleanup_error:
-                    logger.warning(f"Failed to cleanup temp file {temp_image_path}: {cleanup_error}")
+        if not queued:
+            try:
+                logger.info(f"Running verification pipeline for report {report_id}")
+                # S3 images are downloaded to a temp file for vision analysis and removed afterwards
+                verification_result = await verify_and_apply_report(db, created_report)
+                created_report = await db.hazard_reports.find_one({"_id": result.inserted_id})
+            except Exception as verify_error:
+                logger.warning(f"Verification pipeline failed (non-blocking): {verify_error}")
 
         # Log audit event
         await AuditLogger.log(
@@ -899,110 +762,80 @@ async def get_map_data(
     include_heatmap: bool = Query(default=True, description="Include heatmap data points"),
     include_clusters: bool = Query(default=True, description="Include cluster data"),
     min_severity: Optional[str] = Query(default=None, description="Filter by minimum severity"),
+    zoom: Optional[int] = Query(default=None, ge=0, le=22, description="Map zoom; clusters reports per grid cell"),
+    bbox: Optional[str] = Query(default=None, description="Viewport as west,south,east,north"),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Get optimized map data with time-based filtering
 
     Returns reports, heatmap points, and statistics for the map visualization.
-    Data is filtered to show only the last N hours (default 24h).
-    This endpoint implements automatic 24-hour cleanup by only returning recent data.
+    Data is filtered to show only the last N hours (default 24h, aligned to
+    whole hours). With a zoom level, reports are clustered server-side and
+    the heatmap has one weighted point per cell; bbox limits the result to
+    the viewport. Served from the in-memory map index, not per-request scans.
     """
-    from datetime import timedelta
-
-    try:
-        # Calculate cutoff time
-        cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
-
-        # Base query for reports
-        query = {
-            "is_deleted": False,
-            "is_active": True,
-            "created_at": {"$gte": cutoff_time},
-            "verification_status": {"$in": [
-                VerificationStatus.VERIFIED.value,
-                VerificationStatus.PENDING.value
-            ]}
-        }
-
-        # Add severity filter if specified
-        if min_severity:
-            query["severity"] = {"$gte": min_severity}
-
-        # Fetch reports
-        cursor = db.hazard_reports.find(query).sort("created_at", -1).limit(500)
-        reports = await cursor.to_list(length=500)
-
-        # Process reports for response
-        processed_reports = []
-        heatmap_points = []
-
-        for report in reports:
-            report["_id"] = str(report["_id"])
+    viewport = None
+    if bbox:
+        try:
+            viewport = tuple(float(v) for v in bbox.split(","))
+        except ValueError:
+            viewport = ()
+        if len(viewport) != 4 or not (-90 <= viewport[1] <= viewport[3] <= 90):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="bbox must be west,south,east,north in degrees"
+            )
 
-            # Extract coordinates
-            lat = report.get("location", {}).get("latitude")
-            lon = report.get("location", {}).get("longitude")
-
-            if lat and lon:
-                processed_reports.append({
-                    "id": report.get("report_id"),
-                    "hazard_type": report.get("hazard_type"),
-                    "severity": report.get("severity", "medium"),
-                    "description": report.get("description", "")[:200],  # Truncate for performance
-                    "latitude": lat,
-                    "longitude": lon,
-                    "verification_status": report.get("verification_status"),
-                    "created_at": report.get("created_at").isoformat() if report.get("created_at") else None,
-                    "region": report.get("location", {}).get("region"),
-                })
-
-                # Generate heatmap point
-                if include_heatmap:
-                    severity_weight = {
-                        "critical": 1.0,
-                        "high": 0.8,
-                        "medium": 0.6,
-                        "low": 0.4
-                    }
-                    weight = severity_weight.get(
-                        report.get("severity", "medium").lower(),
-                        0.5
-                    )
-                    heatmap_points.append([lat, lon, weight])
+    async def build_response():
+        map_index = get_map_index()
+        await map_index.sync(db)
 
-        # Calculate statistics
-        total_reports = len(processed_reports)
-        severity_counts = {
-            "critical": sum(1 for r in processed_reports if r.get("severity", "").lower() == "critical"),
-            "high": sum(1 for r in processed_reports if r.get("severity", "").lower() == "high"),
-            "medium": sum(1 for r in processed_reports if r.get("severity", "").lower() == "medium"),
-            "low": sum(1 for r in processed_reports if r.get("severity", "").lower() == "low"),
-        }
+        try:
+            data = map_index.query(
+                hours,
+                zoom=zoom,
+                bbox=viewport,
+                min_severity=min_severity,
+                include_heatmap=include_heatmap,
+                include_reports=include_clusters
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
         return {
             "success": True,
-            "data": {
-                "reports": processed_reports if include_clusters else [],
-                "heatmap_points": heatmap_points if include_heatmap else [],
-                "statistics": {
-                    "total_reports": total_reports,
-                    "critical_count": severity_counts["critical"],
-                    "high_count": severity_counts["high"],
-                    "medium_count": severity_counts["medium"],
-                    "low_count": severity_counts["low"],
-                    "last_update": datetime.now(timezone.utc).isoformat()
-                }
-            },
+            "data": data,
             "meta": {
                 "hours_filter": hours,
-                "cutoff_time": cutoff_time.isoformat(),
+                "cutoff_time": window_start(hours).isoformat(),
                 "refresh_interval": 60,  # Recommended refresh in seconds
                 "include_heatmap": include_heatmap,
-                "include_clusters": include_clusters
+                "include_clusters": include_clusters,
+                "zoom": zoom,
+                "bbox": list(viewport) if viewport else None
             }
         }
 
+    try:
+        # Other workers' map indexes lag by up to MAP_INDEX_REFRESH_SECONDS; cache no longer than that
+        return await get_response_cache().get_or_compute(
+            "hazards:map-data",
+            build_response,
+            params={
+                "hours": hours,
+                "include_heatmap": include_heatmap,
+                "include_clusters": include_clusters,
+                "min_severity": min_severity,
+                "zoom": zoom,
+                "bbox": viewport
+            },
+            tags=(TAG_REPORTS,),
+            ttl=settings.MAP_INDEX_REFRESH_SECONDS
+        )
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching map data: {e}")
         raise HTTPException(
@@ -1433,6 +1266,7 @@ async def verify_hazard_report(
             {"report_id": report_id},
             {"$set": update_data}
         )
+        await invalidate_responses(TAG_REPORTS)
 
         # Update user's credibility score
         if verify_data.verification_status == VerificationStatus.VERIFIED:
@@ -1754,6 +1588,7 @@ async def delete_hazard_report(
                 }
             }
         )
+        await invalidate_responses(TAG_REPORTS)
 
         # Log audit event
         await AuditLogger.log(
@@ -15,6 +15,7 @@ from app.models.monitoring import (
     AlertStatus
 )
 from app.services.ml_monitor import ml_service
+from app.services.response_cache import TAG_MONITORING, get_response_cache
 from app.middleware.security import get_current_user
 from app.models.user import User
 
@@ -55,28 +56,39 @@ async def get_current_monitoring_data(
 
     Public endpoint - no authentication required for transparency.
     """
-    try:
+    if min_alert_level is not None and (min_alert_level < 1 or min_alert_level > 5):
+        raise HTTPException(status_code=400, detail="min_alert_level must be between 1 and 5")
+
+    async def build_response():
         # Get latest monitoring data
         monitoring_data = ml_service.get_current_data()
 
         # Filter by alert level if specified
         if min_alert_level is not None:
-            if min_alert_level < 1 or min_alert_level > 5:
-                raise HTTPException(status_code=400, detail="min_alert_level must be between 1 and 5")
-
             filtered_locations = {
                 loc_id: loc_data
-                for loc_id, loc_data in monitoring_data["locations"].items()
+                for loc_id, loc_data in monitoring_data.locations.items()
                 if loc_data.max_alert >= min_alert_level
             }
-            monitoring_data["locations"] = filtered_locations
 
             # Recalculate summary
-            monitoring_data["summary"] = ml_service._calculate_summary(
-                list(filtered_locations.values())
+            monitoring_data = MonitoringResponse(
+                locations=filtered_locations,
+                summary=ml_service._calculate_summary(list(filtered_locations.values())),
+                recent_earthquakes=monitoring_data.recent_earthquakes
             )
 
         return monitoring_data
+
+    try:
+        # Per-process monitor state: cached locally, invalidated after each detection cycle
+        return await get_response_cache().get_or_compute(
+            "monitoring:current",
+            build_response,
+            params={"min_alert_level": min_alert_level},
+            tags=(TAG_MONITORING,),
+            shared=False
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -16,6 +16,7 @@ from app.middleware.rbac import get_current_user, require_analyst, require_admin
 from app.services.multi_hazard_service import (
     get_multi_hazard_service, MultiHazardService
 )
+from app.services.response_cache import TAG_MULTI_HAZARD, get_response_cache, invalidate_responses
 from app.models.multi_hazard import (
     AlertLevel, HazardType,
     HazardAlert, LocationStatus, MultiHazardResponse,
@@ -84,7 +85,7 @@ async def get_public_status():
     Get public status summary.
     Simplified view for public dashboards - no authentication required.
     """
-    try:
+    async def build_status() -> PublicStatusResponse:
         service = get_multi_hazard_service()
 
         if not service._initialized:
@@ -145,6 +146,12 @@ async def get_public_status():
             message=message
         )
 
+    try:
+        # Per-process detector state: cached locally, invalidated after each detection cycle
+        return await get_response_cache().get_or_compute(
+            "multi-hazard:public-status", build_status, tags=(TAG_MULTI_HAZARD,), shared=False
+        )
+
     except Exception as e:
         logger.error(f"Public status error: {e}")
         raise HTTPException(
@@ -253,7 +260,12 @@ async def get_full_status(
     Returns all locations, alerts, earthquakes, and summary.
     Requires Analyst role or higher.
     """
-    return service.get_all_status()
+    async def compute():
+        return service.get_all_status()
+
+    return await get_response_cache().get_or_compute(
+        "multi-hazard:status", compute, role=current_user.role, tags=(TAG_MULTI_HAZARD,), shared=False
+    )
 
 
 @router.get("/summary", response_model=MultiHazardSummary)
@@ -455,6 +467,7 @@ async def inject_demo_alerts():
         )
 
     alerts = service.inject_demo_alerts()
+    await invalidate_responses(TAG_MULTI_HAZARD)
 
     return {
         "success": True,
@@ -488,6 +501,7 @@ async def clear_demo_alerts():
         )
 
     service.clear_demo_alerts()
+    await invalidate_responses(TAG_MULTI_HAZARD)
 
     return {
         "success": True,
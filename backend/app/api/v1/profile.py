@@ -20,6 +20,7 @@ from app.models.profile import (
 from app.models.user import User
 from app.middleware.security import get_current_user
 from app.services.s3_service import s3_service
+from app.services.principal_cache import invalidate_principal
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -129,6 +130,7 @@ async def update_my_profile(
             {"user_id": current_user.user_id},
             {"$set": update_doc}
         )
+        await invalidate_principal(current_user.user_id)
 
         if result.modified_count == 0 and result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Profile not found")
@@ -246,6 +248,7 @@ async def upload_profile_picture(
                 "updated_at": datetime.now(timezone.utc)
             }}
         )
+        await invalidate_principal(current_user.user_id)
 
         return {
             "success": True,
@@ -286,6 +289,7 @@ async def delete_profile_picture(
                     "$set": {"updated_at": datetime.now(timezone.utc)}
                 }
             )
+            await invalidate_principal(current_user.user_id)
 
         return {
             "success": True,
@@ -355,6 +359,7 @@ async def update_profile_picture_s3(
                 "updated_at": datetime.now(timezone.utc)
             }}
         )
+        await invalidate_principal(current_user.user_id)
 
         return {
             "success": True,
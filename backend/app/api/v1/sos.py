@@ -37,11 +37,43 @@ from app.models.sos import (
 from app.middleware.security import get_current_user
 from app.services.fast2sms_service import fast2sms_service
 from app.utils.audit import AuditLogger
+from app.utils.geo import nearest_point
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/sos", tags=["SOS Emergency Alerts"])
 
+# Indian Coast Guard stations (same data as the frontend coast_guard_stations layer)
+# Format: (name, latitude, longitude, contact)
+COAST_GUARD_STATIONS = [
+    ("Coast Guard District HQ - Mumbai", 18.9220, 72.8347, "022-24313636"),
+    ("Coast Guard Station Porbandar", 21.6417, 69.6293, "0286-2242451"),
+    ("Coast Guard Station Okha", 22.4675, 69.0711, "02892-262331"),
+    ("Coast Guard Station Veraval", 20.9159, 70.3629, "02876-221654"),
+    ("Coast Guard Station Daman", 20.4147, 72.8397, "0260-2254891"),
+    ("Coast Guard Air Station Daman", 20.4345, 72.8430, "0260-2254892"),
+    ("Coast Guard Regional HQ - Chennai", 13.0827, 80.2785, "044-25251641"),
+    ("Coast Guard Station Mandapam", 9.2833, 79.1167, "04573-241522"),
+    ("Coast Guard Station Tuticorin", 8.7642, 78.1348, "0461-2320515"),
+    ("Coast Guard Station Karaikal", 10.9167, 79.8500, "04368-222156"),
+    ("Coast Guard District HQ - Visakhapatnam", 17.6868, 83.2847, "0891-2562881"),
+    ("Coast Guard Station Kakinada", 16.9891, 82.2475, "0884-2362512"),
+    ("Coast Guard District HQ - Paradip", 20.2644, 86.6128, "06722-223601"),
+    ("Coast Guard Station Gopalpur", 19.2667, 84.9667, "0680-2242156"),
+    ("Coast Guard District HQ - Haldia", 22.0333, 88.0833, "03224-252500"),
+    ("Coast Guard Station Frasergunj", 21.5833, 88.2500, "03210-255500"),
+    ("Coast Guard Regional HQ - Port Blair", 11.6234, 92.7265, "03192-232310"),
+    ("Coast Guard Station Campbell Bay", 7.0167, 93.9333, "03192-264123"),
+    ("Coast Guard Station Kochi", 9.9312, 76.2673, "0484-2668291"),
+    ("Coast Guard Station Beypore", 11.1667, 75.8167, "0495-2412345"),
+    ("Coast Guard Station New Mangalore", 12.9141, 74.8123, "0824-2407320"),
+    ("Coast Guard Station Karwar", 14.8127, 74.1240, "08382-226256"),
+    ("Coast Guard Station Goa", 15.4023, 73.8007, "0832-2520566"),
+    ("Coast Guard Air Enclave Chennai", 12.9941, 80.1694, "044-25226789"),
+]
+_STATION_LATS = [station[1] for station in COAST_GUARD_STATIONS]
+_STATION_LONS = [station[2] for station in COAST_GUARD_STATIONS]
+
 
 async def generate_sos_id(db: AsyncIOMotorDatabase) -> str:
     """Generate unique SOS ID in format SOS-YYYYMMDD-XXXX"""
@@ -71,12 +103,18 @@ async def find_nearest_coast_guard(
     latitude: float,
     longitude: float
 ) -> Optional[dict]:
-    """Find nearest coast guard station (simplified - uses static data)"""
-    # In a real implementation, this would query coast guard stations
-    # For now, return a placeholder
+    """Find nearest coast guard station (static station list)"""
+    index, distance_km = nearest_point(latitude, longitude, _STATION_LATS, _STATION_LONS)
+    if index < 0:
+        return {"name": "Coast Guard Station", "distance_km": None, "contact": "1554"}
+
+    name, station_lat, station_lon, station_contact = COAST_GUARD_STATIONS[index]
     return {
-        "name": "Coast Guard Station",
-        "distance_km": None,
+        "name": name,
+        "distance_km": round(distance_km, 1),
+        "latitude": station_lat,
+        "longitude": station_lon,
+        "station_contact": station_contact,
         "contact": "1554"  # Indian Coast Guard emergency number
     }
 
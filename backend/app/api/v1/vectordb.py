@@ -3,6 +3,7 @@ VectorDB API Routes
 FAISS-based hazard classification endpoints
 """
 
+import asyncio
 import logging
 from datetime import datetime, timezone
 from typing import List
@@ -14,6 +15,7 @@ from app.database import get_database
 from app.models.user import User
 from app.middleware.rbac import get_current_user, require_analyst
 from app.services.vectordb_service import get_vectordb_service, VectorDBService
+from app.services.inference_executor import InferenceOverloadedError
 from app.models.vectordb import (
     ClassifyRequest, BatchClassifyRequest, AddSampleRequest,
     SearchRequest, SearchResponse, ClassificationResult,
@@ -40,6 +42,15 @@ async def get_service(
     return service
 
 
+def _busy_error(e: Exception) -> HTTPException:
+    """Map inference pool overload/timeout to a retryable 503."""
+    logger.warning(f"VectorDB inference unavailable: {e}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Classification service busy, please retry"
+    )
+
+
 # =============================================================================
 # PUBLIC ENDPOINTS (No Authentication)
 # =============================================================================
@@ -101,7 +112,7 @@ async def classify_text(
     Requires Analyst role or higher.
     """
     try:
-        result = service.classify_hazard(
+        result = await service.classify_hazard_async(
             text=request.text,
             threshold=request.threshold,
             top_k=request.top_k if request.include_similar else 1
@@ -112,6 +123,8 @@ async def classify_text(
 
         return result
 
+    except (InferenceOverloadedError, asyncio.TimeoutError) as e:
+        raise _busy_error(e)
     except Exception as e:
         logger.error(f"Classification error: {e}")
         raise HTTPException(
@@ -136,7 +149,7 @@ async def batch_classify(
     start_time = time.time()
 
     try:
-        results = service.batch_classify(
+        results = await service.batch_classify_async(
             texts=request.texts,
             threshold=request.threshold
         )
@@ -151,6 +164,8 @@ async def batch_classify(
             processing_time_ms=processing_time
         )
 
+    except (InferenceOverloadedError, asyncio.TimeoutError) as e:
+        raise _busy_error(e)
     except Exception as e:
         logger.error(f"Batch classification error: {e}")
         raise HTTPException(
@@ -175,7 +190,7 @@ async def search_similar(
     start_time = time.time()
 
     try:
-        results = service.search_similar(
+        results = await service.search_similar_async(
             query_text=request.query,
             k=request.top_k,
             threshold=request.threshold
@@ -190,6 +205,8 @@ async def search_similar(
             processing_time_ms=processing_time
         )
 
+    except (InferenceOverloadedError, asyncio.TimeoutError) as e:
+        raise _busy_error(e)
     except Exception as e:
         logger.error(f"Search error: {e}")
         raise HTTPException(
@@ -221,7 +238,7 @@ async def add_training_sample(
         metadata["added_by"] = current_user.user_id
         metadata["added_at"] = datetime.now(timezone.utc).isoformat()
 
-        service.add_sample(
+        await service.add_sample_async(
             text=request.text,
             label=request.label,
             metadata=metadata
@@ -248,6 +265,8 @@ async def add_training_sample(
             }
         )
 
+    except (InferenceOverloadedError, asyncio.TimeoutError) as e:
+        raise _busy_error(e)
     except Exception as e:
         logger.error(f"Add sample error: {e}")
         raise HTTPException(
@@ -286,6 +305,73 @@ async def save_index(
         )
 
 
+@router.post("/rebuild", response_model=VectorDBResponse)
+async def rebuild_index(
+    current_user: User = Depends(require_analyst),
+    service: VectorDBService = Depends(get_service)
+):
+    """
+    Retrain and rebuild the FAISS index from the full corpus.
+
+    Applies the configured index type (flat, ivf_flat, hnsw, ivf_pq) and
+    reports recall against exact search.
+    Requires Analyst role or higher.
+    """
+    try:
+        await service.rebuild_index_async()
+        stats = service.get_statistics()
+
+        return VectorDBResponse(
+            success=True,
+            data={
+                "message": "Index rebuilt successfully",
+                "index_type": stats.index_type,
+                "index_size": stats.total_vectors,
+                "index_quality": stats.index_quality
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Rebuild index error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to rebuild index: {str(e)}"
+        )
+
+
+@router.post("/compact", response_model=VectorDBResponse)
+async def compact_sample_log(
+    current_user: User = Depends(require_analyst),
+    service: VectorDBService = Depends(get_service)
+):
+    """
+    Compact the cluster sample log into a shared snapshot.
+
+    Workers started later load the snapshot instead of replaying every
+    logged sample. Runs automatically every VECTORDB_COMPACT_EVERY_SAMPLES.
+    Requires Analyst role or higher.
+    """
+    try:
+        await service.sync_from_log()
+        result = await service.compact_sample_log()
+
+        return VectorDBResponse(
+            success=True,
+            data={
+                "message": "Sample log compacted" if result else "Nothing to compact",
+                "snapshot": result,
+                "sync": service.get_statistics().sync
+            }
+        )
+
+    except Exception as e:
+        logger.error(f"Compact sample log error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to compact sample log: {str(e)}"
+        )
+
+
 # =============================================================================
 # PUBLIC CLASSIFICATION ENDPOINT (For frontend widgets)
 # =============================================================================
@@ -308,7 +394,7 @@ async def public_classify(
                 detail="VectorDB service not initialized"
             )
 
-        result = service.classify_hazard(
+        result = await service.classify_hazard_async(
             text=request.text,
             threshold=request.threshold,
             top_k=5
@@ -321,6 +407,8 @@ async def public_classify(
 
     except HTTPException:
         raise
+    except (InferenceOverloadedError, asyncio.TimeoutError) as e:
+        raise _busy_error(e)
     except Exception as e:
         logger.error(f"Public classification error: {e}")
         raise HTTPException(
@@ -4,12 +4,15 @@ Endpoints for the 6-layer verification pipeline.
 """
 
 import logging
+import secrets
 from datetime import datetime, timezone
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header
+from fastapi.responses import PlainTextResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.config import settings
 from app.database import get_database
 from app.models.user import User
 from app.middleware.rbac import get_current_user, require_analyst, require_admin
@@ -17,13 +20,21 @@ from app.models.hazard import HazardReport, VerificationStatus
 from app.models.verification import (
     VerificationResult, VerificationDecision, VerificationAudit,
     VerificationQueueItem, AnalystDecisionRequest, VerificationStatsResponse,
-    VerificationThresholds, LayerName
+    VerificationThresholds, LayerName, BulkVerificationRequest
 )
 from app.services.verification_service import (
-    get_verification_service, initialize_verification_service, VerificationService
+    get_verification_service, initialize_verification_service, VerificationService,
+    map_decision_to_status, report_from_document, fetch_report_image, remove_temp_image
 )
 from app.services.auto_ticket_service import get_auto_ticket_service
-from app.services.s3_service import s3_service
+from app.services.bulk_verification_service import get_bulk_verification_runner
+from app.services.image_hash_index import get_image_hash_index
+from app.services.response_cache import TAG_REPORTS, invalidate_responses
+from app.services.verification_cache import get_layer_cache
+from app.services.verification_metrics import get_verification_metrics
+from app.services.trust_aggregator import get_trust_aggregator
+from app.services.verification_queue import get_verification_queue as get_priority_queue
+from app.services.vision_inference import RemoteVisionModel, get_vision_model
 
 logger = logging.getLogger(__name__)
 
@@ -44,18 +55,6 @@ async def get_verification_service_dep(
     return service
 
 
-def map_decision_to_status(decision: VerificationDecision) -> VerificationStatus:
-    """Map verification decision to hazard report status."""
-    mapping = {
-        VerificationDecision.AUTO_APPROVED: VerificationStatus.VERIFIED,
-        VerificationDecision.MANUAL_REVIEW: VerificationStatus.NEEDS_MANUAL_REVIEW,
-        VerificationDecision.AI_RECOMMENDED: VerificationStatus.NEEDS_MANUAL_REVIEW,  # Legacy - treat as manual review
-        VerificationDecision.REJECTED: VerificationStatus.REJECTED,
-        VerificationDecision.AUTO_REJECTED: VerificationStatus.AUTO_REJECTED
-    }
-    return mapping.get(decision, VerificationStatus.NEEDS_MANUAL_REVIEW)  # Default to needs review
-
-
 # =============================================================================
 # PUBLIC HEALTH CHECK (must be before dynamic routes)
 # =============================================================================
@@ -174,6 +173,62 @@ async def get_verification_stats(
         )
 
 
+@router.get("/vision/metrics")
+async def get_vision_metrics(
+    current_user: User = Depends(require_analyst)
+):
+    """
+    Vision model inference metrics (throughput, latency, batching, queue).
+
+    With a vision sidecar configured, includes the sidecar's own metrics.
+    Also reports the duplicate image index (entries, lookups, hits).
+    """
+    model = get_vision_model()
+    metrics = model.get_stats()
+    if isinstance(model, RemoteVisionModel):
+        metrics["server"] = await model.get_server_stats()
+    metrics["duplicate_index"] = get_image_hash_index().get_stats()
+    return metrics
+
+
+@router.get("/metrics")
+async def get_pipeline_metrics(
+    current_user: User = Depends(require_analyst)
+):
+    """
+    Per-stage latency percentiles for the verification pipeline.
+
+    Stages are the five layers plus image_fingerprint, trust_update,
+    decision and the total, with cache-hit and fallback counts, sorted by
+    p95 so the slowest stage comes first. Also includes the layer cache stats.
+    """
+    metrics = get_verification_metrics().get_stats()
+    metrics["layer_cache"] = get_layer_cache().get_stats()
+    metrics["trust_aggregator"] = get_trust_aggregator().get_stats()
+    return metrics
+
+
+@router.get("/metrics/prometheus", response_class=PlainTextResponse)
+async def get_pipeline_metrics_prometheus(
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Verification pipeline metrics in Prometheus text format.
+
+    Authenticated with VERIFICATION_METRICS_TOKEN as a bearer token
+    (scrapers do not hold user sessions); disabled when it is not set.
+    """
+    token = settings.VERIFICATION_METRICS_TOKEN
+    if not token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Metrics export is disabled")
+    if not authorization or not secrets.compare_digest(authorization, f"Bearer {token}"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return PlainTextResponse(
+        get_verification_metrics().to_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @router.get("/thresholds", response_model=VerificationThresholds)
 async def get_thresholds(
     current_user: User = Depends(require_analyst)
@@ -301,6 +356,142 @@ async def get_verification_queue(
         )
 
 
+# =============================================================================
+# PRIORITY VERIFICATION QUEUE (must be before dynamic routes)
+# =============================================================================
+
+@router.get("/queue/status")
+async def get_verification_queue_status(
+    current_user: User = Depends(require_analyst)
+):
+    """
+    Verification queue depth per priority lane.
+
+    Includes queued/processing/dead-lettered counts, the age of the oldest
+    queued report, active workers, and wait/run time percentiles.
+    Requires Analyst role or higher.
+    """
+    return await get_priority_queue().get_status()
+
+
+@router.get("/queue/dead-letter")
+async def list_verification_dead_letters(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(require_admin)
+):
+    """Reports whose verification failed every retry. Requires Admin role."""
+    return {"jobs": await get_priority_queue().list_dead_letters(limit)}
+
+
+@router.post("/queue/dead-letter/{report_id}/requeue")
+async def requeue_verification_dead_letter(
+    report_id: str,
+    current_user: User = Depends(require_admin)
+):
+    """Queue a dead-lettered report for verification again. Requires Admin role."""
+    if not await get_priority_queue().requeue(report_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No dead-lettered verification for report '{report_id}'"
+        )
+    return {"success": True, "report_id": report_id}
+
+
+# =============================================================================
+# BULK RE-VERIFICATION JOBS (must be before dynamic routes)
+# =============================================================================
+
+@router.post("/bulk-jobs")
+async def create_bulk_verification_job(
+    request: BulkVerificationRequest,
+    current_user: User = Depends(require_admin)
+):
+    """
+    Re-score stored reports with the current pipeline in the background.
+
+    Use after threshold changes. Dry runs (default) only record which
+    decisions would change; the job is checkpointed and rate-limited.
+
+    Requires Admin role.
+    """
+    job = await get_bulk_verification_runner().create_job(request, created_by=current_user.user_id)
+    return {"success": True, "job": job}
+
+
+@router.get("/bulk-jobs")
+async def list_bulk_verification_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(require_admin)
+):
+    """List recent bulk re-verification jobs. Requires Admin role."""
+    return {"jobs": await get_bulk_verification_runner().list_jobs(limit)}
+
+
+@router.get("/bulk-jobs/{job_id}")
+async def get_bulk_verification_job(
+    job_id: str,
+    current_user: User = Depends(require_admin)
+):
+    """Get bulk re-verification job progress. Requires Admin role."""
+    job = await get_bulk_verification_runner().get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bulk verification job '{job_id}' not found"
+        )
+    return job
+
+
+@router.get("/bulk-jobs/{job_id}/diff")
+async def get_bulk_verification_diff(
+    job_id: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Decision changes found by a bulk job.
+
+    Returns counts per old -> new decision and a page of changed reports.
+    Requires Admin role.
+    """
+    runner = get_bulk_verification_runner()
+    if not await runner.get_job(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Bulk verification job '{job_id}' not found"
+        )
+    return await runner.get_diff(job_id, skip=skip, limit=limit)
+
+
+@router.post("/bulk-jobs/{job_id}/cancel")
+async def cancel_bulk_verification_job(
+    job_id: str,
+    current_user: User = Depends(require_admin)
+):
+    """Cancel a running bulk job (progress is kept). Requires Admin role."""
+    if not await get_bulk_verification_runner().cancel_job(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Bulk verification job '{job_id}' is not running"
+        )
+    return {"success": True, "job_id": job_id}
+
+
+@router.post("/bulk-jobs/{job_id}/resume")
+async def resume_bulk_verification_job(
+    job_id: str,
+    current_user: User = Depends(require_admin)
+):
+    """Resume a cancelled, failed or interrupted bulk job from its checkpoint. Requires Admin role."""
+    if not await get_bulk_verification_runner().resume_job(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Bulk verification job '{job_id}' cannot be resumed (finished, missing or running elsewhere)"
+        )
+    return {"success": True, "job_id": job_id}
+
+
 @router.get("/{report_id}")
 async def get_verification_details(
     report_id: str,
@@ -477,6 +668,7 @@ async def make_analyst_decision(
         {"report_id": report_id},
         {"$set": update_data}
     )
+    await invalidate_responses(TAG_REPORTS)
 
     # Update reporter credibility
     user_id = doc.get("user_id")
@@ -495,6 +687,7 @@ async def make_analyst_decision(
             {"user_id": user_id},
             credibility_update
         )
+        get_trust_aggregator().invalidate(user_id)
 
     # Create audit record
     verification_result = doc.get("verification_result")
@@ -585,6 +778,7 @@ async def make_analyst_decision(
 @router.post("/{report_id}/rerun")
 async def rerun_verification(
     report_id: str,
+    fresh: bool = Query(False, description="Recompute every layer instead of reusing cached layer results"),
     current_user: User = Depends(require_analyst),
     db: AsyncIOMotorDatabase = Depends(get_database),
     service: VerificationService = Depends(get_verification_service_dep)
@@ -592,12 +786,11 @@ async def rerun_verification(
     """
     Re-run verification pipeline on a report.
 
-    Useful when environmental data or thresholds have changed.
+    Useful when environmental data or thresholds have changed. Layers whose
+    inputs are unchanged are served from the layer cache unless fresh=true.
 
     Requires Analyst role or higher.
     """
-    from app.models.hazard import HazardType, HazardCategory
-
     # Find the report
     doc = await db.hazard_reports.find_one({"report_id": report_id})
 
@@ -607,48 +800,9 @@ async def rerun_verification(
             detail=f"Report '{report_id}' not found"
         )
 
-    # Normalize enum fields before creating HazardReport to handle legacy data
-    doc_copy = doc.copy()
-
-    # Normalize hazard_type
-    if "hazard_type" in doc_copy:
-        ht = doc_copy["hazard_type"]
-        valid_types = {e.value for e in HazardType}
-        if ht not in valid_types:
-            # Try case-insensitive match
-            matched = None
-            for enum_member in HazardType:
-                if enum_member.value.lower() == str(ht).lower():
-                    matched = enum_member.value
-                    break
-            doc_copy["hazard_type"] = matched or HazardType.HIGH_WAVES.value
-
-    # Normalize category
-    if "category" in doc_copy:
-        cat = doc_copy["category"]
-        valid_cats = {e.value for e in HazardCategory}
-        if cat not in valid_cats:
-            matched = None
-            for enum_member in HazardCategory:
-                if enum_member.value.lower() == str(cat).lower():
-                    matched = enum_member.value
-                    break
-            doc_copy["category"] = matched or HazardCategory.NATURAL.value
-
-    # Normalize verification_status
-    if "verification_status" in doc_copy:
-        vs = doc_copy["verification_status"]
-        valid_statuses = {e.value for e in VerificationStatus}
-        if vs not in valid_statuses:
-            matched = None
-            for enum_member in VerificationStatus:
-                if enum_member.value.lower() == str(vs).lower():
-                    matched = enum_member.value
-                    break
-            doc_copy["verification_status"] = matched or VerificationStatus.PENDING.value
-
+    # Normalize legacy enum fields before creating HazardReport
     try:
-        report = HazardReport.from_mongo(doc_copy)
+        report = report_from_document(doc)
     except Exception as e:
         logger.error(f"Error creating HazardReport from document: {e}")
         raise HTTPException(
@@ -656,44 +810,22 @@ async def rerun_verification(
             detail=f"Failed to parse report data: {str(e)}"
         )
 
-    # Determine image path for re-verification
-    # The image_url may be S3 URL or local path "/uploads/hazards/..."
-    image_path = None
-    temp_image_path = None  # Track temp file for cleanup
-    
-    if report.image_url:
-        if report.image_url.startswith('http'):
-            # S3 URL - download to temp file for verification
-            if s3_service.is_enabled:
-                logger.info(f"Downloading S3 image for re-verification: {report.image_url}")
-                temp_image_path = s3_service.download_from_url_to_temp(report.image_url)
-                if temp_image_path:
-                    image_path = temp_image_path
-                    logger.info(f"S3 image downloaded to: {temp_image_path}")
-                else:
-                    logger.warning(f"Failed to download S3 image, skipping image verification")
-        else:
-            # Local path - strip leading slash if present
-            image_path = report.image_url.lstrip('/')
-            logger.info(f"Re-verification using local image path: {image_path}")
+    # The image_url may be S3 URL (downloaded to a temp file) or local path "/uploads/hazards/..."
+    image_path, temp_image_path = await fetch_report_image(report.image_url)
+    if image_path:
+        logger.info(f"Re-verification using image: {image_path}")
 
     try:
         # Re-run verification
         result = await service.verify_report(
             report,
             image_path=image_path,
-            db=db
+            db=db,
+            use_cache=not fresh
         )
     finally:
         # Clean up temporary S3 download file
-        if temp_image_path:
-            try:
-                import os
-                if os.path.exists(temp_image_path):
-                    os.remove(temp_image_path)
-                    logger.debug(f"Cleaned up temp file: {temp_image_path}")
-            except Exception as cleanup_error:
-                logger.warning(f"Failed to cleanup temp file {temp_image_path}: {cleanup_error}")
+        remove_temp_image(temp_image_path)
 
     # Update the report
     new_status = map_decision_to_status(result.decision)
@@ -711,6 +843,7 @@ async def rerun_verification(
             }
         }
     )
+    await invalidate_responses(TAG_REPORTS)
 
     logger.info(
         f"Re-ran verification for report {report_id}: "
@@ -725,6 +858,7 @@ async def rerun_verification(
         "decision": result.decision.value,
         "new_status": new_status.value,
         "processing_time_ms": result.processing_time_ms,
+        "cached_layers": [layer.value for layer in result.cached_layers],
         "layer_summary": {
             lr.layer_name.value: {"status": lr.status.value, "score": lr.score}
             for lr in result.layer_results
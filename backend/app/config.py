@@ -108,8 +108,13 @@ class Settings(BaseSettings):
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_WINDOW_SECONDS: int = 3600
     RATE_LIMIT_MAX_REQUESTS_PER_WINDOW: int = 100
-    RATE_LIMIT_LOGIN_MAX_ATTEMPTS: int = 5
+    RATE_LIMIT_LOGIN_MAX_ATTEMPTS: int = 5  # Per auth endpoint (login, OTP, password reset)
     RATE_LIMIT_LOGIN_WINDOW_SECONDS: int = 900
+    RATE_LIMIT_POLLING_MAX_REQUESTS: int = 720  # Map/alert/status polling, shared budget (a 5s poll for an hour)
+    RATE_LIMIT_POLLING_WINDOW_SECONDS: int = 3600
+    RATE_LIMIT_SOS_MAX_REQUESTS: int = 10  # SOS triggers; own budget so other traffic never blocks an SOS
+    RATE_LIMIT_SOS_WINDOW_SECONDS: int = 600
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 50000  # In-process fallback buckets (per worker) while Redis is unavailable
 
     # Google OAuth2
     GOOGLE_CLIENT_ID: str = ""
@@ -158,6 +163,129 @@ class Settings(BaseSettings):
     VECTORDB_EMBED_DIM: int = 384
     VECTORDB_INDEX_PATH: str = "data/models/vectordb_index"
     VECTORDB_CLASSIFICATION_THRESHOLD: float = 0.6
+    VECTORDB_ARTIFACT_DIR: str = "data/models/vectordb_artifacts"  # Prebuilt training-set embeddings
+    VECTORDB_INDEX_TYPE: str = "flat"  # flat, ivf_flat, hnsw, ivf_pq
+    VECTORDB_ANN_MIN_VECTORS: int = 10000  # Below this, approximate indexes fall back to flat
+    VECTORDB_IVF_NLIST: int = 1024
+    VECTORDB_IVF_NPROBE: int = 16
+    VECTORDB_HNSW_M: int = 32
+    VECTORDB_HNSW_EF_CONSTRUCTION: int = 200
+    VECTORDB_HNSW_EF_SEARCH: int = 64
+    VECTORDB_PQ_M: int = 48  # Sub-quantizers; must divide VECTORDB_EMBED_DIM
+    VECTORDB_REBUILD_EVERY_SAMPLES: int = 5000  # Retrain ANN index after this many new samples
+    VECTORDB_REBUILD_INTERVAL_SECONDS: int = 86400  # ...or when older than this and samples were added
+    VECTORDB_RECALL_SAMPLE_SIZE: int = 200  # Queries used to measure recall after a rebuild
+    VECTORDB_SYNC_ENABLED: bool = True  # Share added samples across workers via the MongoDB sample log
+    VECTORDB_SYNC_INTERVAL_SECONDS: float = 5.0  # How often workers replay new log entries
+    VECTORDB_SYNC_BATCH_SIZE: int = 500  # Log entries applied per replay batch
+    VECTORDB_SNAPSHOT_PATH: str = "data/models/vectordb_snapshot"  # Compacted log; must be shared across replicas
+    VECTORDB_COMPACT_EVERY_SAMPLES: int = 1000  # Compact the log after this many entries
+    VECTORDB_COMPACTION_LEASE_SECONDS: int = 300
+    VECTORDB_BATCH_MAX_SIZE: int = 32  # Max texts per coalesced encode/search
+    VECTORDB_BATCH_WAIT_MS: float = 5.0  # How long to gather concurrent requests
+
+    # Embedding cache (in-process LRU + on-disk float32 store, shared with SMI)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MEMORY_ITEMS: int = 20000
+    EMBEDDING_CACHE_PATH: str = "data/cache/embeddings.sqlite3"  # Empty to disable the disk tier
+
+    # Inference worker pool (embeddings / FAISS search off the event loop)
+    INFERENCE_MAX_WORKERS: int = 2
+    INFERENCE_MAX_QUEUE: int = 64  # Calls waiting beyond this are rejected (503)
+    INFERENCE_TIMEOUT_SECONDS: float = 10.0
+
+    # Upload image processing pool (EXIF transpose / resize / strip)
+    IMAGE_PROCESSING_MAX_WORKERS: int = 2
+    IMAGE_PROCESSING_MAX_QUEUE: int = 32  # Beyond this uploads are stored unprocessed
+    IMAGE_PROCESSING_TIMEOUT_SECONDS: float = 30.0
+
+    # Vision model inference (verification layer 4)
+    VISION_INFERENCE_URL: str = ""  # Vision sidecar (app.vision_server), e.g. http://127.0.0.1:8100; empty loads the model in-process
+    VISION_BATCH_MAX_SIZE: int = 16  # Max images per predict call
+    VISION_BATCH_WAIT_MS: float = 25.0  # Latency budget for gathering a batch
+    VISION_INFERENCE_TIMEOUT_SECONDS: float = 30.0
+
+    # Duplicate / recycled image detection
+    IMAGE_HASH_MAX_DISTANCE: int = 8  # dHash Hamming radius (of 64 bits) for a near-duplicate
+    IMAGE_HASH_PHASH_MAX_DISTANCE: int = 10  # pHash distance that must also hold
+    IMAGE_HASH_SYNC_SECONDS: float = 30.0  # Pull hashes indexed by other workers
+    IMAGE_HASH_BLUERADAR_LOG: str = ""  # Empty uses blueradar_intelligence/data/cache/image_hashes.jsonl
+    IMAGE_RECYCLED_SCORE_FACTOR: float = 0.5  # Image layer score multiplier for another reporter's / scraped photo
+
+    # Verification layer cache (per-layer memo keyed by input fingerprints; 0 disables a layer)
+    VERIFICATION_CACHE_MAX_ITEMS: int = 4096
+    VERIFICATION_CACHE_REDIS_ENABLED: bool = True
+    VERIFICATION_CACHE_GEOFENCE_TTL_SECONDS: float = 86400.0
+    VERIFICATION_CACHE_WEATHER_TTL_SECONDS: float = 3600.0
+    VERIFICATION_CACHE_TEXT_TTL_SECONDS: float = 21600.0
+    VERIFICATION_CACHE_IMAGE_TTL_SECONDS: float = 86400.0
+    VERIFICATION_CACHE_REPORTER_TTL_SECONDS: float = 0.0  # Trust scores change with every verification
+
+    # Reporter trust scores (write-behind) and reporter-layer user stats
+    TRUST_FLUSH_INTERVAL_SECONDS: float = 5.0
+    TRUST_FLUSH_MAX_PENDING: int = 200  # Buffered verifications that trigger an early flush
+    USER_STATS_CACHE_TTL_SECONDS: float = 30.0
+
+    # Verification work queue (new reports)
+    VERIFICATION_QUEUE_ENABLED: bool = True  # False verifies new reports inline in the create request
+    VERIFICATION_QUEUE_CRITICAL_WORKERS: int = 4  # Max concurrent verifications per lane
+    VERIFICATION_QUEUE_HIGH_WORKERS: int = 3
+    VERIFICATION_QUEUE_NORMAL_WORKERS: int = 2
+    VERIFICATION_QUEUE_LOW_WORKERS: int = 1
+    VERIFICATION_QUEUE_MAX_ATTEMPTS: int = 4  # Attempts before a job is dead-lettered
+    VERIFICATION_QUEUE_RETRY_BASE_SECONDS: float = 2.0  # Exponential backoff: base * 2^(attempt-1)
+    VERIFICATION_QUEUE_RETRY_MAX_SECONDS: float = 120.0
+    VERIFICATION_QUEUE_LEASE_SECONDS: int = 300  # Claimed jobs are re-queued if not finished within this
+    VERIFICATION_QUEUE_POLL_SECONDS: float = 2.0  # Scale check for retries and jobs enqueued by other processes
+    VERIFICATION_QUEUE_IDLE_SECONDS: float = 30.0  # Idle workers exit (lane scales down)
+    VERIFICATION_QUEUE_RETENTION_DAYS: int = 7  # Finished jobs are removed after this
+
+    # Bulk re-verification jobs
+    BULK_VERIFICATION_BATCH_SIZE: int = 32  # Reports read and verified together (coalesced text/image inference)
+    BULK_VERIFICATION_MAX_RATE: float = 5.0  # Reports per second ceiling per job
+    BULK_VERIFICATION_BACKOFF_QUEUE_DEPTH: int = 4  # Pause while live work is queued on the inference pool
+    BULK_VERIFICATION_BACKOFF_SECONDS: float = 2.0
+    BULK_VERIFICATION_RESUME_ON_STARTUP: bool = True  # Continue jobs interrupted by a restart from their checkpoint
+
+    # Verification pipeline metrics
+    VERIFICATION_METRICS_TOKEN: str = ""  # Bearer token for the Prometheus scrape endpoint; empty disables it
+
+    # Map aggregates (/hazards/map-data)
+    MAP_INDEX_REFRESH_SECONDS: float = 10.0  # Pull changed reports (by updated_at) at most this often
+    MAP_INDEX_FULL_RELOAD_SECONDS: float = 900.0  # Rebuild to catch writes that skip updated_at
+    MAP_CLUSTER_MAX_ZOOM: int = 15  # Above this zoom reports are returned individually
+    MAP_RESPONSE_CACHE_SIZE: int = 512  # Memoized map responses (per window/zoom/viewport)
+
+    # Report rollups (hourly/daily counters behind the admin and analyst dashboards)
+    REPORT_ROLLUPS_ENABLED: bool = True  # False makes the dashboards count hazard_reports directly
+    REPORT_ROLLUP_SYNC_SECONDS: float = 15.0  # Tail job interval (reports changed by updated_at)
+    REPORT_ROLLUP_BATCH_SIZE: int = 1000  # Reports applied per bulk write
+    REPORT_ROLLUP_LEASE_SECONDS: int = 120  # One process maintains the rollups at a time
+    REPORT_ROLLUP_AUTO_BACKFILL: bool = True  # Build the rollups on startup if they were never built; else run scripts/backfill_report_rollups.py
+
+    # Response cache (map/alert feeds, monitoring status, analyst analytics)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ITEMS: int = 2048
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0  # Upper bound on staleness for data without an invalidation hook
+    RESPONSE_CACHE_REDIS_ENABLED: bool = True  # Share responses and invalidations across workers when Redis is connected
+    RESPONSE_CACHE_LOCK_SECONDS: float = 5.0  # Other workers wait this long for the one recomputing a response
+    RESPONSE_CACHE_VERSION_CHECK_SECONDS: float = 1.0  # Invalidations by other workers are seen within this
+
+    # Principal cache (authenticated user lookups in get_current_user)
+    PRINCIPAL_CACHE_ENABLED: bool = True
+    PRINCIPAL_CACHE_MAX_ITEMS: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0  # Staleness bound for counters updated without an invalidation (credibility, report totals)
+    PRINCIPAL_CACHE_REDIS_ENABLED: bool = True  # Share users and invalidations across workers when Redis is connected
+    PRINCIPAL_CACHE_VERSION_CHECK_SECONDS: float = 1.0  # Bans/role changes by other workers take effect within this
+
+    # Geofence (verification layer 1)
+    GEOFENCE_COASTLINE_PATH: str = ""  # GeoJSON coastline lines/land polygons; empty uses built-in reference points
+
+    # Weather / marine data cache (weather, Open-Meteo, environmental and multi-hazard fetches)
+    WEATHER_CACHE_MAX_ITEMS: int = 2048
+    WEATHER_CACHE_TTL_SECONDS: int = 300
+    WEATHER_CACHE_GEOHASH_PRECISION: int = 5  # ~4.9 km cells; nearby reports share one lookup
+    WEATHER_CACHE_REDIS_ENABLED: bool = True  # Share entries across workers when Redis is connected
 
     # MultiHazard Detection Module
     MULTIHAZARD_ENABLED: bool = True
@@ -165,6 +293,8 @@ class Settings(BaseSettings):
     
     MULTIHAZARD_MONITORING_INTERVAL_SECONDS: int = 300
     MULTIHAZARD_AUTO_START: bool = True
+    MULTIHAZARD_MAX_CONCURRENCY: int = 4  # Locations fetched/evaluated in parallel per cycle (also ML monitor)
+    MULTIHAZARD_LOCATION_TIMEOUT_SECONDS: float = 45.0  # Per-location budget; slower locations are reported as failed
     TSUNAMI_MODEL_PATH: str = "data/models/tsunami_classifier.pkl"
     TSUNAMI_ML_THRESHOLD: float = 0.7
 
@@ -297,6 +297,58 @@ class MongoDB:
             except (DuplicateKeyError, OperationFailure):
                 logger.warning("⚠ user_points indexes already exist")
 
+            # Hazard reports: map index load and incremental sync
+            hazard_reports = cls.database.hazard_reports
+            try:
+                await hazard_reports.create_index("updated_at")
+                await hazard_reports.create_index([("is_deleted", 1), ("is_active", 1), ("created_at", -1)])
+            except (DuplicateKeyError, OperationFailure):
+                logger.warning("⚠ hazard_reports indexes already exist")
+
+            # Image hash index (duplicate / recycled photo detection)
+            image_hashes = cls.database.image_hashes
+            try:
+                await image_hashes.create_index("created_at")
+                await image_hashes.create_index("ref_id")
+            except (DuplicateKeyError, OperationFailure):
+                logger.warning("⚠ image_hashes indexes already exist")
+
+            # Bulk re-verification jobs and their decision diffs
+            verification_jobs = cls.database.verification_jobs
+            verification_job_diffs = cls.database.verification_job_diffs
+            try:
+                await verification_jobs.create_index("job_id", unique=True)
+                await verification_jobs.create_index([("status", 1), ("created_at", -1)])
+                await verification_job_diffs.create_index([("job_id", 1), ("report_id", 1)], unique=True)
+            except (DuplicateKeyError, OperationFailure):
+                logger.warning("⚠ verification job indexes already exist")
+
+            # Verification work queue (priority lanes; finished jobs expire)
+            verification_queue = cls.database.verification_queue
+            try:
+                await verification_queue.create_index("report_id", unique=True)
+                await verification_queue.create_index([("status", 1), ("priority", 1), ("available_at", 1)])
+                await verification_queue.create_index([("status", 1), ("lease_until", 1)])
+                await verification_queue.create_index(
+                    "completed_at",
+                    expireAfterSeconds=settings.VERIFICATION_QUEUE_RETENTION_DAYS * 86400
+                )
+            except (DuplicateKeyError, OperationFailure):
+                logger.warning("⚠ verification_queue indexes already exist")
+
+            # Report rollups (dashboard counters) and the per-report key they were counted under
+            report_rollups = cls.database.report_rollups
+            report_rollup_state = cls.database.report_rollup_state
+            try:
+                await report_rollups.create_index(
+                    [("granularity", 1), ("bucket", 1), ("hazard_type", 1), ("region", 1),
+                     ("status", 1), ("severity", 1), ("priority", 1)],
+                    unique=True
+                )
+                await report_rollup_state.create_index("report_id", unique=True)
+            except (DuplicateKeyError, OperationFailure):
+                logger.warning("⚠ report_rollups indexes already exist")
+
             logger.info("✓ Database indexes created successfully")
 
         except Exception as e:
@@ -169,6 +169,30 @@ async def lifespan(app: FastAPI):
                 logger.warning(f"[WARN] Predictive Alert Scheduler failed to start: {scheduler_error}")
                 logger.warning("[WARN] Automatic alert checks will be unavailable")
 
+        # Resume bulk re-verification jobs interrupted by the last shutdown
+        if settings.BULK_VERIFICATION_RESUME_ON_STARTUP:
+            try:
+                from app.services.bulk_verification_service import get_bulk_verification_runner
+                await get_bulk_verification_runner().resume_interrupted()
+            except Exception as bulk_error:
+                logger.warning(f"[WARN] Bulk verification resume failed: {bulk_error}")
+
+        # Start verification queue workers (picks up reports queued before the restart)
+        if settings.VERIFICATION_QUEUE_ENABLED:
+            try:
+                from app.services.verification_queue import get_verification_queue
+                get_verification_queue().start()
+            except Exception as queue_error:
+                logger.warning(f"[WARN] Verification queue failed to start: {queue_error}")
+
+        # Keep the dashboard report rollups current (first start also builds them)
+        if settings.REPORT_ROLLUPS_ENABLED:
+            try:
+                from app.services.report_rollup_service import get_report_rollup_service
+                get_report_rollup_service().start()
+            except Exception as rollup_error:
+                logger.warning(f"[WARN] Report rollups failed to start: {rollup_error}")
+
         logger.info("[OK] All services connected successfully")
 
     except Exception as e:
@@ -200,6 +224,54 @@ async def lifespan(app: FastAPI):
             except Exception as mh_error:
                 logger.warning(f"[WARN] MultiHazard shutdown error: {mh_error}")
 
+        # Stop verification queue workers (interrupted jobs return to the queue)
+        try:
+            from app.services.verification_queue import get_verification_queue
+            await get_verification_queue().shutdown()
+        except Exception as queue_error:
+            logger.warning(f"[WARN] Verification queue shutdown error: {queue_error}")
+
+        # Stop the report rollup tail job
+        try:
+            from app.services.report_rollup_service import get_report_rollup_service
+            await get_report_rollup_service().shutdown()
+        except Exception as rollup_error:
+            logger.warning(f"[WARN] Report rollup shutdown error: {rollup_error}")
+
+        # Stop bulk re-verification jobs (checkpointed; resumed on next startup)
+        try:
+            from app.services.bulk_verification_service import get_bulk_verification_runner
+            await get_bulk_verification_runner().shutdown()
+        except Exception as bulk_error:
+            logger.warning(f"[WARN] Bulk verification shutdown error: {bulk_error}")
+
+        # Stop VectorDB sample-log replay
+        if settings.VECTORDB_ENABLED:
+            try:
+                from app.services.vectordb_service import get_vectordb_service
+                await get_vectordb_service().shutdown()
+            except Exception as vectordb_error:
+                logger.warning(f"[WARN] VectorDB shutdown error: {vectordb_error}")
+
+        # Release ML inference and image processing worker threads
+        try:
+            from app.services.inference_executor import shutdown_inference_executor
+            shutdown_inference_executor()
+        except Exception as inference_error:
+            logger.warning(f"[WARN] Inference executor shutdown error: {inference_error}")
+        try:
+            from app.services.image_processor import shutdown_image_executor
+            shutdown_image_executor()
+        except Exception as image_pool_error:
+            logger.warning(f"[WARN] Image processing pool shutdown error: {image_pool_error}")
+
+        # Write buffered reporter trust updates
+        try:
+            from app.services.trust_aggregator import get_trust_aggregator
+            await get_trust_aggregator().shutdown()
+        except Exception as trust_error:
+            logger.warning(f"[WARN] Trust score flush error: {trust_error}")
+
         await MongoDB.disconnect()
 
         # Disconnect Redis if connected
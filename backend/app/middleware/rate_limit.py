@@ -1,24 +1,255 @@
 """
 Rate Limiting Middleware
-Redis-based rate limiting
+Redis-based rate limiting with an in-process fallback
+
+Limits use GCRA (generic cell rate algorithm): a limit of N requests per
+window lets a client burst N requests, then refills one request every
+window/N. Against Redis each check is a single atomic script call; when
+Redis is not connected or a call fails, an in-process token bucket with the
+same limits keeps protecting the service (per worker) until Redis is back.
+
+Routes fall into limit classes (see RATE_LIMIT_CLASSES): SOS triggers and
+map/alert polling each get their own budget, auth endpoints get the login
+limits, everything else the default per-path limit.
 """
 
+import hashlib
 import logging
-from typing import Callable
+import math
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
 from fastapi import Request, HTTPException, status, Depends
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
-from redis.asyncio import Redis
+from redis.exceptions import NoScriptError
 
 from app.config import settings
 from app.database import get_redis
+from app.utils.jwt import get_request_token_claims
 
 logger = logging.getLogger(__name__)
 
+# GCRA in one round trip. KEYS[1]: limiter key; ARGV[1]: max requests;
+# ARGV[2]: window in ms. Returns {allowed, remaining, retry_after_ms}.
+# Uses the Redis clock so workers with skewed clocks share one timeline.
+_GCRA_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local emission = window / limit
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+  tat = now
+end
+local allow_at = tat + emission - window
+if allow_at > now then
+  return {0, 0, math.ceil(allow_at - now)}
+end
+local new_tat = tat + emission
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.ceil(new_tat - now))
+return {1, math.floor((window - (new_tat - now)) / emission), 0}
+"""
+_GCRA_SHA = hashlib.sha1(_GCRA_SCRIPT.encode("utf-8")).hexdigest()
+
+# Paths (below API_PREFIX) grouped into limit classes
+RATE_LIMIT_CLASSES: Dict[str, Tuple[str, ...]] = {
+    "sos": (
+        "/sos/trigger",
+    ),
+    "polling": (
+        "/hazards/map-data",
+        "/alerts/active/summary",
+        "/monitoring/current",
+        "/monitoring/summary",
+        "/multi-hazard/status",
+        "/multi-hazard/public/status",
+        "/multi-hazard/public/alerts",
+        "/notifications/stats",
+    ),
+    "auth": (
+        "/auth/login",
+        "/auth/signup",
+        "/auth/verify-otp",
+        "/auth/request-otp",
+        "/auth/forgot-password",
+        "/auth/reset-password",
+    ),
+}
+
+
+class RateLimitRule(NamedTuple):
+    """Limit applied to a request"""
+    name: str
+    max_requests: int
+    window_seconds: int
+    per_path: bool  # Separate budget per path rather than one per class
+
+
+def get_rate_limit_rule(path: str) -> RateLimitRule:
+    """
+    Get the limit class for a request path
+
+    Args:
+        path: Request path
+
+    Returns:
+        RateLimitRule for the path
+    """
+    route = path[len(settings.API_PREFIX):] if path.startswith(settings.API_PREFIX) else path
+    if route in RATE_LIMIT_CLASSES["sos"]:
+        return RateLimitRule("sos", settings.RATE_LIMIT_SOS_MAX_REQUESTS, settings.RATE_LIMIT_SOS_WINDOW_SECONDS, False)
+    if route in RATE_LIMIT_CLASSES["polling"]:
+        return RateLimitRule(
+            "polling", settings.RATE_LIMIT_POLLING_MAX_REQUESTS, settings.RATE_LIMIT_POLLING_WINDOW_SECONDS, False
+        )
+    if route in RATE_LIMIT_CLASSES["auth"]:
+        return RateLimitRule(
+            "auth", settings.RATE_LIMIT_LOGIN_MAX_ATTEMPTS, settings.RATE_LIMIT_LOGIN_WINDOW_SECONDS, True
+        )
+    return RateLimitRule(
+        "default", settings.RATE_LIMIT_MAX_REQUESTS_PER_WINDOW, settings.RATE_LIMIT_WINDOW_SECONDS, True
+    )
+
+
+class LocalTokenBucket:
+    """
+    In-process token buckets used while Redis is unavailable
+
+    Each key holds (tokens, updated_at); a bucket starts full at max_requests
+    and refills max_requests per window. Least recently used keys are
+    dropped beyond max_keys (a dropped key starts full again).
+    """
+
+    def __init__(self, max_keys: int = 50000):
+        self.max_keys = max(1, max_keys)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def hit(self, key: str, max_requests: int, window_seconds: int) -> Tuple[bool, int, int]:
+        """
+        Take one token
+
+        Returns:
+            Tuple of (is_allowed, remaining_requests, retry_after_seconds)
+        """
+        now = time.monotonic()
+        rate = max_requests / window_seconds
+        tokens, updated_at = self._buckets.get(key, (float(max_requests), now))
+        tokens = min(float(max_requests), tokens + (now - updated_at) * rate)
+
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        if allowed:
+            return True, int(tokens), 0
+        return False, 0, max(1, math.ceil((1.0 - tokens) / rate))
+
+
+class RateLimiter:
+    """Atomic Redis GCRA limiter falling back to local token buckets"""
+
+    def __init__(self, local_max_keys: int = 50000):
+        self.local = LocalTokenBucket(local_max_keys)
+        self._redis_checks = 0
+        self._local_checks = 0
+        self._rejected = 0
+        self._redis_failing = False
+
+    async def hit(self, key: str, max_requests: int, window_seconds: int) -> Tuple[bool, int, int]:
+        """
+        Count one request against a limit
+
+        Args:
+            key: Limiter key (identifier and route or class)
+            max_requests: Requests allowed per window
+            window_seconds: Window length in seconds
+
+        Returns:
+            Tuple of (is_allowed, remaining_requests, retry_after_seconds)
+        """
+        redis = await get_redis()
+        result = await self._hit_redis(redis, key, max_requests, window_seconds) if redis is not None else None
+
+        if result is None:
+            self._local_checks += 1
+            result = self.local.hit(key, max_requests, window_seconds)
+        else:
+            self._redis_checks += 1
+
+        if not result[0]:
+            self._rejected += 1
+        return result
+
+    async def _hit_redis(self, redis, key: str, max_requests: int, window_seconds: int) -> Optional[Tuple[bool, int, int]]:
+        args = (max_requests, int(window_seconds * 1000))
+        try:
+            try:
+                allowed, remaining, retry_after_ms = await redis.evalsha(_GCRA_SHA, 1, key, *args)
+            except NoScriptError:
+                allowed, remaining, retry_after_ms = await redis.eval(_GCRA_SCRIPT, 1, key, *args)
+        except Exception as e:
+            if not self._redis_failing:
+                logger.warning(f"Rate limiting falling back to in-process buckets: {e}")
+                self._redis_failing = True
+            return None
+
+        if self._redis_failing:
+            logger.info("Rate limiting back on Redis")
+            self._redis_failing = False
+        retry_after = max(1, math.ceil(int(retry_after_ms) / 1000)) if not int(allowed) else 0
+        return bool(int(allowed)), int(remaining), retry_after
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get limiter statistics"""
+        return {
+            "redis_checks": self._redis_checks,
+            "local_checks": self._local_checks,
+            "rejected": self._rejected,
+            "local_keys": len(self.local._buckets),
+        }
+
+
+# Singleton instance
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the shared rate limiter"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(local_max_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS)
+    return _rate_limiter
+
+
+def _rate_limit_response(message: str, retry_after: int, max_requests: int) -> JSONResponse:
+    """429 response in the same shape as the app's HTTP exception handler"""
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={
+            "success": False,
+            "error": {
+                "code": status.HTTP_429_TOO_MANY_REQUESTS,
+                "message": message
+            }
+        },
+        headers={
+            "Retry-After": str(retry_after),
+            "X-RateLimit-Limit": str(max_requests),
+            "X-RateLimit-Remaining": "0"
+        }
+    )
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
-    Rate limiting middleware using Redis
-    Implements sliding window rate limiting
+    Rate limiting middleware
+    Implements GCRA rate limiting per identifier and limit class
     """
 
     async def dispatch(self, request: Request, call_next: Callable):
@@ -33,43 +264,35 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         if request.url.path in skip_paths:
             return await call_next(request)
 
-        try:
-            # Get identifier (IP address or user ID from token)
-            identifier = self._get_identifier(request)
-
-            # Get Redis client - skip rate limiting if Redis not available
-            redis = await get_redis()
-
-            # Check rate limit
-            is_allowed, remaining = await self._check_rate_limit(
-                redis,
-                identifier,
-                request.url.path
+        # Get identifier (IP address or user ID from token)
+        identifier = self._get_identifier(request)
+
+        # Check rate limit
+        rule = get_rate_limit_rule(request.url.path)
+        scope = request.url.path if rule.per_path else rule.name
+        is_allowed, remaining, retry_after = await get_rate_limiter().hit(
+            f"rate_limit:{identifier}:{scope}",
+            rule.max_requests,
+            rule.window_seconds
+        )
+
+        if not is_allowed:
+            # Returned rather than raised: exceptions raised in middleware
+            # bypass the app's exception handlers
+            return _rate_limit_response(
+                "Rate limit exceeded. Please try again later.",
+                retry_after,
+                rule.max_requests
             )
 
-            if not is_allowed:
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail="Rate limit exceeded. Please try again later.",
-                    headers={"Retry-After": str(remaining)}
-                )
-
-            # Process request
-            response = await call_next(request)
-
-            # Add rate limit headers
-            response.headers["X-RateLimit-Limit"] = str(
-                settings.RATE_LIMIT_MAX_REQUESTS_PER_WINDOW
-            )
+        # Process request
+        response = await call_next(request)
 
-            return response
+        # Add rate limit headers
+        response.headers["X-RateLimit-Limit"] = str(rule.max_requests)
+        response.headers["X-RateLimit-Remaining"] = str(remaining)
 
-        except RuntimeError as e:
-            # Redis not connected - skip rate limiting
-            if "not connected" in str(e).lower():
-                logger.debug("Rate limiting skipped - Redis not connected")
-                return await call_next(request)
-            raise
+        return response
 
     def _get_identifier(self, request: Request) -> str:
         """Get identifier for rate limiting (IP or user ID)"""
@@ -78,9 +301,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         auth_header = request.headers.get("Authorization")
         if auth_header and auth_header.startswith("Bearer "):
             try:
-                from app.utils.jwt import decode_token
                 token = auth_header.split(" ")[1]
-                payload = decode_token(token)
+                payload = get_request_token_claims(request, token)
                 user_id = payload.get("sub")
                 if user_id:
                     return f"user:{user_id}"
@@ -98,36 +320,6 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         return f"ip:{client_ip}"
 
-    async def _check_rate_limit(
-        self,
-        redis: Redis,
-        identifier: str,
-        path: str
-    ) -> tuple[bool, int]:
-        """
-        Check rate limit using sliding window
-
-        Returns:
-            Tuple of (is_allowed, remaining_time_seconds)
-        """
-        key = f"rate_limit:{identifier}:{path}"
-
-        # Get current count
-        count = await redis.get(key)
-
-        if count and int(count) >= settings.RATE_LIMIT_MAX_REQUESTS_PER_WINDOW:
-            # Get remaining TTL
-            ttl = await redis.ttl(key)
-            return False, ttl
-
-        # Increment counter
-        pipe = redis.pipeline()
-        pipe.incr(key)
-        pipe.expire(key, settings.RATE_LIMIT_WINDOW_SECONDS)
-        await pipe.execute()
-
-        return True, 0
-
 
 async def rate_limit_dependency(
     request: Request,
@@ -149,52 +341,34 @@ async def rate_limit_dependency(
     if not settings.RATE_LIMIT_ENABLED:
         return
 
-    try:
-        # Get Redis client
-        redis = await get_redis()
-
-        # Get identifier
-        client_ip = request.client.host if request.client else "unknown"
-        identifier = f"ip:{client_ip}"
+    # Get identifier
+    client_ip = request.client.host if request.client else "unknown"
+    identifier = f"ip:{client_ip}"
 
-        # Check auth token for user ID
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            try:
-                from app.utils.jwt import decode_token
-                token = auth_header.split(" ")[1]
-                payload = decode_token(token)
-                user_id = payload.get("sub")
-                if user_id:
-                    identifier = f"user:{user_id}"
-            except (IndexError, KeyError, Exception):
-                # Fall back to IP if token is invalid
-                pass
-
-        # Rate limit key
-        endpoint = request.url.path
-        key = f"rate_limit:custom:{identifier}:{endpoint}"
-
-        # Check limit
-        count = await redis.get(key)
-
-        if count and int(count) >= max_requests:
-            ttl = await redis.ttl(key)
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail=f"Rate limit exceeded. Try again in {ttl} seconds.",
-                headers={"Retry-After": str(ttl)}
-            )
-
-        # Increment
-        pipe = redis.pipeline()
-        pipe.incr(key)
-        pipe.expire(key, window_seconds)
-        await pipe.execute()
-
-    except RuntimeError as e:
-        # Redis not connected - skip rate limiting
-        if "not connected" in str(e).lower():
-            logger.debug("Rate limiting skipped - Redis not connected")
-            return
-        raise
+    # Check auth token for user ID
+    auth_header = request.headers.get("Authorization")
+    if auth_header and auth_header.startswith("Bearer "):
+        try:
+            token = auth_header.split(" ")[1]
+            payload = get_request_token_claims(request, token)
+            user_id = payload.get("sub")
+            if user_id:
+                identifier = f"user:{user_id}"
+        except (IndexError, KeyError, Exception):
+            # Fall back to IP if token is invalid
+            pass
+
+    # Check limit
+    endpoint = request.url.path
+    is_allowed, _, retry_after = await get_rate_limiter().hit(
+        f"rate_limit:custom:{identifier}:{endpoint}",
+        max_requests,
+        window_seconds
+    )
+
+    if not is_allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Rate limit exceeded. Try again in {retry_after} seconds.",
+            headers={"Retry-After": str(retry_after)}
+        )
@@ -6,14 +6,15 @@ Role-based and permission-based access control for FastAPI
 import logging
 from typing import List, Optional, Callable
 from functools import wraps
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.database import get_database
-from app.utils.jwt import verify_token
+from app.utils.jwt import check_token_claims, get_request_token_claims
 from app.models.user import User
 from app.models.rbac import UserRole, Permission, RolePermissions, RoleHierarchy
+from app.services.principal_cache import get_principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,13 +23,18 @@ security = HTTPBearer()
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ) -> User:
     """
     Get current authenticated user from JWT token
 
+    The token is decoded once per request (shared with the rate limiter) and
+    the user comes from the principal cache rather than a users lookup.
+
     Args:
+        request: Current request
         credentials: HTTP Bearer credentials
         db: Database connection
 
@@ -41,7 +47,7 @@ async def get_current_user(
     token = credentials.credentials
 
     # Verify token
-    payload = verify_token(token, expected_type="access")
+    payload = check_token_claims(get_request_token_claims(request, token), expected_type="access")
     user_id = payload.get("sub")
 
     if not user_id:
@@ -50,17 +56,15 @@ async def get_current_user(
             detail="Invalid token: missing user ID"
         )
 
-    # Get user from database
-    user_doc = await db.users.find_one({"user_id": user_id})
+    # Get user (cached)
+    user = await get_principal_cache().get_user(db, user_id)
 
-    if not user_doc:
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found"
         )
 
-    user = User.from_mongo(user_doc)
-
     # Check if user is active
     if not user.is_active:
         raise HTTPException(
@@ -83,6 +87,7 @@ optional_security = HTTPBearer(auto_error=False)
 
 
 async def get_optional_current_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ) -> Optional[User]:
@@ -91,6 +96,7 @@ async def get_optional_current_user(
     Useful for endpoints that work for both authenticated and anonymous users.
 
     Args:
+        request: Current request
         credentials: HTTP Bearer credentials (optional)
         db: Database connection
 
@@ -104,20 +110,18 @@ async def get_optional_current_user(
         token = credentials.credentials
 
         # Verify token
-        payload = verify_token(token, expected_type="access")
+        payload = check_token_claims(get_request_token_claims(request, token), expected_type="access")
         user_id = payload.get("sub")
 
         if not user_id:
             return None
 
-        # Get user from database
-        user_doc = await db.users.find_one({"user_id": user_id})
+        # Get user (cached)
+        user = await get_principal_cache().get_user(db, user_id)
 
-        if not user_doc:
+        if not user:
             return None
 
-        user = User.from_mongo(user_doc)
-
         # Check if user is active and not banned
         if not user.is_active or user.is_banned:
             return None
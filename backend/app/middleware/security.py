@@ -12,9 +12,10 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.config import settings
 from app.database import get_database
-from app.utils.jwt import verify_token
+from app.utils.jwt import verify_token, check_token_claims, get_request_token_claims
 from app.models.user import User
 from app.models.rbac import UserRole
+from app.services.principal_cache import get_principal_cache
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +78,7 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ) -> User:
@@ -84,6 +86,7 @@ async def get_current_user(
     Get current authenticated user from JWT token
 
     Args:
+        request: Current request (shares the decoded token with the rate limiter)
         credentials: HTTP Bearer credentials
         db: Database connection
 
@@ -96,7 +99,7 @@ async def get_current_user(
     token = credentials.credentials
 
     # Verify token
-    payload = verify_token(token, expected_type="access")
+    payload = check_token_claims(get_request_token_claims(request, token), expected_type="access")
 
     user_id = payload.get("sub")
     if not user_id:
@@ -106,18 +109,16 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"}
         )
 
-    # Get user from database
-    user_data = await db.users.find_one({"user_id": user_id})
+    # Get user (cached)
+    user = await get_principal_cache().get_user(db, user_id)
 
-    if not user_data:
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"}
         )
 
-    user = User.from_mongo(user_data)
-
     # Check if user is active
     if not user.is_active:
         raise HTTPException(
@@ -168,6 +169,7 @@ require_any_role = require_role([UserRole.CITIZEN, UserRole.ANALYST, UserRole.AU
 
 
 async def get_optional_user(
+    request: Request,
     authorization: str = Header(None),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ) -> User | None:
@@ -175,6 +177,7 @@ async def get_optional_user(
     Get user if authenticated, otherwise return None
 
     Args:
+        request: Current request
         authorization: Authorization header
         db: Database connection
 
@@ -186,13 +189,11 @@ async def get_optional_user(
 
     try:
         token = authorization.split(" ")[1]
-        payload = verify_token(token, expected_type="access")
+        payload = check_token_claims(get_request_token_claims(request, token), expected_type="access")
         user_id = payload.get("sub")
 
         if user_id:
-            user_data = await db.users.find_one({"user_id": user_id})
-            if user_data:
-                return User.from_mongo(user_data)
+            return await get_principal_cache().get_user(db, user_id)
 
     except (HTTPException, IndexError, KeyError, Exception) as e:
         logger.debug(f"Optional authentication failed: {e}")
@@ -248,6 +248,11 @@ class HazardReport(BaseModel):
 
     # Media files
     image_url: str = Field(..., description="URL/path to captured image")
+    image_sha256: Optional[str] = Field(default=None, description="SHA-256 of the image as uploaded")
+    image_metadata: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Metadata read from the image before EXIF was stripped (GPS, capture time, device)"
+    )
     voice_note_url: Optional[str] = Field(default=None, description="URL/path to voice note")
 
     # Location data
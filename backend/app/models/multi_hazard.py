@@ -209,6 +209,13 @@ class DetectionCycleResult(BaseModel):
     alerts_generated: int = Field(..., description="Number of new alerts")
     locations_processed: int = Field(..., description="Locations processed")
     processing_time_ms: float = Field(..., description="Processing time in ms")
+    locations_failed: int = Field(default=0, description="Locations that errored or timed out")
+    stage_timings_ms: Dict[str, float] = Field(
+        default_factory=dict, description="Wall time per cycle stage in ms"
+    )
+    location_timings_ms: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict, description="Per-location fetch/detection time in ms"
+    )
     errors: List[str] = Field(default_factory=list, description="Any errors encountered")
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -46,6 +46,12 @@ class VectorDBStats(BaseModel):
     label_distribution: Dict[str, int] = Field(..., description="Count of each label")
     is_trained: bool = Field(..., description="Whether index is trained")
     is_initialized: bool = Field(..., description="Whether service is initialized")
+    configured_index_type: str = Field(default="flat", description="Configured index type (flat, ivf_flat, hnsw, ivf_pq)")
+    index_quality: Dict[str, Any] = Field(default_factory=dict, description="Recall vs latency of the active index against exact search")
+    batching: Dict[str, Any] = Field(default_factory=dict, description="Request coalescer statistics")
+    embedding_cache: Dict[str, Any] = Field(default_factory=dict, description="Embedding cache hit-rate statistics")
+    inference: Dict[str, Any] = Field(default_factory=dict, description="Inference pool queue and latency metrics")
+    sync: Dict[str, Any] = Field(default_factory=dict, description="Cluster sample-log replay state")
 
 
 # Request Models
@@ -130,6 +130,15 @@ class LayerResult(BaseModel):
         }
 
 
+class StageTiming(BaseModel):
+    """Wall-clock timing of one verification stage"""
+    stage: str = Field(..., description="Layer name or pipeline stage (trust_update, decision)")
+    duration_ms: float = Field(..., ge=0.0)
+    status: Optional[LayerStatus] = Field(default=None, description="Layer status, for layer stages")
+    cache_hit: bool = Field(default=False, description="Served from the layer result cache")
+    fallback: bool = Field(default=False, description="Layer returned a degraded/default result")
+
+
 # =============================================================================
 # VERIFICATION RESULT MODELS
 # =============================================================================
@@ -151,9 +160,11 @@ class VerificationResult(BaseModel):
     # Layers that were applicable
     applicable_layers: List[LayerName] = Field(..., description="Layers that were applied")
     skipped_layers: List[LayerName] = Field(default=[], description="Layers that were skipped")
+    cached_layers: List[LayerName] = Field(default=[], description="Layers served from the layer result cache")
 
     # Processing metadata
     processing_time_ms: int = Field(..., description="Total processing time in milliseconds")
+    timings: List[StageTiming] = Field(default=[], description="Per-layer and per-stage timings")
     verified_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         description="When verification was completed"
@@ -279,6 +290,50 @@ class VerificationThresholds(BaseModel):
     weight_reporter: float = Field(default=0.10, ge=0, le=1)
 
 
+# =============================================================================
+# BULK RE-VERIFICATION
+# =============================================================================
+
+class BulkVerificationStatus(str, Enum):
+    """Bulk re-verification job status"""
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+    FAILED = "failed"
+
+
+class BulkVerificationRequest(BaseModel):
+    """Request to re-score stored reports with the current pipeline"""
+    verification_statuses: Optional[List[str]] = Field(default=None, description="Only reports in these statuses")
+    hazard_types: Optional[List[str]] = Field(default=None, description="Only these hazard types")
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    dry_run: bool = Field(default=True, description="Record the diff without updating reports")
+    fresh: bool = Field(default=False, description="Recompute every layer instead of reusing cached layer results")
+    batch_size: Optional[int] = Field(default=None, ge=1, le=256)
+    max_rate: Optional[float] = Field(default=None, gt=0, description="Reports per second")
+
+
+# =============================================================================
+# VERIFICATION WORK QUEUE
+# =============================================================================
+
+class VerificationLane(str, Enum):
+    """Priority lane of a queued verification (highest first)"""
+    CRITICAL = "critical"   # Tsunami/warning-level threats, reporters with an open SOS
+    HIGH = "high"           # Surges, floods, spills, wrecks
+    NORMAL = "normal"
+    LOW = "low"
+
+
+class VerificationQueueStatus(str, Enum):
+    """Verification queue job status"""
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    DONE = "done"
+    DEAD = "dead"           # Exhausted retries (dead-letter)
+
+
 # =============================================================================
 # ENHANCED VERIFICATION STATUS FOR HAZARD REPORT
 # =============================================================================
@@ -4,11 +4,12 @@ Provides comprehensive admin functionality for the Super Admin panel.
 Handles user management, system monitoring, settings, and audit logs.
 """
 
+import asyncio
 import logging
 import os
 import uuid
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from app.models.admin import (
@@ -16,6 +17,9 @@ from app.models.admin import (
     SettingCategory, SettingValueType, HealthStatus
 )
 from app.models.rbac import UserRole
+from app.services.principal_cache import invalidate_principal
+from app.services.report_rollup_service import ReportRollupService
+from app.services.response_cache import TAG_ALERTS, TAG_REPORTS, invalidate_responses
 from app.utils.password import hash_password
 
 logger = logging.getLogger(__name__)
@@ -115,99 +119,32 @@ class AdminService:
         now = datetime.now(timezone.utc)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         seven_days_ago = now - timedelta(days=7)
-        thirty_days_ago = now - timedelta(days=30)
-
-        # User statistics
-        total_users = await self.db.users.count_documents({})
-        active_users = await self.db.users.count_documents({"is_active": True, "is_banned": False})
-        banned_users = await self.db.users.count_documents({"is_banned": True})
-        new_users_today = await self.db.users.count_documents({
-            "created_at": {"$gte": today_start}
-        })
-        new_users_week = await self.db.users.count_documents({
-            "created_at": {"$gte": seven_days_ago}
-        })
-
-        # User role distribution
-        role_pipeline = [
-            {"$group": {"_id": "$role", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]
-        role_results = await self.db.users.aggregate(role_pipeline).to_list(10)
-        users_by_role = {item["_id"]: item["count"] for item in role_results if item["_id"]}
-
-        # Report statistics
-        total_reports = await self.db.hazard_reports.count_documents({})
-        pending_reports = await self.db.hazard_reports.count_documents({
-            "$or": [
-                {"verification_status": "pending"},
-                {"status": "pending"}
-            ]
-        })
-        verified_reports = await self.db.hazard_reports.count_documents({
-            "$or": [
-                {"verification_status": "verified"},
-                {"status": "verified"}
-            ]
-        })
-        reports_today = await self.db.hazard_reports.count_documents({
-            "created_at": {"$gte": today_start}
-        })
-
-        # Alert statistics
-        total_alerts = await self.db.alerts.count_documents({})
-        active_alerts = await self.db.alerts.count_documents({"status": "active"})
-        critical_alerts = await self.db.alerts.count_documents({
-            "status": "active",
-            "severity": {"$in": ["critical", "high"]}
-        })
-
-        # System activity (last 24 hours)
         yesterday = now - timedelta(days=1)
-        logins_24h = await self.db.audit_logs.count_documents({
-            "action": "login",
-            "success": True,
-            "timestamp": {"$gte": yesterday}
-        })
 
-        # Error counts (if error_logs collection exists)
-        try:
-            errors_24h = await self.db.error_logs.count_documents({
+        # Independent collections are queried concurrently
+        users, reports, alerts, logins_24h, errors, recent_admin_actions = await asyncio.gather(
+            self._user_dashboard_stats(today_start, seven_days_ago),
+            self._report_dashboard_stats(today_start),
+            self._alert_dashboard_stats(),
+            self.db.audit_logs.count_documents({
+                "action": "login",
+                "success": True,
                 "timestamp": {"$gte": yesterday}
+            }),
+            self._error_dashboard_stats(yesterday),
+            self.db.admin_activity_logs.count_documents({
+                "timestamp": {"$gte": seven_days_ago}
             })
-            unresolved_errors = await self.db.error_logs.count_documents({
-                "resolved": False
-            })
-        except Exception:
-            errors_24h = 0
-            unresolved_errors = 0
-
-        # Recent admin actions
-        recent_admin_actions = await self.db.admin_activity_logs.count_documents({
-            "timestamp": {"$gte": seven_days_ago}
-        })
+        )
+        errors_24h, unresolved_errors = errors
 
         return {
-            "users": {
-                "total": total_users,
-                "active": active_users,
-                "banned": banned_users,
-                "new_today": new_users_today,
-                "new_this_week": new_users_week,
-                "by_role": users_by_role
-            },
+            "users": users,
             "reports": {
-                "total": total_reports,
-                "pending": pending_reports,
-                "verified": verified_reports,
-                "today": reports_today,
-                "verification_rate": round((verified_reports / max(total_reports, 1)) * 100, 1)
-            },
-            "alerts": {
-                "total": total_alerts,
-                "active": active_alerts,
-                "critical": critical_alerts
+                **reports,
+                "verification_rate": round((reports["verified"] / max(reports["total"], 1)) * 100, 1)
             },
+            "alerts": alerts,
             "system": {
                 "logins_24h": logins_24h,
                 "errors_24h": errors_24h,
@@ -217,6 +154,97 @@ class AdminService:
             "last_updated": now.isoformat()
         }
 
+    async def _user_dashboard_stats(self, today_start: datetime, seven_days_ago: datetime) -> Dict[str, Any]:
+        """User counts and role distribution in one aggregation."""
+        pipeline = [{"$facet": {
+            "total": [{"$count": "count"}],
+            "active": [{"$match": {"is_active": True, "is_banned": False}}, {"$count": "count"}],
+            "banned": [{"$match": {"is_banned": True}}, {"$count": "count"}],
+            "new_today": [{"$match": {"created_at": {"$gte": today_start}}}, {"$count": "count"}],
+            "new_this_week": [{"$match": {"created_at": {"$gte": seven_days_ago}}}, {"$count": "count"}],
+            "by_role": [
+                {"$group": {"_id": "$role", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1}},
+                {"$limit": 10}
+            ]
+        }}]
+        results = await self.db.users.aggregate(pipeline).to_list(1)
+        facets = results[0] if results else {}
+
+        def count(name: str) -> int:
+            rows = facets.get(name)
+            return rows[0]["count"] if rows else 0
+
+        return {
+            "total": count("total"),
+            "active": count("active"),
+            "banned": count("banned"),
+            "new_today": count("new_today"),
+            "new_this_week": count("new_this_week"),
+            "by_role": {item["_id"]: item["count"] for item in facets.get("by_role", []) if item["_id"]}
+        }
+
+    async def _report_dashboard_stats(self, today_start: datetime) -> Dict[str, int]:
+        """Report totals from the report rollups, or from hazard_reports until they are built."""
+        rollups = ReportRollupService(self.db)
+        if await rollups.is_ready():
+            overview = await rollups.get_overview(today_start)
+            return {
+                "total": overview["total"],
+                "pending": overview["by_status"].get("pending", 0),
+                "verified": overview["by_status"].get("verified", 0),
+                "today": overview["today"]
+            }
+
+        total_reports, pending_reports, verified_reports, reports_today = await asyncio.gather(
+            self.db.hazard_reports.count_documents({}),
+            self.db.hazard_reports.count_documents({
+                "$or": [
+                    {"verification_status": "pending"},
+                    {"status": "pending"}
+                ]
+            }),
+            self.db.hazard_reports.count_documents({
+                "$or": [
+                    {"verification_status": "verified"},
+                    {"status": "verified"}
+                ]
+            }),
+            self.db.hazard_reports.count_documents({
+                "created_at": {"$gte": today_start}
+            })
+        )
+        return {
+            "total": total_reports,
+            "pending": pending_reports,
+            "verified": verified_reports,
+            "today": reports_today
+        }
+
+    async def _alert_dashboard_stats(self) -> Dict[str, int]:
+        """Alert counts in one aggregation."""
+        pipeline = [{"$facet": {
+            "total": [{"$count": "count"}],
+            "active": [{"$match": {"status": "active"}}, {"$count": "count"}],
+            "critical": [
+                {"$match": {"status": "active", "severity": {"$in": ["critical", "high"]}}},
+                {"$count": "count"}
+            ]
+        }}]
+        results = await self.db.alerts.aggregate(pipeline).to_list(1)
+        facets = results[0] if results else {}
+        return {name: (facets.get(name) or [{"count": 0}])[0]["count"] for name in ("total", "active", "critical")}
+
+    async def _error_dashboard_stats(self, since: datetime) -> Tuple[int, int]:
+        """(errors since, unresolved errors); zeros if error_logs is unavailable."""
+        try:
+            return await asyncio.gather(
+                self.db.error_logs.count_documents({"timestamp": {"$gte": since}}),
+                self.db.error_logs.count_documents({"resolved": False})
+            )
+        except Exception:
+            return 0, 0
+
     # =========================================================================
     # USER MANAGEMENT
     # =========================================================================
@@ -505,6 +533,7 @@ class AdminService:
             {"user_id": user_id},
             {"$set": update_fields}
         )
+        await invalidate_principal(user_id)
 
         # Log admin action
         await self._log_admin_action(
@@ -552,6 +581,7 @@ class AdminService:
                 "updated_at": now
             }}
         )
+        await invalidate_principal(user_id)
 
         # Log admin action
         await self._log_admin_action(
@@ -596,6 +626,7 @@ class AdminService:
                 "updated_at": datetime.now(timezone.utc)
             }}
         )
+        await invalidate_principal(user_id)
 
         # Log admin action
         await self._log_admin_action(
@@ -647,6 +678,7 @@ class AdminService:
                 "updated_at": now
             }}
         )
+        await invalidate_principal(user_id)
 
         # Log admin action
         await self._log_admin_action(
@@ -694,6 +726,7 @@ class AdminService:
                 "updated_at": datetime.now(timezone.utc)
             }}
         )
+        await invalidate_principal(user_id)
 
         # Log admin action
         await self._log_admin_action(
@@ -803,6 +836,7 @@ class AdminService:
                 "deletion_reason": reason
             }}
         )
+        await invalidate_responses(TAG_REPORTS)
 
         # Log admin action
         await self._log_admin_action(
@@ -882,6 +916,7 @@ class AdminService:
             raise ValueError("Alert not found")
 
         await self.db.alerts.delete_one({"alert_id": alert_id})
+        await invalidate_responses(TAG_ALERTS)
 
         # Log admin action
         await self._log_admin_action(
@@ -4,13 +4,25 @@ Provides aggregated analytics data for the Analyst module.
 Handles MongoDB aggregation pipelines for complex queries.
 """
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.services.report_rollup_service import ReportRollupService
+
 logger = logging.getLogger(__name__)
 
+# The filter dropdown's region list changes rarely; cache it instead of two distinct scans per request
+AVAILABLE_REGIONS_TTL_SECONDS = 300
+
+
+def _first_count(rows: Optional[List[Dict[str, Any]]], field: str = "count") -> int:
+    """Value of a $count facet (the facet is empty when nothing matched)."""
+    return rows[0][field] if rows else 0
+
 
 class AnalyticsService:
     """
@@ -27,6 +39,9 @@ class AnalyticsService:
 
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
+        self.rollups = ReportRollupService(db)
+        self._regions_cache: Optional[List[str]] = None
+        self._regions_cached_at = 0.0
 
     # =========================================================================
     # DATE RANGE HELPERS
@@ -83,28 +98,22 @@ class AnalyticsService:
         seven_days_ago = now - timedelta(days=7)
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        # Get total reports
-        total_reports = await self.db.hazard_reports.count_documents({})
-
-        # Get reports this week
-        reports_this_week = await self.db.hazard_reports.count_documents({
-            "created_at": {"$gte": seven_days_ago}
-        })
-
-        # Get today's reports
-        reports_today = await self.db.hazard_reports.count_documents({
-            "created_at": {"$gte": today_start}
-        })
-
-        # Get pending verification count
-        pending_reports = await self.db.hazard_reports.count_documents({
-            "verification_status": "pending"
-        })
-
-        # Get verified reports count
-        verified_reports = await self.db.hazard_reports.count_documents({
-            "verification_status": "verified"
-        })
+        # Report counts from the rollups once built (flat as hazard_reports grows)
+        if await self.rollups.is_ready():
+            overview = await self.rollups.get_overview(seven_days_ago)
+            total_reports = overview["total"]
+            reports_this_week = overview["since"]
+            reports_today = overview["today"]
+            pending_reports = overview["by_status"].get("pending", 0)
+            verified_reports = overview["by_status"].get("verified", 0)
+        else:
+            total_reports, reports_this_week, reports_today, pending_reports, verified_reports = await asyncio.gather(
+                self.db.hazard_reports.count_documents({}),
+                self.db.hazard_reports.count_documents({"created_at": {"$gte": seven_days_ago}}),
+                self.db.hazard_reports.count_documents({"created_at": {"$gte": today_start}}),
+                self.db.hazard_reports.count_documents({"verification_status": "pending"}),
+                self.db.hazard_reports.count_documents({"verification_status": "verified"})
+            )
 
         # Get active alerts count
         active_alerts = await self.db.alerts.count_documents({
@@ -170,25 +179,24 @@ class AnalyticsService:
         if date_range != "all":
             match_filter["created_at"] = {"$gte": dates["start"], "$lte": dates["end"]}
 
+        filters = []
         if region:
-            match_filter["$or"] = [
+            filters.append({"$or": [
                 {"location.region": region},
                 {"location.state": region},
                 {"location.city": region}
-            ]
+            ]})
         if hazard_type:
             match_filter["hazard_type"] = hazard_type
         if status and status != "all":
-            match_filter["$or"] = [
+            filters.append({"$or": [
                 {"verification_status": status},
                 {"status": status}
-            ]
-
-        # Get total count (no date filter for overall stats)
-        total_all = await self.db.hazard_reports.count_documents({})
-
-        # Total reports in period
-        total_reports = await self.db.hazard_reports.count_documents(match_filter) if match_filter else total_all
+            ]})
+        if len(filters) == 1:
+            match_filter.update(filters[0])
+        elif filters:
+            match_filter["$and"] = filters
 
         # Previous period filter for comparison
         prev_match_filter = {}
@@ -197,84 +205,93 @@ class AnalyticsService:
                 "$gte": prev_dates["start"],
                 "$lte": prev_dates["end"]
             }
-        prev_total = await self.db.hazard_reports.count_documents(prev_match_filter) if prev_match_filter else 0
 
-        # Calculate change percentage
-        change_pct = 0
-        if prev_total > 0:
-            change_pct = round(((total_reports - prev_total) / prev_total) * 100, 1)
+        # One scan over both periods; each facet picks its period
+        facets = {
+            # Reports by verification status (try both field names)
+            "by_status": [
+                {"$match": match_filter},
+                {"$group": {
+                    "_id": {"$ifNull": ["$verification_status", "$status"]},
+                    "count": {"$sum": 1}
+                }}
+            ],
+            # Reports by hazard type
+            "by_hazard_type": [
+                {"$match": match_filter},
+                {"$group": {
+                    "_id": "$hazard_type",
+                    "count": {"$sum": 1}
+                }},
+                {"$sort": {"count": -1}}
+            ],
+            # Reports by region (top 10) - try multiple location fields
+            "by_region": [
+                {"$match": match_filter},
+                {"$group": {
+                    "_id": {"$ifNull": ["$location.state", {"$ifNull": ["$location.region", "$location.city"]}]},
+                    "count": {"$sum": 1}
+                }},
+                {"$match": {"_id": {"$ne": None}}},
+                {"$sort": {"count": -1}},
+                {"$limit": 10}
+            ],
+            # High severity count
+            "high_severity": [
+                {"$match": match_filter},
+                {"$match": {
+                    "$or": [
+                        {"severity": {"$in": ["critical", "high", "severe"]}},
+                        {"risk_level": {"$in": ["critical", "high"]}},
+                        {"urgency": "immediate"}
+                    ]
+                }},
+                {"$count": "count"}
+            ]
+        }
+        scan_filter = match_filter
+        if prev_match_filter:
+            facets["previous_total"] = [{"$match": prev_match_filter}, {"$count": "count"}]
+            scan_filter = {"$or": [match_filter, prev_match_filter]}
+
+        results = await self.db.hazard_reports.aggregate([
+            {"$match": scan_filter},
+            {"$facet": facets}
+        ]).to_list(1)
+        result = results[0] if results else {}
 
-        # Reports by verification status (try both field names)
-        status_pipeline = [
-            {"$match": match_filter} if match_filter else {"$match": {}},
-            {"$group": {
-                "_id": {"$ifNull": ["$verification_status", "$status"]},
-                "count": {"$sum": 1}
-            }}
-        ]
-        status_results = await self.db.hazard_reports.aggregate(status_pipeline).to_list(100)
         by_status = {}
-        for item in status_results:
+        for item in result.get("by_status", []):
             key = item["_id"] or "unknown"
             by_status[key] = item["count"]
 
+        # Every report in the period is in exactly one status group
+        total_reports = sum(by_status.values())
+        prev_total = _first_count(result.get("previous_total"))
+
+        # Calculate change percentage
+        change_pct = 0
+        if prev_total > 0:
+            change_pct = round(((total_reports - prev_total) / prev_total) * 100, 1)
+
         # Verified and pending counts
         verified_count = by_status.get("verified", 0)
         pending_count = by_status.get("pending", 0)
 
-        # Reports by hazard type
-        type_pipeline = [
-            {"$match": match_filter} if match_filter else {"$match": {}},
-            {"$group": {
-                "_id": "$hazard_type",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}}
-        ]
-        type_results = await self.db.hazard_reports.aggregate(type_pipeline).to_list(100)
         by_hazard_type = {}
-        for item in type_results:
+        for item in result.get("by_hazard_type", []):
             if item["_id"]:
                 by_hazard_type[item["_id"]] = item["count"]
 
-        # Reports by region (top 10) - try multiple location fields
-        region_pipeline = [
-            {"$match": match_filter} if match_filter else {"$match": {}},
-            {"$group": {
-                "_id": {"$ifNull": ["$location.state", {"$ifNull": ["$location.region", "$location.city"]}]},
-                "count": {"$sum": 1}
-            }},
-            {"$match": {"_id": {"$ne": None}}},
-            {"$sort": {"count": -1}},
-            {"$limit": 10}
-        ]
-        region_results = await self.db.hazard_reports.aggregate(region_pipeline).to_list(100)
         by_region = {}
-        for item in region_results:
+        for item in result.get("by_region", []):
             if item["_id"]:
                 by_region[item["_id"]] = item["count"]
 
-        # High severity count
-        high_severity_pipeline = [
-            {"$match": match_filter} if match_filter else {"$match": {}},
-            {"$match": {
-                "$or": [
-                    {"severity": {"$in": ["critical", "high", "severe"]}},
-                    {"risk_level": {"$in": ["critical", "high"]}},
-                    {"urgency": "immediate"}
-                ]
-            }},
-            {"$count": "count"}
-        ]
-        high_severity_result = await self.db.hazard_reports.aggregate(high_severity_pipeline).to_list(1)
-        high_severity_count = high_severity_result[0]["count"] if high_severity_result else 0
+        high_severity_count = _first_count(result.get("high_severity"))
 
         # Get available regions for filters
-        regions_list = await self.db.hazard_reports.distinct("location.state")
-        regions_list = [r for r in regions_list if r]
-        if not regions_list:
-            regions_list = await self.db.hazard_reports.distinct("location.region")
-            regions_list = [r for r in regions_list if r]
+        regions_list = await self.get_available_regions()
 
         return {
             "total_reports": total_reports,
@@ -290,7 +307,7 @@ class AnalyticsService:
             "by_status": by_status,
             "by_hazard_type": by_hazard_type,
             "by_region": by_region,
-            "available_regions": sorted(regions_list),
+            "available_regions": regions_list,
             "date_range": {
                 "start": dates["start"].isoformat(),
                 "end": dates["end"].isoformat(),
@@ -298,6 +315,21 @@ class AnalyticsService:
             }
         }
 
+    async def get_available_regions(self) -> List[str]:
+        """Regions (states, else regions) present in reports, for the filter dropdown."""
+        if self._regions_cache is not None and time.monotonic() - self._regions_cached_at < AVAILABLE_REGIONS_TTL_SECONDS:
+            return self._regions_cache
+
+        regions_list = await self.db.hazard_reports.distinct("location.state")
+        regions_list = [r for r in regions_list if r]
+        if not regions_list:
+            regions_list = await self.db.hazard_reports.distinct("location.region")
+            regions_list = [r for r in regions_list if r]
+
+        self._regions_cache = sorted(regions_list)
+        self._regions_cached_at = time.monotonic()
+        return self._regions_cache
+
     # =========================================================================
     # TREND ANALYSIS
     # =========================================================================
@@ -323,6 +355,56 @@ class AnalyticsService:
         """
         dates = self.get_date_range(date_range)
 
+        if await self.rollups.is_ready():
+            timeline = await self._trend_from_rollups(dates["start"], group_by, hazard_type, region)
+        else:
+            timeline = await self._trend_from_reports(dates, group_by, hazard_type, region)
+
+        return {
+            "timeline": timeline,
+            "group_by": group_by,
+            "date_range": {
+                "start": dates["start"].isoformat(),
+                "end": dates["end"].isoformat()
+            }
+        }
+
+    async def _trend_from_rollups(
+        self,
+        start: datetime,
+        group_by: str,
+        hazard_type: Optional[str],
+        region: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Trend timeline summed from the daily report rollups."""
+        days = await self.rollups.get_daily_counts(start, hazard_type=hazard_type, region=region)
+
+        timeline: Dict[str, Dict[str, Any]] = {}
+        for day in days:
+            if group_by == "week":
+                # %U matches MongoDB's $week (weeks start on Sunday)
+                date_str = f"{day['day'].year}-W{int(day['day'].strftime('%U')):02d}"
+            elif group_by == "month":
+                date_str = day["day"].strftime("%Y-%m")
+            else:
+                date_str = day["day"].strftime("%Y-%m-%d")
+
+            entry = timeline.setdefault(
+                date_str, {"date": date_str, "total": 0, "verified": 0, "pending": 0, "high_priority": 0}
+            )
+            for field in ("total", "verified", "pending", "high_priority"):
+                entry[field] += day[field]
+
+        return list(timeline.values())
+
+    async def _trend_from_reports(
+        self,
+        dates: Dict[str, datetime],
+        group_by: str,
+        hazard_type: Optional[str],
+        region: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Trend timeline aggregated from hazard_reports."""
         # Build match filter
         match_filter = {
             "created_at": {"$gte": dates["start"], "$lte": dates["end"]}
@@ -399,14 +481,7 @@ class AnalyticsService:
                 "high_priority": item["high_priority"]
             })
 
-        return {
-            "timeline": timeline,
-            "group_by": group_by,
-            "date_range": {
-                "start": dates["start"].isoformat(),
-                "end": dates["end"].isoformat()
-            }
-        }
+        return timeline
 
     # =========================================================================
     # GEOSPATIAL ANALYTICS
@@ -644,71 +719,72 @@ class AnalyticsService:
             "created_at": {"$gte": dates["start"], "$lte": dates["end"]}
         }
 
-        # Total and verified counts
-        total = await self.db.hazard_reports.count_documents(match_filter)
-        verified = await self.db.hazard_reports.count_documents({
-            **match_filter,
-            "verification_status": "verified"
-        })
-        rejected = await self.db.hazard_reports.count_documents({
-            **match_filter,
-            "verification_status": "rejected"
-        })
-
-        # Average response time (verified_at - created_at)
-        response_pipeline = [
-            {"$match": {
-                **match_filter,
-                "verification_status": {"$in": ["verified", "rejected"]},
-                "verified_at": {"$exists": True}
-            }},
-            {"$project": {
-                "response_time": {
-                    "$subtract": ["$verified_at", "$created_at"]
-                }
-            }},
-            {"$group": {
-                "_id": None,
-                "avg_response_ms": {"$avg": "$response_time"},
-                "min_response_ms": {"$min": "$response_time"},
-                "max_response_ms": {"$max": "$response_time"}
+        # One scan: counts, response times, verifiers and reporters as facets
+        results = await self.db.hazard_reports.aggregate([
+            {"$match": match_filter},
+            {"$facet": {
+                # Total and verified counts
+                "counts": [
+                    {"$group": {
+                        "_id": None,
+                        "total": {"$sum": 1},
+                        "verified": {"$sum": {"$cond": [{"$eq": ["$verification_status", "verified"]}, 1, 0]}},
+                        "rejected": {"$sum": {"$cond": [{"$eq": ["$verification_status", "rejected"]}, 1, 0]}}
+                    }}
+                ],
+                # Average response time (verified_at - created_at)
+                "response": [
+                    {"$match": {
+                        "verification_status": {"$in": ["verified", "rejected"]},
+                        "verified_at": {"$exists": True}
+                    }},
+                    {"$project": {
+                        "response_time": {
+                            "$subtract": ["$verified_at", "$created_at"]
+                        }
+                    }},
+                    {"$group": {
+                        "_id": None,
+                        "avg_response_ms": {"$avg": "$response_time"},
+                        "min_response_ms": {"$min": "$response_time"},
+                        "max_response_ms": {"$max": "$response_time"}
+                    }}
+                ],
+                # Top verifiers
+                "verifiers": [
+                    {"$match": {"verified_by": {"$exists": True, "$ne": None}}},
+                    {"$group": {
+                        "_id": "$verified_by",
+                        "count": {"$sum": 1}
+                    }},
+                    {"$sort": {"count": -1}},
+                    {"$limit": 10}
+                ],
+                # Active reporters (unique users who submitted reports)
+                "reporters": [
+                    {"$group": {"_id": "$user_id"}},
+                    {"$count": "total"}
+                ]
             }}
-        ]
-        response_results = await self.db.hazard_reports.aggregate(response_pipeline).to_list(1)
-        response_stats = response_results[0] if response_results else {}
+        ]).to_list(1)
+        result = results[0] if results else {}
+
+        counts = result.get("counts") or [{}]
+        total = counts[0].get("total", 0)
+        verified = counts[0].get("verified", 0)
+        rejected = counts[0].get("rejected", 0)
+
+        response_stats = (result.get("response") or [{}])[0]
 
         # Convert ms to hours
         avg_response_hours = 0
         if response_stats.get("avg_response_ms"):
             avg_response_hours = round(response_stats["avg_response_ms"] / (1000 * 60 * 60), 1)
 
-        # Top verifiers
-        verifier_pipeline = [
-            {"$match": {
-                **match_filter,
-                "verified_by": {"$exists": True, "$ne": None}
-            }},
-            {"$group": {
-                "_id": "$verified_by",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}},
-            {"$limit": 10}
-        ]
-        verifier_results = await self.db.hazard_reports.aggregate(verifier_pipeline).to_list(100)
         # Note: We don't expose verifier names (PII) to analysts, just IDs
-        top_verifiers = [{"id": item["_id"], "count": item["count"]} for item in verifier_results if item["_id"]]
+        top_verifiers = [{"id": item["_id"], "count": item["count"]} for item in result.get("verifiers", []) if item["_id"]]
 
-        # Active reporters (unique users who submitted reports)
-        reporter_pipeline = [
-            {"$match": match_filter},
-            {"$group": {
-                "_id": "$user_id"
-            }},
-            {"$count": "total"}
-        ]
-        reporter_results = await self.db.hazard_reports.aggregate(reporter_pipeline).to_list(1)
-        active_reporters = reporter_results[0]["total"] if reporter_results else 0
+        active_reporters = _first_count(result.get("reporters"), "total")
 
         return {
             "total_reports": total,
@@ -796,34 +872,43 @@ class AnalyticsService:
         current_dates = self.get_date_range(current_range)
         previous_dates = self.get_previous_period(current_dates["start"], current_dates["end"])
 
-        async def get_period_stats(start: datetime, end: datetime) -> Dict:
-            match_filter = {
-                "created_at": {"$gte": start, "$lte": end}
-            }
-            if hazard_type:
-                match_filter["hazard_type"] = hazard_type
+        # Both periods in one scan, grouped by which period a report falls in
+        match_filter = {
+            "created_at": {"$gte": previous_dates["start"], "$lte": current_dates["end"]}
+        }
+        if hazard_type:
+            match_filter["hazard_type"] = hazard_type
 
-            total = await self.db.hazard_reports.count_documents(match_filter)
-            verified = await self.db.hazard_reports.count_documents({
-                **match_filter, "verification_status": "verified"
-            })
-            high_priority = await self.db.hazard_reports.count_documents({
-                **match_filter,
-                "$or": [
-                    {"risk_level": {"$in": ["critical", "high"]}},
-                    {"urgency": "immediate"}
-                ]
-            })
+        results = await self.db.hazard_reports.aggregate([
+            {"$match": match_filter},
+            {"$group": {
+                "_id": {"$cond": [{"$gte": ["$created_at", current_dates["start"]]}, "current", "previous"]},
+                "total": {"$sum": 1},
+                "verified": {"$sum": {"$cond": [{"$eq": ["$verification_status", "verified"]}, 1, 0]}},
+                "high_priority": {"$sum": {"$cond": [
+                    {"$or": [
+                        {"$in": ["$risk_level", ["critical", "high"]]},
+                        {"$eq": ["$urgency", "immediate"]}
+                    ]},
+                    1, 0
+                ]}}
+            }}
+        ]).to_list(2)
+        by_period = {item["_id"]: item for item in results}
 
+        def get_period_stats(period: str) -> Dict:
+            item = by_period.get(period, {})
+            total = item.get("total", 0)
+            verified = item.get("verified", 0)
             return {
                 "total": total,
                 "verified": verified,
-                "high_priority": high_priority,
+                "high_priority": item.get("high_priority", 0),
                 "verification_rate": round((verified / max(total, 1)) * 100, 1)
             }
 
-        current_stats = await get_period_stats(current_dates["start"], current_dates["end"])
-        previous_stats = await get_period_stats(previous_dates["start"], previous_dates["end"])
+        current_stats = get_period_stats("current")
+        previous_stats = get_period_stats("previous")
 
         def calc_change(current: int, previous: int) -> float:
             if previous == 0:
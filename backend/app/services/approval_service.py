@@ -23,6 +23,8 @@ from app.models.verification import (
     VERIFICATION_THRESHOLDS
 )
 from app.models.user import User, CredibilityMetrics
+from app.services.response_cache import TAG_REPORTS, invalidate_responses
+from app.services.trust_aggregator import get_trust_aggregator
 
 logger = logging.getLogger(__name__)
 
@@ -118,6 +120,7 @@ class ApprovalService:
                 {"report_id": report_id},
                 {"$set": update_data}
             )
+            await invalidate_responses(TAG_REPORTS)
 
             # Update verification result with authority confirmation
             await self.db.verification_results.update_one(
@@ -233,6 +236,7 @@ class ApprovalService:
                 {"report_id": report_id},
                 {"$set": update_data}
             )
+            await invalidate_responses(TAG_REPORTS)
 
             # Update reporter credibility (+5 for verified report)
             await self._update_reporter_credibility(report.user_id, verified=True)
@@ -300,6 +304,7 @@ class ApprovalService:
                 {"report_id": report_id},
                 {"$set": update_data}
             )
+            await invalidate_responses(TAG_REPORTS)
 
             # Update reporter credibility (-3 for rejected report)
             await self._update_reporter_credibility(report.user_id, verified=False)
@@ -532,6 +537,8 @@ class ApprovalService:
                 }
             )
 
+            get_trust_aggregator().invalidate(user_id)
+
             logger.info(
                 f"Updated credibility for user {user_id}: "
                 f"{current_score} -> {new_score} ({'verified' if verified else 'rejected'})"
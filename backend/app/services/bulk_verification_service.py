@@ -0,0 +1,467 @@
+"""
+Bulk Verification Service
+Re-scores stored hazard reports with the current verification pipeline.
+
+Used after decision thresholds or the vision thresholds change. A job walks
+hazard_reports in _id order one batch at a time (keyset pagination, so no
+cursor has to stay open for hours) and verifies each batch concurrently, so
+the text and image micro-batchers coalesce the batch into shared inference
+calls. The last _id is checkpointed with the counters after every batch;
+an interrupted job resumes from there.
+
+Reports whose decision changes are written to verification_job_diffs. Dry
+runs (the default) leave the reports untouched; applied runs update them
+like a single re-run, except reports an analyst already decided. Reporter
+trust is never adjusted by re-scoring.
+
+Jobs are paced to BULK_VERIFICATION_MAX_RATE reports per second and pause
+while live requests are queued on the inference or image pools.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.database import MongoDB
+from app.models.verification import BulkVerificationRequest, BulkVerificationStatus
+from app.services.image_processor import get_image_executor
+from app.services.inference_executor import get_inference_executor
+from app.services.response_cache import TAG_REPORTS, invalidate_responses
+from app.services.verification_service import (
+    VerificationService, get_verification_service, map_decision_to_status,
+    report_from_document, fetch_report_image, remove_temp_image
+)
+
+logger = logging.getLogger(__name__)
+
+JOBS_COLLECTION = "verification_jobs"
+DIFFS_COLLECTION = "verification_job_diffs"
+
+# A job is owned by one process; the lease is renewed at every checkpoint
+LEASE_SECONDS = 600
+
+
+def build_report_query(request: BulkVerificationRequest) -> Dict[str, Any]:
+    """MongoDB filter selecting the reports a job re-scores."""
+    query: Dict[str, Any] = {}
+    if request.verification_statuses:
+        query["verification_status"] = {"$in": request.verification_statuses}
+    if request.hazard_types:
+        query["hazard_type"] = {"$in": request.hazard_types}
+    created: Dict[str, datetime] = {}
+    if request.created_after:
+        created["$gte"] = request.created_after
+    if request.created_before:
+        created["$lt"] = request.created_before
+    if created:
+        query["created_at"] = created
+    return query
+
+
+class BulkVerificationRunner:
+    """Runs resumable bulk re-verification jobs as background tasks."""
+
+    def __init__(
+        self,
+        db: Optional[AsyncIOMotorDatabase] = None,
+        service: Optional[VerificationService] = None
+    ):
+        self.db = db
+        self._service = service
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def _get_db(self) -> AsyncIOMotorDatabase:
+        return self.db if self.db is not None else MongoDB.get_database()
+
+    async def _get_service(self, db: AsyncIOMotorDatabase) -> VerificationService:
+        service = self._service or get_verification_service(db)
+        if not service._initialized:
+            await service.initialize()
+        return service
+
+    # -------------------------------------------------------------------------
+    # Job lifecycle
+    # -------------------------------------------------------------------------
+
+    async def create_job(self, request: BulkVerificationRequest, created_by: str) -> Dict[str, Any]:
+        """
+        Create a job and start it in the background.
+
+        Args:
+            request: Report selection and run options
+            created_by: User ID of the requester
+
+        Returns:
+            The job document
+        """
+        db = self._get_db()
+        now = datetime.now(timezone.utc)
+        job = {
+            "job_id": f"BVJ_{uuid.uuid4().hex[:12].upper()}",
+            "status": BulkVerificationStatus.RUNNING.value,
+            "request": request.model_dump(mode="json"),
+            "created_by": created_by,
+            "total": await db.hazard_reports.count_documents(build_report_query(request)),
+            "processed": 0,
+            "changed": 0,
+            "applied": 0,
+            "failed": 0,
+            "last_id": None,
+            "owner": self._worker_id,
+            "lease_until": now + timedelta(seconds=LEASE_SECONDS),
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+            "completed_at": None,
+        }
+        await db[JOBS_COLLECTION].insert_one(job)
+        job.pop("_id", None)
+
+        self._start(job["job_id"])
+        logger.info(f"Bulk verification job {job['job_id']} created by {created_by}: {job['total']} reports")
+        return job
+
+    def _start(self, job_id: str):
+        task = asyncio.create_task(self._run(job_id))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+    async def _claim(self, job_id: str, statuses: List[str]) -> bool:
+        """Take ownership of a job whose lease has expired (or was released)."""
+        now = datetime.now(timezone.utc)
+        result = await self._get_db()[JOBS_COLLECTION].update_one(
+            {
+                "job_id": job_id,
+                "status": {"$in": statuses},
+                "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}],
+            },
+            {"$set": {
+                "status": BulkVerificationStatus.RUNNING.value,
+                "owner": self._worker_id,
+                "lease_until": now + timedelta(seconds=LEASE_SECONDS),
+                "error": None,
+                "completed_at": None,
+                "updated_at": now,
+            }}
+        )
+        return result.modified_count == 1
+
+    async def resume_job(self, job_id: str) -> bool:
+        """
+        Resume a cancelled, failed or interrupted job from its checkpoint.
+
+        Returns:
+            True if the job was resumed here, False if it is finished or owned elsewhere
+        """
+        if job_id in self._tasks:
+            return False
+        resumable = [
+            BulkVerificationStatus.RUNNING.value,
+            BulkVerificationStatus.CANCELLED.value,
+            BulkVerificationStatus.FAILED.value,
+        ]
+        if not await self._claim(job_id, resumable):
+            return False
+        self._start(job_id)
+        logger.info(f"Bulk verification job {job_id} resumed")
+        return True
+
+    async def resume_interrupted(self) -> int:
+        """Resume running jobs left without an owner by a restart."""
+        cursor = self._get_db()[JOBS_COLLECTION].find(
+            {"status": BulkVerificationStatus.RUNNING.value}, {"job_id": 1}
+        )
+        resumed = 0
+        async for job in cursor:
+            if await self._claim(job["job_id"], [BulkVerificationStatus.RUNNING.value]):
+                self._start(job["job_id"])
+                resumed += 1
+        if resumed:
+            logger.info(f"Resumed {resumed} interrupted bulk verification job(s)")
+        return resumed
+
+    async def cancel_job(self, job_id: str) -> bool:
+        """Cancel a running job; the worker that owns it stops at its next checkpoint."""
+        result = await self._get_db()[JOBS_COLLECTION].update_one(
+            {"job_id": job_id, "status": BulkVerificationStatus.RUNNING.value},
+            {"$set": {
+                "status": BulkVerificationStatus.CANCELLED.value,
+                "lease_until": None,
+                "completed_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc),
+            }}
+        )
+        task = self._tasks.get(job_id)
+        if task:
+            task.cancel()
+        return result.modified_count == 1
+
+    async def shutdown(self):
+        """Stop local jobs, releasing their leases so the next start resumes them."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+
+    async def _run(self, job_id: str):
+        db = self._get_db()
+        jobs = db[JOBS_COLLECTION]
+        job = await jobs.find_one({"job_id": job_id})
+        request = BulkVerificationRequest.model_validate(job["request"])
+        query = build_report_query(request)
+        batch_size = request.batch_size or settings.BULK_VERIFICATION_BATCH_SIZE
+        max_rate = request.max_rate or settings.BULK_VERIFICATION_MAX_RATE
+        last_id = job.get("last_id")
+
+        try:
+            service = await self._get_service(db)
+            logger.info(
+                f"Bulk verification job {job_id} running from "
+                f"{'start' if last_id is None else last_id} (dry_run={request.dry_run})"
+            )
+
+            while True:
+                page_query = dict(query)
+                if last_id is not None:
+                    page_query["_id"] = {"$gt": last_id}
+                docs = await db.hazard_reports.find(page_query).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+                if not docs:
+                    break
+
+                await self._wait_for_live_traffic(jobs, job_id)
+                batch_start = time.monotonic()
+
+                outcomes = await asyncio.gather(*[
+                    self._rescore(service, db, doc, request) for doc in docs
+                ])
+                changes = [o for o in outcomes if o.get("changed")]
+                if changes:
+                    await self._record_changes(db, job_id, changes)
+                if any(o.get("applied") for o in outcomes):
+                    await invalidate_responses(TAG_REPORTS)
+
+                last_id = docs[-1]["_id"]
+                if not await self._checkpoint(jobs, job_id, last_id, outcomes, changes):
+                    logger.info(f"Bulk verification job {job_id} stopped: no longer owned by this worker")
+                    return
+
+                # Pace to max_rate reports per second
+                await asyncio.sleep(max(0.0, len(docs) / max_rate - (time.monotonic() - batch_start)))
+
+            now = datetime.now(timezone.utc)
+            await jobs.update_one(
+                {"job_id": job_id, "owner": self._worker_id, "status": BulkVerificationStatus.RUNNING.value},
+                {"$set": {
+                    "status": BulkVerificationStatus.COMPLETED.value,
+                    "lease_until": None,
+                    "completed_at": now,
+                    "updated_at": now,
+                }}
+            )
+            logger.info(f"Bulk verification job {job_id} completed")
+
+        except asyncio.CancelledError:
+            # Keep the checkpoint; a cancelled job is already marked, otherwise another start resumes it
+            await jobs.update_one(
+                {"job_id": job_id, "owner": self._worker_id},
+                {"$set": {"lease_until": None, "updated_at": datetime.now(timezone.utc)}}
+            )
+            raise
+        except Exception as e:
+            logger.error(f"Bulk verification job {job_id} failed: {e}")
+            await jobs.update_one(
+                {"job_id": job_id, "owner": self._worker_id},
+                {"$set": {
+                    "status": BulkVerificationStatus.FAILED.value,
+                    "error": str(e),
+                    "lease_until": None,
+                    "completed_at": datetime.now(timezone.utc),
+                    "updated_at": datetime.now(timezone.utc),
+                }}
+            )
+
+    async def _wait_for_live_traffic(self, jobs, job_id: str):
+        """Hold the next batch while live requests are queued on the shared pools."""
+        while True:
+            queued = max(
+                get_inference_executor().get_stats()["queue_depth"],
+                get_image_executor().get_stats()["queue_depth"]
+            )
+            if queued < settings.BULK_VERIFICATION_BACKOFF_QUEUE_DEPTH:
+                return
+            await jobs.update_one(
+                {"job_id": job_id, "owner": self._worker_id},
+                {"$set": {"lease_until": datetime.now(timezone.utc) + timedelta(seconds=LEASE_SECONDS)}}
+            )
+            await asyncio.sleep(settings.BULK_VERIFICATION_BACKOFF_SECONDS)
+
+    async def _rescore(
+        self,
+        service: VerificationService,
+        db: AsyncIOMotorDatabase,
+        doc: Dict[str, Any],
+        request: BulkVerificationRequest
+    ) -> Dict[str, Any]:
+        """Re-verify one report; returns its before/after decision."""
+        report_id = doc.get("report_id")
+        temp_path = None
+        try:
+            report = report_from_document(doc)
+            image_path, temp_path = await fetch_report_image(report.image_url)
+            result = await service.verify_report(
+                report,
+                image_path=image_path,
+                db=db,
+                use_cache=not request.fresh,
+                update_trust=False
+            )
+        except Exception as e:
+            logger.warning(f"Bulk re-verification failed for report {report_id}: {e}")
+            return {"report_id": report_id, "error": str(e)}
+        finally:
+            remove_temp_image(temp_path)
+
+        old_result = doc.get("verification_result") or {}
+        new_status = map_decision_to_status(result.decision)
+        # Analyst decisions stand; only the AI assessment is compared for those
+        analyst_decided = bool(doc.get("verified_by"))
+        applied = False
+
+        if not request.dry_run and not analyst_decided:
+            await db.hazard_reports.update_one(
+                {"report_id": report_id},
+                {"$set": {
+                    "verification_status": new_status.value,
+                    "verification_score": result.composite_score,
+                    "verification_result": result.model_dump(),
+                    "verification_id": result.verification_id,
+                    "geofence_valid": result.layer_results[0].status.value == "pass" if result.layer_results else None,
+                    "updated_at": datetime.now(timezone.utc)
+                }}
+            )
+            applied = True
+
+        return {
+            "report_id": report_id,
+            "hazard_type": report.hazard_type.value,
+            "old_decision": old_result.get("decision"),
+            "new_decision": result.decision.value,
+            "old_score": doc.get("verification_score"),
+            "new_score": result.composite_score,
+            "old_status": doc.get("verification_status"),
+            "new_status": new_status.value,
+            "changed": old_result.get("decision") != result.decision.value,
+            "analyst_decided": analyst_decided,
+            "applied": applied,
+        }
+
+    async def _record_changes(self, db: AsyncIOMotorDatabase, job_id: str, changes: List[Dict[str, Any]]):
+        """Upsert changed decisions (idempotent when a batch is replayed after a restart)."""
+        now = datetime.now(timezone.utc)
+        await db[DIFFS_COLLECTION].bulk_write([
+            UpdateOne(
+                {"job_id": job_id, "report_id": change["report_id"]},
+                {"$set": {**{k: v for k, v in change.items() if k != "changed"}, "job_id": job_id, "created_at": now}},
+                upsert=True
+            )
+            for change in changes
+        ], ordered=False)
+
+    async def _checkpoint(
+        self,
+        jobs,
+        job_id: str,
+        last_id: Any,
+        outcomes: List[Dict[str, Any]],
+        changes: List[Dict[str, Any]]
+    ) -> bool:
+        """Save progress and renew the lease; False if the job was cancelled or taken over."""
+        now = datetime.now(timezone.utc)
+        result = await jobs.update_one(
+            {"job_id": job_id, "owner": self._worker_id, "status": BulkVerificationStatus.RUNNING.value},
+            {
+                "$set": {
+                    "last_id": last_id,
+                    "lease_until": now + timedelta(seconds=LEASE_SECONDS),
+                    "updated_at": now,
+                },
+                "$inc": {
+                    "processed": len(outcomes),
+                    "changed": len(changes),
+                    "applied": sum(1 for o in outcomes if o.get("applied")),
+                    "failed": sum(1 for o in outcomes if "error" in o),
+                }
+            }
+        )
+        return result.modified_count == 1
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job document (without internal fields)."""
+        job = await self._get_db()[JOBS_COLLECTION].find_one({"job_id": job_id}, {"_id": 0, "last_id": 0})
+        if job:
+            job["active_here"] = job_id in self._tasks
+        return job
+
+    async def list_jobs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent jobs first."""
+        cursor = self._get_db()[JOBS_COLLECTION].find({}, {"_id": 0, "last_id": 0}).sort("created_at", -1).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def get_diff(self, job_id: str, skip: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """
+        Decision changes recorded by a job.
+
+        Returns:
+            Transition counts (old -> new decision) and a page of changed reports
+        """
+        diffs = self._get_db()[DIFFS_COLLECTION]
+        transitions = await diffs.aggregate([
+            {"$match": {"job_id": job_id}},
+            {"$group": {
+                "_id": {"from": "$old_decision", "to": "$new_decision"},
+                "count": {"$sum": 1}
+            }},
+            {"$sort": {"count": -1}}
+        ]).to_list(length=None)
+
+        changes = await diffs.find({"job_id": job_id}, {"_id": 0}).sort("report_id", 1).skip(skip).limit(limit).to_list(length=limit)
+
+        return {
+            "job_id": job_id,
+            "transitions": [
+                {"from": t["_id"]["from"], "to": t["_id"]["to"], "count": t["count"]}
+                for t in transitions
+            ],
+            "total_changes": sum(t["count"] for t in transitions),
+            "changes": changes,
+        }
+
+
+# Singleton instance
+_bulk_runner: Optional[BulkVerificationRunner] = None
+
+
+def get_bulk_verification_runner() -> BulkVerificationRunner:
+    """Get or create the bulk verification runner."""
+    global _bulk_runner
+    if _bulk_runner is None:
+        _bulk_runner = BulkVerificationRunner()
+    return _bulk_runner
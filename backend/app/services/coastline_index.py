@@ -0,0 +1,275 @@
+"""
+Coastline Index
+Grid-bucketed spatial index over coastline segments for nearest-coast lookup.
+
+Coastlines are loaded from GeoJSON: LineString/MultiLineString features, or
+the rings of Polygon/MultiPolygon land features. Lines are expected to follow
+the OSM coastline convention (land on the left, water on the right in drawing
+order), which is also the RFC 7946 winding of polygon exterior rings, so the
+side of the nearest segment tells whether a point is inland or offshore.
+
+Distances are point-to-segment, measured in a local equirectangular
+projection around the query point and reported as the haversine distance to
+the closest point found.
+"""
+
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.geo import KM_PER_DEGREE, haversine_km
+
+logger = logging.getLogger(__name__)
+
+# Beyond this many km of ring search, fall back to scanning every segment
+_MAX_RING_SEARCH_KM = 250.0
+
+# Indexes this small are scanned directly; grid bookkeeping costs more
+_BRUTE_FORCE_SEGMENTS = 256
+
+# Side of the coastline a point lies on
+SIDE_LAND = 1
+SIDE_WATER = -1
+SIDE_UNKNOWN = 0
+
+
+class CoastlineIndex:
+    """
+    Nearest-segment index over coastline polylines.
+
+    Segments are bucketed into a uniform lat/lon grid by bounding box;
+    queries search rings of cells outward until no unvisited cell can hold
+    a closer segment.
+    """
+
+    def __init__(
+        self,
+        starts: np.ndarray,
+        ends: np.ndarray,
+        feature_ids: np.ndarray,
+        features: List[Dict[str, Any]],
+        oriented: bool = True,
+        cell_degrees: float = 0.25
+    ):
+        """
+        Args:
+            starts / ends: (N, 2) segment endpoints as (lat, lon) degrees
+            feature_ids: (N,) index into features for each segment
+            features: Per-feature properties (name, region)
+            oriented: Whether segment direction encodes the land side
+            cell_degrees: Grid cell size
+        """
+        self.starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+        self.ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+        self.feature_ids = np.asarray(feature_ids, dtype=int)
+        self.features = features
+        self.oriented = oriented
+        self.cell_degrees = cell_degrees
+        self._grid: Dict[Tuple[int, int], np.ndarray] = {}
+        self._build_grid()
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    # -------------------------------------------------------------------------
+    # Construction
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_geojson(cls, path: str, cell_degrees: float = 0.25) -> "CoastlineIndex":
+        """Build an index from a GeoJSON file of coastline lines or land polygons."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        features = data.get("features", [data]) if data.get("type") == "FeatureCollection" else [data]
+        lines: List[Tuple[List[List[float]], int]] = []
+        properties: List[Dict[str, Any]] = []
+
+        for feature in features:
+            geometry = feature.get("geometry") or feature
+            geom_type = geometry.get("type")
+            coords = geometry.get("coordinates") or []
+
+            if geom_type == "LineString":
+                parts = [coords]
+            elif geom_type in ("MultiLineString", "Polygon"):
+                parts = coords
+            elif geom_type == "MultiPolygon":
+                parts = [ring for polygon in coords for ring in polygon]
+            else:
+                continue
+
+            props = feature.get("properties") or {}
+            properties.append({"name": props.get("name"), "region": props.get("region")})
+            lines.extend((part, len(properties) - 1) for part in parts)
+
+        starts, ends, feature_ids = [], [], []
+        for part, feature_id in lines:
+            # GeoJSON positions are [lon, lat]
+            points = np.asarray(part, dtype=float)[:, :2][:, ::-1]
+            if len(points) < 2:
+                continue
+            starts.append(points[:-1])
+            ends.append(points[1:])
+            feature_ids.append(np.full(len(points) - 1, feature_id))
+
+        if not starts:
+            raise ValueError(f"No coastline geometry found in {path}")
+
+        index = cls(np.vstack(starts), np.vstack(ends), np.concatenate(feature_ids), properties, True, cell_degrees)
+        logger.info(f"Loaded coastline {path}: {len(index)} segments from {len(properties)} features")
+        return index
+
+    @classmethod
+    def from_points(
+        cls,
+        points: Sequence[Tuple[float, float, str, str]],
+        cell_degrees: float = 0.25
+    ) -> "CoastlineIndex":
+        """Build an index of zero-length segments from (lat, lon, name, region) points."""
+        coords = np.array([(p[0], p[1]) for p in points], dtype=float)
+        features = [{"name": p[2], "region": p[3]} for p in points]
+        return cls(coords, coords, np.arange(len(points)), features, False, cell_degrees)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lon / self.cell_degrees))
+
+    def _build_grid(self):
+        lo = np.minimum(self.starts, self.ends)
+        hi = np.maximum(self.starts, self.ends)
+        lo_cells = np.floor(lo / self.cell_degrees).astype(int)
+        hi_cells = np.floor(hi / self.cell_degrees).astype(int)
+
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for seg, ((i0, j0), (i1, j1)) in enumerate(zip(lo_cells, hi_cells)):
+            for i in range(i0, i1 + 1):
+                for j in range(j0, j1 + 1):
+                    buckets.setdefault((i, j), []).append(seg)
+
+        self._grid = {cell: np.array(ids, dtype=int) for cell, ids in buckets.items()}
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def _ring_candidates(self, ci: int, cj: int, ring: int) -> List[np.ndarray]:
+        if ring == 0:
+            ids = self._grid.get((ci, cj))
+            return [ids] if ids is not None else []
+
+        found = []
+        for i in range(ci - ring, ci + ring + 1):
+            for j in (cj - ring, cj + ring):
+                ids = self._grid.get((i, j))
+                if ids is not None:
+                    found.append(ids)
+        for j in range(cj - ring + 1, cj + ring):
+            for i in (ci - ring, ci + ring):
+                ids = self._grid.get((i, j))
+                if ids is not None:
+                    found.append(ids)
+        return found
+
+    def _segment_distances(self, lat: float, lon: float, ids: np.ndarray):
+        """Projected distance (km), segment parameter t and side cross product."""
+        scale_x = math.cos(math.radians(lat)) * KM_PER_DEGREE
+        ax = (self.starts[ids, 1] - lon) * scale_x
+        ay = (self.starts[ids, 0] - lat) * KM_PER_DEGREE
+        dx = (self.ends[ids, 1] - lon) * scale_x - ax
+        dy = (self.ends[ids, 0] - lat) * KM_PER_DEGREE - ay
+
+        length2 = dx * dx + dy * dy
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(length2 > 0, np.clip(-(ax * dx + ay * dy) / length2, 0.0, 1.0), 0.0)
+
+        distance = np.hypot(ax + t * dx, ay + t * dy)
+        # (end - start) x (point - start), point at the origin; > 0 means left of segment
+        cross = dx * -ay - dy * -ax
+        return distance, t, cross, np.sqrt(length2)
+
+    def _nearest_segment(self, lat: float, lon: float) -> Tuple[int, float, float]:
+        """Nearest segment id, its parameter t and the side of the point."""
+        if len(self.starts) <= _BRUTE_FORCE_SEGMENTS:
+            return self._pick_nearest(lat, lon, np.arange(len(self.starts)))
+
+        ci, cj = self._cell(lat, lon)
+        cell_km = self.cell_degrees * KM_PER_DEGREE * max(math.cos(math.radians(abs(lat) + self.cell_degrees)), 0.05)
+        max_ring = max(1, int(_MAX_RING_SEARCH_KM / cell_km))
+
+        seen: List[np.ndarray] = []
+        best = math.inf
+        for ring in range(max_ring + 1):
+            found = self._ring_candidates(ci, cj, ring)
+            if found:
+                ids = np.unique(np.concatenate(found))
+                seen.append(ids)
+                distance = self._segment_distances(lat, lon, ids)[0]
+                best = min(best, float(distance.min()))
+            # Unvisited cells are at least `ring` cells away
+            if best <= ring * cell_km:
+                break
+        else:
+            seen = [np.arange(len(self.starts))]
+
+        return self._pick_nearest(lat, lon, np.unique(np.concatenate(seen)))
+
+    def _pick_nearest(self, lat: float, lon: float, ids: np.ndarray) -> Tuple[int, float, float]:
+        distance, t, cross, length = self._segment_distances(lat, lon, ids)
+
+        # At a shared vertex, prefer the segment the point is most clearly beside
+        nearest = distance <= distance.min() + 1e-9
+        with np.errstate(divide="ignore", invalid="ignore"):
+            clearance = np.where(length > 0, np.abs(cross) / length, 0.0)
+        pick = np.flatnonzero(nearest)[np.argmax(clearance[nearest])]
+
+        side = SIDE_UNKNOWN
+        if self.oriented and cross[pick] != 0:
+            side = SIDE_LAND if cross[pick] > 0 else SIDE_WATER
+        return int(ids[pick]), float(t[pick]), side
+
+    def nearest(self, lats: Sequence[float], lons: Sequence[float]) -> Dict[str, np.ndarray]:
+        """
+        Nearest coastline point for each query.
+
+        Returns:
+            Dict of arrays: distance_km, lat, lon (closest coastline point),
+            feature (feature index) and side (SIDE_LAND / SIDE_WATER / SIDE_UNKNOWN)
+        """
+        lats = np.asarray(lats, dtype=float).ravel()
+        lons = np.asarray(lons, dtype=float).ravel()
+        n = len(lats)
+
+        segments = np.empty(n, dtype=int)
+        ts = np.empty(n, dtype=float)
+        sides = np.empty(n, dtype=int)
+        for k in range(n):
+            segments[k], ts[k], sides[k] = self._nearest_segment(lats[k], lons[k])
+
+        closest = self.starts[segments] + ts[:, None] * (self.ends[segments] - self.starts[segments])
+        return {
+            "distance_km": haversine_km(lats, lons, closest[:, 0], closest[:, 1]),
+            "lat": closest[:, 0],
+            "lon": closest[:, 1],
+            "feature": self.feature_ids[segments],
+            "side": sides,
+        }
+
+
+def load_coastline_index(
+    path: Optional[str],
+    fallback_points: Sequence[Tuple[float, float, str, str]]
+) -> CoastlineIndex:
+    """Load the GeoJSON coastline at path, or index the fallback points."""
+    if path:
+        if Path(path).exists():
+            try:
+                return CoastlineIndex.from_geojson(path)
+            except Exception as e:
+                logger.error(f"Failed to load coastline {path}: {e}")
+        else:
+            logger.warning(f"Coastline file {path} not found")
+    return CoastlineIndex.from_points(fallback_points)
@@ -0,0 +1,220 @@
+"""
+Embedding Cache
+Two-tier cache for sentence-transformer embeddings.
+
+Tier 1: In-process LRU (bounded by EMBEDDING_CACHE_MEMORY_ITEMS)
+Tier 2: On-disk SQLite store of raw float32 vectors (EMBEDDING_CACHE_PATH)
+
+Keys are sha256(model name + normalized text), so reports, SMI posts and
+retweets that repeat the same text share one encode, and the training set is
+not re-encoded on every boot. The SQLite file is safe to share between
+uvicorn workers and with the SMI service (api/embedding_cache.py there uses
+the same schema and key format).
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (NFKC, collapsed whitespace)."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def embedding_key(model_name: str, text: str) -> str:
+    """Cache key for a (model, normalized text) pair."""
+    return hashlib.sha256(f"{model_name}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Thread-safe LRU + SQLite embedding cache for a single model."""
+
+    def __init__(
+        self,
+        model_name: str,
+        dim: int,
+        max_memory_items: int = 10000,
+        db_path: Optional[str] = None
+    ):
+        self.model_name = model_name
+        self.dim = dim
+        self.max_memory_items = max(0, max_memory_items)
+        self.db_path = db_path
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        if db_path:
+            try:
+                Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache unavailable ({db_path}): {e}")
+                self._conn = None
+
+    def _remember(self, key: str, vector: np.ndarray):
+        """Insert into the LRU tier (caller holds the lock)."""
+        if self.max_memory_items == 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up embeddings; None for misses."""
+        keys = [embedding_key(self.model_name, text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        disk_lookup: Dict[str, List[int]] = {}
+
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = vector
+                    self._memory_hits += 1
+                else:
+                    disk_lookup.setdefault(key, []).append(i)
+
+            if disk_lookup and self._conn is not None:
+                found = self._read_disk(list(disk_lookup.keys()))
+                for key, vector in found.items():
+                    self._remember(key, vector)
+                    for i in disk_lookup.pop(key):
+                        results[i] = vector
+                        self._disk_hits += 1
+
+            self._misses += sum(len(positions) for positions in disk_lookup.values())
+
+        return results
+
+    def _read_disk(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        try:
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, dim, blob in rows:
+                    if dim == self.dim:
+                        found[key] = np.frombuffer(blob, dtype='float32')
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding disk cache read failed: {e}")
+        return found
+
+    def put_many(self, texts: List[str], vectors: np.ndarray):
+        """Store embeddings in both tiers."""
+        vectors = np.asarray(vectors, dtype='float32').reshape(len(texts), -1)
+        rows = []
+
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = embedding_key(self.model_name, text)
+                vector = vector.copy()
+                self._remember(key, vector)
+                rows.append((key, self.model_name, self.dim, vector.tobytes()))
+
+            if self._conn is not None and rows:
+                try:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, model, dim, vector) VALUES (?, ?, ?, ?)",
+                        rows
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding disk cache write failed: {e}")
+
+    def encode(
+        self,
+        texts: List[str],
+        encode_fn: Callable[[List[str]], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Return embeddings for texts, encoding only the cache misses.
+
+        Misses are de-duplicated and encoded in a single encode_fn call on
+        their normalized form.
+        """
+        cached = self.get_many(texts)
+        missing: Dict[str, List[int]] = {}
+        for i, vector in enumerate(cached):
+            if vector is None:
+                missing.setdefault(normalize_text(texts[i]), []).append(i)
+
+        if missing:
+            miss_texts = list(missing.keys())
+            encoded = np.asarray(encode_fn(miss_texts), dtype='float32').reshape(len(miss_texts), -1)
+            self.put_many(miss_texts, encoded)
+            for text, vector in zip(miss_texts, encoded):
+                for i in missing[text]:
+                    cached[i] = vector
+
+        return np.vstack(cached).astype('float32', copy=False) if cached else np.zeros((0, self.dim), dtype='float32')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit-rate statistics."""
+        with self._lock:
+            lookups = self._memory_hits + self._disk_hits + self._misses
+            return {
+                "model_name": self.model_name,
+                "memory_items": len(self._memory),
+                "max_memory_items": self.max_memory_items,
+                "disk_enabled": self._conn is not None,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_rate": round((self._memory_hits + self._disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+# One cache per model, shared by every service in the process
+_embedding_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str, dim: int) -> Optional[EmbeddingCache]:
+    """Get the shared embedding cache for a model (None when disabled)."""
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return None
+    with _caches_lock:
+        cache = _embedding_caches.get(model_name)
+        if cache is None:
+            cache = EmbeddingCache(
+                model_name,
+                dim,
+                max_memory_items=settings.EMBEDDING_CACHE_MEMORY_ITEMS,
+                db_path=settings.EMBEDDING_CACHE_PATH or None
+            )
+            _embedding_caches[model_name] = cache
+        return cache
@@ -8,14 +8,15 @@ import logging
 import asyncio
 import httpx
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List, Dict, Any, Tuple
-from math import radians, cos, sin, asin, sqrt
+from typing import Optional, List, Dict, Any, Tuple, Callable, Awaitable
 
 from app.config import settings
 from app.models.hazard import (
     ExtendedWeatherData, MarineData, AstronomyData, SeismicData,
     EnvironmentalSnapshot
 )
+from app.services.weather_cache import Codec, get_weather_cache
+from app.utils.geo import haversine_km
 
 logger = logging.getLogger(__name__)
 
@@ -50,23 +51,48 @@ class EnvironmentalDataService:
         if self._client and not self._client.is_closed:
             await self._client.aclose()
 
+    async def _cached(
+        self,
+        namespace: str,
+        model: type,
+        latitude: float,
+        longitude: float,
+        request: Callable[[], Awaitable[Tuple[Any, Optional[str]]]]
+    ) -> Tuple[Any, Optional[str]]:
+        """Serve a (data, error) fetch through the weather cache; errors are not cached."""
+        codec = Codec(
+            lambda result: result[0].model_dump(mode="json"),
+            lambda data: (model.model_validate(data), None)
+        )
+        return await get_weather_cache().get_or_fetch(
+            namespace, latitude, longitude, request,
+            codec=codec, cacheable=lambda result: result[0] is not None
+        )
+
     @staticmethod
     def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
         Calculate the great circle distance between two points in km.
         """
-        R = 6371  # Earth's radius in km
-
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
+        return haversine_km(lat1, lon1, lat2, lon2)
 
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * asin(sqrt(a))
+    async def fetch_weather_data(
+        self,
+        latitude: float,
+        longitude: float
+    ) -> Tuple[Optional[ExtendedWeatherData], Optional[str]]:
+        """
+        Fetch current weather data from WeatherAPI (via the shared weather cache).
 
-        return R * c
+        Returns:
+            Tuple of (weather_data, error_message)
+        """
+        return await self._cached(
+            "environmental:weather", ExtendedWeatherData, latitude, longitude,
+            lambda: self._request_weather_data(latitude, longitude)
+        )
 
-    async def fetch_weather_data(
+    async def _request_weather_data(
         self,
         latitude: float,
         longitude: float
@@ -149,6 +175,22 @@ class EnvironmentalDataService:
         self,
         latitude: float,
         longitude: float
+    ) -> Tuple[Optional[MarineData], Optional[str]]:
+        """
+        Fetch marine/ocean data from WeatherAPI Marine API (via the shared weather cache).
+
+        Returns:
+            Tuple of (marine_data, error_message)
+        """
+        return await self._cached(
+            "environmental:marine", MarineData, latitude, longitude,
+            lambda: self._request_marine_data(latitude, longitude)
+        )
+
+    async def _request_marine_data(
+        self,
+        latitude: float,
+        longitude: float
     ) -> Tuple[Optional[MarineData], Optional[str]]:
         """
         Fetch marine/ocean data from WeatherAPI Marine API.
@@ -238,6 +280,22 @@ class EnvironmentalDataService:
         self,
         latitude: float,
         longitude: float
+    ) -> Tuple[Optional[AstronomyData], Optional[str]]:
+        """
+        Fetch astronomy data from WeatherAPI (via the shared weather cache).
+
+        Returns:
+            Tuple of (astronomy_data, error_message)
+        """
+        return await self._cached(
+            "environmental:astronomy", AstronomyData, latitude, longitude,
+            lambda: self._request_astronomy_data(latitude, longitude)
+        )
+
+    async def _request_astronomy_data(
+        self,
+        latitude: float,
+        longitude: float
     ) -> Tuple[Optional[AstronomyData], Optional[str]]:
         """
         Fetch astronomy data from WeatherAPI.
@@ -5,14 +5,19 @@ Uses GeoJSON coastline data for accurate distance calculations.
 """
 
 import logging
-import math
 from datetime import datetime, timezone
 from typing import Optional, Tuple, List, Dict, Any
-from pathlib import Path
 
+import numpy as np
+
+from app.config import settings
 from app.models.verification import (
     LayerResult, LayerStatus, LayerName, GeofenceLayerData
 )
+from app.services.coastline_index import (
+    CoastlineIndex, SIDE_UNKNOWN, SIDE_WATER, load_coastline_index
+)
+from app.utils.geo import distance_matrix_km, haversine_km
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +34,6 @@ class GeofenceService:
     INLAND_LIMIT_KM = 20.0
     OFFSHORE_LIMIT_KM = 30.0
 
-    # Earth's radius in kilometers (for Haversine formula)
-    EARTH_RADIUS_KM = 6371.0
-
     # Indian coastline reference points (major coastal cities and key points)
     # Format: (latitude, longitude, name, region)
     INDIAN_COASTLINE_POINTS: List[Tuple[float, float, str, str]] = [
@@ -108,10 +110,11 @@ class GeofenceService:
         """Initialize geofence service."""
         self._initialized = False
         self._coastline_points = []
+        self._coastline_index: Optional[CoastlineIndex] = None
         self._initialize()
 
     def _initialize(self):
-        """Initialize coastline points."""
+        """Initialize coastline points and the coastline spatial index."""
         try:
             # Convert to internal format
             self._coastline_points = [
@@ -123,8 +126,17 @@ class GeofenceService:
                 }
                 for point in self.INDIAN_COASTLINE_POINTS
             ]
+            self._reference_coords = np.array(
+                [(point["lat"], point["lon"]) for point in self._coastline_points]
+            )
+            self._coastline_index = load_coastline_index(
+                settings.GEOFENCE_COASTLINE_PATH, self.INDIAN_COASTLINE_POINTS
+            )
             self._initialized = True
-            logger.info(f"GeofenceService initialized with {len(self._coastline_points)} coastline points")
+            logger.info(
+                f"GeofenceService initialized with {len(self._coastline_index)} coastline segments "
+                f"({'GeoJSON' if self._coastline_index.oriented else 'reference points'})"
+            )
         except Exception as e:
             logger.error(f"Failed to initialize GeofenceService: {e}")
             self._initialized = False
@@ -134,7 +146,6 @@ class GeofenceService:
     ) -> float:
         """
         Calculate the great-circle distance between two points on Earth.
-        Uses the Haversine formula.
 
         Args:
             lat1, lon1: First point coordinates (degrees)
@@ -143,21 +154,7 @@ class GeofenceService:
         Returns:
             Distance in kilometers
         """
-        # Convert to radians
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
-
-        # Haversine formula
-        a = (
-            math.sin(delta_lat / 2) ** 2 +
-            math.cos(lat1_rad) * math.cos(lat2_rad) *
-            math.sin(delta_lon / 2) ** 2
-        )
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-        return self.EARTH_RADIUS_KM * c
+        return haversine_km(lat1, lon1, lat2, lon2)
 
     def _find_nearest_coastline(
         self, lat: float, lon: float
@@ -172,22 +169,52 @@ class GeofenceService:
         Returns:
             Tuple of (distance_km, nearest_point_info)
         """
-        if not self._coastline_points:
-            return float('inf'), {}
+        return self._find_nearest_coastlines([lat], [lon])[0]
 
-        min_distance = float('inf')
-        nearest_point = {}
+    def _find_nearest_coastlines(
+        self, lats: List[float], lons: List[float]
+    ) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Find the nearest coastline point and distance for many locations.
+
+        Names and regions missing from the coastline data are taken from the
+        closest reference point.
 
-        for point in self._coastline_points:
-            distance = self._haversine_distance(
-                lat, lon,
-                point["lat"], point["lon"]
+        Returns:
+            List of (distance_km, nearest_point_info) per location
+        """
+        if self._coastline_index is None or len(self._coastline_index) == 0:
+            return [(float('inf'), {}) for _ in lats]
+
+        found = self._coastline_index.nearest(lats, lons)
+        features = [self._coastline_index.features[f] for f in found["feature"]]
+
+        unnamed = [k for k, feature in enumerate(features) if not (feature.get("name") and feature.get("region"))]
+        reference = {}
+        if unnamed:
+            closest = np.argmin(
+                distance_matrix_km(
+                    found["lat"][unnamed], found["lon"][unnamed],
+                    self._reference_coords[:, 0], self._reference_coords[:, 1]
+                ),
+                axis=1
             )
-            if distance < min_distance:
-                min_distance = distance
-                nearest_point = point
+            reference = {k: self._coastline_points[c] for k, c in zip(unnamed, closest)}
 
-        return min_distance, nearest_point
+        results = []
+        for k, feature in enumerate(features):
+            fallback = reference.get(k, {})
+            results.append((
+                float(found["distance_km"][k]),
+                {
+                    "lat": float(found["lat"][k]),
+                    "lon": float(found["lon"][k]),
+                    "name": feature.get("name") or fallback.get("name"),
+                    "region": feature.get("region") or fallback.get("region"),
+                    "side": int(found["side"][k])
+                }
+            ))
+        return results
 
     def _determine_location_type(
         self, lat: float, lon: float, nearest_point: Dict[str, Any]
@@ -209,6 +236,12 @@ class GeofenceService:
         if not nearest_point:
             return True, False  # Default to inland if no data
 
+        # Oriented coastline geometry: the side of the nearest segment decides
+        side = nearest_point.get("side", SIDE_UNKNOWN)
+        if side != SIDE_UNKNOWN:
+            is_offshore = side == SIDE_WATER
+            return not is_offshore, is_offshore
+
         # Get the nearest coast point coordinates
         coast_lat = nearest_point.get("lat", lat)
         coast_lon = nearest_point.get("lon", lon)
@@ -266,74 +299,106 @@ class GeofenceService:
         Returns:
             LayerResult with validation outcome
         """
-        start_time = datetime.now(timezone.utc)
+        return (await self.validate_locations([(lat, lon)]))[0]
 
-        try:
-            # Find nearest coastline point
-            distance_km, nearest_point = self._find_nearest_coastline(lat, lon)
-
-            # Determine if inland or offshore
-            is_inland, is_offshore = self._determine_location_type(lat, lon, nearest_point)
-
-            # Validation logic
-            if is_inland and distance_km <= self.INLAND_LIMIT_KM:
-                status = LayerStatus.PASS
-                score = 1.0 - (distance_km / self.INLAND_LIMIT_KM * 0.2)  # Small penalty for distance
-                reasoning = f"Location is {distance_km:.1f}km inland from coast (limit: {self.INLAND_LIMIT_KM}km). Valid coastal area."
-            elif is_offshore and distance_km <= self.OFFSHORE_LIMIT_KM:
-                status = LayerStatus.PASS
-                score = 1.0 - (distance_km / self.OFFSHORE_LIMIT_KM * 0.2)
-                reasoning = f"Location is {distance_km:.1f}km offshore (limit: {self.OFFSHORE_LIMIT_KM}km). Valid coastal waters."
-            elif is_inland and distance_km > self.INLAND_LIMIT_KM:
-                status = LayerStatus.FAIL
-                score = 0.0
-                reasoning = f"Location is {distance_km:.1f}km inland, exceeding {self.INLAND_LIMIT_KM}km limit. Not a valid coastal area."
-            else:  # is_offshore and distance > OFFSHORE_LIMIT
-                status = LayerStatus.FAIL
-                score = 0.0
-                reasoning = f"Location is {distance_km:.1f}km offshore, exceeding {self.OFFSHORE_LIMIT_KM}km limit. Too far from coast."
-
-            # Ensure score is within bounds
-            score = max(0.0, min(1.0, score))
-
-            # Build layer data
-            layer_data = GeofenceLayerData(
-                latitude=lat,
-                longitude=lon,
-                distance_to_coast_km=round(distance_km, 2),
-                is_inland=is_inland,
-                is_offshore=is_offshore,
-                nearest_coastline_point={
-                    "lat": nearest_point.get("lat"),
-                    "lon": nearest_point.get("lon"),
-                    "name": nearest_point.get("name")
-                } if nearest_point else None,
-                region=nearest_point.get("region")
-            )
+    async def validate_locations(
+        self, locations: List[Tuple[float, float]]
+    ) -> List[LayerResult]:
+        """
+        Validate many locations with a single coastline lookup.
 
-            return LayerResult(
-                layer_name=LayerName.GEOFENCE,
-                status=status,
-                score=score,
-                confidence=0.95,  # High confidence in geographic validation
-                weight=0.20,  # Base weight, will be adjusted by orchestrator
-                reasoning=reasoning,
-                data=layer_data.model_dump(),
-                processed_at=datetime.now(timezone.utc)
-            )
+        Args:
+            locations: (latitude, longitude) pairs
 
+        Returns:
+            LayerResult per location, in order
+        """
+        if not locations:
+            return []
+
+        try:
+            lats = [float(lat) for lat, _ in locations]
+            lons = [float(lon) for _, lon in locations]
+            nearest = self._find_nearest_coastlines(lats, lons)
         except Exception as e:
             logger.error(f"Geofence validation error: {e}")
-            return LayerResult(
-                layer_name=LayerName.GEOFENCE,
-                status=LayerStatus.FAIL,
-                score=0.0,
-                confidence=0.0,
-                weight=0.20,
-                reasoning=f"Geofence validation failed due to error: {str(e)}",
-                data={"error": str(e), "latitude": lat, "longitude": lon},
-                processed_at=datetime.now(timezone.utc)
-            )
+            return [self._error_result(lat, lon, e) for lat, lon in locations]
+
+        results = []
+        for lat, lon, (distance_km, nearest_point) in zip(lats, lons, nearest):
+            try:
+                results.append(self._build_layer_result(lat, lon, distance_km, nearest_point))
+            except Exception as e:
+                logger.error(f"Geofence validation error: {e}")
+                results.append(self._error_result(lat, lon, e))
+        return results
+
+    def _build_layer_result(
+        self, lat: float, lon: float, distance_km: float, nearest_point: Dict[str, Any]
+    ) -> LayerResult:
+        """Apply the inland/offshore limits to a coastline lookup."""
+        # Determine if inland or offshore
+        is_inland, is_offshore = self._determine_location_type(lat, lon, nearest_point)
+
+        # Validation logic
+        if is_inland and distance_km <= self.INLAND_LIMIT_KM:
+            status = LayerStatus.PASS
+            score = 1.0 - (distance_km / self.INLAND_LIMIT_KM * 0.2)  # Small penalty for distance
+            reasoning = f"Location is {distance_km:.1f}km inland from coast (limit: {self.INLAND_LIMIT_KM}km). Valid coastal area."
+        elif is_offshore and distance_km <= self.OFFSHORE_LIMIT_KM:
+            status = LayerStatus.PASS
+            score = 1.0 - (distance_km / self.OFFSHORE_LIMIT_KM * 0.2)
+            reasoning = f"Location is {distance_km:.1f}km offshore (limit: {self.OFFSHORE_LIMIT_KM}km). Valid coastal waters."
+        elif is_inland and distance_km > self.INLAND_LIMIT_KM:
+            status = LayerStatus.FAIL
+            score = 0.0
+            reasoning = f"Location is {distance_km:.1f}km inland, exceeding {self.INLAND_LIMIT_KM}km limit. Not a valid coastal area."
+        else:  # is_offshore and distance > OFFSHORE_LIMIT
+            status = LayerStatus.FAIL
+            score = 0.0
+            reasoning = f"Location is {distance_km:.1f}km offshore, exceeding {self.OFFSHORE_LIMIT_KM}km limit. Too far from coast."
+
+        # Ensure score is within bounds
+        score = max(0.0, min(1.0, score))
+
+        # Build layer data
+        layer_data = GeofenceLayerData(
+            latitude=lat,
+            longitude=lon,
+            distance_to_coast_km=round(distance_km, 2),
+            is_inland=is_inland,
+            is_offshore=is_offshore,
+            nearest_coastline_point={
+                "lat": nearest_point.get("lat"),
+                "lon": nearest_point.get("lon"),
+                "name": nearest_point.get("name")
+            } if nearest_point else None,
+            region=nearest_point.get("region")
+        )
+
+        return LayerResult(
+            layer_name=LayerName.GEOFENCE,
+            status=status,
+            score=score,
+            confidence=0.95,  # High confidence in geographic validation
+            weight=0.20,  # Base weight, will be adjusted by orchestrator
+            reasoning=reasoning,
+            data=layer_data.model_dump(),
+            processed_at=datetime.now(timezone.utc)
+        )
+
+    def _error_result(self, lat: float, lon: float, error: Exception) -> LayerResult:
+        """Failed layer result for an unexpected validation error."""
+        return LayerResult(
+            layer_name=LayerName.GEOFENCE,
+            status=LayerStatus.FAIL,
+            score=0.0,
+            confidence=0.0,
+            weight=0.20,
+            reasoning=f"Geofence validation failed due to error: {str(error)}",
+            data={"error": str(error), "latitude": lat, "longitude": lon},
+            processed_at=datetime.now(timezone.utc)
+        )
 
     def is_valid_india_coordinates(self, lat: float, lon: float) -> bool:
         """
@@ -0,0 +1,141 @@
+"""
+Image Context
+Decode-once view of an uploaded image for the vision layer.
+
+The file is read and EXIF-transposed once. The pre-classification checks
+(face detection, skin tones, color palette) share a downscaled copy and its
+grayscale/HSV planes; the CNN preprocess resizes the full-resolution RGB.
+"""
+
+import logging
+import os
+import threading
+from functools import cached_property
+from typing import Any, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_face_cascade: Any = None
+_face_cascade_lock = threading.Lock()
+
+
+def get_face_cascade() -> Any:
+    """Haar frontal-face cascade, loaded once per process."""
+    global _face_cascade
+    if _face_cascade is None:
+        import cv2
+
+        with _face_cascade_lock:
+            if _face_cascade is None:
+                cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+                if cascade.empty():
+                    raise RuntimeError("Failed to load Haar face cascade")
+                _face_cascade = cascade
+    return _face_cascade
+
+
+class ImageContext:
+    """
+    A decoded, correctly oriented image plus derived analysis planes.
+
+    Planes are computed on first use and cached, so each is built at most
+    once per image however many checks read it.
+    """
+
+    # Longest side of the copy used by the pre-classification checks
+    ANALYSIS_MAX_SIDE = 1024
+
+    def __init__(
+        self,
+        path: str,
+        rgb: np.ndarray,
+        image_format: Optional[str] = None,
+        mode: Optional[str] = None,
+        file_size: int = 0
+    ):
+        """
+        Args:
+            path: Source file path
+            rgb: Full-resolution RGB pixels (H, W, 3) uint8, EXIF orientation applied
+            image_format: PIL format of the source file (JPEG, PNG, ...)
+            mode: PIL mode of the source file before RGB conversion
+            file_size: Source file size in bytes
+        """
+        self.path = path
+        self.rgb = rgb
+        self.format = image_format
+        self.mode = mode
+        self.file_size = file_size
+
+    @classmethod
+    def load(cls, path: str) -> Optional["ImageContext"]:
+        """Read and EXIF-transpose an image file; None if it cannot be decoded."""
+        try:
+            from PIL import Image, ImageOps
+
+            with Image.open(path) as img:
+                image_format, mode = img.format, img.mode
+                # Burn the EXIF orientation into the pixels (mobile uploads)
+                oriented = ImageOps.exif_transpose(img)
+                if oriented.mode != 'RGB':
+                    oriented = oriented.convert('RGB')
+                rgb = np.asarray(oriented, dtype=np.uint8)
+
+            return cls(path, rgb, image_format, mode, os.path.getsize(path))
+
+        except Exception as e:
+            logger.warning(f"Failed to decode image {path}: {e}")
+            return None
+
+    @property
+    def height(self) -> int:
+        return self.rgb.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.rgb.shape[1]
+
+    def _analysis_size(self) -> Optional[tuple]:
+        """(width, height) of the analysis planes, or None to use full resolution."""
+        scale = self.ANALYSIS_MAX_SIDE / max(self.height, self.width)
+        if scale >= 1.0:
+            return None
+        return max(1, round(self.width * scale)), max(1, round(self.height * scale))
+
+    @cached_property
+    def analysis_rgb(self) -> np.ndarray:
+        """Area-filtered RGB copy with its longest side at most ANALYSIS_MAX_SIDE."""
+        import cv2
+
+        size = self._analysis_size()
+        return self.rgb if size is None else cv2.resize(self.rgb, size, interpolation=cv2.INTER_AREA)
+
+    @cached_property
+    def gray(self) -> np.ndarray:
+        """Grayscale plane of analysis_rgb (for detectors)."""
+        import cv2
+
+        return cv2.cvtColor(self.analysis_rgb, cv2.COLOR_RGB2GRAY)
+
+    @cached_property
+    def hsv(self) -> np.ndarray:
+        """
+        HSV planes (OpenCV ranges: H 0-180, S/V 0-255) at the analysis size.
+
+        Sampled with nearest-neighbour rather than area filtering: the color
+        checks threshold individual pixels, and averaging would shift the
+        ratios away from the full-resolution values.
+        """
+        import cv2
+
+        size = self._analysis_size()
+        sampled = self.rgb if size is None else cv2.resize(self.rgb, size, interpolation=cv2.INTER_NEAREST)
+        return cv2.cvtColor(sampled, cv2.COLOR_RGB2HSV)
+
+    @property
+    def analysis_pixels(self) -> int:
+        """Pixel count of the analysis planes."""
+        size = self._analysis_size()
+        return self.width * self.height if size is None else size[0] * size[1]
@@ -0,0 +1,277 @@
+"""
+Image Hash Index
+Persistent near-duplicate index of report photos and scraped social media images.
+
+Every uploaded image is hashed (64-bit dHash + pHash, see app.utils.image_hash)
+and recorded in the image_hashes collection together with its vision result.
+Each worker keeps the hashes in an in-memory BK-tree, so a lookup is a
+radius search rather than a collection scan, and pulls entries written by
+other workers every IMAGE_HASH_SYNC_SECONDS.
+
+BlueRadar appends the hashes of scraped images to its own log
+(blueradar_intelligence/data/cache/image_hashes.jsonl); the index tails that
+log so a report photo lifted from a viral post is recognised as recycled.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.database import MongoDB
+from app.utils.image_hash import BKTree, ImageHashes, hamming_distance
+
+logger = logging.getLogger(__name__)
+
+SOURCE_REPORT = "report"
+SOURCE_SOCIAL_MEDIA = "social_media"
+
+# Re-read entries this far behind the last sync; writers' clocks are not in lockstep
+_SYNC_OVERLAP = timedelta(seconds=5)
+
+
+def default_blueradar_log() -> Path:
+    """BlueRadar's scraped-image hash log next to the backend."""
+    return (
+        Path(__file__).resolve().parent.parent.parent.parent
+        / "blueradar_intelligence" / "data" / "cache" / "image_hashes.jsonl"
+    )
+
+
+@dataclass
+class IndexedImage:
+    """One hashed image and what is known about it."""
+    entry_id: str
+    hashes: ImageHashes
+    source: str
+    ref_id: Optional[str] = None  # report_id, or post id for social media
+    user_id: Optional[str] = None
+    hazard_type: Optional[str] = None
+    probabilities: Optional[List[float]] = None  # CNN output, reusable for any hazard type
+    result: Optional[Dict[str, Any]] = None  # Vision layer status/score/reasoning/data
+    created_at: Optional[datetime] = None
+
+
+@dataclass
+class DuplicateMatch:
+    """A near-duplicate found in the index."""
+    image: IndexedImage
+    distance: int
+    phash_distance: int
+    candidates: int = 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source": self.image.source,
+            "ref_id": self.image.ref_id,
+            "distance": self.distance,
+            "phash_distance": self.phash_distance,
+            "first_seen": self.image.created_at.isoformat() if self.image.created_at else None,
+        }
+
+
+class ImageHashIndex:
+    """BK-tree over dHash, confirmed by pHash, backed by MongoDB."""
+
+    COLLECTION = "image_hashes"
+
+    def __init__(
+        self,
+        max_distance: int = 8,
+        phash_max_distance: int = 10,
+        sync_seconds: float = 30.0,
+        blueradar_log: Optional[Path] = None
+    ):
+        """
+        Args:
+            max_distance: dHash Hamming radius for a near-duplicate
+            phash_max_distance: pHash Hamming distance that must also hold
+            sync_seconds: How often to pull entries written by other workers
+            blueradar_log: BlueRadar hash log to tail (None to disable)
+        """
+        self.max_distance = max_distance
+        self.phash_max_distance = phash_max_distance
+        self.sync_seconds = sync_seconds
+        self.blueradar_log = blueradar_log
+
+        self._tree = BKTree()
+        self._entry_ids: set = set()
+        self._synced_until: Optional[datetime] = None
+        self._last_sync = float("-inf")
+        self._log_offset = 0
+        self._sync_lock = asyncio.Lock()
+
+        self._lookups = 0
+        self._duplicates = 0
+
+    def _add_to_tree(self, image: IndexedImage):
+        if image.entry_id in self._entry_ids:
+            return
+        self._entry_ids.add(image.entry_id)
+        self._tree.add(image.hashes.dhash, image)
+
+    @staticmethod
+    def _from_document(doc: Dict[str, Any]) -> IndexedImage:
+        return IndexedImage(
+            entry_id=str(doc["_id"]),
+            hashes=ImageHashes.from_dict(doc),
+            source=doc.get("source", SOURCE_REPORT),
+            ref_id=doc.get("ref_id"),
+            user_id=doc.get("user_id"),
+            hazard_type=doc.get("hazard_type"),
+            probabilities=doc.get("probabilities"),
+            result=doc.get("result"),
+            created_at=doc.get("created_at"),
+        )
+
+    async def _sync_database(self):
+        try:
+            db = MongoDB.get_database()
+        except RuntimeError:
+            return
+
+        query = {}
+        if self._synced_until is not None:
+            query["created_at"] = {"$gte": self._synced_until - _SYNC_OVERLAP}
+
+        synced_until = self._synced_until
+        async for doc in db[self.COLLECTION].find(query):
+            self._add_to_tree(self._from_document(doc))
+            created_at = doc.get("created_at")
+            if created_at is not None and (synced_until is None or created_at > synced_until):
+                synced_until = created_at
+        self._synced_until = synced_until
+
+    def _read_blueradar_log(self) -> List[IndexedImage]:
+        """New lines of the BlueRadar log since the last read."""
+        if self.blueradar_log is None or not self.blueradar_log.exists():
+            return []
+
+        images = []
+        with open(self.blueradar_log, "rb") as f:
+            f.seek(self._log_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written; pick it up next time
+                self._log_offset += len(line)
+                try:
+                    record = json.loads(line)
+                    images.append(IndexedImage(
+                        entry_id=f"blueradar:{record['dhash']}:{record.get('post_id')}",
+                        hashes=ImageHashes.from_dict(record),
+                        source=SOURCE_SOCIAL_MEDIA,
+                        ref_id=record.get("post_id"),
+                        created_at=datetime.fromisoformat(record["seen_at"]) if record.get("seen_at") else None,
+                    ))
+                except (KeyError, ValueError) as e:
+                    logger.debug(f"Skipping malformed BlueRadar hash record: {e}")
+        return images
+
+    async def sync(self, force: bool = False):
+        """Pull entries added by other workers and BlueRadar."""
+        if not force and time.monotonic() - self._last_sync < self.sync_seconds:
+            return
+
+        async with self._sync_lock:
+            if not force and time.monotonic() - self._last_sync < self.sync_seconds:
+                return
+            self._last_sync = time.monotonic()
+            try:
+                await self._sync_database()
+                for image in await asyncio.to_thread(self._read_blueradar_log):
+                    self._add_to_tree(image)
+            except Exception as e:
+                logger.warning(f"Image hash index sync failed: {e}")
+
+    async def lookup(self, hashes: ImageHashes) -> Optional[DuplicateMatch]:
+        """
+        Closest near-duplicate of an image, if any.
+
+        Args:
+            hashes: Hashes of the new image
+
+        Returns:
+            DuplicateMatch or None
+        """
+        await self.sync()
+        self._lookups += 1
+
+        matches = []
+        for distance, image in self._tree.search(hashes.dhash, self.max_distance):
+            phash_distance = hamming_distance(hashes.phash, image.hashes.phash)
+            if phash_distance <= self.phash_max_distance:
+                matches.append((distance, phash_distance, image))
+        if not matches:
+            return None
+
+        # Prefer entries whose vision result can be reused
+        distance, phash_distance, image = min(
+            matches, key=lambda m: (m[0], m[2].probabilities is None and m[2].result is None, m[1])
+        )
+        self._duplicates += 1
+        return DuplicateMatch(image, distance, phash_distance, candidates=len(matches))
+
+    async def add(
+        self,
+        hashes: ImageHashes,
+        report_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+        hazard_type: Optional[str] = None,
+        probabilities: Optional[List[float]] = None,
+        result: Optional[Dict[str, Any]] = None
+    ) -> IndexedImage:
+        """Record a report image (persisted when the database is connected)."""
+        doc = {
+            **hashes.to_dict(),
+            "source": SOURCE_REPORT,
+            "ref_id": report_id,
+            "user_id": user_id,
+            "hazard_type": hazard_type,
+            "probabilities": probabilities,
+            "result": result,
+            "created_at": datetime.now(timezone.utc),
+        }
+
+        try:
+            inserted = await MongoDB.get_database()[self.COLLECTION].insert_one(doc)
+            entry_id = str(inserted.inserted_id)
+        except RuntimeError:
+            entry_id = f"local:{hashes.dhash:016x}:{report_id}"
+        except Exception as e:
+            logger.warning(f"Failed to persist image hash for {report_id}: {e}")
+            entry_id = f"local:{hashes.dhash:016x}:{report_id}"
+
+        image = self._from_document({**doc, "_id": entry_id})
+        self._add_to_tree(image)
+        return image
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._tree),
+            "lookups": self._lookups,
+            "duplicates": self._duplicates,
+            "synced_until": self._synced_until.isoformat() if self._synced_until else None,
+        }
+
+
+# Singleton instance
+_image_hash_index: Optional[ImageHashIndex] = None
+
+
+def get_image_hash_index() -> ImageHashIndex:
+    """Get the image hash index singleton."""
+    global _image_hash_index
+    if _image_hash_index is None:
+        _image_hash_index = ImageHashIndex(
+            max_distance=settings.IMAGE_HASH_MAX_DISTANCE,
+            phash_max_distance=settings.IMAGE_HASH_PHASH_MAX_DISTANCE,
+            sync_seconds=settings.IMAGE_HASH_SYNC_SECONDS,
+            blueradar_log=Path(settings.IMAGE_HASH_BLUERADAR_LOG) if settings.IMAGE_HASH_BLUERADAR_LOG
+            else default_blueradar_log()
+        )
+    return _image_hash_index
@@ -4,16 +4,22 @@ Handles EXIF transposition, metadata extraction, and image optimization.
 
 This service ensures images display correctly regardless of device orientation
 by burning EXIF rotation directly into pixel data before stripping metadata.
+
+Uploads are processed from the file on disk on a bounded worker pool, so large
+photos never sit in memory as bytes or block the event loop.
 """
 
 import logging
 import os
 import io
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, BinaryIO
 from pathlib import Path
 from dataclasses import dataclass
 
+from app.config import settings
+from app.services.inference_executor import InferenceExecutor
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,7 +40,7 @@ class ImageMetadata:
 @dataclass
 class ProcessedImage:
     """Result of image processing."""
-    image_bytes: bytes
+    image_bytes: Optional[bytes]  # None when written to a file
     metadata: ImageMetadata
     final_width: int
     final_height: int
@@ -42,6 +48,7 @@ class ProcessedImage:
     format: str
     was_rotated: bool
     compression_applied: bool
+    path: Optional[str] = None
 
 
 class ImageProcessor:
@@ -269,31 +276,35 @@ class ImageProcessor:
         # Use high-quality resize
         return image.resize((new_width, new_height), Image.LANCZOS)
 
-    def _strip_metadata_and_save(
+    def _save(
         self,
         image,
+        output: BinaryIO,
         format: str = 'JPEG',
-        quality: int = 85
-    ) -> bytes:
+        quality: int = 85,
+        strip_metadata: bool = True
+    ):
         """
-        Save image without any EXIF metadata.
+        Encode image into a file object.
 
         Args:
             image: PIL Image object
+            output: Binary file object to write to
             format: Output format (JPEG, PNG)
             quality: JPEG quality (0-100)
-
-        Returns:
-            Image bytes without metadata
+            strip_metadata: Save without EXIF (pixel data only)
         """
+        if not strip_metadata:
+            # Save with metadata intact (rarely used)
+            image.save(output, format=format, quality=quality)
+            return
+
         # Create new image without EXIF by copying pixel data
         # This effectively strips all metadata
         if image.mode in ('RGBA', 'P'):
             # Convert to RGB for JPEG
             image = image.convert('RGB')
 
-        output = io.BytesIO()
-
         # Save without EXIF
         save_kwargs = {
             'format': format,
@@ -307,54 +318,60 @@ class ImageProcessor:
             save_kwargs['compress_level'] = 6
 
         image.save(output, **save_kwargs)
-        return output.getvalue()
 
-    def process_image(
+    def _strip_metadata_and_save(
         self,
-        image_bytes: bytes,
-        filename: Optional[str] = None,
-        extract_gps: bool = True,
-        apply_rotation: bool = True,
-        strip_metadata: bool = True,
-        resize: bool = True,
-        output_format: Optional[str] = None
-    ) -> ProcessedImage:
+        image,
+        format: str = 'JPEG',
+        quality: int = 85
+    ) -> bytes:
         """
-        Process image with full EXIF handling pipeline.
-
-        Workflow:
-        1. Extract GPS and timestamp metadata (before stripping)
-        2. Read and apply EXIF orientation
-        3. Resize if needed
-        4. Strip all metadata
-        5. Compress and return
+        Save image without any EXIF metadata.
 
         Args:
-            image_bytes: Raw image bytes
-            filename: Original filename (for format detection)
-            extract_gps: Whether to extract GPS metadata
-            apply_rotation: Whether to apply EXIF rotation
-            strip_metadata: Whether to strip EXIF data
-            resize: Whether to resize large images
-            output_format: Force output format (JPEG/PNG)
+            image: PIL Image object
+            format: Output format (JPEG, PNG)
+            quality: JPEG quality (0-100)
 
         Returns:
-            ProcessedImage with processed bytes and extracted metadata
+            Image bytes without metadata
         """
-        if not self._pil_available:
-            raise RuntimeError("PIL not available for image processing")
+        output = io.BytesIO()
+        self._save(image, output, format=format, quality=quality)
+        return output.getvalue()
 
-        from PIL import Image
+    def _transform(
+        self,
+        image,
+        extract_gps: bool,
+        apply_rotation: bool,
+        resize: bool,
+        output_format: Optional[str]
+    ) -> Tuple[Any, ImageMetadata, bool, bool, str, int]:
+        """
+        Steps 1-3 of the pipeline on an opened image.
 
-        # Load image
-        input_buffer = io.BytesIO(image_bytes)
-        image = Image.open(input_buffer)
+        Returns:
+            (image, metadata, was_rotated, compression_applied, out_format, quality)
+        """
         original_format = image.format or 'JPEG'
+        original_size = image.size
+
+        max_dim = (
+            self.LOW_BANDWIDTH_MAX_DIMENSION
+            if self.low_bandwidth_mode
+            else self.DEFAULT_MAX_DIMENSION
+        )
+        if resize:
+            # Let the JPEG decoder downscale by 1/2, 1/4 or 1/8 while decoding;
+            # no-op for other formats and for images already small enough
+            image.draft('RGB', (max_dim, max_dim))
 
         # Step 1: Extract metadata BEFORE any processing
         metadata = ImageMetadata()
         if extract_gps:
             metadata = self._extract_metadata(image)
+            metadata.original_width, metadata.original_height = original_size
 
         # Step 2: Apply EXIF rotation to burn orientation into pixels
         was_rotated = False
@@ -366,17 +383,10 @@ class ImageProcessor:
         # Step 3: Resize if needed
         compression_applied = False
         if resize:
-            max_dim = (
-                self.LOW_BANDWIDTH_MAX_DIMENSION
-                if self.low_bandwidth_mode
-                else self.DEFAULT_MAX_DIMENSION
-            )
-            original_size = (image.width, image.height)
             image = self._resize_image(image, max_dim)
-            if (image.width, image.height) != original_size:
+            if image.size not in (original_size, original_size[::-1]):
                 compression_applied = True
 
-        # Step 4 & 5: Strip metadata and compress
         quality = (
             self.LOW_BANDWIDTH_QUALITY
             if self.low_bandwidth_mode
@@ -393,18 +403,55 @@ class ImageProcessor:
         else:
             out_format = 'JPEG'  # Default to JPEG for compression
 
-        if strip_metadata:
-            processed_bytes = self._strip_metadata_and_save(
-                image,
-                format=out_format,
-                quality=quality
-            )
-            compression_applied = True
-        else:
-            # Save with metadata intact (rarely used)
-            output = io.BytesIO()
-            image.save(output, format=out_format, quality=quality)
-            processed_bytes = output.getvalue()
+        return image, metadata, was_rotated, compression_applied, out_format, quality
+
+    def process_image(
+        self,
+        image_bytes: bytes,
+        filename: Optional[str] = None,
+        extract_gps: bool = True,
+        apply_rotation: bool = True,
+        strip_metadata: bool = True,
+        resize: bool = True,
+        output_format: Optional[str] = None
+    ) -> ProcessedImage:
+        """
+        Process image with full EXIF handling pipeline.
+
+        Workflow:
+        1. Extract GPS and timestamp metadata (before stripping)
+        2. Read and apply EXIF orientation
+        3. Resize if needed
+        4. Strip all metadata
+        5. Compress and return
+
+        Args:
+            image_bytes: Raw image bytes
+            filename: Original filename (for format detection)
+            extract_gps: Whether to extract GPS metadata
+            apply_rotation: Whether to apply EXIF rotation
+            strip_metadata: Whether to strip EXIF data
+            resize: Whether to resize large images
+            output_format: Force output format (JPEG/PNG)
+
+        Returns:
+            ProcessedImage with processed bytes and extracted metadata
+        """
+        if not self._pil_available:
+            raise RuntimeError("PIL not available for image processing")
+
+        from PIL import Image
+
+        # Load image
+        image = Image.open(io.BytesIO(image_bytes))
+        image, metadata, was_rotated, compression_applied, out_format, quality = self._transform(
+            image, extract_gps, apply_rotation, resize, output_format
+        )
+
+        # Step 4 & 5: Strip metadata and compress
+        output = io.BytesIO()
+        self._save(image, output, format=out_format, quality=quality, strip_metadata=strip_metadata)
+        processed_bytes = output.getvalue()
 
         return ProcessedImage(
             image_bytes=processed_bytes,
@@ -414,7 +461,72 @@ class ImageProcessor:
             file_size=len(processed_bytes),
             format=out_format,
             was_rotated=was_rotated,
-            compression_applied=compression_applied
+            compression_applied=compression_applied or strip_metadata
+        )
+
+    def process_file(
+        self,
+        path: str,
+        output_path: Optional[str] = None,
+        extract_gps: bool = True,
+        apply_rotation: bool = True,
+        strip_metadata: bool = True,
+        resize: bool = True,
+        output_format: Optional[str] = None
+    ) -> ProcessedImage:
+        """
+        Process an image file on disk (same pipeline as process_image).
+
+        The decoder reads from the file, and the result is written to a temporary
+        file and renamed over output_path, so readers never see a partial image.
+
+        Args:
+            path: Image file to process
+            output_path: Where to write the result (defaults to path, in place)
+
+        Returns:
+            ProcessedImage with path set and image_bytes None
+        """
+        if not self._pil_available:
+            raise RuntimeError("PIL not available for image processing")
+
+        from PIL import Image
+
+        output_path = output_path or path
+        temp_path = f"{output_path}.tmp"
+
+        try:
+            with Image.open(path) as opened:
+                image, metadata, was_rotated, compression_applied, out_format, quality = self._transform(
+                    opened, extract_gps, apply_rotation, resize, output_format
+                )
+                with open(temp_path, "wb") as output:
+                    self._save(image, output, format=out_format, quality=quality, strip_metadata=strip_metadata)
+            # Source is closed before it is replaced
+            os.replace(temp_path, output_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return ProcessedImage(
+            image_bytes=None,
+            metadata=metadata,
+            final_width=image.width,
+            final_height=image.height,
+            file_size=os.path.getsize(output_path),
+            format=out_format,
+            was_rotated=was_rotated,
+            compression_applied=compression_applied or strip_metadata,
+            path=output_path
+        )
+
+    def _log_result(self, result: ProcessedImage):
+        logger.info(
+            f"Image processed: {result.final_width}x{result.final_height}, "
+            f"size={result.file_size/1024:.1f}KB, "
+            f"rotated={result.was_rotated}, "
+            f"gps={'yes' if result.metadata.latitude else 'no'}"
         )
 
     async def process_upload(
@@ -425,7 +537,8 @@ class ImageProcessor:
         """
         Process an uploaded image file.
 
-        Convenience method for API endpoints.
+        Convenience method for API endpoints. Prefer process_upload_file for
+        uploads already on disk.
 
         Args:
             upload_bytes: Raw uploaded file bytes
@@ -434,7 +547,8 @@ class ImageProcessor:
         Returns:
             Tuple of (processed_bytes, extracted_metadata)
         """
-        result = self.process_image(
+        result = await get_image_executor().run(
+            self.process_image,
             upload_bytes,
             filename=filename,
             extract_gps=True,
@@ -442,19 +556,38 @@ class ImageProcessor:
             strip_metadata=True,
             resize=True
         )
+        self._log_result(result)
+        return result.image_bytes, result.metadata
 
-        logger.info(
-            f"Image processed: {result.final_width}x{result.final_height}, "
-            f"size={result.file_size/1024:.1f}KB, "
-            f"rotated={result.was_rotated}, "
-            f"gps={'yes' if result.metadata.latitude else 'no'}"
-        )
+    async def process_upload_file(self, path: str) -> ProcessedImage:
+        """
+        Rotate, resize and strip an uploaded image in place, on the image pool.
 
-        return result.image_bytes, result.metadata
+        Args:
+            path: Uploaded image on disk
 
+        Returns:
+            ProcessedImage (extracted metadata, final size)
 
-# Singleton instance
+        Raises:
+            InferenceOverloadedError: If the image pool queue is full
+            asyncio.TimeoutError: If processing does not finish in time
+        """
+        result = await get_image_executor().run(
+            self.process_file,
+            path,
+            extract_gps=True,
+            apply_rotation=True,
+            strip_metadata=True,
+            resize=True
+        )
+        self._log_result(result)
+        return result
+
+
+# Singleton instances
 _image_processor: Optional[ImageProcessor] = None
+_image_executor: Optional[InferenceExecutor] = None
 
 
 def get_image_processor(low_bandwidth_mode: bool = False) -> ImageProcessor:
@@ -463,3 +596,24 @@ def get_image_processor(low_bandwidth_mode: bool = False) -> ImageProcessor:
     if _image_processor is None:
         _image_processor = ImageProcessor(low_bandwidth_mode=low_bandwidth_mode)
     return _image_processor
+
+
+def get_image_executor() -> InferenceExecutor:
+    """Bounded pool for image decoding/encoding (Pillow releases the GIL)."""
+    global _image_executor
+    if _image_executor is None:
+        _image_executor = InferenceExecutor(
+            max_workers=settings.IMAGE_PROCESSING_MAX_WORKERS,
+            max_queue=settings.IMAGE_PROCESSING_MAX_QUEUE,
+            timeout_seconds=settings.IMAGE_PROCESSING_TIMEOUT_SECONDS,
+            name="image_processing"
+        )
+    return _image_executor
+
+
+def shutdown_image_executor():
+    """Shut down the image processing pool."""
+    global _image_executor
+    if _image_executor is not None:
+        _image_executor.shutdown()
+        _image_executor = None
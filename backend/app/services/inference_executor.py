@@ -0,0 +1,181 @@
+"""
+Inference Executor
+Bounded worker pool for CPU-bound ML calls (embeddings, FAISS search).
+
+Keeps SentenceTransformer encoding and index search off the FastAPI event
+loop so a slow embedding never stalls SOS, chat websockets or map requests.
+Threads are used rather than processes: PyTorch and FAISS release the GIL
+while computing, and the model is loaded once and shared by every worker.
+
+Features:
+- Bounded queue with backpressure (InferenceOverloadedError when full)
+- Per-call timeouts
+- Queue depth, wait time and run time metrics
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_TIMEOUT = object()
+
+
+class InferenceOverloadedError(RuntimeError):
+    """Raised when the inference queue is full and the call is rejected."""
+
+
+class InferenceExecutor:
+    """Thread pool with a bounded queue, timeouts and metrics."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue: int = 64,
+        timeout_seconds: Optional[float] = 10.0,
+        name: str = "inference"
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(1, max_queue)
+        self.timeout_seconds = timeout_seconds
+        self.name = name
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+
+        # Metrics (guarded by _lock)
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._max_queue_depth = 0
+        self._total_wait_ms = 0.0
+        self._total_run_ms = 0.0
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout: Any = _DEFAULT_TIMEOUT,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Run fn(*args, **kwargs) on the pool and await the result.
+
+        Args:
+            fn: Blocking callable to execute
+            timeout: Seconds to wait (None for no limit, default from config)
+
+        Raises:
+            InferenceOverloadedError: If the queue is full
+            asyncio.TimeoutError: If the call does not finish in time
+        """
+        if timeout is _DEFAULT_TIMEOUT:
+            timeout = self.timeout_seconds
+
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise InferenceOverloadedError(
+                    f"{self.name} queue full ({self._queued} waiting, {self._active} running)"
+                )
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._total_wait_ms += (started_at - submitted_at) * 1000
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._total_run_ms += (time.perf_counter() - started_at) * 1000
+
+        concurrent_future = self._executor.submit(task)
+        future = asyncio.wrap_future(concurrent_future)
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            # Drop the work if it never started; running work cannot be interrupted
+            if concurrent_future.cancel():
+                with self._lock:
+                    self._queued -= 1
+            with self._lock:
+                self._timeouts += 1
+            logger.warning(f"{self.name}: {getattr(fn, '__name__', 'call')} timed out after {timeout}s")
+            raise
+        except Exception:
+            with self._lock:
+                self._failed += 1
+            raise
+
+        with self._lock:
+            self._completed += 1
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool metrics."""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "timeout_seconds": self.timeout_seconds,
+                "queue_depth": self._queued,
+                "active": self._active,
+                "max_queue_depth": self._max_queue_depth,
+                "completed": self._completed,
+                "failed": self._failed,
+                "timeouts": self._timeouts,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait_ms / finished, 2) if finished else 0.0,
+                "avg_run_ms": round(self._total_run_ms / finished, 2) if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = False):
+        """Stop accepting work and release worker threads."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Singleton instance
+_inference_executor: Optional[InferenceExecutor] = None
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """Get the shared inference executor."""
+    global _inference_executor
+    if _inference_executor is None:
+        _inference_executor = InferenceExecutor(
+            max_workers=settings.INFERENCE_MAX_WORKERS,
+            max_queue=settings.INFERENCE_MAX_QUEUE,
+            timeout_seconds=settings.INFERENCE_TIMEOUT_SECONDS,
+            name="inference"
+        )
+    return _inference_executor
+
+
+def shutdown_inference_executor():
+    """Shut down the shared inference executor."""
+    global _inference_executor
+    if _inference_executor is not None:
+        _inference_executor.shutdown()
+        _inference_executor = None
@@ -0,0 +1,564 @@
+"""
+Map Index Service
+In-memory geo aggregates behind /hazards/map-data.
+
+The endpoint used to fetch up to 500 full report documents on every poll
+from every map client and build heatmap points and severity counts in
+Python. Instead, each process keeps a slim point (only the fields the map
+shows) for every report of the last WINDOW_HOURS that is on the map, plus
+precomputed per-zoom grid cells: Web Mercator tiles split into
+CELLS_PER_TILE x CELLS_PER_TILE cells for zoom 0..MAP_CLUSTER_MAX_ZOOM,
+each holding count, coordinate sums and heatmap weight per
+(hour, severity) bucket.
+
+Adding or removing a report updates one cell per zoom level, so the index
+is maintained incrementally: changes are pulled every
+MAP_INDEX_REFRESH_SECONDS by updated_at (with a full reload every
+MAP_INDEX_FULL_RELOAD_SECONDS to catch writes that do not touch
+updated_at), and new reports are added as they are created. A query sums
+the hour buckets of the cells in the requested bbox at the requested zoom;
+windows are aligned to whole hours. Responses are memoized per
+(window, zoom, snapped bbox, filters) until the index changes, so clients
+polling the same view share one computation.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.config import settings
+from app.models.hazard import VerificationStatus
+
+logger = logging.getLogger(__name__)
+
+WINDOW_HOURS = 168
+CELLS_PER_TILE = 4  # ~64px cells on 256px tiles
+MAX_REPORTS = 500
+# Overlap between incremental syncs, absorbs clock skew between API servers
+SYNC_OVERLAP = timedelta(seconds=5)
+MAX_LATITUDE = 85.05112878
+
+SEVERITIES = ("critical", "high", "medium", "low")
+SEVERITY_WEIGHTS = {"critical": 1.0, "high": 0.8, "medium": 0.6, "low": 0.4}
+MAP_STATUSES = [VerificationStatus.VERIFIED.value, VerificationStatus.PENDING.value]
+
+_PROJECTION = {
+    "_id": 0,
+    "report_id": 1,
+    "hazard_type": 1,
+    "severity": 1,
+    "description": 1,
+    "location.latitude": 1,
+    "location.longitude": 1,
+    "location.region": 1,
+    "verification_status": 1,
+    "created_at": 1,
+    "is_deleted": 1,
+    "is_active": 1,
+}
+
+Cell = Tuple[int, int]
+CellRange = Tuple[int, int, int, int]  # x0, x1, y0, y1 (inclusive; x0 > x1 wraps the antimeridian)
+
+
+def _timestamp(value: datetime) -> float:
+    """MongoDB returns naive UTC datetimes unless the client is tz-aware."""
+    return (value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value).timestamp()
+
+
+def _hour(ts: float) -> int:
+    return int(ts // 3600)
+
+
+def tile_cell(lat: float, lon: float, zoom: int) -> Cell:
+    """Grid cell of a coordinate at a zoom level (Web Mercator, CELLS_PER_TILE per tile side)."""
+    n = (2 ** zoom) * CELLS_PER_TILE
+    lat_rad = math.radians(max(-MAX_LATITUDE, min(MAX_LATITUDE, lat)))
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def bbox_cells(bbox: Tuple[float, float, float, float], zoom: int) -> CellRange:
+    """Cell range covering a (west, south, east, north) bbox."""
+    west, south, east, north = bbox
+    x0, y0 = tile_cell(north, west, zoom)
+    x1, y1 = tile_cell(south, east, zoom)
+    return x0, x1, y0, y1
+
+
+def _in_range(cell: Cell, cells: Optional[CellRange]) -> bool:
+    if cells is None:
+        return True
+    x, y = cell
+    x0, x1, y0, y1 = cells
+    in_x = x0 <= x <= x1 if x0 <= x1 else (x >= x0 or x <= x1)
+    return in_x and y0 <= y <= y1
+
+
+@dataclass
+class MapPoint:
+    """The fields of a report that the map shows."""
+    report_id: str
+    hazard_type: Optional[str]
+    severity: str
+    description: str
+    latitude: float
+    longitude: float
+    verification_status: Optional[str]
+    created_at: datetime
+    created_ts: float
+    region: Optional[str]
+
+    @property
+    def weight(self) -> float:
+        return SEVERITY_WEIGHTS.get(self.severity, 0.5)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.report_id,
+            "hazard_type": self.hazard_type,
+            "severity": self.severity,
+            "description": self.description,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "verification_status": self.verification_status,
+            "created_at": self.created_at.isoformat(),
+            "region": self.region,
+        }
+
+
+def point_from_document(doc: Dict[str, Any]) -> Optional[MapPoint]:
+    """Map point for a report, or None if the report is not shown on the map."""
+    if doc.get("is_deleted") is not False or doc.get("is_active") is not True:
+        return None
+    status = getattr(doc.get("verification_status"), "value", doc.get("verification_status"))
+    if status not in MAP_STATUSES or not doc.get("created_at"):
+        return None
+    location = doc.get("location") or {}
+    lat, lon = location.get("latitude"), location.get("longitude")
+    if not lat or not lon:
+        return None
+    return MapPoint(
+        report_id=doc["report_id"],
+        hazard_type=getattr(doc.get("hazard_type"), "value", doc.get("hazard_type")),
+        severity=(doc.get("severity") or "medium").lower(),
+        description=(doc.get("description") or "")[:200],  # Truncate for performance
+        latitude=lat,
+        longitude=lon,
+        verification_status=status,
+        created_at=doc["created_at"],
+        created_ts=_timestamp(doc["created_at"]),
+        region=location.get("region"),
+    )
+
+
+class _Bucket:
+    """Aggregate of the points of one cell, hour and severity."""
+    __slots__ = ("count", "lat_sum", "lon_sum", "weight")
+
+    def __init__(self):
+        self.count = 0
+        self.lat_sum = 0.0
+        self.lon_sum = 0.0
+        self.weight = 0.0
+
+    def add(self, point: MapPoint, sign: int = 1):
+        self.count += sign
+        self.lat_sum += sign * point.latitude
+        self.lon_sum += sign * point.longitude
+        self.weight += sign * point.weight
+
+
+BucketKey = Tuple[int, str]  # (hour, severity)
+
+
+class _Summary:
+    """Sum of the buckets selected by a query."""
+
+    def __init__(self):
+        self.count = 0
+        self.lat_sum = 0.0
+        self.lon_sum = 0.0
+        self.weight = 0.0
+        self.severity_counts = {severity: 0 for severity in SEVERITIES}
+
+    def add(self, buckets: Dict[BucketKey, _Bucket], cutoff_hour: int, allowed: Optional[Set[str]]):
+        for (hour, severity), bucket in buckets.items():
+            if hour < cutoff_hour or (allowed is not None and severity not in allowed):
+                continue
+            self.count += bucket.count
+            self.lat_sum += bucket.lat_sum
+            self.lon_sum += bucket.lon_sum
+            self.weight += bucket.weight
+            if severity in self.severity_counts:
+                self.severity_counts[severity] += bucket.count
+
+
+def _statistics(summary: _Summary, last_update: Optional[datetime]) -> Dict[str, Any]:
+    return {
+        "total_reports": summary.count,
+        "critical_count": summary.severity_counts["critical"],
+        "high_count": summary.severity_counts["high"],
+        "medium_count": summary.severity_counts["medium"],
+        "low_count": summary.severity_counts["low"],
+        "last_update": (last_update or datetime.now(timezone.utc)).isoformat(),
+    }
+
+
+def window_start(hours: int) -> datetime:
+    """Start of an hour-aligned window covering at least the last `hours` hours."""
+    cutoff_hour = _hour(time.time()) - hours
+    return datetime.fromtimestamp(cutoff_hour * 3600, tz=timezone.utc)
+
+
+def allowed_severities(min_severity: Optional[str]) -> Optional[Set[str]]:
+    """
+    Severities at or above a minimum.
+
+    Raises:
+        ValueError: Unknown severity
+    """
+    if not min_severity:
+        return None
+    min_severity = min_severity.lower()
+    if min_severity not in SEVERITIES:
+        raise ValueError(f"min_severity must be one of {', '.join(SEVERITIES)}")
+    return set(SEVERITIES[:SEVERITIES.index(min_severity) + 1])
+
+
+class MapIndex:
+    """Incrementally maintained map points and per-zoom cluster cells."""
+
+    def __init__(self, max_zoom: int = 15, response_cache_size: int = 512):
+        """
+        Args:
+            max_zoom: Highest zoom with precomputed cells; above it reports are returned individually
+            response_cache_size: Memoized responses kept
+        """
+        self.max_zoom = max_zoom
+        self.response_cache_size = response_cache_size
+        self._reset()
+
+        self._lock = asyncio.Lock()
+        self._loaded_at = 0.0
+        self._refreshed_at = 0.0
+        self._synced_to: Optional[datetime] = None
+        self._last_update: Optional[datetime] = None
+        self._responses: "OrderedDict[tuple, Tuple[int, Dict[str, Any]]]" = OrderedDict()
+
+        self._full_loads = 0
+        self._incremental_syncs = 0
+        self._docs_synced = 0
+        self._queries = 0
+        self._response_hits = 0
+
+    def _reset(self):
+        self.points: Dict[str, MapPoint] = {}
+        self._by_hour: Dict[int, Set[str]] = {}
+        self._totals: Dict[BucketKey, _Bucket] = {}
+        self._cells: List[Dict[Cell, Dict[BucketKey, _Bucket]]] = [{} for _ in range(self.max_zoom + 1)]
+        self._cell_ids: List[Dict[Cell, Set[str]]] = [{} for _ in range(self.max_zoom + 1)]
+        self._version = getattr(self, "_version", 0) + 1
+
+    # -------------------------------------------------------------------------
+    # Maintenance
+    # -------------------------------------------------------------------------
+
+    def _apply(self, point: MapPoint, sign: int):
+        hour = _hour(point.created_ts)
+        key = (hour, point.severity)
+        buckets = [self._totals]
+        for zoom in range(self.max_zoom + 1):
+            cell = tile_cell(point.latitude, point.longitude, zoom)
+            buckets.append(self._cells[zoom].setdefault(cell, {}))
+            ids = self._cell_ids[zoom].setdefault(cell, set())
+            if sign > 0:
+                ids.add(point.report_id)
+            else:
+                ids.discard(point.report_id)
+                if not ids:
+                    del self._cell_ids[zoom][cell]
+                    del self._cells[zoom][cell]
+                    buckets.pop()
+
+        for cell_buckets in buckets:
+            bucket = cell_buckets.setdefault(key, _Bucket())
+            bucket.add(point, sign)
+            if bucket.count <= 0:
+                del cell_buckets[key]
+
+        hour_ids = self._by_hour.setdefault(hour, set())
+        if sign > 0:
+            hour_ids.add(point.report_id)
+        else:
+            hour_ids.discard(point.report_id)
+            if not hour_ids:
+                del self._by_hour[hour]
+
+    def _remove(self, report_id: str) -> bool:
+        point = self.points.pop(report_id, None)
+        if point is None:
+            return False
+        self._apply(point, -1)
+        return True
+
+    def upsert(self, doc: Dict[str, Any]) -> bool:
+        """
+        Add, move or drop a report after it changed.
+
+        Returns:
+            True if the index changed
+        """
+        report_id = doc.get("report_id")
+        if not report_id:
+            return False
+        changed = self._remove(report_id)
+        point = point_from_document(doc)
+        if point is not None and _hour(point.created_ts) >= _hour(time.time()) - WINDOW_HOURS:
+            self.points[report_id] = point
+            self._apply(point, 1)
+            changed = True
+        if changed:
+            self._version += 1
+        return changed
+
+    def _prune(self):
+        """Drop hours that left the longest window."""
+        cutoff_hour = _hour(time.time()) - WINDOW_HOURS
+        expired = [hour for hour in self._by_hour if hour < cutoff_hour]
+        for hour in expired:
+            for report_id in list(self._by_hour.get(hour, ())):
+                self._remove(report_id)
+        if expired:
+            self._version += 1
+
+    async def sync(self, db: AsyncIOMotorDatabase):
+        """Bring the index up to date if the refresh interval has passed (single-flight)."""
+        if time.monotonic() - self._refreshed_at < settings.MAP_INDEX_REFRESH_SECONDS:
+            return
+        async with self._lock:
+            if time.monotonic() - self._refreshed_at < settings.MAP_INDEX_REFRESH_SECONDS:
+                return
+            try:
+                if self._synced_to is None or time.monotonic() - self._loaded_at >= settings.MAP_INDEX_FULL_RELOAD_SECONDS:
+                    await self._load(db)
+                else:
+                    await self._sync_changes(db)
+            except Exception as e:
+                if self._synced_to is None:
+                    raise
+                logger.warning(f"Map index sync failed, serving previous data: {e}")
+            finally:
+                self._refreshed_at = time.monotonic()
+            self._prune()
+
+    async def _load(self, db: AsyncIOMotorDatabase):
+        started = datetime.now(timezone.utc)
+        cursor = db.hazard_reports.find(
+            {
+                "is_deleted": False,
+                "is_active": True,
+                "created_at": {"$gte": window_start(WINDOW_HOURS)},
+                "verification_status": {"$in": MAP_STATUSES},
+            },
+            _PROJECTION
+        )
+        docs = await cursor.to_list(length=None)
+
+        self._reset()
+        for doc in docs:
+            point = point_from_document(doc)
+            if point is not None:
+                self.points[point.report_id] = point
+                self._apply(point, 1)
+
+        self._synced_to = started - SYNC_OVERLAP
+        self._last_update = started
+        self._loaded_at = time.monotonic()
+        self._full_loads += 1
+        logger.info(f"Map index loaded: {len(self.points)} reports")
+
+    async def _sync_changes(self, db: AsyncIOMotorDatabase):
+        started = datetime.now(timezone.utc)
+        cursor = db.hazard_reports.find({"updated_at": {"$gte": self._synced_to}}, _PROJECTION)
+        docs = await cursor.to_list(length=None)
+        for doc in docs:
+            self.upsert(doc)
+        self._synced_to = started - SYNC_OVERLAP
+        self._last_update = started
+        self._incremental_syncs += 1
+        self._docs_synced += len(docs)
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def query(
+        self,
+        hours: int,
+        zoom: Optional[int] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        min_severity: Optional[str] = None,
+        include_heatmap: bool = True,
+        include_reports: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Map data for a time window and viewport.
+
+        Without a zoom the response keeps the original shape: the most
+        recent reports and one heatmap point per report. With a zoom at or
+        below max_zoom, reports are clustered by grid cell and the heatmap
+        has one weighted point per cell; single-report cells are returned
+        as reports.
+
+        Args:
+            hours: Window length (aligned to whole hours)
+            zoom: Map zoom level
+            bbox: (west, south, east, north) viewport
+            min_severity: Lowest severity to include
+
+        Returns:
+            reports, clusters, heatmap_points and statistics
+
+        Raises:
+            ValueError: Unknown min_severity
+        """
+        allowed = allowed_severities(min_severity)
+        cutoff_hour = _hour(time.time()) - hours
+        cell_zoom = self.max_zoom if zoom is None else min(zoom, self.max_zoom)
+        cells = bbox_cells(bbox, cell_zoom) if bbox else None
+        clustered = zoom is not None and zoom <= self.max_zoom
+
+        self._queries += 1
+        key = (cutoff_hour, zoom if clustered else None, clustered, cells,
+               tuple(sorted(allowed)) if allowed else None, include_heatmap, include_reports)
+        cached = self._responses.get(key)
+        if cached is not None and cached[0] == self._version:
+            self._response_hits += 1
+            self._responses.move_to_end(key)
+            return cached[1]
+
+        if clustered:
+            data = self._clustered(cell_zoom, cells, cutoff_hour, allowed, include_heatmap, include_reports)
+        else:
+            data = self._points(cell_zoom, cells, cutoff_hour, allowed, include_heatmap, include_reports)
+
+        self._responses[key] = (self._version, data)
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.response_cache_size:
+            self._responses.popitem(last=False)
+        return data
+
+    def _clustered(self, zoom, cells, cutoff_hour, allowed, include_heatmap, include_reports) -> Dict[str, Any]:
+        total = _Summary()
+        clusters = []
+        reports = []
+        heatmap = []
+        for cell, buckets in self._cells[zoom].items():
+            if not _in_range(cell, cells):
+                continue
+            summary = _Summary()
+            summary.add(buckets, cutoff_hour, allowed)
+            if summary.count <= 0:
+                continue
+            total.add(buckets, cutoff_hour, allowed)
+
+            latitude = summary.lat_sum / summary.count
+            longitude = summary.lon_sum / summary.count
+            if include_heatmap:
+                heatmap.append([round(latitude, 6), round(longitude, 6), round(summary.weight, 3)])
+            if summary.count == 1:
+                if include_reports:
+                    reports.extend(
+                        self.points[report_id].to_dict()
+                        for report_id in self._cell_ids[zoom][cell]
+                        if self._selected(self.points[report_id], cutoff_hour, allowed)
+                    )
+            else:
+                clusters.append({
+                    "cell": f"{zoom}/{cell[0]}/{cell[1]}",
+                    "latitude": round(latitude, 6),
+                    "longitude": round(longitude, 6),
+                    "count": summary.count,
+                    "severity_counts": summary.severity_counts,
+                })
+
+        return {
+            "reports": reports,
+            "clusters": clusters,
+            "heatmap_points": heatmap,
+            "statistics": _statistics(total, self._last_update),
+        }
+
+    def _points(self, zoom, cells, cutoff_hour, allowed, include_heatmap, include_reports) -> Dict[str, Any]:
+        if cells is None:
+            total = _Summary()
+            total.add(self._totals, cutoff_hour, allowed)
+            selected = [
+                point for hour, ids in self._by_hour.items() if hour >= cutoff_hour
+                for point in (self.points[report_id] for report_id in ids)
+                if allowed is None or point.severity in allowed
+            ]
+        else:
+            total = _Summary()
+            selected = []
+            for cell, ids in self._cell_ids[zoom].items():
+                if not _in_range(cell, cells):
+                    continue
+                total.add(self._cells[zoom][cell], cutoff_hour, allowed)
+                selected.extend(
+                    self.points[report_id] for report_id in ids
+                    if self._selected(self.points[report_id], cutoff_hour, allowed)
+                )
+
+        selected.sort(key=lambda point: point.created_ts, reverse=True)
+        selected = selected[:MAX_REPORTS]
+        return {
+            "reports": [point.to_dict() for point in selected] if include_reports else [],
+            "clusters": [],
+            "heatmap_points": [
+                [point.latitude, point.longitude, point.weight] for point in selected
+            ] if include_heatmap else [],
+            "statistics": _statistics(total, self._last_update),
+        }
+
+    @staticmethod
+    def _selected(point: MapPoint, cutoff_hour: int, allowed: Optional[Set[str]]) -> bool:
+        return _hour(point.created_ts) >= cutoff_hour and (allowed is None or point.severity in allowed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size and sync/cache counters."""
+        return {
+            "reports": len(self.points),
+            "cells": sum(len(cells) for cells in self._cells),
+            "version": self._version,
+            "full_loads": self._full_loads,
+            "incremental_syncs": self._incremental_syncs,
+            "docs_synced": self._docs_synced,
+            "queries": self._queries,
+            "response_hits": self._response_hits,
+            "last_update": self._last_update.isoformat() if self._last_update else None,
+        }
+
+
+# Singleton instance
+_map_index: Optional[MapIndex] = None
+
+
+def get_map_index() -> MapIndex:
+    """Get or create the map index."""
+    global _map_index
+    if _map_index is None:
+        _map_index = MapIndex(
+            max_zoom=settings.MAP_CLUSTER_MAX_ZOOM,
+            response_cache_size=settings.MAP_RESPONSE_CACHE_SIZE
+        )
+    return _map_index
@@ -32,6 +32,9 @@ from app.models.monitoring import (
     CycloneCategory,
     BeachFlag
 )
+from app.config import settings
+from app.services.response_cache import TAG_MONITORING, invalidate_responses
+from app.utils.geo import haversine_km, within_radius
 
 logger = logging.getLogger(__name__)
 
@@ -171,11 +174,12 @@ class MLMonitorService:
             self.is_running = True
             logger.info("Starting hazard detection cycle...")
 
-            # Step 1: Run ML model for all locations
-            all_hazards, all_weather, all_marine = await self._run_ml_model()
-
-            # Step 2: Fetch recent earthquake data
-            earthquakes = await self._fetch_earthquake_data()
+            # Step 1 & 2: Run ML model for all locations while fetching
+            # recent earthquake data
+            (all_hazards, all_weather, all_marine), earthquakes = await asyncio.gather(
+                self._run_ml_model(),
+                self._fetch_earthquake_data()
+            )
 
             # Step 3: Build monitoring locations with hazard data
             locations_dict = {}
@@ -228,6 +232,7 @@ class MLMonitorService:
             )
 
             self.last_update = datetime.now(timezone.utc)
+            await invalidate_responses(TAG_MONITORING)
             logger.info(f"Detection cycle completed successfully. Found {summary.critical_alerts} critical alerts.")
 
             return True
@@ -243,7 +248,9 @@ class MLMonitorService:
         Run ML model for hazard detection with real-time weather and tide data.
 
         This function fetches weather/marine data for each location and
-        generates hazard predictions using the ML model.
+        generates hazard predictions using the ML model. Locations run
+        concurrently (MULTIHAZARD_MAX_CONCURRENCY at a time), each within
+        MULTIHAZARD_LOCATION_TIMEOUT_SECONDS.
 
         Returns:
             Tuple of (hazards_dict, weather_dict, marine_dict) mapping location_id to data
@@ -253,44 +260,56 @@ class MLMonitorService:
         # Import weather service
         from app.services.weather_service import weather_service
 
-        hazards_by_location = {}
-        weather_by_location = {}
-        marine_by_location = {}
-
-        for loc_id, loc_config in self.locations_config.items():
-            try:
-                # Get coordinates for this location
-                lat = loc_config["coordinates"]["lat"]
-                lon = loc_config["coordinates"]["lon"]
+        semaphore = asyncio.Semaphore(max(1, settings.MULTIHAZARD_MAX_CONCURRENCY))
+        timeout = settings.MULTIHAZARD_LOCATION_TIMEOUT_SECONDS
 
-                # Fetch real-time weather data
-                weather_data = await weather_service.fetch_current_weather(lat, lon)
-                weather_by_location[loc_id] = weather_data
+        async def run_location(loc_id: str, loc_config: Dict) -> tuple:
+            # Get coordinates for this location
+            lat = loc_config["coordinates"]["lat"]
+            lon = loc_config["coordinates"]["lon"]
 
-                # Fetch marine/tide data for coastal analysis
-                marine_data = await weather_service.fetch_marine_data(lat, lon)
-                marine_by_location[loc_id] = marine_data
+            # Fetch real-time weather and marine/tide data together
+            weather_data, marine_data = await asyncio.gather(
+                weather_service.fetch_current_weather(lat, lon),
+                weather_service.fetch_marine_data(lat, lon)
+            )
 
-                # Get recent earthquakes near this location
-                nearby_earthquakes = self._get_nearby_earthquakes(lat, lon, radius_km=500)
+            # Get recent earthquakes near this location
+            nearby_earthquakes = self._get_nearby_earthquakes(lat, lon, radius_km=500)
 
-                # Run ML prediction model
-                hazards = await self._generate_predictions(
-                    location_id=loc_id,
-                    location_config=loc_config,
-                    weather=weather_data,
-                    marine=marine_data,
-                    earthquakes=nearby_earthquakes
-                )
+            # Run ML prediction model
+            hazards = await self._generate_predictions(
+                location_id=loc_id,
+                location_config=loc_config,
+                weather=weather_data,
+                marine=marine_data,
+                earthquakes=nearby_earthquakes
+            )
+            return hazards, weather_data, marine_data
+
+        async def run_bounded(loc_id: str, loc_config: Dict) -> tuple:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(run_location(loc_id, loc_config), timeout)
+                except asyncio.TimeoutError:
+                    logger.error(f"ML model timed out for {loc_id} after {timeout:g}s")
+                except Exception as e:
+                    logger.error(f"Error running ML model for {loc_id}: {e}")
+                # Return empty hazards for this location if error occurs
+                return {}, None, None
 
-                hazards_by_location[loc_id] = hazards
+        location_ids = list(self.locations_config.keys())
+        results = await asyncio.gather(*[
+            run_bounded(loc_id, self.locations_config[loc_id]) for loc_id in location_ids
+        ])
 
-            except Exception as e:
-                logger.error(f"Error running ML model for {loc_id}: {e}")
-                # Return empty hazards for this location if error occurs
-                hazards_by_location[loc_id] = {}
-                weather_by_location[loc_id] = None
-                marine_by_location[loc_id] = None
+        hazards_by_location = {}
+        weather_by_location = {}
+        marine_by_location = {}
+        for loc_id, (hazards, weather_data, marine_data) in zip(location_ids, results):
+            hazards_by_location[loc_id] = hazards
+            weather_by_location[loc_id] = weather_data
+            marine_by_location[loc_id] = marine_data
 
         return hazards_by_location, weather_by_location, marine_by_location
 
@@ -337,16 +356,15 @@ class MLMonitorService:
         if not self.current_data or not self.current_data.recent_earthquakes:
             return []
 
-        nearby = []
-        for eq in self.current_data.recent_earthquakes:
-            distance = self._calculate_distance(
-                lat, lon,
-                eq.coordinates.lat, eq.coordinates.lon
-            )
-            if distance <= radius_km:
-                nearby.append(eq)
-
-        return nearby
+        earthquakes = self.current_data.recent_earthquakes
+        indices, _ = within_radius(
+            lat, lon,
+            [eq.coordinates.lat for eq in earthquakes],
+            [eq.coordinates.lon for eq in earthquakes],
+            radius_km
+        )
+        # Keep feed order
+        return [earthquakes[i] for i in sorted(indices)]
 
     def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """
@@ -359,19 +377,7 @@ class MLMonitorService:
         Returns:
             Distance in kilometers
         """
-        from math import radians, sin, cos, sqrt, atan2
-
-        R = 6371  # Earth's radius in kilometers
-
-        lat1_rad = radians(lat1)
-        lat2_rad = radians(lat2)
-        delta_lat = radians(lat2 - lat1)
-        delta_lon = radians(lon2 - lon1)
-
-        a = sin(delta_lat / 2) ** 2 + cos(lat1_rad) * cos(lat2_rad) * sin(delta_lon / 2) ** 2
-        c = 2 * atan2(sqrt(a), sqrt(1 - a))
-
-        return R * c
+        return haversine_km(lat1, lon1, lat2, lon2)
 
     async def _generate_predictions(
         self,
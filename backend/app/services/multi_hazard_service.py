@@ -6,10 +6,12 @@ Implements 5 hazard detectors: Tsunami, Cyclone, High Waves, Coastal Flood, Rip
 
 import asyncio
 import logging
+import time
 import uuid
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any
 import httpx
+import numpy as np
 
 from app.config import settings
 from app.models.multi_hazard import (
@@ -19,9 +21,20 @@ from app.models.multi_hazard import (
     MultiHazardSummary, MultiHazardResponse, DetectionCycleResult,
     HazardThresholds
 )
+from app.services.response_cache import TAG_MULTI_HAZARD, invalidate_responses
+from app.services.weather_cache import Codec, get_weather_cache
+from app.utils.geo import distance_matrix_km, distances_km, haversine_km
 
 logger = logging.getLogger(__name__)
 
+_FORECAST_CODEC = Codec(
+    lambda result: [params.model_dump(mode="json") if params else None for params in result],
+    lambda data: (
+        WeatherParams.model_validate(data[0]) if data[0] else None,
+        MarineParams.model_validate(data[1]) if data[1] else None,
+    )
+)
+
 
 class MultiHazardService:
     """
@@ -396,6 +409,8 @@ class MultiHazardService:
 
         # Recent earthquakes cache
         self.recent_earthquakes: List[EarthquakeData] = []
+        # Distances (km) from each monitored location to each recent earthquake
+        self._earthquake_distances: Dict[str, np.ndarray] = {}
 
         # Detection cycle tracking
         self.last_detection_cycle: Optional[datetime] = None
@@ -499,60 +514,81 @@ class MultiHazardService:
         Run a complete detection cycle for all or specified locations.
 
         This:
-        1. Fetches weather/marine data for each location
-        2. Fetches recent earthquake data
-        3. Runs all 5 hazard detectors
+        1. Fetches recent earthquake data (shared across all locations)
+        2. Fetches weather/marine data for each location, up to
+           MULTIHAZARD_MAX_CONCURRENCY at a time
+        3. Runs all 5 hazard detectors once a location's data is in
         4. Updates alerts and status
+
+        Each location has MULTIHAZARD_LOCATION_TIMEOUT_SECONDS; locations that
+        fail or time out are reported in errors while the rest are updated.
         """
-        import time
         start_time = time.time()
         errors = []
-        alerts_generated = 0
+        stage_timings: Dict[str, float] = {}
+        location_timings: Dict[str, Dict[str, float]] = {}
 
         locations_to_process = location_ids or list(self.MONITORED_LOCATIONS.keys())
+        known = [loc_id for loc_id in locations_to_process if loc_id in self.MONITORED_LOCATIONS]
+        errors.extend(
+            f"Unknown location: {loc_id}"
+            for loc_id in locations_to_process if loc_id not in self.MONITORED_LOCATIONS
+        )
 
-        try:
-            # Fetch earthquake data first (shared across all locations)
+        async def fetch_earthquakes():
+            stage_start = time.perf_counter()
             await self._fetch_earthquake_data()
+            stage_timings["earthquake_fetch"] = (time.perf_counter() - stage_start) * 1000
 
-            # Process each location
-            for loc_id in locations_to_process:
-                if loc_id not in self.MONITORED_LOCATIONS:
-                    errors.append(f"Unknown location: {loc_id}")
-                    continue
-
-                try:
-                    location = self.MONITORED_LOCATIONS[loc_id]
-
-                    # Fetch weather and marine data
-                    weather, marine = await self._fetch_weather_data(location)
-
-                    # Run all detectors
-                    new_alerts = await self._detect_hazards(
-                        location, weather, marine
+        earthquakes = asyncio.create_task(fetch_earthquakes())
+        try:
+            semaphore = asyncio.Semaphore(max(1, settings.MULTIHAZARD_MAX_CONCURRENCY))
+            timeout = settings.MULTIHAZARD_LOCATION_TIMEOUT_SECONDS
+
+            stage_start = time.perf_counter()
+            results = await asyncio.gather(
+                *[
+                    self._process_location(
+                        loc_id, earthquakes, semaphore, timeout,
+                        location_timings.setdefault(loc_id, {})
                     )
-
-                    # Update alerts
-                    alerts_generated += len(new_alerts)
-                    self._update_location_alerts(loc_id, new_alerts, weather, marine)
-
-                except Exception as e:
-                    errors.append(f"{loc_id}: {str(e)}")
-                    logger.error(f"Detection error for {loc_id}: {e}")
+                    for loc_id in known
+                ],
+                return_exceptions=True
+            )
+            await earthquakes
+            stage_timings["locations"] = (time.perf_counter() - stage_start) * 1000
+
+            alerts_generated = 0
+            processed = 0
+            for loc_id, result in zip(known, results):
+                if isinstance(result, asyncio.TimeoutError):
+                    errors.append(f"{loc_id}: timed out after {timeout:g}s")
+                    logger.error(f"Detection timed out for {loc_id}")
+                elif isinstance(result, Exception):
+                    errors.append(f"{loc_id}: {str(result)}")
+                    logger.error(f"Detection error for {loc_id}: {result}")
+                else:
+                    alerts_generated += result
+                    processed += 1
 
             self.last_detection_cycle = datetime.now(timezone.utc)
             processing_time = (time.time() - start_time) * 1000
+            await invalidate_responses(TAG_MULTI_HAZARD)
 
             logger.info(
-                f"Detection cycle complete: {len(locations_to_process)} locations, "
+                f"Detection cycle complete: {processed}/{len(known)} locations, "
                 f"{alerts_generated} alerts, {processing_time:.0f}ms"
             )
 
             return DetectionCycleResult(
                 success=len(errors) == 0,
                 alerts_generated=alerts_generated,
-                locations_processed=len(locations_to_process),
+                locations_processed=processed,
+                locations_failed=len(known) - processed,
                 processing_time_ms=processing_time,
+                stage_timings_ms=stage_timings,
+                location_timings_ms=location_timings,
                 errors=errors
             )
 
@@ -562,10 +598,55 @@ class MultiHazardService:
                 success=False,
                 alerts_generated=0,
                 locations_processed=0,
+                locations_failed=len(known),
                 processing_time_ms=(time.time() - start_time) * 1000,
+                stage_timings_ms=stage_timings,
                 errors=[str(e)]
             )
 
+        finally:
+            if not earthquakes.done():
+                earthquakes.cancel()
+
+    async def _process_location(
+        self,
+        loc_id: str,
+        earthquakes: asyncio.Task,
+        semaphore: asyncio.Semaphore,
+        timeout: float,
+        timings: Dict[str, float]
+    ) -> int:
+        """Run detection for one location within its timeout; returns the number of new alerts."""
+        async with semaphore:
+            return await asyncio.wait_for(
+                self._detect_location(loc_id, earthquakes, timings), timeout
+            )
+
+    async def _detect_location(
+        self,
+        loc_id: str,
+        earthquakes: asyncio.Task,
+        timings: Dict[str, float]
+    ) -> int:
+        """Fetch data, run all detectors and update alerts for one location."""
+        location = self.MONITORED_LOCATIONS[loc_id]
+
+        stage_start = time.perf_counter()
+        weather, marine = await self._fetch_weather_data(location)
+        timings["weather_fetch"] = (time.perf_counter() - stage_start) * 1000
+
+        # Tsunami detection needs this cycle's earthquakes; the fetch is shared
+        stage_start = time.perf_counter()
+        await asyncio.shield(earthquakes)
+        timings["earthquake_wait"] = (time.perf_counter() - stage_start) * 1000
+
+        stage_start = time.perf_counter()
+        new_alerts = await self._detect_hazards(location, weather, marine)
+        self._update_location_alerts(loc_id, new_alerts, weather, marine)
+        timings["detection"] = (time.perf_counter() - stage_start) * 1000
+
+        return len(new_alerts)
+
     # =========================================================================
     # Data Fetching
     # =========================================================================
@@ -574,7 +655,21 @@ class MultiHazardService:
         self,
         location: MonitoredLocation
     ) -> tuple[Optional[WeatherParams], Optional[MarineParams]]:
-        """Fetch weather and marine data from WeatherAPI."""
+        """Fetch weather and marine data from WeatherAPI (via the shared weather cache)."""
+        return await get_weather_cache().get_or_fetch(
+            "multihazard:forecast",
+            location.coordinates.lat,
+            location.coordinates.lon,
+            lambda: self._request_weather_data(location),
+            codec=_FORECAST_CODEC,
+            cacheable=lambda result: result[0] is not None
+        )
+
+    async def _request_weather_data(
+        self,
+        location: MonitoredLocation
+    ) -> tuple[Optional[WeatherParams], Optional[MarineParams]]:
+        """Request the WeatherAPI forecast for a monitored location."""
         try:
             url = "http://api.weatherapi.com/v1/forecast.json"
             params = {
@@ -661,11 +756,34 @@ class MultiHazardService:
 
                 self.recent_earthquakes.append(earthquake)
 
+            self._update_earthquake_distances()
             logger.debug(f"Fetched {len(self.recent_earthquakes)} recent earthquakes")
 
         except Exception as e:
             logger.warning(f"Failed to fetch earthquake data: {e}")
 
+    def _update_earthquake_distances(self):
+        """Compute the location x earthquake distance matrix once per fetch."""
+        location_ids = list(self.MONITORED_LOCATIONS.keys())
+        locations = [self.MONITORED_LOCATIONS[loc_id].coordinates for loc_id in location_ids]
+        matrix = distance_matrix_km(
+            [c.lat for c in locations], [c.lon for c in locations],
+            [eq.coordinates.lat for eq in self.recent_earthquakes],
+            [eq.coordinates.lon for eq in self.recent_earthquakes]
+        )
+        self._earthquake_distances = dict(zip(location_ids, matrix))
+
+    def _distances_to_earthquakes(self, location: MonitoredLocation) -> np.ndarray:
+        """Distances from a location to each of recent_earthquakes."""
+        distances = self._earthquake_distances.get(location.location_id)
+        if distances is None or len(distances) != len(self.recent_earthquakes):
+            distances = distances_km(
+                location.coordinates.lat, location.coordinates.lon,
+                [eq.coordinates.lat for eq in self.recent_earthquakes],
+                [eq.coordinates.lon for eq in self.recent_earthquakes]
+            )
+        return distances
+
     def _is_oceanic_location(self, lat: float, lon: float) -> bool:
         """Check if coordinates are in oceanic region near India."""
         # Indian Ocean / Bay of Bengal / Arabian Sea approximate bounds
@@ -726,18 +844,15 @@ class MultiHazardService:
         - Oceanic location
         """
         thresholds = self.THRESHOLDS.tsunami
+        distances = self._distances_to_earthquakes(location)
 
-        for eq in self.recent_earthquakes:
+        for eq, distance in zip(self.recent_earthquakes, distances):
             # Check if earthquake meets tsunami criteria
             if (eq.magnitude >= thresholds["earthquake_magnitude"] and
                 eq.depth_km <= thresholds["earthquake_depth_km"] and
                 (not thresholds["oceanic_only"] or eq.is_oceanic)):
 
-                # Calculate distance to location
-                distance = self._calculate_distance(
-                    eq.coordinates.lat, eq.coordinates.lon,
-                    location.coordinates.lat, location.coordinates.lon
-                )
+                distance = float(distance)
 
                 # Only alert if within 3000km
                 if distance > 3000:
@@ -1373,18 +1488,7 @@ class MultiHazardService:
         lat2: float, lon2: float
     ) -> float:
         """Calculate distance between two points in km (Haversine formula)."""
-        from math import radians, sin, cos, sqrt, atan2
-
-        R = 6371  # Earth's radius in km
-
-        lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-
-        a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-
-        return R * c
+        return haversine_km(lat1, lon1, lat2, lon2)
 
     # =========================================================================
     # Public API Methods
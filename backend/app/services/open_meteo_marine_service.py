@@ -8,7 +8,9 @@ import httpx
 import logging
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+
+from app.services.weather_cache import Codec, get_weather_cache
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +71,18 @@ class WeatherConditions:
     source: str = "Open-Meteo API"
 
 
+def _conditions_codec(cls) -> Codec:
+    """Redis codec for a conditions dataclass (timestamp as ISO 8601)."""
+    return Codec(
+        lambda c: {**asdict(c), "timestamp": c.timestamp.isoformat()},
+        lambda d: cls(**{**d, "timestamp": datetime.fromisoformat(d["timestamp"])})
+    )
+
+
+_MARINE_CODEC = _conditions_codec(MarineConditions)
+_WEATHER_CODEC = _conditions_codec(WeatherConditions)
+
+
 class OpenMeteoMarineService:
     """
     Service for fetching marine and weather data from Open-Meteo APIs.
@@ -83,32 +97,7 @@ class OpenMeteoMarineService:
 
     def __init__(self):
         self._last_request_time = None
-        self._cache = {}
-        self._cache_ttl = 300  # 5 minutes
-
-    def _get_cache_key(self, lat: float, lon: float, data_type: str) -> str:
-        """Generate cache key"""
-        return f"{data_type}:{lat:.2f}:{lon:.2f}"
-
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cache is still valid"""
-        if cache_key not in self._cache:
-            return False
-
-        data, timestamp = self._cache[cache_key]
-        age = (datetime.now(timezone.utc) - timestamp).total_seconds()
-        return age < self._cache_ttl
-
-    def _get_from_cache(self, cache_key: str) -> Optional[Any]:
-        """Get data from cache"""
-        if self._is_cache_valid(cache_key):
-            data, _ = self._cache[cache_key]
-            return data
-        return None
-
-    def _save_to_cache(self, cache_key: str, data: Any):
-        """Save to cache"""
-        self._cache[cache_key] = (data, datetime.now(timezone.utc))
+        self._cache = get_weather_cache()
 
     async def get_marine_conditions(
         self,
@@ -127,14 +116,17 @@ class OpenMeteoMarineService:
         Returns:
             MarineConditions object or None if failed
         """
-        cache_key = self._get_cache_key(latitude, longitude, "marine")
-
-        if use_cache:
-            cached = self._get_from_cache(cache_key)
-            if cached:
-                logger.debug(f"Cache hit for marine data at {latitude}, {longitude}")
-                return cached
-
+        return await self._cache.get_or_fetch(
+            "open_meteo:marine",
+            latitude,
+            longitude,
+            lambda: self._fetch_marine_conditions(latitude, longitude),
+            codec=_MARINE_CODEC,
+            refresh=not use_cache
+        )
+
+    async def _fetch_marine_conditions(self, latitude: float, longitude: float) -> Optional[MarineConditions]:
+        """Request current marine conditions from Open-Meteo."""
         try:
             params = {
                 "latitude": latitude,
@@ -179,7 +171,6 @@ class OpenMeteoMarineService:
                 ocean_current_direction=current.get("ocean_current_direction"),
             )
 
-            self._save_to_cache(cache_key, conditions)
             logger.info(f"Fetched marine data for {latitude}, {longitude}: wave={conditions.wave_height}m")
 
             return conditions
@@ -208,14 +199,17 @@ class OpenMeteoMarineService:
         Returns:
             WeatherConditions object or None if failed
         """
-        cache_key = self._get_cache_key(latitude, longitude, "weather")
-
-        if use_cache:
-            cached = self._get_from_cache(cache_key)
-            if cached:
-                logger.debug(f"Cache hit for weather data at {latitude}, {longitude}")
-                return cached
-
+        return await self._cache.get_or_fetch(
+            "open_meteo:weather",
+            latitude,
+            longitude,
+            lambda: self._fetch_weather_conditions(latitude, longitude),
+            codec=_WEATHER_CODEC,
+            refresh=not use_cache
+        )
+
+    async def _fetch_weather_conditions(self, latitude: float, longitude: float) -> Optional[WeatherConditions]:
+        """Request current weather conditions from Open-Meteo."""
         try:
             params = {
                 "latitude": latitude,
@@ -258,7 +252,6 @@ class OpenMeteoMarineService:
                 precipitation=current.get("precipitation"),
             )
 
-            self._save_to_cache(cache_key, conditions)
             logger.info(f"Fetched weather data for {latitude}, {longitude}: wind={wind_speed_kts:.1f}kts" if wind_speed_kts else f"Fetched weather data for {latitude}, {longitude}")
 
             return conditions
@@ -23,6 +23,7 @@ from app.models.community import (
 from app.models.user import User
 from app.models.rbac import UserRole
 from app.services.email import EmailService
+from app.services.principal_cache import invalidate_principal
 
 logger = logging.getLogger(__name__)
 
@@ -358,6 +359,7 @@ class OrganizerService:
                     }
                 }
             )
+            await invalidate_principal(application.user_id)
 
             # Get updated application
             updated_doc = await self.db.organizer_applications.find_one({"application_id": application_id})
@@ -6,11 +6,11 @@ Rule-based alert engine using IMD standards for maritime safety
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from math import radians, sin, cos, sqrt, atan2
 from pydantic import BaseModel
 from enum import Enum
 
 from app.database import MongoDB
+from app.utils.geo import EARTH_RADIUS_KM, haversine_km
 
 logger = logging.getLogger(__name__)
 
@@ -160,17 +160,7 @@ class PredictiveAlertService:
         self, lat1: float, lon1: float, lat2: float, lon2: float
     ) -> float:
         """Calculate distance between two points in km using Haversine formula"""
-        R = 6371  # Earth's radius in km
-
-        lat1_rad = radians(lat1)
-        lat2_rad = radians(lat2)
-        delta_lat = radians(lat2 - lat1)
-        delta_lon = radians(lon2 - lon1)
-
-        a = sin(delta_lat / 2) ** 2 + cos(lat1_rad) * cos(lat2_rad) * sin(delta_lon / 2) ** 2
-        c = 2 * atan2(sqrt(a), sqrt(1 - a))
-
-        return R * c
+        return haversine_km(lat1, lon1, lat2, lon2)
 
     def _get_severity_for_wave(self, wave_height: float) -> AlertSeverity:
         """Determine severity based on wave height"""
@@ -670,7 +660,7 @@ class PredictiveAlertService:
                     "$geoWithin": {
                         "$centerSphere": [
                             [longitude, latitude],
-                            radius_km / 6371  # Convert km to radians
+                            radius_km / EARTH_RADIUS_KM  # Convert km to radians
                         ]
                     }
                 }
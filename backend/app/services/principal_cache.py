@@ -0,0 +1,229 @@
+"""
+Principal Cache
+Short-lived cache of authenticated users for get_current_user, so an API call
+from a logged-in user does not cost a users lookup and a User.from_mongo.
+
+Entries are keyed by user id and the user's cache version. Write paths that
+change who a user is or what they may do (ban/unban, role or status changes,
+profile edits, password changes, logout) call invalidate(), which drops the
+local entry and bumps the version in Redis so other workers refetch the user.
+Counters updated elsewhere (credibility, report totals) are refreshed by TTL.
+
+Tier 1: In-process LRU with per-entry expiry (PRINCIPAL_CACHE_MAX_ITEMS)
+Tier 2: Redis, when connected, shared across workers. Secrets (password hash,
+        2FA secret, pending OTP) are never written to it.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from app.config import settings
+from app.database import get_redis
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "principal_cache:"
+_VERSION_PREFIX = "principal_cache_version:"
+
+# Version counters outlive any Redis entry they guard
+_VERSION_TTL_SECONDS = 86400
+
+# Fields kept out of the shared tier
+_SECRET_FIELDS = {
+    "hashed_password",
+    "two_factor_secret",
+    "pending_otp",
+    "pending_otp_expires_at",
+    "pending_otp_type",
+    "pending_otp_attempts",
+}
+
+
+class PrincipalCache:
+    """LRU + TTL cache of User objects keyed by user id and cache version."""
+
+    def __init__(
+        self,
+        max_items: int = 10000,
+        ttl_seconds: float = 30.0,
+        redis_enabled: bool = True
+    ):
+        self.max_items = max(1, max_items)
+        self.ttl_seconds = ttl_seconds
+        self.redis_enabled = redis_enabled
+
+        # user_id -> (expires_at, version, version_checked_at, user)
+        self._entries: "OrderedDict[str, Tuple[float, int, float, User]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self._hits = 0
+        self._redis_hits = 0
+        self._coalesced = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    async def _redis(self):
+        return await get_redis() if self.redis_enabled else None
+
+    async def _version(self, redis, user_id: str) -> int:
+        if redis is None:
+            return 0
+        try:
+            return int(await redis.get(_VERSION_PREFIX + user_id) or 0)
+        except Exception as e:
+            logger.debug(f"Principal cache version check failed for {user_id}: {e}")
+            return -1
+
+    def _put_local(self, user_id: str, expires_at: float, version: int, user: User):
+        self._entries[user_id] = (expires_at, version, time.monotonic(), user)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+
+    async def get_user(self, db: AsyncIOMotorDatabase, user_id: str) -> Optional[User]:
+        """
+        Get a user by id, from the cache when possible.
+
+        Args:
+            db: Database connection
+            user_id: User ID from the access token
+
+        Returns:
+            User object, or None if the user does not exist
+        """
+        if not settings.PRINCIPAL_CACHE_ENABLED:
+            user_doc = await db.users.find_one({"user_id": user_id})
+            return User.from_mongo(user_doc) if user_doc else None
+
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            expires_at, version, checked_at, user = entry
+            if expires_at > time.time():
+                if time.monotonic() - checked_at < settings.PRINCIPAL_CACHE_VERSION_CHECK_SECONDS:
+                    self._entries.move_to_end(user_id)
+                    self._hits += 1
+                    return user
+                redis = await self._redis()
+                if redis is None or await self._version(redis, user_id) == version:
+                    self._entries[user_id] = (expires_at, version, time.monotonic(), user)
+                    self._entries.move_to_end(user_id)
+                    self._hits += 1
+                    return user
+            self._entries.pop(user_id, None)
+
+        task = self._inflight.get(user_id)
+        if task is not None:
+            self._coalesced += 1
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(self._load(db, user_id))
+        self._inflight[user_id] = task
+        task.add_done_callback(lambda t: self._finish(user_id, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, user_id: str, task: asyncio.Task):
+        if self._inflight.get(user_id) is task:
+            del self._inflight[user_id]
+        if not task.cancelled():
+            # Mark the exception retrieved if every waiter was cancelled
+            task.exception()
+
+    async def _load(self, db: AsyncIOMotorDatabase, user_id: str) -> Optional[User]:
+        # An invalidation while loading means the document read may predate it
+        invalidations = self._invalidations
+        redis = await self._redis()
+        version = await self._version(redis, user_id)
+
+        if redis is not None and version >= 0:
+            try:
+                raw = await redis.get(f"{_REDIS_PREFIX}{user_id}:{version}")
+                if raw:
+                    user = User.model_validate_json(raw)
+                    self._redis_hits += 1
+                    if invalidations == self._invalidations:
+                        self._put_local(user_id, time.time() + self.ttl_seconds, version, user)
+                    return user
+            except Exception as e:
+                logger.debug(f"Principal cache Redis read failed for {user_id}: {e}")
+
+        self._misses += 1
+        user_doc = await db.users.find_one({"user_id": user_id})
+        if not user_doc:
+            return None
+        user = User.from_mongo(user_doc)
+
+        if invalidations == self._invalidations and version >= 0:
+            self._put_local(user_id, time.time() + self.ttl_seconds, version, user)
+            if redis is not None:
+                try:
+                    await redis.set(
+                        f"{_REDIS_PREFIX}{user_id}:{version}",
+                        user.model_dump_json(by_alias=True, exclude=_SECRET_FIELDS),
+                        ex=max(1, int(self.ttl_seconds))
+                    )
+                except Exception as e:
+                    logger.debug(f"Principal cache Redis write failed for {user_id}: {e}")
+        return user
+
+    async def invalidate(self, user_id: str):
+        """
+        Drop a cached user everywhere (ban, role change, logout, profile edits).
+
+        Never raises: a failed shared invalidation only leaves other workers'
+        entries to expire by TTL.
+        """
+        self._entries.pop(user_id, None)
+        self._invalidations += 1
+        redis = await self._redis()
+        if redis is not None:
+            try:
+                await redis.incr(_VERSION_PREFIX + user_id)
+                await redis.expire(_VERSION_PREFIX + user_id, _VERSION_TTL_SECONDS)
+            except Exception as e:
+                logger.warning(f"Principal cache invalidation of {user_id} not shared: {e}")
+
+    def clear(self):
+        """Drop local entries."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics."""
+        lookups = self._hits + self._coalesced + self._redis_hits + self._misses
+        return {
+            "items": len(self._entries),
+            "max_items": self.max_items,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "coalesced": self._coalesced,
+            "redis_hits": self._redis_hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+            "hit_rate": round((self._hits + self._coalesced + self._redis_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Singleton instance
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get or create the shared principal cache."""
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache(
+            max_items=settings.PRINCIPAL_CACHE_MAX_ITEMS,
+            ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+            redis_enabled=settings.PRINCIPAL_CACHE_REDIS_ENABLED
+        )
+    return _principal_cache
+
+
+async def invalidate_principal(user_id: str):
+    """Invalidate a cached user (for write paths changing the user)."""
+    await get_principal_cache().invalidate(user_id)
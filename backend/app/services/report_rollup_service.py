@@ -0,0 +1,445 @@
+"""
+Report Rollups
+Materialized hourly and daily report counters for the admin and analyst dashboards.
+
+The dashboards used to count hazard_reports directly (a dozen count_documents
+calls per admin dashboard load, a $group over the raw reports for every trend
+chart), so their latency grew with the collection. Counters now live in
+report_rollups, one document per
+
+    (granularity, bucket, hazard_type, region, status, severity, priority)
+
+with a count, and the dashboards sum those instead. Their number depends on
+the time range and the dimension mix, not on how many reports exist.
+
+A tail job keeps them current: every REPORT_ROLLUP_SYNC_SECONDS the reports
+changed since the last run (by updated_at) are compared with the key they were
+last counted under (report_rollup_state) and only the difference is applied
+with $inc. Reading a report twice is a no-op, so each run re-reads a short
+overlap instead of needing an exact resume point. One process at a time runs
+the job, under a lease in report_rollup_meta.
+
+The backfill (scripts/backfill_report_rollups.py, or automatically on first
+start) rebuilds everything from hazard_reports. Until one has completed the
+dashboards keep querying hazard_reports.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from app.config import settings
+from app.database import MongoDB
+
+logger = logging.getLogger(__name__)
+
+ROLLUPS_COLLECTION = "report_rollups"
+STATE_COLLECTION = "report_rollup_state"
+META_COLLECTION = "report_rollup_meta"
+META_ID = "hazard_reports"
+
+DIMENSIONS = ("hazard_type", "region", "status", "severity", "priority")
+
+# Same definition as the trend chart's high_priority series
+HIGH_PRIORITY_RISK_LEVELS = {"critical", "high"}
+
+# Each sync re-reads this far behind its watermark (writes in flight, clock skew between hosts)
+SYNC_OVERLAP_SECONDS = 60
+
+REPORT_PROJECTION = {
+    "_id": 0,
+    "report_id": 1,
+    "created_at": 1,
+    "hazard_type": 1,
+    "location.region": 1,
+    "verification_status": 1,
+    "status": 1,
+    "severity": 1,
+    "risk_level": 1,
+    "urgency": 1,
+}
+
+RollupKey = Tuple[Any, ...]  # (granularity, bucket, *DIMENSIONS)
+
+
+def _value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """MongoDB returns naive UTC datetimes unless the client is tz-aware."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def floor_hour(value: datetime) -> datetime:
+    return _as_utc(value).replace(minute=0, second=0, microsecond=0)
+
+
+def floor_day(value: datetime) -> datetime:
+    return _as_utc(value).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _window_bounds(start: datetime) -> Tuple[datetime, datetime]:
+    """Hour buckets cover [start hour, next midnight); day buckets cover the rest."""
+    first_day = floor_day(start)
+    if first_day < _as_utc(start):
+        first_day += timedelta(days=1)
+    return floor_hour(start), first_day
+
+
+def rollup_key(doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    The hour and dimensions a report is counted under.
+
+    Args:
+        doc: hazard_reports document (REPORT_PROJECTION is enough)
+
+    Returns:
+        Key dict, or None for a report without a usable created_at
+    """
+    created = doc.get("created_at")
+    if isinstance(created, str):
+        try:
+            created = datetime.fromisoformat(created.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(created, datetime):
+        return None
+
+    risk_level = _value(doc.get("risk_level"))
+    high_priority = risk_level in HIGH_PRIORITY_RISK_LEVELS or _value(doc.get("urgency")) == "immediate"
+    return {
+        "hour": floor_hour(created),
+        "hazard_type": _value(doc.get("hazard_type")),
+        "region": (doc.get("location") or {}).get("region"),
+        "status": _value(doc.get("verification_status") or doc.get("status")),
+        "severity": _value(doc.get("severity")),
+        "priority": "high" if high_priority else "normal",
+    }
+
+
+def _add_key(deltas: Dict[RollupKey, int], key: Dict[str, Any], amount: int):
+    dimensions = tuple(key[name] for name in DIMENSIONS)
+    deltas[("hour", key["hour"]) + dimensions] += amount
+    deltas[("day", floor_day(key["hour"])) + dimensions] += amount
+
+
+class ReportRollupService:
+    """Maintains and reads the report_rollups counters."""
+
+    def __init__(self, db: Optional[AsyncIOMotorDatabase] = None):
+        self.db = db
+        self._owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._stats = {"syncs": 0, "reports_changed": 0, "backfills": 0, "last_error": None}
+
+    def _get_db(self) -> AsyncIOMotorDatabase:
+        return self.db if self.db is not None else MongoDB.get_database()
+
+    # =========================================================================
+    # MAINTENANCE
+    # =========================================================================
+
+    async def _acquire_lease(self) -> Optional[Dict[str, Any]]:
+        """Take or extend the maintenance lease. Returns the meta doc, or None if another process holds it."""
+        now = datetime.now(timezone.utc)
+        try:
+            return await self._get_db()[META_COLLECTION].find_one_and_update(
+                {"_id": META_ID, "$or": [
+                    {"owner": self._owner},
+                    {"lease_until": None},
+                    {"lease_until": {"$lt": now}},
+                ]},
+                {"$set": {
+                    "owner": self._owner,
+                    "lease_until": now + timedelta(seconds=settings.REPORT_ROLLUP_LEASE_SECONDS),
+                }},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            return None
+
+    async def apply(self, docs: List[Dict[str, Any]]) -> int:
+        """
+        Bring the rollups in line with the current state of some reports.
+
+        Args:
+            docs: hazard_reports documents
+
+        Returns:
+            Number of reports whose counted key changed
+        """
+        db = self._get_db()
+        report_ids = [doc["report_id"] for doc in docs if doc.get("report_id")]
+        if not report_ids:
+            return 0
+
+        previous: Dict[str, Optional[Dict[str, Any]]] = {}
+        async for row in db[STATE_COLLECTION].find({"report_id": {"$in": report_ids}}, {"_id": 0}):
+            key = row.get("key")
+            previous[row["report_id"]] = {**key, "hour": _as_utc(key["hour"])} if key else None
+
+        deltas: Dict[RollupKey, int] = defaultdict(int)
+        state_ops = []
+        for doc in docs:
+            report_id = doc.get("report_id")
+            if not report_id:
+                continue
+            key = rollup_key(doc)
+            old = previous.get(report_id)
+            if old == key:
+                continue
+            if old:
+                _add_key(deltas, old, -1)
+            if key:
+                _add_key(deltas, key, 1)
+            previous[report_id] = key
+            state_ops.append(UpdateOne({"report_id": report_id}, {"$set": {"key": key}}, upsert=True))
+
+        rollup_ops = [
+            UpdateOne(
+                {"granularity": rollup[0], "bucket": rollup[1], **dict(zip(DIMENSIONS, rollup[2:]))},
+                {"$inc": {"count": amount}},
+                upsert=True,
+            )
+            for rollup, amount in deltas.items() if amount
+        ]
+        # State first: a crash in between under-counts one batch rather than double-counting it on replay
+        if state_ops:
+            await db[STATE_COLLECTION].bulk_write(state_ops, ordered=False)
+        if rollup_ops:
+            await db[ROLLUPS_COLLECTION].bulk_write(rollup_ops, ordered=False)
+        return len(state_ops)
+
+    async def _apply_cursor(self, cursor) -> Tuple[int, int]:
+        """Apply a cursor of reports in batches, renewing the lease per batch. Returns (read, changed)."""
+        read = changed = 0
+        batch: List[Dict[str, Any]] = []
+        async for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= settings.REPORT_ROLLUP_BATCH_SIZE:
+                if await self._acquire_lease() is None:
+                    raise RuntimeError("Report rollup lease lost to another process")
+                changed += await self.apply(batch)
+                read += len(batch)
+                batch = []
+        if batch:
+            changed += await self.apply(batch)
+            read += len(batch)
+        return read, changed
+
+    async def sync(self) -> int:
+        """
+        Apply reports changed since the last run (no-op until a backfill has completed).
+
+        Returns:
+            Number of reports whose counted key changed
+        """
+        meta = await self._acquire_lease()
+        if not meta or not meta.get("backfilled_at"):
+            return 0
+
+        db = self._get_db()
+        started = datetime.now(timezone.utc)
+        since = _as_utc(meta["watermark"]) - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        cursor = db.hazard_reports.find(
+            {"updated_at": {"$gte": since}}, REPORT_PROJECTION
+        ).sort("updated_at", 1)
+        _, changed = await self._apply_cursor(cursor)
+
+        await db[META_COLLECTION].update_one(
+            {"_id": META_ID, "owner": self._owner},
+            {"$set": {"watermark": started, "synced_at": datetime.now(timezone.utc)}},
+        )
+        self._stats["syncs"] += 1
+        self._stats["reports_changed"] += changed
+        return changed
+
+    async def backfill(self) -> int:
+        """
+        Rebuild all rollups from hazard_reports.
+
+        Dashboards read hazard_reports directly while the rebuild runs.
+
+        Returns:
+            Number of reports read
+
+        Raises:
+            RuntimeError: If another process holds the maintenance lease
+        """
+        if await self._acquire_lease() is None:
+            raise RuntimeError("Report rollups are being maintained by another process")
+
+        db = self._get_db()
+        started = datetime.now(timezone.utc)
+        await db[META_COLLECTION].update_one(
+            {"_id": META_ID}, {"$set": {"backfilled_at": None, "watermark": started}}
+        )
+        await db[ROLLUPS_COLLECTION].delete_many({})
+        await db[STATE_COLLECTION].delete_many({})
+
+        read, _ = await self._apply_cursor(db.hazard_reports.find({}, REPORT_PROJECTION))
+
+        # Reports changed during the rebuild are picked up by the next sync (watermark = start);
+        # the lease is released so the API's tail job can take over right away
+        await db[META_COLLECTION].update_one(
+            {"_id": META_ID},
+            {"$set": {"backfilled_at": datetime.now(timezone.utc), "watermark": started, "lease_until": None}},
+        )
+        self._stats["backfills"] += 1
+        logger.info(f"Report rollups rebuilt from {read} reports")
+        return read
+
+    def start(self):
+        """Start the tail job (and the initial backfill if REPORT_ROLLUP_AUTO_BACKFILL)."""
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                if settings.REPORT_ROLLUP_AUTO_BACKFILL and not await self.is_ready():
+                    meta = await self._acquire_lease()
+                    if meta is not None and not meta.get("backfilled_at"):
+                        await self.backfill()
+                await self.sync()
+                self._stats["last_error"] = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["last_error"] = str(e)
+                logger.warning(f"Report rollup sync failed: {e}")
+            await asyncio.sleep(settings.REPORT_ROLLUP_SYNC_SECONDS)
+
+    async def shutdown(self):
+        """Stop the tail job; the next holder of the lease continues from the watermark."""
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"running": self._task is not None and not self._task.done(), **self._stats}
+
+    # =========================================================================
+    # READS
+    # =========================================================================
+
+    async def is_ready(self) -> bool:
+        """True once a backfill has completed (dashboards may read the rollups)."""
+        if not settings.REPORT_ROLLUPS_ENABLED:
+            return False
+        meta = await self._get_db()[META_COLLECTION].find_one({"_id": META_ID}, {"backfilled_at": 1})
+        return bool(meta and meta.get("backfilled_at"))
+
+    async def get_overview(self, since: datetime) -> Dict[str, Any]:
+        """
+        Report totals for the dashboards.
+
+        Args:
+            since: Start of the recent window (counted to the hour)
+
+        Returns:
+            Dict with total, today, since and by_status (all-time totals per status)
+        """
+        now = datetime.now(timezone.utc)
+        hour_start, first_day = _window_bounds(since)
+        is_day = {"$eq": ["$granularity", "day"]}
+        pipeline = [
+            {"$match": {"$or": [
+                {"granularity": "day"},
+                {"granularity": "hour", "bucket": {"$gte": hour_start, "$lt": first_day}},
+            ]}},
+            {"$group": {
+                "_id": "$status",
+                "total": {"$sum": {"$cond": [is_day, "$count", 0]}},
+                "today": {"$sum": {"$cond": [
+                    {"$and": [is_day, {"$gte": ["$bucket", floor_day(now)]}]}, "$count", 0
+                ]}},
+                "since": {"$sum": {"$cond": [
+                    {"$or": [{"$eq": ["$granularity", "hour"]}, {"$gte": ["$bucket", first_day]}]}, "$count", 0
+                ]}},
+            }},
+        ]
+        rows = await self._get_db()[ROLLUPS_COLLECTION].aggregate(pipeline).to_list(None)
+        return {
+            "total": sum(row["total"] for row in rows),
+            "today": sum(row["today"] for row in rows),
+            "since": sum(row["since"] for row in rows),
+            "by_status": {row["_id"]: row["total"] for row in rows},
+        }
+
+    async def get_daily_counts(
+        self,
+        start: datetime,
+        hazard_type: Optional[str] = None,
+        region: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-day report counts since start (counted to the hour), oldest first.
+
+        Args:
+            start: Window start
+            hazard_type: Optional filter
+            region: Optional filter (location.region)
+
+        Returns:
+            List of dicts with day, total, verified, pending and high_priority
+        """
+        hour_start, first_day = _window_bounds(start)
+        match: Dict[str, Any] = {"$or": [
+            {"granularity": "hour", "bucket": {"$gte": hour_start, "$lt": first_day}},
+            {"granularity": "day", "bucket": {"$gte": first_day}},
+        ]}
+        if hazard_type:
+            match["hazard_type"] = hazard_type
+        if region:
+            match["region"] = region
+
+        def count_if(condition: Dict[str, Any]) -> Dict[str, Any]:
+            return {"$sum": {"$cond": [condition, "$count", 0]}}
+
+        pipeline = [
+            {"$match": match},
+            {"$group": {
+                "_id": "$bucket",
+                "total": {"$sum": "$count"},
+                "verified": count_if({"$eq": ["$status", "verified"]}),
+                "pending": count_if({"$eq": ["$status", "pending"]}),
+                "high_priority": count_if({"$eq": ["$priority", "high"]}),
+            }},
+        ]
+        rows = await self._get_db()[ROLLUPS_COLLECTION].aggregate(pipeline).to_list(None)
+
+        # Fold the leading hour buckets into their day
+        days: Dict[datetime, Dict[str, Any]] = {}
+        for row in rows:
+            day = floor_day(row["_id"])
+            entry = days.setdefault(day, {"day": day, "total": 0, "verified": 0, "pending": 0, "high_priority": 0})
+            for field in ("total", "verified", "pending", "high_priority"):
+                entry[field] += row[field]
+        return [days[day] for day in sorted(days) if days[day]["total"]]
+
+
+# Singleton instance
+_report_rollup_service: Optional[ReportRollupService] = None
+
+
+def get_report_rollup_service() -> ReportRollupService:
+    """Get or create the report rollup service."""
+    global _report_rollup_service
+    if _report_rollup_service is None:
+        _report_rollup_service = ReportRollupService()
+    return _report_rollup_service
@@ -0,0 +1,332 @@
+"""
+Response Cache
+Shared cache for read-heavy endpoint responses (public map and alert feeds,
+monitoring status, analyst analytics).
+
+Entries are keyed by route, caller role and the normalized query parameters.
+Each route declares the data it depends on as tags ("reports", "alerts",
+"monitoring", "multi_hazard"); the current version of every tag is part of the
+key, so invalidate() bumping a tag version retires all dependent entries at
+once without scanning for them. Write paths call invalidate() when reports
+are created or verified and when alerts or monitoring cycles change.
+
+Tier 1: In-process LRU with per-entry expiry (RESPONSE_CACHE_MAX_ITEMS)
+Tier 2: Redis, when connected, shared across workers. Tag versions live in
+        Redis too; other workers pick up an invalidation within
+        RESPONSE_CACHE_VERSION_CHECK_SECONDS.
+
+Stampede protection: concurrent misses in one process are coalesced into a
+single computation, and across workers the first miss takes a short Redis
+lock while the others wait for its result instead of recomputing.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.database import get_redis
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "response_cache:"
+_VERSION_PREFIX = "response_cache_version:"
+_LOCK_PREFIX = "response_cache_lock:"
+
+# Invalidation tags
+TAG_REPORTS = "reports"
+TAG_ALERTS = "alerts"
+TAG_MONITORING = "monitoring"
+TAG_MULTI_HAZARD = "multi_hazard"
+
+# How often a worker waiting on another worker's computation checks Redis
+_LOCK_POLL_SECONDS = 0.05
+
+
+def normalize_params(params: Optional[Dict[str, Any]]) -> str:
+    """Stable digest of query parameters (unset parameters are ignored)."""
+    normalized = {
+        name: getattr(value, "value", value)
+        for name, value in (params or {}).items() if value is not None
+    }
+    encoded = json.dumps(normalized, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()[:16]
+
+
+class ResponseCache:
+    """LRU + TTL response cache with tag-version invalidation and single-flight computation."""
+
+    def __init__(
+        self,
+        max_items: int = 2048,
+        ttl_seconds: float = 30.0,
+        redis_enabled: bool = True
+    ):
+        self.max_items = max(1, max_items)
+        self.ttl_seconds = ttl_seconds
+        self.redis_enabled = redis_enabled
+
+        # key -> (expires_at, value)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # tag -> (version, checked_at)
+        self._versions: Dict[str, Tuple[int, float]] = {}
+
+        self._hits = 0
+        self._redis_hits = 0
+        self._coalesced = 0
+        self._lock_waits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._routes: Dict[str, Dict[str, int]] = {}
+
+    # -------------------------------------------------------------------------
+    # Local tier
+    # -------------------------------------------------------------------------
+
+    def _get_local(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _put_local(self, key: str, value: Any, expires_at: float):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+
+    # -------------------------------------------------------------------------
+    # Redis tier
+    # -------------------------------------------------------------------------
+
+    async def _redis(self):
+        return await get_redis() if self.redis_enabled else None
+
+    async def _get_remote(self, redis, key: str) -> Tuple[bool, Any, float]:
+        try:
+            raw = await redis.get(_REDIS_PREFIX + key)
+            if raw:
+                payload = json.loads(raw)
+                if payload["expires_at"] > time.time():
+                    return True, payload["value"], payload["expires_at"]
+        except Exception as e:
+            logger.debug(f"Response cache Redis read failed for {key}: {e}")
+        return False, None, 0.0
+
+    async def _put_remote(self, redis, key: str, value: Any, expires_at: float):
+        try:
+            payload = json.dumps({"expires_at": expires_at, "value": value})
+            await redis.set(_REDIS_PREFIX + key, payload, ex=max(1, int(expires_at - time.time()) + 1))
+        except Exception as e:
+            logger.debug(f"Response cache Redis write failed for {key}: {e}")
+
+    # -------------------------------------------------------------------------
+    # Invalidation
+    # -------------------------------------------------------------------------
+
+    async def _tag_versions(self, tags: Iterable[str]) -> str:
+        tags = sorted(set(tags))
+        now = time.monotonic()
+        stale = [
+            tag for tag in tags
+            if tag not in self._versions
+            or now - self._versions[tag][1] >= settings.RESPONSE_CACHE_VERSION_CHECK_SECONDS
+        ]
+        if stale:
+            redis = await self._redis()
+            if redis is not None:
+                try:
+                    remote = await redis.mget([_VERSION_PREFIX + tag for tag in stale])
+                    for tag, version in zip(stale, remote):
+                        self._versions[tag] = (int(version or 0), now)
+                except Exception as e:
+                    logger.debug(f"Response cache version check failed: {e}")
+            for tag in stale:
+                version = self._versions.get(tag, (0, 0.0))[0]
+                self._versions[tag] = (version, now)
+        return ".".join(f"{tag}{self._versions[tag][0]}" for tag in tags)
+
+    async def invalidate(self, *tags: str):
+        """
+        Retire every cached response that depends on any of the tags.
+
+        Never raises: a failed invalidation only leaves entries to expire by TTL.
+        """
+        redis = await self._redis()
+        now = time.monotonic()
+        for tag in tags:
+            version = self._versions.get(tag, (0, 0.0))[0] + 1
+            if redis is not None:
+                try:
+                    version = max(version, int(await redis.incr(_VERSION_PREFIX + tag)))
+                except Exception as e:
+                    logger.debug(f"Response cache invalidation of {tag} not shared: {e}")
+            self._versions[tag] = (version, now)
+            self._invalidations += 1
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    def _count(self, route: str, outcome: str):
+        counts = self._routes.setdefault(route, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    async def get_or_compute(
+        self,
+        route: str,
+        compute: Callable[[], Awaitable[Any]],
+        params: Optional[Dict[str, Any]] = None,
+        role: Optional[str] = None,
+        tags: Iterable[str] = (),
+        ttl: Optional[float] = None,
+        shared: bool = True
+    ) -> Any:
+        """
+        Return the cached response, computing it on a miss.
+
+        Args:
+            route: Endpoint identifier, e.g. "alerts:active-summary"
+            compute: Coroutine function producing the response
+            params: Query parameters the response depends on
+            role: Caller role for role-dependent responses (None for public)
+            tags: Data the response depends on (see invalidate)
+            ttl: Entry lifetime in seconds (default RESPONSE_CACHE_TTL_SECONDS)
+            shared: Store in Redis; False for responses built from per-process state
+
+        Returns:
+            The response, JSON-encoded (models and datetimes converted)
+        """
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return jsonable_encoder(await compute())
+
+        versions = await self._tag_versions(tags)
+        key = f"{route}:{getattr(role, 'value', role) or 'public'}:{versions}:{normalize_params(params)}"
+
+        found, value = self._get_local(key)
+        if found:
+            self._hits += 1
+            self._count(route, "hits")
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._coalesced += 1
+            self._count(route, "hits")
+            return await asyncio.shield(task)
+
+        self._count(route, "misses")
+        task = asyncio.ensure_future(
+            self._load(key, compute, self.ttl_seconds if ttl is None else ttl, shared)
+        )
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._finish(key, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved if every waiter was cancelled
+            task.exception()
+
+    async def _load(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: float, shared: bool) -> Any:
+        redis = await self._redis() if shared else None
+        locked = False
+        if redis is not None:
+            found, value, expires_at = await self._get_remote(redis, key)
+            if found:
+                self._redis_hits += 1
+                self._put_local(key, value, expires_at)
+                return value
+
+            # Another worker computing the same response: wait for its result
+            try:
+                locked = bool(await redis.set(
+                    _LOCK_PREFIX + key, "1", nx=True,
+                    px=int(settings.RESPONSE_CACHE_LOCK_SECONDS * 1000)
+                ))
+            except Exception as e:
+                logger.debug(f"Response cache lock failed for {key}: {e}")
+                locked = True
+            if not locked:
+                self._lock_waits += 1
+                deadline = time.monotonic() + settings.RESPONSE_CACHE_LOCK_SECONDS
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(_LOCK_POLL_SECONDS)
+                    found, value, expires_at = await self._get_remote(redis, key)
+                    if found:
+                        self._redis_hits += 1
+                        self._put_local(key, value, expires_at)
+                        return value
+
+        self._misses += 1
+        try:
+            value = jsonable_encoder(await compute())
+            expires_at = time.time() + ttl
+            self._put_local(key, value, expires_at)
+            if redis is not None:
+                await self._put_remote(redis, key, value, expires_at)
+            return value
+        finally:
+            if locked:
+                try:
+                    await redis.delete(_LOCK_PREFIX + key)
+                except Exception:
+                    pass
+
+    def clear(self):
+        """Drop local entries."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics."""
+        lookups = self._hits + self._coalesced + self._redis_hits + self._misses
+        return {
+            "items": len(self._entries),
+            "max_items": self.max_items,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self._hits,
+            "coalesced": self._coalesced,
+            "redis_hits": self._redis_hits,
+            "lock_waits": self._lock_waits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+            "inflight": len(self._inflight),
+            "hit_rate": round((self._hits + self._coalesced + self._redis_hits) / lookups, 4) if lookups else 0.0,
+            "tag_versions": {tag: version for tag, (version, _) in self._versions.items()},
+            "routes": {name: dict(counts) for name, counts in self._routes.items()},
+        }
+
+
+# Singleton instance
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the shared response cache."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            max_items=settings.RESPONSE_CACHE_MAX_ITEMS,
+            ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+            redis_enabled=settings.RESPONSE_CACHE_REDIS_ENABLED
+        )
+    return _response_cache
+
+
+async def invalidate_responses(*tags: str):
+    """Invalidate cached responses depending on tags (for write paths)."""
+    await get_response_cache().invalidate(*tags)
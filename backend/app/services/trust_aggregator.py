@@ -0,0 +1,310 @@
+"""
+Trust Score Aggregator
+Write-behind buffer for the AI-layer trust updates made by verification.
+
+Every verification used to read the reporter's user document and write its
+credibility_score back straight away, so a reporter submitting many reports
+during an event had all of them contending on one document. Trust events
+are now buffered per user and flushed every TRUST_FLUSH_INTERVAL_SECONDS
+(or once TRUST_FLUSH_MAX_PENDING verifications are waiting) with a single
+bulk_write.
+
+Each verification's events are applied in order with the same asymptotic
+formula and integer rounding as before, so the flushed score equals the
+score the per-verification writes would have produced. Writes are
+conditional on the score read at flush time; users whose score changed
+underneath (an analyst decision) are re-queued for the next flush.
+
+The reporter layer reads user stats through a short-lived cache
+(USER_STATS_CACHE_TTL_SECONDS) that adds pending events to the stored
+score and is invalidated for every user written by a flush.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.database import MongoDB
+from app.models.user import TrustEventType, calculate_trust_score
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CREDIBILITY = 50
+
+_USER_STATS_PROJECTION = {
+    "_id": 0,
+    "user_id": 1,
+    "total_reports": 1,
+    "verified_reports": 1,
+    "rejected_reports": 1,
+    "credibility_score": 1,
+}
+
+
+def apply_trust_events(score: int, verifications: List[List[TrustEventType]]) -> int:
+    """Apply buffered verifications in order (integer score after each, as when written one by one)."""
+    for events in verifications:
+        new_score = float(score)
+        for event_type in events:
+            new_score = calculate_trust_score(new_score, event_type)
+        score = int(new_score)
+    return score
+
+
+class TrustScoreAggregator:
+    """Buffers trust events per user and flushes them in bulk."""
+
+    def __init__(
+        self,
+        db: Optional[AsyncIOMotorDatabase] = None,
+        flush_interval: float = 5.0,
+        max_pending: int = 200,
+        stats_ttl: float = 30.0
+    ):
+        """
+        Args:
+            db: Database (defaults to the app connection)
+            flush_interval: Seconds between background flushes
+            max_pending: Buffered verifications that trigger an early flush
+            stats_ttl: Lifetime of cached user stats in seconds
+        """
+        self.db = db
+        self.flush_interval = flush_interval
+        self.max_pending = max(1, max_pending)
+        self.stats_ttl = stats_ttl
+
+        # user_id -> one list of events per verification, oldest first
+        self._pending: Dict[str, List[List[TrustEventType]]] = {}
+        self._pending_count = 0
+        # Batch being written by the current flush
+        self._flushing: Dict[str, List[List[TrustEventType]]] = {}
+        # user_id -> (expires_at, user stats or None for unknown users)
+        self._stats: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+        self._flushes = 0
+        self._users_written = 0
+        self._conflicts = 0
+        self._stats_hits = 0
+        self._stats_misses = 0
+
+    def _get_db(self) -> AsyncIOMotorDatabase:
+        return self.db if self.db is not None else MongoDB.get_database()
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    def record(self, user_id: str, events: List[TrustEventType], db: Optional[AsyncIOMotorDatabase] = None):
+        """
+        Buffer the trust events of one verification.
+
+        Args:
+            user_id: Reporter
+            events: Events from this verification, in order
+            db: Database to flush to (kept for later flushes)
+        """
+        if not events:
+            return
+        if db is not None:
+            self.db = db
+
+        self._pending.setdefault(user_id, []).append(list(events))
+        self._pending_count += 1
+
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._flush_loop())
+        if self._pending_count >= self.max_pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self.flush())
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Trust score flush failed: {e}")
+
+    def _requeue(self, batch: Dict[str, List[List[TrustEventType]]]):
+        """Put unwritten verifications back ahead of anything buffered since."""
+        for user_id, verifications in batch.items():
+            self._pending[user_id] = verifications + self._pending.get(user_id, [])
+        self._pending_count = sum(len(v) for v in self._pending.values())
+
+    async def flush(self) -> int:
+        """
+        Write all buffered trust events.
+
+        Returns:
+            Number of user documents updated
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            self._pending_count = 0
+            self._flushing = batch
+
+            try:
+                written, conflicted = await self._write(batch)
+            except asyncio.CancelledError:
+                self._requeue(batch)
+                raise
+            except Exception as e:
+                logger.error(f"Trust score flush failed, keeping {len(batch)} user(s) buffered: {e}")
+                self._requeue(batch)
+                return 0
+            finally:
+                self._flushing = {}
+
+            if conflicted:
+                self._conflicts += len(conflicted)
+                self._requeue({user_id: batch[user_id] for user_id in conflicted})
+
+            for user_id in batch:
+                self._stats.pop(user_id, None)
+
+            self._flushes += 1
+            self._users_written += written
+            logger.debug(f"Flushed trust updates for {len(batch)} user(s): {written} written, {len(conflicted)} requeued")
+            return written
+
+    async def _write(self, batch: Dict[str, List[List[TrustEventType]]]) -> Tuple[int, List[str]]:
+        """Apply the batch with one bulk_write; returns (written, user_ids that changed underneath)."""
+        users = self._get_db().users
+        docs = await users.find(
+            {"user_id": {"$in": list(batch)}}, {"_id": 0, "user_id": 1, "credibility_score": 1}
+        ).to_list(length=None)
+
+        operations = []
+        intended: Dict[str, int] = {}
+        for doc in docs:
+            user_id = doc["user_id"]
+            stored = doc.get("credibility_score")
+            current = stored if stored is not None else DEFAULT_CREDIBILITY
+            new_score = apply_trust_events(current, batch[user_id])
+            if new_score != current:
+                intended[user_id] = new_score
+                # Conditional on the score we read, so concurrent analyst updates are not overwritten
+                operations.append(UpdateOne(
+                    {"user_id": user_id, "credibility_score": stored},
+                    {"$set": {"credibility_score": new_score}}
+                ))
+
+        missing = set(batch) - {doc["user_id"] for doc in docs}
+        if missing:
+            logger.warning(f"Cannot update trust: {len(missing)} user(s) not found")
+        if not operations:
+            return 0, []
+
+        result = await users.bulk_write(operations, ordered=False)
+        if result.matched_count == len(operations):
+            return result.modified_count, []
+
+        # Find the users whose score moved between our read and write
+        current_docs = await users.find(
+            {"user_id": {"$in": list(intended)}}, {"_id": 0, "user_id": 1, "credibility_score": 1}
+        ).to_list(length=None)
+        conflicted = [
+            doc["user_id"] for doc in current_docs
+            if doc.get("credibility_score") != intended[doc["user_id"]]
+        ]
+        return result.modified_count, conflicted
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def projected_score(self, user_id: str, stored_score: int) -> int:
+        """Stored score with this process's unwritten events applied."""
+        unwritten = self._flushing.get(user_id, []) + self._pending.get(user_id, [])
+        return apply_trust_events(stored_score, unwritten)
+
+    async def get_user_stats(
+        self,
+        user_id: str,
+        db: Optional[AsyncIOMotorDatabase] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Reporter statistics for the reporter layer, from the short-lived cache.
+
+        Returns:
+            total/verified/rejected report counts and the projected
+            credibility_score, or None for an unknown user
+        """
+        entry = self._stats.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._stats_hits += 1
+            stats = entry[1]
+        else:
+            self._stats_misses += 1
+            database = db if db is not None else self._get_db()
+            stats = await database.users.find_one({"user_id": user_id}, _USER_STATS_PROJECTION)
+            self._stats[user_id] = (time.monotonic() + self.stats_ttl, stats)
+
+        if stats is None:
+            return None
+        stored = stats.get("credibility_score")
+        return {
+            **stats,
+            "credibility_score": self.projected_score(
+                user_id, stored if stored is not None else DEFAULT_CREDIBILITY
+            ),
+        }
+
+    def invalidate(self, user_id: str):
+        """Drop cached stats after another writer changed the user."""
+        self._stats.pop(user_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Buffer and cache statistics."""
+        return {
+            "pending_verifications": self._pending_count,
+            "pending_users": len(self._pending),
+            "flushes": self._flushes,
+            "users_written": self._users_written,
+            "conflicts_requeued": self._conflicts,
+            "user_stats_cached": len(self._stats),
+            "user_stats_hits": self._stats_hits,
+            "user_stats_misses": self._stats_misses,
+        }
+
+    async def shutdown(self):
+        """Stop the flush loop and write whatever is still buffered."""
+        if self._loop_task and not self._loop_task.done():
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+        if self._flush_task and not self._flush_task.done():
+            await self._flush_task
+        self._loop_task = None
+        self._flush_task = None
+        await self.flush()
+
+
+# Singleton instance
+_trust_aggregator: Optional[TrustScoreAggregator] = None
+
+
+def get_trust_aggregator() -> TrustScoreAggregator:
+    """Get or create the trust score aggregator."""
+    global _trust_aggregator
+    if _trust_aggregator is None:
+        _trust_aggregator = TrustScoreAggregator(
+            flush_interval=settings.TRUST_FLUSH_INTERVAL_SECONDS,
+            max_pending=settings.TRUST_FLUSH_MAX_PENDING,
+            stats_ttl=settings.USER_STATS_CACHE_TTL_SECONDS
+        )
+    return _trust_aggregator
@@ -0,0 +1,194 @@
+"""
+VectorDB Artifacts
+Versioned on-disk corpus files for fast VectorDB cold starts.
+
+An artifact is a set of files sharing one path prefix:
+- {prefix}.npy          float32 embeddings, memory-mapped on load so every
+                        uvicorn worker shares the same page-cache copy
+- {prefix}.corpus.json  columnar texts / label codes / metadata (no pickle)
+- {prefix}.faiss        flat FAISS index (optional, memory-mapped when possible)
+
+Training-set artifacts are named by a fingerprint of the model, embedding
+dimension and training data, so they are rebuilt only when one of those
+changes (see scripts/build_vectordb_artifact.py).
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import faiss
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 1
+
+# Metadata keys stored as their own columns rather than per-row
+_COLUMN_KEYS = ("text", "label")
+
+
+def training_fingerprint(
+    model_name: str,
+    embed_dim: int,
+    training_data: Sequence[Tuple[str, str]]
+) -> str:
+    """Fingerprint of everything that determines the training embeddings."""
+    payload = json.dumps(
+        {
+            "version": ARTIFACT_VERSION,
+            "model": model_name,
+            "dim": embed_dim,
+            "data": [list(item) for item in training_data],
+        },
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def training_artifact_prefix(fingerprint: str) -> str:
+    """Path prefix of the training-set artifact for a fingerprint."""
+    return str(Path(settings.VECTORDB_ARTIFACT_DIR) / f"training-{fingerprint[:16]}")
+
+
+def artifact_exists(prefix: str) -> bool:
+    """Whether a complete artifact exists at prefix."""
+    return Path(f"{prefix}.npy").exists() and Path(f"{prefix}.corpus.json").exists()
+
+
+def remove_artifact(prefix: str):
+    """Delete an artifact's files (missing files are ignored)."""
+    for suffix in (".corpus.json", ".npy", ".faiss"):
+        try:
+            os.remove(f"{prefix}{suffix}")
+        except FileNotFoundError:
+            pass
+
+
+def _atomic_write(path: str, write_fn):
+    """Write via a temp file and rename so readers never see partial files."""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        write_fn(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def write_artifact(
+    prefix: str,
+    vectors: np.ndarray,
+    texts: List[str],
+    labels: List[str],
+    metadata: List[Dict[str, Any]],
+    extra: Optional[Dict[str, Any]] = None,
+    index: Optional[faiss.Index] = None
+):
+    """
+    Write corpus vectors, columns and (optionally) a FAISS index.
+
+    Args:
+        prefix: Path prefix for the artifact files
+        vectors: (N, D) float32 embeddings
+        texts / labels / metadata: Row-aligned corpus columns
+        extra: Additional manifest fields (e.g. fingerprint, model name)
+        index: FAISS index to persist alongside
+    """
+    Path(prefix).parent.mkdir(parents=True, exist_ok=True)
+    vectors = np.ascontiguousarray(vectors, dtype='float32')
+
+    label_names = sorted(set(labels))
+    codes = {name: i for i, name in enumerate(label_names)}
+
+    corpus = {
+        "version": ARTIFACT_VERSION,
+        "count": len(texts),
+        "dim": int(vectors.shape[1]) if vectors.ndim == 2 else 0,
+        **(extra or {}),
+        "label_names": label_names,
+        "label_codes": [codes[label] for label in labels],
+        "texts": texts,
+        "metadata": [
+            {k: v for k, v in (row or {}).items() if k not in _COLUMN_KEYS}
+            for row in metadata
+        ],
+    }
+
+    def write_vectors(path):
+        with open(path, "wb") as f:
+            np.save(f, vectors)
+
+    def write_corpus(path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(corpus, f, ensure_ascii=False, separators=(",", ":"), default=str)
+
+    _atomic_write(f"{prefix}.npy", write_vectors)
+    if index is not None:
+        _atomic_write(f"{prefix}.faiss", lambda path: faiss.write_index(index, path))
+    # Corpus last: its presence marks the artifact complete
+    _atomic_write(f"{prefix}.corpus.json", write_corpus)
+
+
+def read_artifact(
+    prefix: str,
+    mmap: bool = True
+) -> Optional[Tuple[np.ndarray, List[str], List[str], List[Dict[str, Any]], Dict[str, Any]]]:
+    """
+    Read an artifact.
+
+    Returns:
+        (vectors, texts, labels, metadata, manifest) or None if missing/invalid.
+        vectors is a read-only memory map when mmap=True.
+    """
+    if not artifact_exists(prefix):
+        return None
+
+    try:
+        with open(f"{prefix}.corpus.json", "r", encoding="utf-8") as f:
+            corpus = json.load(f)
+
+        if corpus.get("version") != ARTIFACT_VERSION:
+            logger.info(f"Ignoring VectorDB artifact {prefix}: version {corpus.get('version')}")
+            return None
+
+        vectors = np.load(f"{prefix}.npy", mmap_mode="r" if mmap else None)
+        texts = corpus["texts"]
+        label_names = corpus["label_names"]
+        labels = [label_names[code] for code in corpus["label_codes"]]
+        metadata = [
+            {**row, "text": text, "label": label}
+            for row, text, label in zip(corpus["metadata"], texts, labels)
+        ]
+
+        if len(vectors) != len(texts):
+            logger.warning(f"VectorDB artifact {prefix} is inconsistent ({len(vectors)} vectors, {len(texts)} texts)")
+            return None
+
+        manifest = {k: v for k, v in corpus.items() if k not in ("label_names", "label_codes", "texts", "metadata")}
+        return vectors, texts, labels, metadata, manifest
+
+    except Exception as e:
+        logger.warning(f"Could not read VectorDB artifact {prefix}: {e}")
+        return None
+
+
+def read_artifact_index(prefix: str) -> Optional[faiss.Index]:
+    """Read the artifact's FAISS index, memory-mapped when the build supports it."""
+    path = f"{prefix}.faiss"
+    if not Path(path).exists():
+        return None
+    try:
+        return faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    except Exception:
+        try:
+            return faiss.read_index(path)
+        except Exception as e:
+            logger.warning(f"Could not read VectorDB artifact index {path}: {e}")
+            return None
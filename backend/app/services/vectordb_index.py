@@ -0,0 +1,194 @@
+"""
+VectorDB Index Builders
+FAISS index construction for the hazard VectorDB.
+
+Supported index types (VECTORDB_INDEX_TYPE):
+- flat:     Exact inner-product search (IndexFlatIP)
+- ivf_flat: Inverted lists over k-means centroids, exact vectors
+- hnsw:     Hierarchical navigable small-world graph
+- ivf_pq:   Inverted lists with product-quantized vectors (smallest memory)
+
+Approximate indexes fall back to flat search below
+VECTORDB_ANN_MIN_VECTORS, where brute force is both exact and fast.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+import faiss
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+
+# FAISS k-means wants roughly this many training points per centroid
+_MIN_POINTS_PER_CENTROID = 39
+
+
+class VectorStore:
+    """
+    Growable float32 matrix holding every corpus embedding.
+
+    Kept alongside the FAISS index so approximate indexes can be retrained
+    and rebuilt, and so recall can be measured against exact search.
+    """
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._buffer = np.zeros((capacity, dim), dtype='float32')
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """View of the stored vectors (no copy)."""
+        return self._buffer[:self._count]
+
+    def append(self, embeddings: np.ndarray):
+        """Append rows, doubling capacity as needed."""
+        embeddings = np.asarray(embeddings, dtype='float32').reshape(-1, self.dim)
+        needed = self._count + len(embeddings)
+        if needed > len(self._buffer) or not self._buffer.flags.writeable:
+            capacity = max(needed, len(self._buffer) * 2)
+            buffer = np.zeros((capacity, self.dim), dtype='float32')
+            buffer[:self._count] = self._buffer[:self._count]
+            self._buffer = buffer
+        self._buffer[self._count:needed] = embeddings
+        self._count = needed
+
+    def replace(self, embeddings: np.ndarray):
+        """Replace all stored rows."""
+        self._count = 0
+        self.append(embeddings)
+
+    def truncate(self, count: int):
+        """Drop rows after the first count."""
+        self._count = min(self._count, count)
+
+    def wrap(self, embeddings: np.ndarray):
+        """
+        Use an existing (possibly memory-mapped, read-only) array as storage.
+
+        Nothing is copied until the next append, so workers that only search
+        keep sharing the mapped pages.
+        """
+        self._buffer = embeddings.reshape(-1, self.dim)
+        self._count = len(self._buffer)
+
+
+def resolve_index_type(requested: str, n_vectors: int) -> str:
+    """Pick the effective index type for a corpus of n_vectors."""
+    requested = (requested or "flat").lower()
+    if requested not in INDEX_TYPES:
+        logger.warning(f"Unknown VECTORDB_INDEX_TYPE '{requested}', using flat")
+        return "flat"
+    if requested != "flat" and n_vectors < settings.VECTORDB_ANN_MIN_VECTORS:
+        return "flat"
+    return requested
+
+
+def index_type_of(index: faiss.Index) -> Optional[str]:
+    """Map a FAISS index instance back to its INDEX_TYPES name."""
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "ivf_pq"
+    if isinstance(index, faiss.IndexIVFFlat):
+        return "ivf_flat"
+    if isinstance(index, faiss.IndexHNSWFlat):
+        return "hnsw"
+    if isinstance(index, faiss.IndexFlat):
+        return "flat"
+    return None
+
+
+def build_index(vectors: np.ndarray, index_type: str) -> faiss.Index:
+    """
+    Build (and train, if needed) a FAISS inner-product index over vectors.
+
+    Args:
+        vectors: (N, D) float32 normalized embeddings
+        index_type: One of INDEX_TYPES (already resolved)
+
+    Returns:
+        Populated FAISS index
+    """
+    n, dim = vectors.shape
+    metric = faiss.METRIC_INNER_PRODUCT
+
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, settings.VECTORDB_HNSW_M, metric)
+        index.hnsw.efConstruction = settings.VECTORDB_HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = settings.VECTORDB_HNSW_EF_SEARCH
+
+    elif index_type in ("ivf_flat", "ivf_pq"):
+        nlist = max(1, min(settings.VECTORDB_IVF_NLIST, n // _MIN_POINTS_PER_CENTROID))
+        quantizer = faiss.IndexFlatIP(dim)
+
+        if index_type == "ivf_pq":
+            pq_m = settings.VECTORDB_PQ_M
+            if dim % pq_m != 0:
+                raise ValueError(f"VECTORDB_PQ_M={pq_m} must divide embedding dimension {dim}")
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_m, 8, metric)
+        else:
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist, metric)
+
+        index.train(vectors)
+        index.nprobe = min(settings.VECTORDB_IVF_NPROBE, nlist)
+
+    else:
+        index = faiss.IndexFlatIP(dim)
+
+    if n:
+        index.add(vectors)
+    return index
+
+
+def evaluate_index(
+    index: faiss.Index,
+    vectors: np.ndarray,
+    k: int = 10,
+    sample_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Measure recall@k and latency of index against exact search.
+
+    Queries are a random sample of corpus vectors; ground truth comes from
+    a brute-force flat index over the same vectors.
+    """
+    n = len(vectors)
+    if n == 0:
+        return {}
+
+    sample_size = min(n, sample_size or settings.VECTORDB_RECALL_SAMPLE_SIZE)
+    rng = np.random.default_rng(0)
+    queries = vectors[rng.choice(n, size=sample_size, replace=False)]
+    k = min(k, n)
+
+    exact = faiss.IndexFlatIP(vectors.shape[1])
+    exact.add(vectors)
+
+    start = time.perf_counter()
+    _, truth = exact.search(queries, k)
+    flat_ms = (time.perf_counter() - start) * 1000 / sample_size
+
+    start = time.perf_counter()
+    _, found = index.search(queries, k)
+    index_ms = (time.perf_counter() - start) * 1000 / sample_size
+
+    hits = sum(
+        len(set(t[t != -1]) & set(f[f != -1]))
+        for t, f in zip(truth, found)
+    )
+
+    return {
+        "recall_at_k": round(hits / (sample_size * k), 4),
+        "k": k,
+        "queries": sample_size,
+        "index_latency_ms": round(index_ms, 4),
+        "flat_latency_ms": round(flat_ms, 4),
+    }
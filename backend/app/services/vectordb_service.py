@@ -9,10 +9,13 @@ Enhanced with:
 - Verification layer integration for 6-layer pipeline
 """
 
+import asyncio
 import os
 import logging
 import pickle
 import re
+import socket
+import threading
 import time
 from typing import List, Tuple, Dict, Any, Optional
 from datetime import datetime, timezone
@@ -31,6 +34,17 @@ from app.models.vectordb import (
 from app.models.verification import (
     LayerResult, LayerStatus, LayerName, TextLayerData
 )
+from app.services.embedding_cache import EmbeddingCache, get_embedding_cache
+from app.services.inference_executor import get_inference_executor
+from app.services.vectordb_artifact import (
+    artifact_exists, read_artifact, read_artifact_index, remove_artifact, write_artifact,
+    training_artifact_prefix, training_fingerprint
+)
+from app.services.vectordb_index import (
+    VectorStore, build_index, evaluate_index, index_type_of, resolve_index_type
+)
+from app.services.vectordb_sync import SampleLog, take_contiguous
+from app.utils.batching import MicroBatcher
 
 logger = logging.getLogger(__name__)
 
@@ -307,10 +321,31 @@ class VectorDBService:
         self.model_name = settings.VECTORDB_MODEL_NAME
         self.embed_dim = settings.VECTORDB_EMBED_DIM
         self.model: Optional[SentenceTransformer] = None
-        self.index: Optional[faiss.IndexFlatIP] = None
+        self.index: Optional[faiss.Index] = None
         self.labels: List[str] = []
         self.texts: List[str] = []
         self.metadata: List[Dict] = []
+        # Full corpus embeddings, used to (re)train approximate indexes
+        self._store = VectorStore(self.embed_dim)
+        # Bumped whenever existing store rows are replaced (not appended to)
+        self._store_generation = 0
+        self._index_type = "flat"
+        self._index_eval: Dict[str, Any] = {}
+        self._samples_since_rebuild = 0
+        self._last_rebuild: Optional[datetime] = None
+        self._rebuild_task: Optional[asyncio.Future] = None
+        self._batcher: Optional[MicroBatcher] = None
+        self._embedding_cache: Optional[EmbeddingCache] = get_embedding_cache(self.model_name, self.embed_dim)
+        # Guards index/texts/labels mutation against searches on pool threads
+        self._index_lock = threading.RLock()
+        # Cluster sample log: rows after _base_count come from it
+        self._sample_log: Optional[SampleLog] = None
+        self._base_count = 0
+        self._log_seq = 0
+        self._snapshot_seq = 0
+        self._sync_lock = asyncio.Lock()
+        self._sync_task: Optional[asyncio.Task] = None
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}"
         self._initialized = False
 
     async def initialize(self):
@@ -325,18 +360,27 @@ class VectorDBService:
             os.environ['TRANSFORMERS_NO_TF'] = '1'
             os.environ['TOKENIZERS_PARALLELISM'] = 'false'
 
-            self.model = SentenceTransformer(self.model_name)
+            # Model load and training-set encoding are blocking; keep them off the event loop
+            await get_inference_executor().run(self._load_model_and_training_data, timeout=None)
 
-            # Initialize FAISS index (Inner Product for cosine similarity)
-            self.index = faiss.IndexFlatIP(self.embed_dim)
+            if self.db is not None and settings.VECTORDB_SYNC_ENABLED:
+                # Samples come from the shared log; a per-process saved index would drift
+                self._sample_log = SampleLog(self.db)
+            else:
+                # Try to load persisted index if exists
+                index_path = Path(settings.VECTORDB_INDEX_PATH)
+                if index_path.with_suffix('.faiss').exists():
+                    await self.load_index(str(index_path))
 
-            # Load training data
-            self._initialize_with_training_data()
+            self._base_count = len(self.texts)
 
-            # Try to load persisted index if exists
-            index_path = Path(settings.VECTORDB_INDEX_PATH)
-            if index_path.with_suffix('.faiss').exists():
-                await self.load_index(str(index_path))
+            if self._sample_log is not None:
+                try:
+                    await self._sample_log.ensure_indexes()
+                    await self.sync_from_log()
+                except Exception as e:
+                    logger.warning(f"VectorDB sample log replay failed, will retry: {e}")
+                self._sync_task = asyncio.create_task(self._sync_loop())
 
             self._initialized = True
             logger.info(f"VectorDB initialized with {self.index.ntotal} vectors")
@@ -345,17 +389,121 @@ class VectorDBService:
             logger.error(f"Failed to initialize VectorDB: {e}")
             raise
 
+    def _load_model_and_training_data(self):
+        """Load the sentence transformer and build the index from training data."""
+        self.model = SentenceTransformer(self.model_name)
+
+        # Fast path: memory-map the prebuilt training artifact
+        if self._load_training_artifact():
+            return
+
+        # Load training data
+        self._initialize_with_training_data()
+
+        # Build the configured FAISS index (Inner Product for cosine similarity)
+        self.rebuild_index()
+
+        # Save for the next worker/boot (best effort)
+        try:
+            self.build_training_artifact(vectors=self._store.vectors)
+        except Exception as e:
+            logger.warning(f"Could not write VectorDB training artifact: {e}")
+
+    def _training_fingerprint(self) -> str:
+        return training_fingerprint(self.model_name, self.embed_dim, self.MARINE_TRAINING_DATA)
+
+    def _load_training_artifact(self) -> bool:
+        """Load training embeddings from the versioned artifact, if current."""
+        prefix = training_artifact_prefix(self._training_fingerprint())
+        artifact = read_artifact(prefix, mmap=True)
+        if artifact is None:
+            return False
+
+        vectors, texts, labels, metadata, _ = artifact
+        self._adopt_corpus(vectors, texts, labels, metadata, read_artifact_index(prefix))
+        logger.info(f"Loaded {len(texts)} training samples from artifact {prefix}")
+        return True
+
+    def build_training_artifact(
+        self,
+        force: bool = False,
+        vectors: Optional[np.ndarray] = None
+    ) -> Tuple[str, bool]:
+        """
+        Write the training-set artifact for the current model and training data.
+
+        Args:
+            force: Rebuild even if an artifact for the fingerprint exists
+            vectors: Already-computed training embeddings (encoded if omitted)
+
+        Returns:
+            (artifact path prefix, whether it was (re)built)
+        """
+        fingerprint = self._training_fingerprint()
+        prefix = training_artifact_prefix(fingerprint)
+        if artifact_exists(prefix) and not force:
+            return prefix, False
+
+        texts = [item[0] for item in self.MARINE_TRAINING_DATA]
+        labels = [item[1] for item in self.MARINE_TRAINING_DATA]
+        if vectors is None:
+            vectors = self.encode_texts(texts)
+        metadata = [
+            {"id": i, "source": "training_data", "timestamp": datetime.now(timezone.utc).isoformat()}
+            for i in range(len(texts))
+        ]
+        index = faiss.IndexFlatIP(self.embed_dim)
+        index.add(vectors)
+
+        write_artifact(
+            prefix, vectors, texts, labels, metadata,
+            extra={"fingerprint": fingerprint, "model_name": self.model_name},
+            index=index
+        )
+        logger.info(f"Wrote VectorDB training artifact {prefix} ({len(texts)} vectors)")
+        return prefix, True
+
+    def _adopt_corpus(
+        self,
+        vectors: np.ndarray,
+        texts: List[str],
+        labels: List[str],
+        metadata: List[Dict],
+        index: Optional[faiss.Index] = None
+    ):
+        """
+        Install a loaded corpus, reusing its saved index when it matches.
+
+        A saved index of the configured type is used as-is (memory-mapped for
+        flat indexes); otherwise the index is rebuilt from the vectors.
+        """
+        with self._index_lock:
+            self._store.wrap(vectors)
+            self._store_generation += 1
+            self.texts = list(texts)
+            self.labels = list(labels)
+            self.metadata = list(metadata)
+
+        target_type = resolve_index_type(settings.VECTORDB_INDEX_TYPE, len(vectors))
+        if index is not None and index.ntotal == len(vectors) and index_type_of(index) == target_type:
+            with self._index_lock:
+                self.index = index
+                self._index_type = target_type
+                self._samples_since_rebuild = 0
+                self._last_rebuild = datetime.now(timezone.utc)
+        else:
+            self.rebuild_index()
+
     def _initialize_with_training_data(self):
         """Initialize FAISS index with training data."""
         texts = [item[0] for item in self.MARINE_TRAINING_DATA]
         labels = [item[1] for item in self.MARINE_TRAINING_DATA]
 
-        # Generate embeddings
-        embeddings = self.model.encode(texts, normalize_embeddings=True)
-        embeddings = embeddings.astype('float32')
+        # Generate embeddings (served from the disk cache after the first boot)
+        embeddings = self.encode_texts(texts)
 
-        # Add to index
-        self.index.add(embeddings)
+        # Add to corpus (the index is built from it afterwards)
+        self._store.append(embeddings)
         self.texts.extend(texts)
         self.labels.extend(labels)
 
@@ -370,34 +518,59 @@ class VectorDBService:
 
         logger.info(f"Initialized with {len(texts)} training samples")
 
+    def encode_texts(self, texts: List[str]) -> np.ndarray:
+        """Encode a list of texts to normalized embeddings, reusing cached ones."""
+        if self._embedding_cache is not None:
+            return self._embedding_cache.encode(texts, self._encode_uncached)
+        return self._encode_uncached(texts)
+
+    def _encode_uncached(self, texts: List[str]) -> np.ndarray:
+        """Encode texts with the model in one forward pass."""
+        embeddings = self.model.encode(
+            texts,
+            batch_size=max(1, min(len(texts), settings.VECTORDB_BATCH_MAX_SIZE)),
+            normalize_embeddings=True
+        )
+        return np.asarray(embeddings, dtype='float32').reshape(len(texts), -1)
+
     def encode_text(self, text: str) -> np.ndarray:
         """Encode text to vector embedding."""
-        embedding = self.model.encode([text], normalize_embeddings=True)
-        return embedding[0].astype('float32')
+        return self.encode_texts([text])[0]
 
-    def classify_hazard(
+    def _search_embeddings(
         self,
-        text: str,
-        threshold: float = None,
-        top_k: int = 10
+        embeddings: np.ndarray,
+        k: int,
+        threshold: float
+    ) -> List[List[VectorSearchResult]]:
+        """Run a single FAISS search over a matrix of query embeddings."""
+        with self._index_lock:
+            scores, indices = self.index.search(embeddings, k)
+            texts, labels, metadata = self.texts, self.labels, self.metadata
+
+        all_results = []
+        for row_scores, row_indices in zip(scores, indices):
+            results = []
+            for score, idx in zip(row_scores, row_indices):
+                if idx != -1 and score >= threshold:
+                    results.append(VectorSearchResult(
+                        rank=len(results) + 1,
+                        score=float(score),
+                        text=texts[idx],
+                        label=labels[idx],
+                        metadata=metadata[idx] if idx < len(metadata) else {}
+                    ))
+            all_results.append(results)
+
+        return all_results
+
+    def _build_classification(
+        self,
+        similar: List[VectorSearchResult],
+        threshold: float,
+        start_time: float
     ) -> ClassificationResult:
-        """
-        Classify text as HAZARD or NOT HAZARD.
-
-        Args:
-            text: Text to classify
-            threshold: Classification threshold (default from config)
-            top_k: Number of similar examples to consider
-
-        Returns:
-            ClassificationResult with classification, confidence, and similar examples
-        """
-        start_time = time.time()
-        threshold = threshold or settings.VECTORDB_CLASSIFICATION_THRESHOLD
-
-        # Search for similar examples
-        similar = self.search_similar(text, k=top_k, threshold=0.3)
-
+        """Turn similarity search results into a weighted-vote classification."""
         if not similar:
             return ClassificationResult(
                 classification="NOT_HAZARD",
@@ -449,6 +622,79 @@ class VectorDBService:
             processing_time_ms=(time.time() - start_time) * 1000
         )
 
+    def classify_hazard(
+        self,
+        text: str,
+        threshold: float = None,
+        top_k: int = 10
+    ) -> ClassificationResult:
+        """
+        Classify text as HAZARD or NOT HAZARD.
+
+        Args:
+            text: Text to classify
+            threshold: Classification threshold (default from config)
+            top_k: Number of similar examples to consider
+
+        Returns:
+            ClassificationResult with classification, confidence, and similar examples
+        """
+        return self._classify_requests([(text, threshold, top_k)])[0]
+
+    def _classify_requests(
+        self,
+        requests: List[Tuple[str, Optional[float], int]]
+    ) -> List[ClassificationResult]:
+        """
+        Classify a batch of (text, threshold, top_k) requests.
+
+        All texts are encoded in one forward pass and searched with one
+        FAISS call using the largest top_k; each request then keeps only its
+        own top_k neighbours, so results match per-text classification.
+        """
+        start_time = time.time()
+
+        texts = [text for text, _, _ in requests]
+        max_k = max(top_k for _, _, top_k in requests)
+
+        embeddings = self.encode_texts(texts)
+        neighbours = self._search_embeddings(embeddings, k=max_k, threshold=0.3)
+
+        results = []
+        for (_, threshold, top_k), similar in zip(requests, neighbours):
+            threshold = threshold or settings.VECTORDB_CLASSIFICATION_THRESHOLD
+            results.append(self._build_classification(similar[:top_k], threshold, start_time))
+
+        return results
+
+    async def classify_hazard_async(
+        self,
+        text: str,
+        threshold: float = None,
+        top_k: int = 10
+    ) -> ClassificationResult:
+        """
+        Classify text through the request coalescer.
+
+        Concurrent callers within VECTORDB_BATCH_WAIT_MS share one encode
+        and one index search.
+        """
+        if self._batcher is None:
+            self._batcher = MicroBatcher(
+                self._classify_requests_in_pool,
+                max_batch_size=settings.VECTORDB_BATCH_MAX_SIZE,
+                max_wait_ms=settings.VECTORDB_BATCH_WAIT_MS,
+                name="vectordb_classify"
+            )
+        return await self._batcher.submit((text, threshold, top_k))
+
+    async def _classify_requests_in_pool(
+        self,
+        requests: List[Tuple[str, Optional[float], int]]
+    ) -> List[ClassificationResult]:
+        """Run a coalesced classification batch on the inference pool."""
+        return await get_inference_executor().run(self._classify_requests, requests)
+
     def search_similar(
         self,
         query_text: str,
@@ -457,74 +703,378 @@ class VectorDBService:
     ) -> List[VectorSearchResult]:
         """Search for similar texts using FAISS."""
         query_embedding = self.encode_text(query_text).reshape(1, -1)
+        return self._search_embeddings(query_embedding, k, threshold)[0]
 
-        scores, indices = self.index.search(query_embedding, k)
-
-        results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx != -1 and score >= threshold:
-                results.append(VectorSearchResult(
-                    rank=len(results) + 1,
-                    score=float(score),
-                    text=self.texts[idx],
-                    label=self.labels[idx],
-                    metadata=self.metadata[idx] if idx < len(self.metadata) else {}
-                ))
+    async def search_similar_async(
+        self,
+        query_text: str,
+        k: int = 5,
+        threshold: float = 0.5
+    ) -> List[VectorSearchResult]:
+        """Search for similar texts on the inference pool."""
+        return await get_inference_executor().run(self.search_similar, query_text, k, threshold)
 
-        return results
+    async def batch_classify_async(
+        self,
+        texts: List[str],
+        threshold: float = None
+    ) -> List[ClassificationResult]:
+        """Classify multiple texts on the inference pool."""
+        return await get_inference_executor().run(self.batch_classify, texts, threshold)
 
     def add_sample(self, text: str, label: str, metadata: Dict = None):
-        """Add new sample to the index."""
+        """Add new sample to this process's index only (see add_sample_async)."""
         embedding = self.encode_text(text)
-        self.index.add(embedding.reshape(1, -1))
-
-        self.texts.append(text)
-        self.labels.append(label)
-        self.metadata.append({
-            "id": len(self.texts) - 1,
-            "text": text,
-            "label": label,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            **(metadata or {})
-        })
-
+        self._apply_samples(
+            embedding.reshape(1, -1),
+            [text],
+            [label],
+            [{"timestamp": datetime.now(timezone.utc).isoformat(), **(metadata or {})}]
+        )
         logger.info(f"Added sample to VectorDB: {text[:50]}... -> {label}")
 
-    async def save_index(self, filepath: str = None):
-        """Persist FAISS index to disk."""
-        filepath = filepath or settings.VECTORDB_INDEX_PATH
+    def _apply_samples(
+        self,
+        embeddings: np.ndarray,
+        texts: List[str],
+        labels: List[str],
+        metadata: List[Dict],
+        log_seq: Optional[int] = None
+    ):
+        """
+        Append samples to the index and corpus.
+
+        Never rebuilds inline (this runs on the request's pool call); async
+        callers follow up with _schedule_rebuild().
+        """
+        with self._index_lock:
+            self.index.add(embeddings)
+            self._store.append(embeddings)
+            self._samples_since_rebuild += len(texts)
+
+            for text, label, meta in zip(texts, labels, metadata):
+                self.texts.append(text)
+                self.labels.append(label)
+                self.metadata.append({
+                    **(meta or {}),
+                    "id": len(self.texts) - 1,
+                    "text": text,
+                    "label": label
+                })
+
+            if log_seq is not None:
+                self._log_seq = log_seq
+
+    def _needs_rebuild(self) -> bool:
+        """Check whether the index should be rebuilt from the corpus."""
+        target_type = resolve_index_type(settings.VECTORDB_INDEX_TYPE, len(self._store))
+        if target_type != self._index_type:
+            # Crossed the ANN size threshold (or configuration changed)
+            return True
+        if self._index_type == "flat" or self._samples_since_rebuild == 0:
+            return False
+        if self._samples_since_rebuild >= settings.VECTORDB_REBUILD_EVERY_SAMPLES:
+            return True
+        if self._last_rebuild is not None:
+            age = (datetime.now(timezone.utc) - self._last_rebuild).total_seconds()
+            return age >= settings.VECTORDB_REBUILD_INTERVAL_SECONDS
+        return False
+
+    def rebuild_index(self):
+        """
+        Rebuild (and retrain) the FAISS index from the full corpus.
+
+        The new index is built outside the lock so searches keep running on
+        the old one; samples added meanwhile are appended before the swap.
+        If the rows were replaced meanwhile (snapshot load), the built index
+        no longer matches texts/labels and the build starts over.
+        """
+        while True:
+            with self._index_lock:
+                vectors = self._store.vectors.copy()
+                generation = self._store_generation
+
+            index_type = resolve_index_type(settings.VECTORDB_INDEX_TYPE, len(vectors))
+            start_time = time.time()
+            index = build_index(vectors, index_type)
+            build_ms = (time.time() - start_time) * 1000
+
+            evaluation = evaluate_index(index, vectors) if index_type != "flat" else {}
+
+            with self._index_lock:
+                if generation != self._store_generation:
+                    logger.info("VectorDB corpus replaced during index rebuild; rebuilding again")
+                    continue
+                if len(self._store) > len(vectors):
+                    index.add(self._store.vectors[len(vectors):])
+                self.index = index
+                self._index_type = index_type
+                self._samples_since_rebuild = 0
+                self._last_rebuild = datetime.now(timezone.utc)
+                self._index_eval = {**evaluation, "build_ms": round(build_ms, 2)}
+            break
+
+        logger.info(
+            f"Rebuilt VectorDB index: {index_type} over {index.ntotal} vectors "
+            f"in {build_ms:.0f}ms"
+            + (f" (recall@{evaluation['k']}: {evaluation['recall_at_k']:.3f})" if evaluation else "")
+        )
 
-        # Ensure directory exists
-        Path(filepath).parent.mkdir(parents=True, exist_ok=True)
+    def _rebuild_running(self) -> bool:
+        task = self._rebuild_task
+        return task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop()
 
-        faiss.write_index(self.index, f"{filepath}.faiss")
+    def _start_rebuild(self) -> asyncio.Future:
+        self._rebuild_task = asyncio.ensure_future(
+            get_inference_executor().run(self.rebuild_index, timeout=None)
+        )
+        self._rebuild_task.add_done_callback(self._rebuild_done)
+        return self._rebuild_task
+
+    @staticmethod
+    def _rebuild_done(task: asyncio.Future):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"VectorDB index rebuild failed: {task.exception()}")
+
+    async def rebuild_index_async(self):
+        """Rebuild the index on the inference pool (joins a rebuild already running)."""
+        task = self._rebuild_task if self._rebuild_running() else self._start_rebuild()
+        await asyncio.shield(task)
+
+    def _schedule_rebuild(self):
+        """Start a background rebuild if one is due and none is running."""
+        if not self._rebuild_running() and self._needs_rebuild():
+            self._start_rebuild()
+
+    async def add_sample_async(self, text: str, label: str, metadata: Dict = None):
+        """
+        Add new sample to the index, encoding on the inference pool.
+
+        With the sample log enabled the sample is appended to the shared log
+        and applied through replay, so every worker picks it up.
+        """
+        executor = get_inference_executor()
+        if self._sample_log is None:
+            await executor.run(self.add_sample, text, label, metadata)
+            self._schedule_rebuild()
+            return
+
+        embedding = (await executor.run(self.encode_texts, [text]))[0]
+        seq = await self._sample_log.append(
+            text,
+            label,
+            {"timestamp": datetime.now(timezone.utc).isoformat(), **(metadata or {})},
+            embedding,
+            self.model_name
+        )
+        await self.sync_from_log()
+        logger.info(f"Added sample #{seq} to VectorDB log: {text[:50]}... -> {label}")
 
-        with open(f"{filepath}.pkl", 'wb') as f:
-            pickle.dump({
-                "texts": self.texts,
-                "labels": self.labels,
-                "metadata": self.metadata,
-                "model_name": self.model_name,
-                "embed_dim": self.embed_dim
-            }, f)
+    # =========================================================================
+    # Cluster synchronization
+    # =========================================================================
+
+    async def sync_from_log(self) -> int:
+        """
+        Replay sample-log entries added (by any worker) since the last sync.
+
+        Loads the compacted snapshot first when this worker is behind it.
+
+        Returns:
+            Number of log entries applied
+        """
+        if self._sample_log is None:
+            return 0
+
+        executor = get_inference_executor()
+        batch_size = settings.VECTORDB_SYNC_BATCH_SIZE
+        applied = 0
+
+        async with self._sync_lock:
+            snapshot = await self._sample_log.get_snapshot()
+            if snapshot:
+                self._snapshot_seq = snapshot["seq"]
+                if snapshot["seq"] > self._log_seq:
+                    await executor.run(self._load_snapshot, snapshot, timeout=None)
+
+            while True:
+                entries = await self._sample_log.fetch_since(self._log_seq, batch_size)
+                ready = take_contiguous(entries, self._log_seq)
+                if ready:
+                    await executor.run(self._apply_log_entries, ready, timeout=None)
+                    applied += len(ready)
+                if len(ready) < batch_size:
+                    break
+
+        self._schedule_rebuild()
+        if applied:
+            logger.info(f"Applied {applied} VectorDB log entries (now at #{self._log_seq})")
+        return applied
+
+    def _apply_log_entries(self, entries: List[Dict[str, Any]]):
+        """Apply replayed log entries, re-encoding any from a different model."""
+        vectors: List[Optional[np.ndarray]] = []
+        stale = []
+        for i, entry in enumerate(entries):
+            if entry.get("model_name") == self.model_name and entry.get("dim") == self.embed_dim:
+                vectors.append(np.frombuffer(entry["embedding"], dtype='float32'))
+            else:
+                vectors.append(None)
+                stale.append(i)
+
+        if stale:
+            encoded = self.encode_texts([entries[i]["text"] for i in stale])
+            for i, vector in zip(stale, encoded):
+                vectors[i] = vector
+
+        self._apply_samples(
+            np.vstack(vectors).astype('float32', copy=False),
+            [entry["text"] for entry in entries],
+            [entry["label"] for entry in entries],
+            [entry.get("metadata") or {} for entry in entries],
+            log_seq=entries[-1]["seq"]
+        )
+
+    def _load_snapshot(self, snapshot: Dict[str, Any]):
+        """Replace log-derived rows with those of a compacted snapshot."""
+        artifact = read_artifact(snapshot["path"], mmap=False)
+        if artifact is None:
+            logger.warning(f"VectorDB snapshot {snapshot['path']} unavailable; samples before #{snapshot['seq']} may be missing")
+            return
+
+        vectors, texts, labels, metadata, _ = artifact
+        with self._index_lock:
+            self._store.truncate(self._base_count)
+            self._store_generation += 1
+            del self.texts[self._base_count:]
+            del self.labels[self._base_count:]
+            del self.metadata[self._base_count:]
+            self.index = build_index(self._store.vectors, "flat")
+            self._index_type = "flat"
+            self._apply_samples(vectors, texts, labels, metadata, log_seq=snapshot["seq"])
+
+        logger.info(f"Loaded VectorDB snapshot #{snapshot['seq']} ({len(texts)} samples)")
+
+    async def compact_sample_log(self) -> Optional[Dict[str, Any]]:
+        """
+        Fold the applied log into a shared snapshot and prune covered entries.
+
+        Only one worker compacts at a time (MongoDB lease).
+
+        Returns:
+            Snapshot summary, or None if there was nothing to do / lease held
+        """
+        if self._sample_log is None:
+            return None
+        if not await self._sample_log.acquire_lease(self._worker_id, settings.VECTORDB_COMPACTION_LEASE_SECONDS):
+            return None
+
+        try:
+            async with self._sync_lock:
+                seq = self._log_seq
+                previous = await self._sample_log.get_snapshot()
+                if previous and previous["seq"] >= seq:
+                    return None
+
+                path = f"{settings.VECTORDB_SNAPSHOT_PATH}-{seq}"
+                count = await get_inference_executor().run(self._write_snapshot, path, timeout=None)
+                await self._sample_log.set_snapshot(seq, path, count)
+                self._snapshot_seq = seq
+
+            pruned = await self._sample_log.prune(seq)
+            if previous and previous["path"] != path:
+                remove_artifact(previous["path"])
+
+            logger.info(f"Compacted VectorDB sample log through #{seq}: {count} samples, {pruned} entries pruned")
+            return {"seq": seq, "path": path, "samples": count, "pruned": pruned}
+        finally:
+            await self._sample_log.release_lease(self._worker_id)
+
+    def _write_snapshot(self, path: str) -> int:
+        """Write log-derived rows to a snapshot artifact."""
+        with self._index_lock:
+            base = self._base_count
+            vectors = self._store.vectors[base:].copy()
+            texts = self.texts[base:]
+            labels = self.labels[base:]
+            metadata = self.metadata[base:]
+            seq = self._log_seq
+
+        write_artifact(path, vectors, texts, labels, metadata, extra={"model_name": self.model_name, "log_seq": seq})
+        return len(texts)
+
+    async def _sync_loop(self):
+        """Background replay (and periodic compaction) of the sample log."""
+        while True:
+            await asyncio.sleep(settings.VECTORDB_SYNC_INTERVAL_SECONDS)
+            try:
+                # Also starts interval-based rebuilds (see _schedule_rebuild)
+                await self.sync_from_log()
+                if self._log_seq - self._snapshot_seq >= settings.VECTORDB_COMPACT_EVERY_SAMPLES:
+                    await self.compact_sample_log()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"VectorDB sample log sync failed: {e}")
+
+    async def shutdown(self):
+        """Stop background log replay and stop waiting on a background rebuild."""
+        if self._rebuild_running():
+            self._rebuild_task.cancel()
+        if self._sync_task:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+
+    async def save_index(self, filepath: str = None):
+        """Persist FAISS index and corpus to disk (artifact format)."""
+        filepath = filepath or settings.VECTORDB_INDEX_PATH
+
+        with self._index_lock:
+            write_artifact(
+                filepath,
+                self._store.vectors,
+                self.texts,
+                self.labels,
+                self.metadata,
+                extra={"model_name": self.model_name},
+                index=self.index
+            )
 
         logger.info(f"Saved VectorDB to {filepath}")
 
     async def load_index(self, filepath: str):
-        """Load FAISS index from disk."""
+        """Load FAISS index and corpus from disk."""
         try:
-            self.index = faiss.read_index(f"{filepath}.faiss")
+            artifact = read_artifact(filepath, mmap=True) if artifact_exists(filepath) else None
+            if artifact is not None:
+                vectors, texts, labels, metadata, _ = artifact
+            else:
+                vectors, texts, labels, metadata = self._read_legacy_index(filepath)
 
-            with open(f"{filepath}.pkl", 'rb') as f:
-                data = pickle.load(f)
-                self.texts = data["texts"]
-                self.labels = data["labels"]
-                self.metadata = data["metadata"]
+            self._adopt_corpus(vectors, texts, labels, metadata, read_artifact_index(filepath))
 
             logger.info(f"Loaded VectorDB from {filepath} ({self.index.ntotal} vectors)")
         except Exception as e:
             logger.warning(f"Could not load index from {filepath}: {e}")
 
+    def _read_legacy_index(self, filepath: str) -> Tuple[np.ndarray, List[str], List[str], List[Dict]]:
+        """Read an index saved in the older .faiss + .pkl format."""
+        with open(f"{filepath}.pkl", 'rb') as f:
+            data = pickle.load(f)
+
+        vectors_path = Path(f"{filepath}.npy")
+        if vectors_path.exists():
+            vectors = np.load(vectors_path)
+        else:
+            index = faiss.read_index(f"{filepath}.faiss")
+            vectors = index.reconstruct_n(0, index.ntotal)
+
+        return vectors, data["texts"], data["labels"], data["metadata"]
+
     def get_statistics(self) -> VectorDBStats:
         """Get VectorDB statistics."""
         label_counts = {}
@@ -534,11 +1084,27 @@ class VectorDBService:
         return VectorDBStats(
             total_vectors=self.index.ntotal if self.index else 0,
             embedding_dimension=self.embed_dim,
-            index_type="IndexFlatIP",
+            index_type=type(self.index).__name__ if self.index else "none",
             model_name=self.model_name,
             label_distribution=label_counts,
             is_trained=self.index.is_trained if self.index else False,
-            is_initialized=self._initialized
+            is_initialized=self._initialized,
+            configured_index_type=settings.VECTORDB_INDEX_TYPE,
+            index_quality={
+                **self._index_eval,
+                "active_type": self._index_type,
+                "samples_since_rebuild": self._samples_since_rebuild,
+                "last_rebuild": self._last_rebuild.isoformat() if self._last_rebuild else None
+            },
+            batching=self._batcher.get_stats() if self._batcher else {},
+            embedding_cache=self._embedding_cache.get_stats() if self._embedding_cache else {},
+            inference=get_inference_executor().get_stats(),
+            sync={
+                "enabled": self._sample_log is not None,
+                "log_seq": self._log_seq,
+                "snapshot_seq": self._snapshot_seq,
+                "log_samples": len(self.texts) - self._base_count
+            }
         )
 
     def batch_classify(
@@ -546,8 +1112,10 @@ class VectorDBService:
         texts: List[str],
         threshold: float = None
     ) -> List[ClassificationResult]:
-        """Classify multiple texts."""
-        return [self.classify_hazard(text, threshold) for text in texts]
+        """Classify multiple texts with a single encode and index search."""
+        if not texts:
+            return []
+        return self._classify_requests([(text, threshold, 10) for text in texts])
 
     # =============================================================================
     # VERIFICATION LAYER METHODS (Enhanced for 6-layer pipeline)
@@ -678,14 +1246,13 @@ class VectorDBService:
             # 2. Panic level calculation
             panic_level = self.calculate_panic_level(text)
 
-            # 3. Vector similarity classification
-            classification = self.classify_hazard(text, top_k=10)
+            # 3. Vector similarity classification (coalesced with concurrent reports)
+            classification = await self.classify_hazard_async(text, top_k=10)
 
-            # 4. Get top matches for layer data
-            similar_results = self.search_similar(text, k=3, threshold=0.3)
+            # 4. Get top matches for layer data (same 0.3 cut-off, already ranked)
             top_matches = [
                 {"text": r.text[:100], "label": r.label, "score": r.score}
-                for r in similar_results
+                for r in classification.similar_examples[:3]
             ]
 
             # 5. Map predicted type to system hazard type
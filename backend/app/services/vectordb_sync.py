@@ -0,0 +1,143 @@
+"""
+VectorDB Sample Log
+Append-only MongoDB log of labeled samples shared by every worker and replica.
+
+Collections:
+- vectordb_sample_log:  one document per added sample, with a cluster-wide
+                        increasing `seq` and its float32 embedding
+- vectordb_sync_state:  the sequence counter, the latest snapshot pointer
+                        and the compaction lease
+
+Each worker replays entries above the last seq it applied, in batches, so a
+sample added on one worker becomes searchable on all of them within
+VECTORDB_SYNC_INTERVAL_SECONDS. Compaction folds the log into a snapshot
+artifact (see vectordb_artifact) under VECTORDB_SNAPSHOT_PATH and prunes the
+entries it covers; that path must be on storage shared by all replicas.
+"""
+
+import logging
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# How long a gap in seq may stay open before it is treated as an abandoned
+# write (seq allocated, insert never completed) and skipped
+_GAP_GRACE_SECONDS = 30
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def take_contiguous(entries: List[Dict[str, Any]], last_seq: int) -> List[Dict[str, Any]]:
+    """
+    Return the prefix of entries that can be applied after last_seq.
+
+    Sequence numbers are allocated before the insert, so a higher seq can
+    become visible before a lower one. Replay stops at a gap unless the
+    entry after it is older than the grace period.
+    """
+    taken = []
+    expected = last_seq + 1
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=_GAP_GRACE_SECONDS)
+
+    for entry in entries:
+        if entry["seq"] != expected:
+            created_at = entry.get("created_at")
+            if created_at is None or _as_utc(created_at) > cutoff:
+                break
+            logger.warning(f"Skipping VectorDB sample log gap {expected}..{entry['seq'] - 1}")
+        taken.append(entry)
+        expected = entry["seq"] + 1
+
+    return taken
+
+
+class SampleLog:
+    """MongoDB-backed append-only sample log."""
+
+    def __init__(self, db: AsyncIOMotorDatabase):
+        self.db = db
+        self.entries = db.vectordb_sample_log
+        self.state = db.vectordb_sync_state
+
+    async def ensure_indexes(self):
+        await self.entries.create_index([("seq", ASCENDING)], unique=True)
+
+    async def append(
+        self,
+        text: str,
+        label: str,
+        metadata: Dict[str, Any],
+        embedding: np.ndarray,
+        model_name: str
+    ) -> int:
+        """Append a sample and return its sequence number."""
+        counter = await self.state.find_one_and_update(
+            {"_id": "sample_seq"},
+            {"$inc": {"value": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        seq = counter["value"]
+
+        embedding = np.asarray(embedding, dtype='float32').ravel()
+        await self.entries.insert_one({
+            "seq": seq,
+            "text": text,
+            "label": label,
+            "metadata": metadata,
+            "model_name": model_name,
+            "dim": int(embedding.shape[0]),
+            "embedding": embedding.tobytes(),
+            "created_at": datetime.now(timezone.utc)
+        })
+        return seq
+
+    async def fetch_since(self, seq: int, limit: int) -> List[Dict[str, Any]]:
+        """Entries with seq greater than the given one, in order."""
+        cursor = self.entries.find({"seq": {"$gt": seq}}, {"_id": 0}).sort("seq", ASCENDING).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def get_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Latest compacted snapshot pointer ({seq, path, count}), if any."""
+        return await self.state.find_one({"_id": "snapshot"})
+
+    async def set_snapshot(self, seq: int, path: str, count: int):
+        await self.state.update_one(
+            {"_id": "snapshot"},
+            {"$set": {"seq": seq, "path": path, "count": count, "created_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+
+    async def prune(self, through_seq: int) -> int:
+        """Delete entries covered by a snapshot."""
+        result = await self.entries.delete_many({"seq": {"$lte": through_seq}})
+        return result.deleted_count
+
+    async def acquire_lease(self, owner: str, ttl_seconds: int) -> bool:
+        """Try to take the compaction lease (held until released or expired)."""
+        now = datetime.now(timezone.utc)
+        try:
+            lease = await self.state.find_one_and_update(
+                {"_id": "compaction_lease", "$or": [{"owner": owner}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": owner, "expires_at": now + timedelta(seconds=ttl_seconds)}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # Lease document exists and is held by another worker
+            return False
+        return lease is not None and lease.get("owner") == owner
+
+    async def release_lease(self, owner: str):
+        await self.state.update_one(
+            {"_id": "compaction_lease", "owner": owner},
+            {"$set": {"expires_at": datetime.now(timezone.utc)}}
+        )
@@ -0,0 +1,234 @@
+"""
+Verification Layer Cache
+Memoizes individual verification layer results by a fingerprint of their inputs.
+
+Re-verification, bulk re-scoring and duplicate submissions usually repeat the
+same location, description and photo; each layer result is reused while its
+TTL (VERIFICATION_CACHE_*_TTL_SECONDS) lasts instead of running the vector
+search, vision model or geofence query again. A TTL of 0 disables caching
+for that layer (the reporter layer by default, since trust scores move with
+every verification).
+
+Tier 1: In-process LRU with per-entry expiry (VERIFICATION_CACHE_MAX_ITEMS)
+Tier 2: Redis, when connected, shared across workers
+
+Results that carry an "error" in their data are never cached.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import settings
+from app.database import get_redis
+from app.models.verification import LayerName, LayerResult
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "verification_cache:"
+
+
+def fingerprint(*parts: Any) -> str:
+    """Stable digest of a layer's inputs."""
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def file_fingerprint(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 of a file's content (blocking; run off the event loop)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _is_cacheable(result: LayerResult) -> bool:
+    return "error" not in (result.data or {})
+
+
+class LayerResultCache:
+    """Per-layer LRU + TTL memo of LayerResults with optional Redis backing."""
+
+    def __init__(
+        self,
+        ttls: Dict[LayerName, float],
+        max_items: int = 4096,
+        redis_enabled: bool = True
+    ):
+        """
+        Args:
+            ttls: Lifetime in seconds per layer (0 or missing disables the layer)
+            max_items: Local LRU capacity across all layers
+            redis_enabled: Share entries through Redis when it is connected
+        """
+        self.ttls = ttls
+        self.max_items = max(1, max_items)
+        self.redis_enabled = redis_enabled
+
+        # key -> (expires_at, result as JSON-compatible dict)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._layers: Dict[str, Dict[str, int]] = {}
+
+    def enabled(self, layer: LayerName) -> bool:
+        return self.ttls.get(layer, 0) > 0
+
+    def _count(self, layer: LayerName, outcome: str):
+        counts = self._layers.setdefault(layer.value, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    def _get_local(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, payload = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def _put_local(self, key: str, payload: Dict[str, Any], expires_at: float):
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+
+    async def _redis(self):
+        return await get_redis() if self.redis_enabled else None
+
+    async def _get_remote(self, key: str) -> Tuple[Optional[Dict[str, Any]], float]:
+        redis = await self._redis()
+        if redis is None:
+            return None, 0.0
+        try:
+            raw = await redis.get(_REDIS_PREFIX + key)
+            if raw:
+                envelope = json.loads(raw)
+                if envelope["expires_at"] > time.time():
+                    return envelope["result"], envelope["expires_at"]
+        except Exception as e:
+            logger.debug(f"Verification cache Redis read failed for {key}: {e}")
+        return None, 0.0
+
+    async def _put_remote(self, key: str, payload: Dict[str, Any], expires_at: float):
+        redis = await self._redis()
+        if redis is None:
+            return
+        try:
+            envelope = json.dumps({"expires_at": expires_at, "result": payload})
+            await redis.set(_REDIS_PREFIX + key, envelope, ex=max(1, int(expires_at - time.time())))
+        except Exception as e:
+            logger.debug(f"Verification cache Redis write failed for {key}: {e}")
+
+    async def get_or_run(
+        self,
+        layer: LayerName,
+        key: str,
+        run: Callable[[], Awaitable[LayerResult]],
+        refresh: bool = False
+    ) -> Tuple[LayerResult, bool]:
+        """
+        Return the memoized result for a layer's inputs, running the layer on a miss.
+
+        Args:
+            layer: Verification layer
+            key: Fingerprint of the layer's inputs
+            run: Coroutine function computing the layer result
+            refresh: Ignore cached results (the fresh result is still stored)
+
+        Returns:
+            (result, served_from_cache); each caller gets its own copy
+        """
+        if not self.enabled(layer):
+            return await run(), False
+
+        full_key = f"{layer.value}:{key}"
+
+        if not refresh:
+            payload = self._get_local(full_key)
+            if payload is None:
+                payload, expires_at = await self._get_remote(full_key)
+                if payload is not None:
+                    self._put_local(full_key, payload, expires_at)
+            if payload is not None:
+                self._count(layer, "hits")
+                return LayerResult.model_validate(payload), True
+
+        task = self._inflight.get(full_key)
+        if task is None:
+            self._count(layer, "misses")
+            task = asyncio.ensure_future(self._run_and_store(layer, full_key, run))
+            self._inflight[full_key] = task
+            task.add_done_callback(lambda t: self._finish(full_key, t))
+            return (await asyncio.shield(task)).model_copy(deep=True), False
+
+        # Identical inputs already running (duplicate submission): share that run
+        self._count(layer, "hits")
+        return (await asyncio.shield(task)).model_copy(deep=True), True
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def _run_and_store(
+        self,
+        layer: LayerName,
+        key: str,
+        run: Callable[[], Awaitable[LayerResult]]
+    ) -> LayerResult:
+        result = await run()
+        if _is_cacheable(result):
+            payload = result.model_dump(mode="json")
+            expires_at = time.time() + self.ttls[layer]
+            self._put_local(key, payload, expires_at)
+            await self._put_remote(key, payload, expires_at)
+        return result
+
+    def clear(self, layer: Optional[LayerName] = None):
+        """Drop local entries, optionally only those of one layer."""
+        if layer is None:
+            self._entries.clear()
+        else:
+            prefix = f"{layer.value}:"
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-layer hit/miss statistics."""
+        return {
+            "items": len(self._entries),
+            "max_items": self.max_items,
+            "inflight": len(self._inflight),
+            "ttl_seconds": {layer.value: ttl for layer, ttl in self.ttls.items()},
+            "layers": {name: dict(counts) for name, counts in self._layers.items()},
+        }
+
+
+# Singleton instance
+_layer_cache: Optional[LayerResultCache] = None
+
+
+def get_layer_cache() -> LayerResultCache:
+    """Get or create the verification layer cache."""
+    global _layer_cache
+    if _layer_cache is None:
+        _layer_cache = LayerResultCache(
+            ttls={
+                LayerName.GEOFENCE: settings.VERIFICATION_CACHE_GEOFENCE_TTL_SECONDS,
+                LayerName.WEATHER: settings.VERIFICATION_CACHE_WEATHER_TTL_SECONDS,
+                LayerName.TEXT: settings.VERIFICATION_CACHE_TEXT_TTL_SECONDS,
+                LayerName.IMAGE: settings.VERIFICATION_CACHE_IMAGE_TTL_SECONDS,
+                LayerName.REPORTER: settings.VERIFICATION_CACHE_REPORTER_TTL_SECONDS,
+            },
+            max_items=settings.VERIFICATION_CACHE_MAX_ITEMS,
+            redis_enabled=settings.VERIFICATION_CACHE_REDIS_ENABLED
+        )
+    return _layer_cache
@@ -0,0 +1,155 @@
+"""
+Verification Metrics
+Latency histograms for each stage of the verification pipeline.
+
+Every VerificationResult carries per-stage timings (geofence, weather, text,
+image, reporter, trust_update, decision, plus the total). They are folded
+into fixed-bucket histograms, so memory stays constant and percentiles can
+be estimated without keeping samples. The same histograms are rendered in
+Prometheus text exposition format for scraping.
+"""
+
+import bisect
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.models.verification import VerificationResult
+
+# Upper bounds in milliseconds; the last bucket is +Inf
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000
+)
+
+TOTAL_STAGE = "total"
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations in milliseconds."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.counts[bisect.bisect_left(self.buckets, duration_ms)] += 1
+        self.count += 1
+        self.sum_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th percentile (0-100) by interpolating inside its bucket."""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max_ms
+                fraction = (rank - seen) / bucket_count
+                return min(lower + (upper - lower) * fraction, self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class VerificationMetrics:
+    """Per-stage latency histograms plus cache-hit, fallback and decision counters."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._cache_hits: Dict[str, int] = {}
+        self._fallbacks: Dict[str, int] = {}
+        self._decisions: Dict[str, int] = {}
+
+    def _histogram(self, stage: str) -> LatencyHistogram:
+        if stage not in self._histograms:
+            self._histograms[stage] = LatencyHistogram()
+        return self._histograms[stage]
+
+    def observe(self, result: VerificationResult):
+        """Record the timings and decision of one verification."""
+        for timing in result.timings:
+            self._histogram(timing.stage).observe(timing.duration_ms)
+            if timing.cache_hit:
+                self._cache_hits[timing.stage] = self._cache_hits.get(timing.stage, 0) + 1
+            if timing.fallback:
+                self._fallbacks[timing.stage] = self._fallbacks.get(timing.stage, 0) + 1
+        self._histogram(TOTAL_STAGE).observe(result.processing_time_ms)
+        decision = result.decision.value
+        self._decisions[decision] = self._decisions.get(decision, 0) + 1
+
+    def get_stats(self) -> Dict[str, object]:
+        """Percentiles per stage, slowest p95 first."""
+        stages = {}
+        for stage, histogram in self._histograms.items():
+            stages[stage] = {
+                **histogram.snapshot(),
+                "cache_hits": self._cache_hits.get(stage, 0),
+                "fallbacks": self._fallbacks.get(stage, 0),
+            }
+        ordered = dict(sorted(stages.items(), key=lambda item: item[1]["p95_ms"], reverse=True))
+        return {
+            "since": self.started_at,
+            "verifications": self._histograms[TOTAL_STAGE].count if TOTAL_STAGE in self._histograms else 0,
+            "decisions": dict(self._decisions),
+            "stages": ordered,
+        }
+
+    def to_prometheus(self, prefix: str = "coastguardian_verification") -> str:
+        """Render metrics in Prometheus text exposition format (version 0.0.4)."""
+        lines = [
+            f"# HELP {prefix}_stage_duration_seconds Verification stage latency.",
+            f"# TYPE {prefix}_stage_duration_seconds histogram",
+        ]
+        for stage in sorted(self._histograms):
+            histogram = self._histograms[stage]
+            cumulative = 0
+            for upper_ms, bucket_count in zip(histogram.buckets + (math.inf,), histogram.counts):
+                cumulative += bucket_count
+                le = "+Inf" if upper_ms == math.inf else _format_float(upper_ms / 1000)
+                lines.append(f'{prefix}_stage_duration_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_stage_duration_seconds_sum{{stage="{stage}"}} {_format_float(histogram.sum_ms / 1000)}')
+            lines.append(f'{prefix}_stage_duration_seconds_count{{stage="{stage}"}} {histogram.count}')
+
+        for name, help_text, counts, label in (
+            ("stage_cache_hits_total", "Stages served from the layer result cache.", self._cache_hits, "stage"),
+            ("stage_fallbacks_total", "Stages that returned a degraded/default result.", self._fallbacks, "stage"),
+            ("decisions_total", "Verification decisions.", self._decisions, "decision"),
+        ):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} counter")
+            for key in sorted(counts):
+                lines.append(f'{prefix}_{name}{{{label}="{key}"}} {counts[key]}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_float(value: float) -> str:
+    return repr(round(value, 6))
+
+
+# Singleton instance
+_verification_metrics: Optional[VerificationMetrics] = None
+
+
+def get_verification_metrics() -> VerificationMetrics:
+    """Get or create the verification metrics registry."""
+    global _verification_metrics
+    if _verification_metrics is None:
+        _verification_metrics = VerificationMetrics()
+    return _verification_metrics
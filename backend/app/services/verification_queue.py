@@ -0,0 +1,615 @@
+"""
+Verification Queue
+Persistent priority queue for verifying newly submitted hazard reports.
+
+create_hazard_report used to run the whole verification pipeline inside the
+request, so a flood of low-priority reports delayed the verification of a
+tsunami warning. New reports are now enqueued in verification_queue
+(MongoDB: queued work survives restarts and is shared by every API process)
+in one of four lanes:
+
+- critical: tsunami or warning-level threat classification, or a reporter
+  with an open SOS
+- high / normal / low: by hazard type (HAZARD_TYPE_LANES)
+
+Each lane has its own workers, capped by VERIFICATION_QUEUE_<LANE>_WORKERS.
+A worker claims the oldest due job of its own lane or of a higher lane, so
+idle lower-lane workers help with urgent work but never the reverse: the
+critical lane keeps its capacity however deep the other lanes are. The caps
+also bound how much low-priority work is in flight on the shared inference
+pool.
+
+Workers are started on demand (on enqueue, and by a supervisor that checks
+lane depth every VERIFICATION_QUEUE_POLL_SECONDS) and exit after
+VERIFICATION_QUEUE_IDLE_SECONDS without work.
+
+Claims are leases: a job whose worker died is claimed again once its lease
+expires. Failed attempts are retried with exponential backoff; after
+VERIFICATION_QUEUE_MAX_ATTEMPTS the job is dead-lettered until an admin
+requeues it.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.config import settings
+from app.database import MongoDB
+from app.models.hazard import HazardType, ThreatLevel, VerificationStatus
+from app.models.sos import SOSStatus
+from app.models.verification import VerificationLane, VerificationQueueStatus, VerificationResult
+from app.services.auto_ticket_service import get_auto_ticket_service
+from app.services.response_cache import TAG_REPORTS, invalidate_responses
+from app.services.verification_metrics import LatencyHistogram
+from app.services.verification_service import (
+    VerificationService, get_verification_service, map_decision_to_status,
+    report_from_document, fetch_report_image, remove_temp_image
+)
+
+logger = logging.getLogger(__name__)
+
+QUEUE_COLLECTION = "verification_queue"
+
+# Highest priority first; a job's "priority" field is its index here
+LANE_ORDER: List[VerificationLane] = [
+    VerificationLane.CRITICAL,
+    VerificationLane.HIGH,
+    VerificationLane.NORMAL,
+    VerificationLane.LOW,
+]
+LANE_PRIORITY: Dict[VerificationLane, int] = {lane: i for i, lane in enumerate(LANE_ORDER)}
+
+HAZARD_TYPE_LANES: Dict[str, VerificationLane] = {
+    HazardType.STORM_SURGE.value: VerificationLane.HIGH,
+    HazardType.FLOODED_COASTLINE.value: VerificationLane.HIGH,
+    HazardType.OIL_SPILL.value: VerificationLane.HIGH,
+    HazardType.CHEMICAL_SPILL.value: VerificationLane.HIGH,
+    HazardType.SHIP_WRECK.value: VerificationLane.HIGH,
+    HazardType.HIGH_WAVES.value: VerificationLane.NORMAL,
+    HazardType.RIP_CURRENT.value: VerificationLane.NORMAL,
+    HazardType.BEACHED_ANIMAL.value: VerificationLane.NORMAL,
+    HazardType.FISHER_NETS.value: VerificationLane.NORMAL,
+    HazardType.PLASTIC_POLLUTION.value: VerificationLane.LOW,
+}
+
+OPEN_SOS_STATUSES = [SOSStatus.ACTIVE.value, SOSStatus.ACKNOWLEDGED.value, SOSStatus.DISPATCHED.value]
+
+
+def _value(value: Any) -> Any:
+    return getattr(value, "value", value)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """MongoDB returns naive UTC datetimes unless the client is tz-aware."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def classify_lane(doc: Dict[str, Any], has_open_sos: bool = False) -> VerificationLane:
+    """
+    Pick the priority lane for a report.
+
+    Args:
+        doc: Hazard report document
+        has_open_sos: Whether the reporter has an open SOS alert
+
+    Returns:
+        The lane the report is verified in
+    """
+    if has_open_sos:
+        return VerificationLane.CRITICAL
+
+    classification = doc.get("hazard_classification") or {}
+    if isinstance(classification, dict):
+        threat_level = _value(classification.get("threat_level"))
+        tsunami_threat = _value(classification.get("tsunami_threat"))
+        if threat_level == ThreatLevel.WARNING.value or tsunami_threat in (
+            ThreatLevel.WARNING.value, ThreatLevel.ALERT.value
+        ):
+            return VerificationLane.CRITICAL
+        if threat_level == ThreatLevel.ALERT.value:
+            return VerificationLane.HIGH
+
+    return HAZARD_TYPE_LANES.get(_value(doc.get("hazard_type")), VerificationLane.NORMAL)
+
+
+async def verify_and_apply_report(
+    db: AsyncIOMotorDatabase,
+    doc: Dict[str, Any],
+    service: Optional[VerificationService] = None
+) -> VerificationResult:
+    """
+    Run the verification pipeline on a stored report and write the outcome.
+
+    Updates the report's verification fields and auto-generates a ticket
+    when the report is AI-approved.
+
+    Args:
+        db: Database connection
+        doc: Hazard report document
+        service: Verification service (defaults to the shared one)
+
+    Returns:
+        The verification result
+    """
+    if service is None:
+        service = get_verification_service(db)
+        if not service._initialized:
+            await service.initialize()
+
+    report = report_from_document(doc)
+    image_path, temp_path = await fetch_report_image(report.image_url)
+    try:
+        result = await service.verify_report(report, image_path=image_path, db=db)
+    finally:
+        remove_temp_image(temp_path)
+
+    new_status = map_decision_to_status(result.decision)
+
+    geofence_result = next(
+        (lr for lr in result.layer_results if lr.layer_name.value == "geofence"),
+        None
+    )
+    geofence_valid = geofence_result.status.value == "pass" if geofence_result else None
+    geofence_distance = None
+    if geofence_result and geofence_result.data:
+        geofence_distance = geofence_result.data.get("distance_to_coast_km")
+
+    vision_result = next(
+        (lr for lr in result.layer_results if lr.layer_name.value == "image"),
+        None
+    )
+    vision_classification = vision_result.data if vision_result else None
+
+    await db.hazard_reports.update_one(
+        {"report_id": report.report_id},
+        {
+            "$set": {
+                "verification_status": new_status.value,
+                "verification_score": result.composite_score,
+                "verification_result": result.model_dump(),
+                "verification_id": result.verification_id,
+                "geofence_valid": geofence_valid,
+                "geofence_distance_km": geofence_distance,
+                "vision_classification": vision_classification,
+                "verified_at": datetime.now(timezone.utc) if new_status == VerificationStatus.VERIFIED else None,
+                "updated_at": datetime.now(timezone.utc)
+            }
+        }
+    )
+    await invalidate_responses(TAG_REPORTS)
+
+    logger.info(
+        f"Verification complete for {report.report_id}: "
+        f"score={result.composite_score:.1f}%, "
+        f"decision={result.decision.value}"
+    )
+
+    # AUTO-GENERATE TICKET for AI-approved reports
+    if new_status == VerificationStatus.VERIFIED:
+        try:
+            updated_doc = await db.hazard_reports.find_one({"report_id": report.report_id})
+            ticket_result = await get_auto_ticket_service(db).create_ticket_for_approved_report(
+                report_doc=updated_doc,
+                approver=None,  # No manual approver for AI-approval
+                approval_type="auto",
+                db=db
+            )
+            if ticket_result:
+                ticket, _ = ticket_result
+                logger.info(f"Auto-generated ticket {ticket.ticket_id} for AI-approved report {report.report_id}")
+        except Exception as ticket_error:
+            logger.warning(f"Failed to auto-generate ticket for report {report.report_id}: {ticket_error}")
+            # Non-blocking - report is still verified
+
+    return result
+
+
+class VerificationQueue:
+    """Priority lanes of verification work with autoscaled workers."""
+
+    def __init__(
+        self,
+        db: Optional[AsyncIOMotorDatabase] = None,
+        service: Optional[VerificationService] = None,
+        worker_limits: Optional[Dict[VerificationLane, int]] = None
+    ):
+        """
+        Args:
+            db: Database (defaults to the app connection)
+            service: Verification service (defaults to the shared one)
+            worker_limits: Max concurrent workers per lane (defaults to settings)
+        """
+        self.db = db
+        self._service = service
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.worker_limits = worker_limits or {
+            VerificationLane.CRITICAL: settings.VERIFICATION_QUEUE_CRITICAL_WORKERS,
+            VerificationLane.HIGH: settings.VERIFICATION_QUEUE_HIGH_WORKERS,
+            VerificationLane.NORMAL: settings.VERIFICATION_QUEUE_NORMAL_WORKERS,
+            VerificationLane.LOW: settings.VERIFICATION_QUEUE_LOW_WORKERS,
+        }
+
+        self._workers: Dict[VerificationLane, Set[asyncio.Task]] = {lane: set() for lane in LANE_ORDER}
+        self._idle: Dict[VerificationLane, int] = {lane: 0 for lane in LANE_ORDER}
+        self._wakeup: Dict[VerificationLane, asyncio.Event] = {lane: asyncio.Event() for lane in LANE_ORDER}
+        self._supervisor: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Enqueue -> first claim, and claim -> finished, per lane (this process)
+        self._wait_ms: Dict[VerificationLane, LatencyHistogram] = {lane: LatencyHistogram() for lane in LANE_ORDER}
+        self._run_ms: Dict[VerificationLane, LatencyHistogram] = {lane: LatencyHistogram() for lane in LANE_ORDER}
+        self._completed = 0
+        self._retried = 0
+        self._dead_lettered = 0
+
+    def _get_db(self) -> AsyncIOMotorDatabase:
+        return self.db if self.db is not None else MongoDB.get_database()
+
+    async def _get_service(self, db: AsyncIOMotorDatabase) -> VerificationService:
+        service = self._service or get_verification_service(db)
+        if not service._initialized:
+            await service.initialize()
+        return service
+
+    # -------------------------------------------------------------------------
+    # Producers
+    # -------------------------------------------------------------------------
+
+    async def _has_open_sos(self, db: AsyncIOMotorDatabase, user_id: Optional[str]) -> bool:
+        if not user_id:
+            return False
+        try:
+            sos = await db.sos_alerts.find_one(
+                {"user_id": user_id, "status": {"$in": OPEN_SOS_STATUSES}}, {"_id": 1}
+            )
+            return sos is not None
+        except Exception as e:
+            logger.warning(f"SOS lookup failed for {user_id}, using hazard lane: {e}")
+            return False
+
+    async def enqueue(self, doc: Dict[str, Any], db: Optional[AsyncIOMotorDatabase] = None) -> Dict[str, Any]:
+        """
+        Queue a stored report for verification.
+
+        Args:
+            doc: Hazard report document
+            db: Database connection
+
+        Returns:
+            The queue job (the existing one if the report is already queued)
+        """
+        if db is not None:
+            self.db = db
+        db = self._get_db()
+
+        lane = classify_lane(doc, await self._has_open_sos(db, doc.get("user_id")))
+        now = datetime.now(timezone.utc)
+        job = {
+            "report_id": doc["report_id"],
+            "user_id": doc.get("user_id"),
+            "hazard_type": _value(doc.get("hazard_type")),
+            "lane": lane.value,
+            "priority": LANE_PRIORITY[lane],
+            "status": VerificationQueueStatus.QUEUED.value,
+            "attempts": 0,
+            "available_at": now,
+            "enqueued_at": now,
+            "started_at": None,
+            "lease_until": None,
+            "owner": None,
+            "last_error": None,
+            "completed_at": None,
+            "updated_at": now,
+        }
+        try:
+            await db[QUEUE_COLLECTION].insert_one(job)
+        except DuplicateKeyError:
+            logger.debug(f"Report {doc['report_id']} is already queued for verification")
+            return await db[QUEUE_COLLECTION].find_one({"report_id": doc["report_id"]}, {"_id": 0})
+        job.pop("_id", None)
+
+        logger.info(f"Queued verification of {doc['report_id']} in {lane.value} lane")
+        self._notify(lane)
+        return job
+
+    def _notify(self, lane: VerificationLane):
+        """Wake idle workers that may take a job of this lane, scaling the lane up if none are idle."""
+        self.start()
+        for worker_lane in LANE_ORDER[LANE_PRIORITY[lane]:]:
+            self._wakeup[worker_lane].set()
+        if not any(self._idle[w] for w in LANE_ORDER[LANE_PRIORITY[lane]:]):
+            self._scale(lane, 1)
+
+    # -------------------------------------------------------------------------
+    # Workers
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """Start the supervisor (picks up queued work left by earlier runs and other processes)."""
+        if self._supervisor is None or self._supervisor.done():
+            self._stopping = False
+            self._supervisor = asyncio.create_task(self._supervise())
+
+    def _scale(self, lane: VerificationLane, due: int):
+        """Start workers for due jobs that no idle worker of the lane can take."""
+        workers = self._workers[lane]
+        spawn = min(self.worker_limits.get(lane, 0) - len(workers), due - self._idle[lane])
+        for _ in range(max(0, spawn)):
+            task = asyncio.create_task(self._worker(lane))
+            workers.add(task)
+            task.add_done_callback(workers.discard)
+
+    async def _supervise(self):
+        while not self._stopping:
+            try:
+                due = await self._due_counts()
+                for lane in LANE_ORDER:
+                    self._scale(lane, due.get(lane.value, 0))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Verification queue scale check failed: {e}")
+            await asyncio.sleep(settings.VERIFICATION_QUEUE_POLL_SECONDS)
+
+    def _claimable(self, now: datetime) -> Dict[str, Any]:
+        return {"$or": [
+            {"status": VerificationQueueStatus.QUEUED.value, "available_at": {"$lte": now}},
+            {"status": VerificationQueueStatus.PROCESSING.value, "lease_until": {"$lt": now}},
+        ]}
+
+    async def _due_counts(self) -> Dict[str, int]:
+        cursor = self._get_db()[QUEUE_COLLECTION].aggregate([
+            {"$match": self._claimable(datetime.now(timezone.utc))},
+            {"$group": {"_id": "$lane", "count": {"$sum": 1}}},
+        ])
+        return {row["_id"]: row["count"] async for row in cursor}
+
+    async def _claim(self, lane: VerificationLane) -> Optional[Dict[str, Any]]:
+        """Lease the most urgent due job this lane's workers may take."""
+        now = datetime.now(timezone.utc)
+        return await self._get_db()[QUEUE_COLLECTION].find_one_and_update(
+            {"priority": {"$lte": LANE_PRIORITY[lane]}, **self._claimable(now)},
+            {
+                "$set": {
+                    "status": VerificationQueueStatus.PROCESSING.value,
+                    "owner": self._worker_id,
+                    "lease_until": now + timedelta(seconds=settings.VERIFICATION_QUEUE_LEASE_SECONDS),
+                    "started_at": now,
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("priority", 1), ("available_at", 1)],
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _worker(self, lane: VerificationLane):
+        wakeup = self._wakeup[lane]
+        idle_since = time.monotonic()
+        while not self._stopping:
+            wakeup.clear()
+            try:
+                job = await self._claim(lane)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Verification queue claim failed: {e}")
+                job = None
+
+            if job is not None:
+                await self._process(job)
+                idle_since = time.monotonic()
+                continue
+
+            if time.monotonic() - idle_since >= settings.VERIFICATION_QUEUE_IDLE_SECONDS:
+                return
+            self._idle[lane] += 1
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=settings.VERIFICATION_QUEUE_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._idle[lane] -= 1
+
+    async def _process(self, job: Dict[str, Any]):
+        lane = VerificationLane(job["lane"])
+        report_id = job["report_id"]
+        if job["attempts"] == 1:
+            wait = datetime.now(timezone.utc) - _as_utc(job["enqueued_at"])
+            self._wait_ms[lane].observe(wait.total_seconds() * 1000)
+
+        start = time.perf_counter()
+        db = self._get_db()
+        try:
+            doc = await db.hazard_reports.find_one({"report_id": report_id})
+            if doc is None:
+                await self._dead_letter(job, "Report not found")
+            elif _value(doc.get("verification_status")) != VerificationStatus.PENDING.value:
+                # Decided meanwhile (analyst or an explicit re-run); nothing to do
+                await self._complete(job, skipped=True)
+            else:
+                await verify_and_apply_report(db, doc, await self._get_service(db))
+                await self._complete(job)
+        except asyncio.CancelledError:
+            await self._release(job)
+            raise
+        except Exception as e:
+            logger.warning(f"Verification of {report_id} failed (attempt {job['attempts']}): {e}")
+            await self._retry_or_dead_letter(job, str(e))
+        finally:
+            self._run_ms[lane].observe((time.perf_counter() - start) * 1000)
+
+    def _owned(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        # Only the current lease holder may finish a job
+        return {"report_id": job["report_id"], "owner": self._worker_id,
+                "status": VerificationQueueStatus.PROCESSING.value}
+
+    async def _complete(self, job: Dict[str, Any], skipped: bool = False):
+        now = datetime.now(timezone.utc)
+        await self._get_db()[QUEUE_COLLECTION].update_one(self._owned(job), {"$set": {
+            "status": VerificationQueueStatus.DONE.value,
+            "skipped": skipped,
+            "lease_until": None,
+            "completed_at": now,
+            "updated_at": now,
+        }})
+        self._completed += 1
+
+    async def _retry_or_dead_letter(self, job: Dict[str, Any], error: str):
+        if job["attempts"] >= settings.VERIFICATION_QUEUE_MAX_ATTEMPTS:
+            await self._dead_letter(job, error)
+            return
+        delay = min(
+            settings.VERIFICATION_QUEUE_RETRY_MAX_SECONDS,
+            settings.VERIFICATION_QUEUE_RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1)
+        )
+        now = datetime.now(timezone.utc)
+        await self._get_db()[QUEUE_COLLECTION].update_one(self._owned(job), {"$set": {
+            "status": VerificationQueueStatus.QUEUED.value,
+            "available_at": now + timedelta(seconds=delay),
+            "lease_until": None,
+            "owner": None,
+            "last_error": error,
+            "updated_at": now,
+        }})
+        self._retried += 1
+
+    async def _dead_letter(self, job: Dict[str, Any], error: str):
+        now = datetime.now(timezone.utc)
+        await self._get_db()[QUEUE_COLLECTION].update_one(self._owned(job), {"$set": {
+            "status": VerificationQueueStatus.DEAD.value,
+            "lease_until": None,
+            "last_error": error,
+            "dead_at": now,
+            "updated_at": now,
+        }})
+        self._dead_lettered += 1
+        logger.error(f"Verification of {job['report_id']} dead-lettered after {job['attempts']} attempt(s): {error}")
+
+    async def _release(self, job: Dict[str, Any]):
+        """Hand an interrupted job back without counting the attempt."""
+        try:
+            await self._get_db()[QUEUE_COLLECTION].update_one(self._owned(job), {
+                "$set": {
+                    "status": VerificationQueueStatus.QUEUED.value,
+                    "lease_until": None,
+                    "owner": None,
+                    "updated_at": datetime.now(timezone.utc),
+                },
+                "$inc": {"attempts": -1},
+            })
+        except Exception as e:
+            logger.warning(f"Could not release {job['report_id']}; it is retried when its lease expires: {e}")
+
+    # -------------------------------------------------------------------------
+    # Admin
+    # -------------------------------------------------------------------------
+
+    async def list_dead_letters(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Dead-lettered jobs, most recent first."""
+        cursor = self._get_db()[QUEUE_COLLECTION].find(
+            {"status": VerificationQueueStatus.DEAD.value}, {"_id": 0}
+        ).sort("dead_at", -1).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    async def requeue(self, report_id: str) -> bool:
+        """
+        Give a dead-lettered job a fresh set of attempts.
+
+        Returns:
+            True if the job was requeued, False if it is not dead-lettered
+        """
+        now = datetime.now(timezone.utc)
+        job = await self._get_db()[QUEUE_COLLECTION].find_one_and_update(
+            {"report_id": report_id, "status": VerificationQueueStatus.DEAD.value},
+            {"$set": {
+                "status": VerificationQueueStatus.QUEUED.value,
+                "attempts": 0,
+                "available_at": now,
+                "enqueued_at": now,
+                "owner": None,
+                "dead_at": None,
+                "updated_at": now,
+            }},
+            projection={"_id": 0, "lane": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if job is None:
+            return False
+        self._notify(VerificationLane(job["lane"]))
+        return True
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Depth, oldest wait and worker counts per lane, with wait/run time percentiles."""
+        now = datetime.now(timezone.utc)
+        cursor = self._get_db()[QUEUE_COLLECTION].aggregate([
+            {"$match": {"status": {"$in": [
+                VerificationQueueStatus.QUEUED.value,
+                VerificationQueueStatus.PROCESSING.value,
+                VerificationQueueStatus.DEAD.value,
+            ]}}},
+            {"$group": {
+                "_id": {"lane": "$lane", "status": "$status"},
+                "count": {"$sum": 1},
+                "oldest": {"$min": "$enqueued_at"},
+            }},
+        ])
+        counts: Dict[str, Dict[str, Any]] = {}
+        async for row in cursor:
+            counts.setdefault(row["_id"]["lane"], {})[row["_id"]["status"]] = row
+
+        lanes = {}
+        for lane in LANE_ORDER:
+            by_status = counts.get(lane.value, {})
+            queued = by_status.get(VerificationQueueStatus.QUEUED.value)
+            lanes[lane.value] = {
+                "queued": queued["count"] if queued else 0,
+                "processing": by_status.get(VerificationQueueStatus.PROCESSING.value, {}).get("count", 0),
+                "dead": by_status.get(VerificationQueueStatus.DEAD.value, {}).get("count", 0),
+                "oldest_queued_seconds": round((now - _as_utc(queued["oldest"])).total_seconds(), 1) if queued else 0.0,
+                "workers": len(self._workers[lane]),
+                "idle_workers": self._idle[lane],
+                "max_workers": self.worker_limits.get(lane, 0),
+                "wait_ms": self._wait_ms[lane].snapshot(),
+                "run_ms": self._run_ms[lane].snapshot(),
+            }
+
+        return {
+            "lanes": lanes,
+            "completed": self._completed,
+            "retried": self._retried,
+            "dead_lettered": self._dead_lettered,
+        }
+
+    async def shutdown(self):
+        """Stop the supervisor and workers; interrupted jobs go back to the queue."""
+        self._stopping = True
+        tasks = [task for workers in self._workers.values() for task in workers]
+        if self._supervisor is not None:
+            tasks.append(self._supervisor)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._supervisor = None
+
+
+# Singleton instance
+_verification_queue: Optional[VerificationQueue] = None
+
+
+def get_verification_queue() -> VerificationQueue:
+    """Get or create the verification queue."""
+    global _verification_queue
+    if _verification_queue is None:
+        _verification_queue = VerificationQueue()
+    return _verification_queue
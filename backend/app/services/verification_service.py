@@ -19,6 +19,7 @@ Decision Thresholds (V2 - Hybrid Mode):
 
 import asyncio
 import logging
+import os
 import time
 import uuid
 from datetime import datetime, timezone
@@ -29,17 +30,28 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.models.verification import (
     LayerResult, LayerStatus, LayerName, VerificationResult,
     VerificationDecision, VerificationAudit, ReporterLayerData,
-    VerificationThresholds, AIRecommendation, VERIFICATION_THRESHOLDS
+    VerificationThresholds, AIRecommendation, StageTiming, VERIFICATION_THRESHOLDS
 )
-from app.models.hazard import HazardReport, HazardType, HazardCategory
-from app.models.user import TrustEventType, calculate_trust_score
+from app.models.hazard import HazardReport, HazardType, HazardCategory, VerificationStatus
+from app.models.user import TrustEventType
 from app.services.geofence_service import get_geofence_service, GeofenceService
 from app.services.vision_service import get_vision_service, VisionService
 from app.services.vectordb_service import get_vectordb_service, VectorDBService
+from app.services.embedding_cache import normalize_text
+from app.services.s3_service import s3_service
+from app.services.verification_cache import (
+    LayerResultCache, file_fingerprint, fingerprint, get_layer_cache
+)
+from app.services.verification_metrics import get_verification_metrics
+from app.services.trust_aggregator import apply_trust_events, get_trust_aggregator
 
 logger = logging.getLogger(__name__)
 
 
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
 class VerificationService:
     """
     Main verification service orchestrating the 6-layer pipeline.
@@ -85,6 +97,7 @@ class VerificationService:
         self.geofence_service: Optional[GeofenceService] = None
         self.vision_service: Optional[VisionService] = None
         self.vectordb_service: Optional[VectorDBService] = None
+        self.layer_cache: LayerResultCache = get_layer_cache()
         self._initialized = False
 
     async def initialize(self):
@@ -305,10 +318,16 @@ class VerificationService:
     async def _run_image_layer(
         self,
         image_path: str,
-        hazard_type: str
+        hazard_type: str,
+        report: Optional[HazardReport] = None
     ) -> LayerResult:
         """Run Layer 4: Image classification."""
-        return await self.vision_service.classify_image(image_path, hazard_type)
+        return await self.vision_service.classify_image(
+            image_path,
+            hazard_type,
+            report_id=report.report_id if report else None,
+            user_id=report.user_id if report else None
+        )
 
     async def _run_reporter_layer(
         self,
@@ -318,11 +337,11 @@ class VerificationService:
         """
         Run Layer 5: Reporter credibility scoring.
 
-        Fetches user's historical data and calculates credibility score.
+        Fetches user's historical data (through the short-lived user stats
+        cache, including buffered trust updates) and calculates credibility score.
         """
         try:
-            # Fetch user from database
-            user = await db.users.find_one({"user_id": user_id})
+            user = await get_trust_aggregator().get_user_stats(user_id, db)
 
             if not user:
                 # New or unknown user - give benefit of doubt
@@ -408,6 +427,46 @@ class VerificationService:
                 processed_at=datetime.now(timezone.utc)
             )
 
+    async def _memoized(
+        self,
+        layer: LayerName,
+        key_parts: Tuple[Any, ...],
+        run,
+        refresh: bool,
+        cached_layers: List[LayerName]
+    ) -> LayerResult:
+        """Run a layer through the layer cache, recording cache hits."""
+        result, from_cache = await self.layer_cache.get_or_run(
+            layer, fingerprint(*key_parts), run, refresh=refresh
+        )
+        if from_cache:
+            cached_layers.append(layer)
+        return result
+
+    async def _image_cache_key(self, image_path: str) -> Optional[str]:
+        """Content hash of the report image, or None if it cannot be read."""
+        if not self.layer_cache.enabled(LayerName.IMAGE) or not os.path.exists(image_path):
+            return None
+        try:
+            return await asyncio.to_thread(file_fingerprint, image_path)
+        except OSError as e:
+            logger.warning(f"Could not hash image {image_path}: {e}")
+            return None
+
+    async def _timed(self, stage: str, awaitable, timings: List[StageTiming]):
+        """Await one stage and record its timing (plus status and fallback for layers)."""
+        start = time.perf_counter()
+        result = await awaitable
+        timing = StageTiming(stage=stage, duration_ms=_elapsed_ms(start))
+        if isinstance(result, LayerResult):
+            data = result.data if isinstance(result.data, dict) else {}
+            timing.status = result.status
+            timing.fallback = bool(
+                data.get("fallback") or "error" in data or data.get("reason") == "no_database"
+            )
+        timings.append(timing)
+        return result
+
     def _calculate_composite_score(
         self,
         layer_results: List[LayerResult],
@@ -534,15 +593,23 @@ class VerificationService:
         self,
         report: HazardReport,
         image_path: Optional[str] = None,
-        db: Optional[AsyncIOMotorDatabase] = None
+        db: Optional[AsyncIOMotorDatabase] = None,
+        use_cache: bool = True,
+        update_trust: bool = True
     ) -> VerificationResult:
         """
         Run full 6-layer verification pipeline on a hazard report.
 
+        Layer results are memoized by a fingerprint of each layer's inputs
+        (coordinates, classification, description, image content, reporter),
+        so re-verification reuses layers whose inputs have not changed.
+
         Args:
             report: HazardReport to verify
             image_path: Path to the uploaded image
             db: Database connection for user lookups
+            use_cache: Reuse cached layer results (fresh results are cached either way)
+            update_trust: Apply AI-layer trust changes to the reporter (off when re-scoring history)
 
         Returns:
             VerificationResult with all layer results and decision
@@ -578,18 +645,25 @@ class VerificationService:
         # Calculate adjusted weights
         weights = self._redistribute_weights(active_layers, skipped_layers)
 
+        refresh = not use_cache
+        cached_layers: List[LayerName] = []
+        timings: List[StageTiming] = []
+        lat, lon = report.location.latitude, report.location.longitude
+
         # Run Layer 1: Geofence (blocking)
-        geofence_result = await self._run_geofence_layer(
-            report.location.latitude,
-            report.location.longitude
-        )
+        geofence_result = await self._timed(LayerName.GEOFENCE.value, self._memoized(
+            LayerName.GEOFENCE,
+            (round(lat, 6), round(lon, 6)),
+            lambda: self._run_geofence_layer(lat, lon),
+            refresh, cached_layers
+        ), timings)
         geofence_result.weight = weights[LayerName.GEOFENCE]
 
         # If geofence fails, return immediately
         if geofence_result.status == LayerStatus.FAIL:
             processing_time = int((time.time() - start_time) * 1000)
 
-            return VerificationResult(
+            return self._finish(VerificationResult(
                 verification_id=verification_id,
                 report_id=report.report_id,
                 composite_score=0.0,
@@ -599,23 +673,47 @@ class VerificationService:
                 weights_used={k.value: v for k, v in weights.items()},
                 applicable_layers=active_layers,
                 skipped_layers=skipped_layers,
+                cached_layers=cached_layers,
                 processing_time_ms=processing_time,
+                timings=timings,
                 verified_at=datetime.now(timezone.utc)
-            )
+            ))
 
         # Run remaining layers in parallel
         layer_tasks = []
 
-        # Weather layer
-        layer_tasks.append(self._run_weather_layer(report, hazard_type))
+        # Weather layer (scored from the classification stored on the report)
+        classification = report.hazard_classification
+        layer_tasks.append(self._timed(LayerName.WEATHER.value, self._memoized(
+            LayerName.WEATHER,
+            (hazard_type, classification.model_dump(mode="json") if classification else None),
+            lambda: self._run_weather_layer(report, hazard_type),
+            refresh, cached_layers
+        ), timings))
 
         # Text layer
         description = report.description or ""
-        layer_tasks.append(self._run_text_layer(description, hazard_type))
+        layer_tasks.append(self._timed(LayerName.TEXT.value, self._memoized(
+            LayerName.TEXT,
+            (hazard_type, normalize_text(description)),
+            lambda: self._run_text_layer(description, hazard_type),
+            refresh, cached_layers
+        ), timings))
 
         # Image layer
         if image_path:
-            layer_tasks.append(self._run_image_layer(image_path, hazard_type))
+            image_key = await self._timed("image_fingerprint", self._image_cache_key(image_path), timings)
+            if image_key is not None:
+                # Reporter is part of the key: recycled-photo flags depend on who submitted it
+                image_task = self._memoized(
+                    LayerName.IMAGE,
+                    (hazard_type, image_key, report.user_id),
+                    lambda: self._run_image_layer(image_path, hazard_type, report),
+                    refresh, cached_layers
+                )
+            else:
+                image_task = self._run_image_layer(image_path, hazard_type, report)
+            layer_tasks.append(self._timed(LayerName.IMAGE.value, image_task, timings))
         else:
             # Create skipped result for image layer if no image provided
             async def skip_image():
@@ -629,11 +727,16 @@ class VerificationService:
                     data={"reason": "no_image"},
                     processed_at=datetime.now(timezone.utc)
                 )
-            layer_tasks.append(skip_image())
+            layer_tasks.append(self._timed(LayerName.IMAGE.value, skip_image(), timings))
 
         # Reporter layer
         if db is not None:
-            layer_tasks.append(self._run_reporter_layer(report.user_id, db))
+            layer_tasks.append(self._timed(LayerName.REPORTER.value, self._memoized(
+                LayerName.REPORTER,
+                (report.user_id,),
+                lambda: self._run_reporter_layer(report.user_id, db),
+                refresh, cached_layers
+            ), timings))
         else:
             async def default_reporter():
                 return LayerResult(
@@ -646,7 +749,7 @@ class VerificationService:
                     data={"reason": "no_database"},
                     processed_at=datetime.now(timezone.utc)
                 )
-            layer_tasks.append(default_reporter())
+            layer_tasks.append(self._timed(LayerName.REPORTER.value, default_reporter(), timings))
 
         # Execute all layers in parallel
         layer_results = await asyncio.gather(*layer_tasks)
@@ -661,29 +764,31 @@ class VerificationService:
         composite_score = self._calculate_composite_score(all_results, weights)
 
         # Update user trust score based on AI layer results (text and image)
-        if db is not None and report.user_id:
-            await self.update_user_trust_from_ai_layers(
+        if update_trust and db is not None and report.user_id:
+            await self._timed("trust_update", self.update_user_trust_from_ai_layers(
                 user_id=report.user_id,
                 layer_results=all_results,
                 db=db
-            )
+            ), timings)
 
         # Determine decision (now with enhanced rejection rules)
+        decision_start = time.perf_counter()
         decision, reason = self._determine_decision(composite_score, geofence_result, all_results)
 
-        processing_time = int((time.time() - start_time) * 1000)
-
         # Simplified: Only manual review requires human confirmation
         ai_recommendation = self._get_ai_recommendation(composite_score, decision)
         requires_confirmation = decision == VerificationDecision.MANUAL_REVIEW
+        timings.append(StageTiming(stage="decision", duration_ms=_elapsed_ms(decision_start)))
+
+        processing_time = int((time.time() - start_time) * 1000)
 
         logger.info(
             f"Verification complete for {report.report_id}: "
             f"score={composite_score:.1f}%, decision={decision.value}, "
-            f"time={processing_time}ms"
+            f"time={processing_time}ms, cached={[layer.value for layer in cached_layers]}"
         )
 
-        return VerificationResult(
+        return self._finish(VerificationResult(
             verification_id=verification_id,
             report_id=report.report_id,
             composite_score=composite_score,
@@ -693,13 +798,27 @@ class VerificationService:
             weights_used={k.value: v for k, v in weights.items()},
             applicable_layers=active_layers,
             skipped_layers=skipped_layers,
+            cached_layers=cached_layers,
             processing_time_ms=processing_time,
+            timings=timings,
             verified_at=datetime.now(timezone.utc),
             # V2 fields
             ai_recommendation=ai_recommendation,
             requires_authority_confirmation=requires_confirmation,
             authority_confirmation=None
+        ))
+
+    def _finish(self, result: VerificationResult) -> VerificationResult:
+        """Mark cache hits on the stage timings and record them in the pipeline metrics."""
+        cached = {layer.value for layer in result.cached_layers}
+        for timing in result.timings:
+            timing.cache_hit = timing.stage in cached
+        logger.debug(
+            f"Verification stages for {result.report_id}: "
+            + ", ".join(f"{t.stage}={t.duration_ms:.1f}ms" for t in result.timings)
         )
+        get_verification_metrics().observe(result)
+        return result
 
     def _get_ai_recommendation(
         self,
@@ -738,51 +857,42 @@ class VerificationService:
         - Text pass/fail: α=0.025 (low impact)
         - Image pass/fail: α=0.05 (moderate impact)
 
+        The events are buffered by the trust aggregator and written in bulk
+        on its next flush.
+
         Args:
             user_id: ID of the user who submitted the report
             layer_results: Results from all verification layers
             db: Database connection
 
         Returns:
-            New trust score if updated, None if failed
+            Projected trust score including this update, None if failed
         """
         if db is None:
             logger.warning("Cannot update trust: no database connection")
             return None
 
         try:
-            # Get current user
-            user = await db.users.find_one({"user_id": user_id})
+            aggregator = get_trust_aggregator()
+            user = await aggregator.get_user_stats(user_id, db)
             if not user:
                 logger.warning(f"Cannot update trust: user {user_id} not found")
                 return None
 
-            current_score = user.get("credibility_score", 50)
-            new_score = current_score
-
-            # Process text layer result
+            events = []
             for result in layer_results:
                 if result.layer_name == LayerName.TEXT and result.status != LayerStatus.SKIPPED:
                     text_passed = result.status == LayerStatus.PASS and result.score >= 0.5
-                    event_type = TrustEventType.AI_TEXT_PASS if text_passed else TrustEventType.AI_TEXT_FAIL
-                    new_score = calculate_trust_score(new_score, event_type)
-                    logger.debug(f"Text layer {'pass' if text_passed else 'fail'}: trust {current_score} -> {new_score}")
+                    events.append(TrustEventType.AI_TEXT_PASS if text_passed else TrustEventType.AI_TEXT_FAIL)
 
                 elif result.layer_name == LayerName.IMAGE and result.status != LayerStatus.SKIPPED:
                     image_passed = result.status == LayerStatus.PASS and result.score >= 0.5
-                    event_type = TrustEventType.AI_IMAGE_PASS if image_passed else TrustEventType.AI_IMAGE_FAIL
-                    new_score = calculate_trust_score(new_score, event_type)
-                    logger.debug(f"Image layer {'pass' if image_passed else 'fail'}: trust -> {new_score}")
-
-            # Update in database if changed
-            if int(new_score) != current_score:
-                await db.users.update_one(
-                    {"user_id": user_id},
-                    {"$set": {"credibility_score": int(new_score)}}
-                )
-                logger.info(f"Updated trust for user {user_id}: {current_score} -> {int(new_score)}")
+                    events.append(TrustEventType.AI_IMAGE_PASS if image_passed else TrustEventType.AI_IMAGE_FAIL)
 
-            return int(new_score)
+            aggregator.record(user_id, events, db)
+            new_score = apply_trust_events(user["credibility_score"], [events])
+            logger.debug(f"Buffered trust update for user {user_id}: {user['credibility_score']} -> {new_score}")
+            return new_score
 
         except Exception as e:
             logger.error(f"Error updating user trust: {e}")
@@ -813,6 +923,90 @@ class VerificationService:
         )
 
 
+def map_decision_to_status(decision: VerificationDecision) -> VerificationStatus:
+    """Map verification decision to hazard report status."""
+    mapping = {
+        VerificationDecision.AUTO_APPROVED: VerificationStatus.VERIFIED,
+        VerificationDecision.MANUAL_REVIEW: VerificationStatus.NEEDS_MANUAL_REVIEW,
+        VerificationDecision.AI_RECOMMENDED: VerificationStatus.NEEDS_MANUAL_REVIEW,  # Legacy - treat as manual review
+        VerificationDecision.REJECTED: VerificationStatus.REJECTED,
+        VerificationDecision.AUTO_REJECTED: VerificationStatus.AUTO_REJECTED
+    }
+    return mapping.get(decision, VerificationStatus.NEEDS_MANUAL_REVIEW)  # Default to needs review
+
+
+def _normalize_enum_value(value: Any, enum_cls, default: str) -> str:
+    """Return a valid enum value, matching legacy values case-insensitively."""
+    valid_values = {e.value for e in enum_cls}
+    if value in valid_values:
+        return value
+    for enum_member in enum_cls:
+        if enum_member.value.lower() == str(value).lower():
+            return enum_member.value
+    return default
+
+
+def report_from_document(doc: Dict[str, Any]) -> HazardReport:
+    """
+    Build a HazardReport from a stored document, normalizing legacy enum values.
+
+    Raises:
+        ValueError: If the document cannot be parsed
+    """
+    doc_copy = doc.copy()
+    if "hazard_type" in doc_copy:
+        doc_copy["hazard_type"] = _normalize_enum_value(
+            doc_copy["hazard_type"], HazardType, HazardType.HIGH_WAVES.value
+        )
+    if "category" in doc_copy:
+        doc_copy["category"] = _normalize_enum_value(
+            doc_copy["category"], HazardCategory, HazardCategory.NATURAL.value
+        )
+    if "verification_status" in doc_copy:
+        doc_copy["verification_status"] = _normalize_enum_value(
+            doc_copy["verification_status"], VerificationStatus, VerificationStatus.PENDING.value
+        )
+    return HazardReport.from_mongo(doc_copy)
+
+
+async def fetch_report_image(image_url: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolve a report's image_url to a local file for re-verification.
+
+    The image_url may be an S3 URL (downloaded to a temp file) or a local
+    path "/uploads/hazards/...".
+
+    Returns:
+        (image_path, temp_path); temp_path is set when the caller must delete it
+    """
+    if not image_url:
+        return None, None
+
+    if not image_url.startswith('http'):
+        # Local path - strip leading slash if present
+        return image_url.lstrip('/'), None
+
+    if not s3_service.is_enabled:
+        return None, None
+
+    temp_path = await asyncio.to_thread(s3_service.download_from_url_to_temp, image_url)
+    if not temp_path:
+        logger.warning(f"Failed to download S3 image {image_url}, skipping image verification")
+        return None, None
+    return temp_path, temp_path
+
+
+def remove_temp_image(temp_path: Optional[str]):
+    """Delete a temp image downloaded by fetch_report_image."""
+    if not temp_path:
+        return
+    try:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    except Exception as cleanup_error:
+        logger.warning(f"Failed to cleanup temp file {temp_path}: {cleanup_error}")
+
+
 # Singleton instance
 _verification_service: Optional[VerificationService] = None
 
@@ -0,0 +1,313 @@
+"""
+Vision Inference
+Dynamically batched predictions for the Keras vision model.
+
+A VisionModelRunner owns one copy of base_model.keras. Concurrent requests
+are coalesced by a MicroBatcher (up to VISION_BATCH_MAX_SIZE images or
+VISION_BATCH_WAIT_MS) and scored with one predict call on the inference
+pool, so a burst of report photos costs a few forward passes rather than
+one per image.
+
+The runner lives in one of two places:
+- In-process (VISION_INFERENCE_URL empty): each API worker loads its own copy
+- Sidecar (VISION_INFERENCE_URL set): app.vision_server loads the model
+  once and API workers send preprocessed tensors to it over localhost;
+  the workers never import TensorFlow
+
+Images are preprocessed in the API worker (preprocess_image) and shipped
+as (224, 224, 3) float32 tensors.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from app.config import settings
+from app.services.inference_executor import get_inference_executor
+from app.utils.batching import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+INPUT_SIZE = 224
+INPUT_SHAPE = (INPUT_SIZE, INPUT_SIZE, 3)
+
+# Window for the throughput / latency percentiles in get_stats()
+_METRICS_WINDOW_SECONDS = 60.0
+
+
+def vision_model_dir() -> Path:
+    """backend/Vision_Model, where base_model.keras and thresholds.json live."""
+    return Path(__file__).resolve().parent.parent.parent / "Vision_Model"
+
+
+def preprocess_image(rgb: np.ndarray) -> np.ndarray:
+    """
+    Resize to the model input and scale to [-1, 1].
+
+    Equivalent to tf.image.resize (bilinear, half-pixel centers, no
+    antialiasing) followed by keras resnet_v2.preprocess_input, up to uint8
+    rounding of the resized pixels, without importing TensorFlow.
+
+    Args:
+        rgb: (H, W, 3) uint8 RGB pixels
+
+    Returns:
+        (224, 224, 3) float32 tensor
+    """
+    import cv2
+
+    resized = cv2.resize(rgb, (INPUT_SIZE, INPUT_SIZE), interpolation=cv2.INTER_LINEAR)
+    return resized.astype(np.float32) / 127.5 - 1.0
+
+
+class _LatencyWindow:
+    """Rolling per-image latency samples for throughput and percentiles."""
+
+    def __init__(self):
+        self._samples: deque = deque(maxlen=5000)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float):
+        with self._lock:
+            self._samples.append((time.time(), latency_ms))
+
+    def snapshot(self) -> Dict[str, float]:
+        cutoff = time.time() - _METRICS_WINDOW_SECONDS
+        with self._lock:
+            recent = np.array([ms for ts, ms in self._samples if ts >= cutoff])
+        if len(recent) == 0:
+            return {"images_per_second": 0.0, "latency_p50_ms": 0.0, "latency_p95_ms": 0.0}
+        return {
+            "images_per_second": round(len(recent) / _METRICS_WINDOW_SECONDS, 3),
+            "latency_p50_ms": round(float(np.percentile(recent, 50)), 2),
+            "latency_p95_ms": round(float(np.percentile(recent, 95)), 2),
+        }
+
+
+class VisionModelRunner:
+    """Single model copy behind a micro-batcher."""
+
+    def __init__(
+        self,
+        model_dir: Optional[Path] = None,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 25.0,
+        timeout_seconds: Optional[float] = 30.0,
+        model: Any = None
+    ):
+        """
+        Args:
+            model_dir: Directory containing base_model.keras
+            max_batch_size: Max images per predict call
+            max_wait_ms: How long to gather concurrent requests
+            timeout_seconds: Limit for one batched predict on the inference pool
+            model: Preloaded model (anything with predict_on_batch)
+        """
+        self.model_dir = model_dir or vision_model_dir()
+        self.timeout_seconds = timeout_seconds
+        self._model = model
+        self._load_lock = threading.Lock()
+        self._predict_lock = threading.Lock()
+        self._load_failed = False
+
+        self._batcher = MicroBatcher(
+            self._predict_batch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            name="vision"
+        )
+        self._latency = _LatencyWindow()
+        self._images = 0
+        self._failures = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self) -> bool:
+        """Load the Keras model once; returns whether it is available."""
+        if self._model is not None:
+            return True
+
+        with self._load_lock:
+            if self._model is not None:
+                return True
+            try:
+                import os
+                # Suppress TensorFlow warnings during load
+                os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+
+                # Use standalone keras for Keras 3.x models (not tf.keras)
+                import keras
+
+                model_path = self.model_dir / "base_model.keras"
+                if not model_path.exists():
+                    logger.error(f"Model file not found: {model_path}")
+                    self._load_failed = True
+                    return False
+
+                logger.info(f"Loading Vision Model from {model_path} (keras {keras.__version__})...")
+                self._model = keras.models.load_model(str(model_path), compile=False)
+                logger.info(
+                    f"Vision Model loaded. Input shape: {self._model.input_shape}, "
+                    f"Output shape: {self._model.output_shape}"
+                )
+                return True
+
+            except ImportError as e:
+                logger.error(f"TensorFlow/Keras import failed: {e}")
+            except Exception as e:
+                logger.error(f"Failed to load Vision Model: {e}", exc_info=True)
+            self._load_failed = True
+            return False
+
+    def _predict_sync(self, tensors: List[np.ndarray]) -> List[np.ndarray]:
+        batch = np.stack(tensors).astype(np.float32, copy=False)
+        # One model copy; concurrent batches would only contend for the same cores
+        with self._predict_lock:
+            probs = np.asarray(self._model.predict_on_batch(batch))
+        return list(probs)
+
+    async def _predict_batch(self, tensors: List[np.ndarray]) -> List[np.ndarray]:
+        return await get_inference_executor().run(self._predict_sync, tensors, timeout=self.timeout_seconds)
+
+    async def predict(self, tensor: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for one preprocessed image.
+
+        Raises:
+            RuntimeError: If the model is not loaded
+        """
+        if self._model is None:
+            raise RuntimeError("Vision Model is not loaded")
+        if tensor.shape != INPUT_SHAPE:
+            raise ValueError(f"Expected input shape {INPUT_SHAPE}, got {tensor.shape}")
+
+        start = time.perf_counter()
+        try:
+            probs = await self._batcher.submit(tensor)
+        except Exception:
+            self._failures += 1
+            raise
+        self._images += 1
+        self._latency.record((time.perf_counter() - start) * 1000)
+        return probs
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Throughput, latency and queue metrics."""
+        return {
+            "mode": "local",
+            "model_loaded": self.is_loaded,
+            "model_load_failed": self._load_failed,
+            "images": self._images,
+            "failures": self._failures,
+            **self._latency.snapshot(),
+            "batching": self._batcher.get_stats(),
+            "inference": get_inference_executor().get_stats(),
+        }
+
+
+class RemoteVisionModel:
+    """Client for the vision sidecar (app.vision_server)."""
+
+    def __init__(self, base_url: str, timeout_seconds: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout_seconds = timeout_seconds
+        self._client = None
+        self._latency = _LatencyWindow()
+        self._images = 0
+        self._failures = 0
+
+    @property
+    def is_loaded(self) -> bool:
+        return True
+
+    def load(self) -> bool:
+        """The sidecar owns the model; failures surface per request."""
+        return True
+
+    def _get_client(self):
+        import httpx
+
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout_seconds)
+        return self._client
+
+    async def predict(self, tensor: np.ndarray) -> np.ndarray:
+        """Class probabilities for one preprocessed image, scored by the sidecar."""
+        start = time.perf_counter()
+        try:
+            response = await self._get_client().post(
+                "/predict",
+                content=np.ascontiguousarray(tensor, dtype=np.float32).tobytes(),
+                headers={
+                    "Content-Type": "application/octet-stream",
+                    "X-Tensor-Shape": ",".join(str(d) for d in tensor.shape),
+                },
+            )
+            response.raise_for_status()
+            probs = np.asarray(response.json()["probabilities"], dtype=np.float32)
+        except Exception:
+            self._failures += 1
+            raise
+        self._images += 1
+        self._latency.record((time.perf_counter() - start) * 1000)
+        return probs
+
+    async def get_server_stats(self) -> Optional[Dict[str, Any]]:
+        """Metrics reported by the sidecar itself."""
+        try:
+            response = await self._get_client().get("/metrics")
+            response.raise_for_status()
+            return response.json()
+        except Exception as e:
+            logger.warning(f"Vision sidecar metrics unavailable: {e}")
+            return None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Client-side throughput and latency (including the network hop)."""
+        return {
+            "mode": "remote",
+            "url": self.base_url,
+            "images": self._images,
+            "failures": self._failures,
+            **self._latency.snapshot(),
+        }
+
+    async def close(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+
+
+VisionModel = Union[VisionModelRunner, RemoteVisionModel]
+
+# Singleton instance
+_vision_model: Optional[VisionModel] = None
+
+
+def create_vision_runner() -> VisionModelRunner:
+    """A local runner configured from settings."""
+    return VisionModelRunner(
+        max_batch_size=settings.VISION_BATCH_MAX_SIZE,
+        max_wait_ms=settings.VISION_BATCH_WAIT_MS,
+        timeout_seconds=settings.VISION_INFERENCE_TIMEOUT_SECONDS
+    )
+
+
+def get_vision_model() -> VisionModel:
+    """Get the vision model used by this process (sidecar client or local runner)."""
+    global _vision_model
+    if _vision_model is None:
+        if settings.VISION_INFERENCE_URL:
+            _vision_model = RemoteVisionModel(
+                settings.VISION_INFERENCE_URL,
+                timeout_seconds=settings.VISION_INFERENCE_TIMEOUT_SECONDS
+            )
+        else:
+            _vision_model = create_vision_runner()
+    return _vision_model
@@ -21,6 +21,13 @@ from app.models.verification import (
     LayerResult, LayerStatus, LayerName, ImageLayerData,
     VisionClassificationResult
 )
+from app.config import settings
+from app.services.image_context import ImageContext, get_face_cascade
+from app.services.image_hash_index import (
+    SOURCE_REPORT, SOURCE_SOCIAL_MEDIA, DuplicateMatch, get_image_hash_index
+)
+from app.services.vision_inference import RemoteVisionModel, get_vision_model, preprocess_image
+from app.utils.image_hash import ImageHashes, compute_hashes
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +73,8 @@ class VisionService:
     def __init__(self):
         """Initialize vision service."""
         self._initialized = False
-        self._model = None
+        self._model = get_vision_model()
+        self._hash_index = get_image_hash_index()
         self._thresholds = None
         self._vision_model_path = None
         self._initialize()
@@ -97,36 +105,18 @@ class VisionService:
             self._initialized = False
 
     def _load_model_if_needed(self):
-        """Lazy load the Keras model."""
-        if self._model is not None:
-            return True
-
-        try:
-            # Use standalone keras for Keras 3.x models (not tf.keras)
-            import keras
-            logger.info(f"Keras imported successfully (version: {keras.__version__})")
-
-            if not self._initialized or self._vision_model_path is None:
-                logger.error("VisionService not initialized - vision_model_path is None")
-                return False
-
-            model_path = self._vision_model_path / "base_model.keras"
-            logger.info(f"Checking model at: {model_path}")
-
-            if not model_path.exists():
-                logger.error(f"Model file not found: {model_path}")
-                return False
-
-            logger.info(f"Loading Vision Model from {model_path}...")
-
-            # Suppress TensorFlow warnings during load
-            import os
-            os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+        """Make sure the vision model (local runner or sidecar) and thresholds are ready."""
+        if not self._load_thresholds_if_needed():
+            return False
+        return self._model.load()
 
-            # Use standalone keras.models.load_model for Keras 3.x saved models
-            self._model = keras.models.load_model(str(model_path), compile=False)
-            logger.info(f"Model loaded! Input shape: {self._model.input_shape}, Output shape: {self._model.output_shape}")
+    def _load_thresholds_if_needed(self) -> bool:
+        """Load the per-class decision thresholds once."""
+        if not self._initialized or self._vision_model_path is None:
+            logger.error("VisionService not initialized - vision_model_path is None")
+            return False
 
+        if self._thresholds is None:
             # Load thresholds from the Vision_Model directory
             # First try thresholds.json directly, then model_export subfolder
             thresh_path = self._vision_model_path / "thresholds.json"
@@ -135,14 +125,17 @@ class VisionService:
             self._thresholds = self._load_thresholds(thresh_path)
             logger.info(f"Loaded thresholds from {thresh_path}: {self._thresholds}")
 
-            logger.info("Vision Model loaded successfully and ready for predictions")
-            return True
+        return True
 
+    def _model_backend_available(self) -> bool:
+        """Whether CNN inference can run: a sidecar is configured or TensorFlow is importable."""
+        if isinstance(self._model, RemoteVisionModel):
+            return True
+        try:
+            import tensorflow
+            return True
         except ImportError as e:
-            logger.error(f"TensorFlow import failed: {e}")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to load Vision Model: {e}", exc_info=True)
+            logger.warning(f"TensorFlow not available: {e}. Image layer will use fallback analysis.")
             return False
 
     def _load_thresholds(self, path: Path) -> Dict[str, float]:
@@ -170,31 +163,19 @@ class VisionService:
             logger.warning(f"Failed to load thresholds: {e}, using defaults")
             return defaults
 
-    def _detect_faces(self, image_path: str) -> Tuple[bool, int, float]:
+    def _detect_faces(self, image: ImageContext) -> Tuple[bool, int, float]:
         """
         Detect faces in image using OpenCV's Haar Cascade classifier.
 
         Args:
-            image_path: Path to the image file
+            image: Decoded image context
 
         Returns:
             Tuple of (faces_detected, face_count, face_area_ratio)
         """
         try:
-            import cv2
-            import numpy as np
-
-            # Read image
-            img = cv2.imread(image_path)
-            if img is None:
-                return False, 0, 0.0
-
-            # Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-            # Load face cascade classifier
-            face_cascade_path = cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-            face_cascade = cv2.CascadeClassifier(face_cascade_path)
+            gray = image.gray
+            face_cascade = get_face_cascade()
 
             # Detect faces
             faces = face_cascade.detectMultiScale(
@@ -208,7 +189,7 @@ class VisionService:
                 return False, 0, 0.0
 
             # Calculate face area ratio
-            img_area = img.shape[0] * img.shape[1]
+            img_area = image.analysis_pixels
             total_face_area = sum(w * h for (x, y, w, h) in faces)
             face_ratio = total_face_area / img_area
 
@@ -222,14 +203,14 @@ class VisionService:
             logger.warning(f"Face detection error: {e}")
             return False, 0, 0.0
 
-    def _analyze_skin_tones(self, image_path: str) -> Tuple[float, bool]:
+    def _analyze_skin_tones(self, image: ImageContext) -> Tuple[float, bool]:
         """
         Analyze image for skin tone prevalence using HSV color space.
 
         Selfies and portrait images typically have high skin tone ratios.
 
         Args:
-            image_path: Path to the image file
+            image: Decoded image context
 
         Returns:
             Tuple of (skin_ratio, is_likely_portrait)
@@ -238,13 +219,7 @@ class VisionService:
             import cv2
             import numpy as np
 
-            # Read image
-            img = cv2.imread(image_path)
-            if img is None:
-                return 0.0, False
-
-            # Convert to HSV
-            hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+            hsv = image.hsv
 
             # Define skin tone ranges in HSV
             # Lower and upper bounds for skin tone detection
@@ -255,7 +230,7 @@ class VisionService:
             mask = cv2.inRange(hsv, lower_skin, upper_skin)
 
             # Calculate ratio
-            total_pixels = img.shape[0] * img.shape[1]
+            total_pixels = image.analysis_pixels
             skin_pixels = cv2.countNonZero(mask)
             skin_ratio = skin_pixels / total_pixels
 
@@ -272,7 +247,7 @@ class VisionService:
             logger.warning(f"Skin tone analysis error: {e}")
             return 0.0, False
 
-    def _analyze_color_palette(self, image_path: str) -> Dict[str, Any]:
+    def _analyze_color_palette(self, image: ImageContext) -> Dict[str, Any]:
         """
         Analyze image color palette for coastal/marine context.
 
@@ -280,7 +255,7 @@ class VisionService:
         Selfies typically have different color distributions.
 
         Args:
-            image_path: Path to the image file
+            image: Decoded image context
 
         Returns:
             Dictionary with color analysis results
@@ -289,38 +264,33 @@ class VisionService:
             import cv2
             import numpy as np
 
-            # Read image
-            img = cv2.imread(image_path)
-            if img is None:
-                return {"valid": False}
-
-            # Convert to HSV for color analysis
-            hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV)
+            hsv = image.hsv
+            total_pixels = image.analysis_pixels
 
             # Define color ranges for marine context
             # Blue (water)
             lower_blue = np.array([100, 50, 50])
             upper_blue = np.array([130, 255, 255])
             blue_mask = cv2.inRange(hsv, lower_blue, upper_blue)
-            blue_ratio = cv2.countNonZero(blue_mask) / (img.shape[0] * img.shape[1])
+            blue_ratio = cv2.countNonZero(blue_mask) / total_pixels
 
             # Green/Brown (algae, debris)
             lower_green = np.array([35, 50, 50])
             upper_green = np.array([85, 255, 255])
             green_mask = cv2.inRange(hsv, lower_green, upper_green)
-            green_ratio = cv2.countNonZero(green_mask) / (img.shape[0] * img.shape[1])
+            green_ratio = cv2.countNonZero(green_mask) / total_pixels
 
             # Brown/tan (beach, sand)
             lower_brown = np.array([10, 50, 50])
             upper_brown = np.array([30, 255, 200])
             brown_mask = cv2.inRange(hsv, lower_brown, upper_brown)
-            brown_ratio = cv2.countNonZero(brown_mask) / (img.shape[0] * img.shape[1])
+            brown_ratio = cv2.countNonZero(brown_mask) / total_pixels
 
             # Dark (oil spill)
             lower_dark = np.array([0, 0, 0])
             upper_dark = np.array([180, 255, 50])
             dark_mask = cv2.inRange(hsv, lower_dark, upper_dark)
-            dark_ratio = cv2.countNonZero(dark_mask) / (img.shape[0] * img.shape[1])
+            dark_ratio = cv2.countNonZero(dark_mask) / total_pixels
 
             # Coastal context score
             coastal_score = blue_ratio + green_ratio * 0.5 + brown_ratio * 0.3 + dark_ratio * 0.2
@@ -342,7 +312,7 @@ class VisionService:
 
     def _perform_pre_classification_checks(
         self,
-        image_path: str,
+        image: Optional[ImageContext],
         reported_hazard_type: str
     ) -> Optional[LayerResult]:
         """
@@ -352,17 +322,20 @@ class VisionService:
         running the expensive CNN classification.
 
         Args:
-            image_path: Path to the image file
+            image: Decoded image context (None if the file could not be decoded)
             reported_hazard_type: The hazard type reported by user
 
         Returns:
             LayerResult if image should be rejected, None to continue with CNN
         """
+        if image is None:
+            return None  # Nothing to check; let the classifier report the problem
+
         rejection_reasons = []
         rejection_score = 0.0
 
         # Check 1: Face detection
-        faces_detected, face_count, face_ratio = self._detect_faces(image_path)
+        faces_detected, face_count, face_ratio = self._detect_faces(image)
         if faces_detected:
             if face_ratio > 0.10:  # Face covers >10% of image
                 rejection_reasons.append(f"Human face detected covering {face_ratio:.1%} of image")
@@ -372,13 +345,13 @@ class VisionService:
                 rejection_score += 0.2
 
         # Check 2: Skin tone analysis
-        skin_ratio, is_portrait = self._analyze_skin_tones(image_path)
+        skin_ratio, is_portrait = self._analyze_skin_tones(image)
         if is_portrait and skin_ratio > 0.20:
             rejection_reasons.append(f"High skin tone ratio ({skin_ratio:.1%}) suggests portrait/selfie")
             rejection_score += 0.3
 
         # Check 3: Color palette analysis
-        color_analysis = self._analyze_color_palette(image_path)
+        color_analysis = self._analyze_color_palette(image)
         if color_analysis.get("valid") and not color_analysis.get("is_likely_coastal", True):
             # Low coastal colors suggest non-marine image
             coastal_score = color_analysis.get("coastal_score", 0)
@@ -416,76 +389,18 @@ class VisionService:
 
         return None  # Continue with CNN classification
 
-    def _apply_exif_transpose(self, image_path: str) -> Any:
-        """
-        Apply EXIF orientation to image pixels using PIL.
-
-        Mobile devices record images in landscape orientation and use EXIF
-        Orientation tag (0x0112) to indicate how the image should be displayed.
-        This function burns the rotation into the pixel data.
-
-        Args:
-            image_path: Path to the image file
-
-        Returns:
-            numpy array of the correctly oriented image (RGB, uint8), or None if failed
-        """
-        try:
-            from PIL import Image, ImageOps
-            import numpy as np
-
-            # Open image with PIL to handle EXIF
-            img = Image.open(image_path)
-
-            # Apply EXIF transpose - this rotates the pixels based on EXIF orientation
-            img = ImageOps.exif_transpose(img)
-
-            # Convert to RGB if needed (handles RGBA, grayscale, etc.)
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-
-            # Convert to numpy array
-            return np.array(img, dtype=np.uint8)
-
-        except Exception as e:
-            logger.warning(f"EXIF transpose failed: {e}, using TensorFlow directly")
-            return None
-
-    def _preprocess_image(self, image_path: str) -> Any:
+    def _preprocess_image(self, image_path: str, image: Optional[ImageContext] = None) -> Any:
         """
         Preprocess image for model input.
 
-        Handles EXIF orientation from mobile devices to ensure images
-        are correctly oriented before classification.
+        Uses the decoded, EXIF-transposed pixels from the image context so
+        mobile photos are correctly oriented before classification.
         """
-        import tensorflow as tf
-        import keras
-
-        # First try EXIF transpose with PIL (handles mobile orientation)
-        img_array = self._apply_exif_transpose(image_path)
-        if img_array is not None:
-            # Convert numpy array to tensor
-            img = tf.convert_to_tensor(img_array, dtype=tf.float32)
-            img = tf.image.resize(img, (224, 224))
-            # Use standalone keras for preprocessing (Keras 3.x compatible)
-            img = keras.applications.resnet_v2.preprocess_input(img)
-            return img
-
-        # Fallback: Use TensorFlow directly (no EXIF handling)
-        img_bytes = tf.io.read_file(image_path)
-
-        # Try JPEG first (faster), fall back to generic decode
-        try:
-            img = tf.image.decode_jpeg(img_bytes, channels=3)
-        except:
-            img = tf.image.decode_image(img_bytes, channels=3, expand_animations=False)
-
-        img = tf.image.resize(img, (224, 224))
-        img = tf.cast(img, tf.float32)
-        # Use standalone keras for preprocessing (Keras 3.x compatible)
-        img = keras.applications.resnet_v2.preprocess_input(img)
-
-        return img
+        if image is None:
+            image = ImageContext.load(image_path)
+        if image is None:
+            raise ValueError(f"Could not decode image: {image_path}")
+        return preprocess_image(image.rgb)
 
     def is_applicable_hazard(self, hazard_type: str) -> bool:
         """
@@ -502,12 +417,15 @@ class VisionService:
     async def classify_image(
         self,
         image_path: str,
-        reported_hazard_type: str
+        reported_hazard_type: str,
+        report_id: Optional[str] = None,
+        user_id: Optional[str] = None
     ) -> LayerResult:
         """
         Classify an image and validate against reported hazard type.
 
         Enhanced verification pipeline:
+        0. Near-duplicate lookup - a photo seen before reuses its earlier result
         1. Pre-classification checks (face detection, skin tones, color palette) - ALWAYS RUN
         2. CNN model classification (only for applicable hazard types)
         3. Hazard type matching
@@ -515,18 +433,12 @@ class VisionService:
         Args:
             image_path: Path to the image file
             reported_hazard_type: The hazard type reported by the user
+            report_id: Report the image belongs to (recorded in the duplicate index)
+            user_id: Reporter; a copy of another reporter's or a scraped photo is flagged as recycled
 
         Returns:
             LayerResult with classification outcome
         """
-        try:
-            import tensorflow as tf
-            import numpy as np
-            tensorflow_available = True
-        except ImportError as e:
-            tensorflow_available = False
-            logger.warning(f"TensorFlow not available: {e}. Image layer will use fallback analysis.")
-
         # Check if image exists FIRST (before any analysis)
         if not os.path.exists(image_path):
             return LayerResult(
@@ -540,11 +452,41 @@ class VisionService:
                 processed_at=datetime.now(timezone.utc)
             )
 
+        # Decode once; the checks and the CNN preprocess share these pixels
+        image = ImageContext.load(image_path)
+        if image is None:
+            return await self._classify_image(image_path, reported_hazard_type, image)
+
+        # STEP 0: Spammers re-upload the same viral photos; don't pay for the CNN again
+        hashes = compute_hashes(image.gray)
+        match = await self._hash_index.lookup(hashes)
+        if match is not None:
+            reused = self._reuse_duplicate_result(match, image_path, reported_hazard_type)
+            if reused is not None:
+                logger.info(
+                    f"Image {image_path} is a near-duplicate of {match.image.source} "
+                    f"{match.image.ref_id} (distance {match.distance}); reusing its result"
+                )
+                return self._flag_duplicate(reused, match, report_id, user_id)
+
+        result = await self._classify_image(image_path, reported_hazard_type, image)
+        await self._index_image(hashes, result, report_id, user_id, reported_hazard_type)
+        return result if match is None else self._flag_duplicate(result, match, report_id, user_id)
+
+    async def _classify_image(
+        self,
+        image_path: str,
+        reported_hazard_type: str,
+        image: Optional[ImageContext]
+    ) -> LayerResult:
+        """Pre-classification checks and CNN classification of a decoded image."""
+        tensorflow_available = self._model_backend_available()
+
         # STEP 1: Pre-classification checks for obvious non-hazard images
         # ALWAYS RUN these checks regardless of hazard type!
         # This catches selfies, portraits, and irrelevant images BEFORE CNN
         logger.info(f"Running pre-classification checks for: {image_path}")
-        pre_check_result = self._perform_pre_classification_checks(image_path, reported_hazard_type)
+        pre_check_result = self._perform_pre_classification_checks(image, reported_hazard_type)
         if pre_check_result is not None:
             logger.info(f"Image rejected by pre-classification: {pre_check_result.reasoning}")
             return pre_check_result
@@ -574,7 +516,7 @@ class VisionService:
 
         # If TensorFlow not available, use fallback image analysis
         if not tensorflow_available:
-            return await self._fallback_image_analysis(image_path, reported_hazard_type)
+            return await self._fallback_image_analysis(image_path, reported_hazard_type, image)
 
         try:
             # STEP 3: Load model if needed for CNN classification
@@ -594,137 +536,238 @@ class VisionService:
 
             # Preprocess and predict
             logger.info(f"Preprocessing image: {image_path}")
-            img = self._preprocess_image(image_path)
-            batch = tf.expand_dims(img, axis=0)
+            img = self._preprocess_image(image_path, image)
             logger.info("Running model prediction...")
-            probs = self._model.predict(batch, verbose=0).squeeze(0)
+            probs = await self._model.predict(img)
             logger.info(f"Prediction complete. Probabilities: {dict(zip(self.LABEL_COLS, probs.tolist()))}")
 
-            # Apply thresholds
-            threshold_array = np.array([
-                self._thresholds.get(label, 0.5)
-                for label in self.LABEL_COLS
-            ])
-            preds = (probs >= threshold_array).astype(int)
+            return self._score_probabilities(probs, image_path, reported_hazard_type)
 
-            # Apply derived-clean logic
-            hazards = preds[:-1]  # All except 'clean'
-            preds[-1] = 1 if not hazards.any() else 0
+        except Exception as e:
+            logger.error(f"Vision classification error: {e}")
+            return LayerResult(
+                layer_name=LayerName.IMAGE,
+                status=LayerStatus.FAIL,
+                score=0.5,  # Partial score for system error
+                confidence=0.0,
+                weight=0.20,
+                reasoning=f"Image classification failed: {str(e)}",
+                data={"error": str(e), "image_path": image_path},
+                processed_at=datetime.now(timezone.utc)
+            )
 
-            # Build predictions dictionary
-            predictions = {
-                self.LABEL_COLS[i]: {
-                    "probability": float(probs[i]),
-                    "predicted": int(preds[i])
-                }
-                for i in range(len(self.LABEL_COLS))
-            }
+    def _score_probabilities(
+        self,
+        probs,
+        image_path: str,
+        reported_hazard_type: str
+    ) -> LayerResult:
+        """
+        Turn CNN class probabilities into the image layer result.
+
+        Args:
+            probs: Probabilities in LABEL_COLS order
+            image_path: Path to the image file
+            reported_hazard_type: The hazard type reported by the user
+
+        Returns:
+            LayerResult with classification outcome
+        """
+        import numpy as np
 
-            # Find the expected Vision Model class for the reported hazard
-            expected_vision_class = self.HAZARD_TO_VISION_MAP.get(reported_hazard_type, None)
+        probs = np.asarray(probs, dtype=np.float32)
 
-            # Determine if prediction matches reported hazard
-            if expected_vision_class:
-                # Check if the expected class was detected
-                is_match = preds[self.LABEL_COLS.index(expected_vision_class)] == 1
-                match_confidence = float(probs[self.LABEL_COLS.index(expected_vision_class)])
+        # Apply thresholds
+        threshold_array = np.array([
+            self._thresholds.get(label, 0.5)
+            for label in self.LABEL_COLS
+        ])
+        preds = (probs >= threshold_array).astype(int)
 
-                # Find what was actually predicted (highest probability hazard)
-                hazard_probs = {
-                    label: float(probs[i])
-                    for i, label in enumerate(self.LABEL_COLS)
-                    if label != 'clean'
-                }
-                predicted_class = max(hazard_probs, key=hazard_probs.get)
-                predicted_confidence = hazard_probs[predicted_class]
+        # Apply derived-clean logic
+        hazards = preds[:-1]  # All except 'clean'
+        preds[-1] = 1 if not hazards.any() else 0
 
-            else:
-                is_match = False
-                match_confidence = 0.0
-                predicted_class = "unknown"
-                predicted_confidence = 0.0
-
-            # Calculate score
-            if is_match:
-                # Match found - hazard type was correctly detected
-                # Score is based on the detection being successful, not raw probability
-                # Since the model's thresholds are already calibrated, passing the threshold
-                # means the detection is valid. We scale the score to reflect confidence levels:
-                # - Above 2x threshold: high confidence (0.9-1.0)
-                # - At threshold: medium confidence (0.7)
-                # - Just above threshold: lower confidence (0.5-0.7)
-                threshold = self._thresholds.get(expected_vision_class, 0.5)
-                if threshold > 0:
-                    # How many times above threshold is the probability?
-                    ratio = match_confidence / threshold
-                    if ratio >= 2.0:
-                        score = 0.9 + min(0.1, (ratio - 2.0) * 0.05)  # 0.9-1.0
-                    elif ratio >= 1.5:
-                        score = 0.8 + (ratio - 1.5) * 0.2  # 0.8-0.9
-                    else:
-                        score = 0.6 + (ratio - 1.0) * 0.4  # 0.6-0.8
-                else:
-                    score = 0.7  # Default if no threshold
+        # Build predictions dictionary
+        predictions = {
+            self.LABEL_COLS[i]: {
+                "probability": float(probs[i]),
+                "predicted": int(preds[i])
+            }
+            for i in range(len(self.LABEL_COLS))
+        }
 
-                status = LayerStatus.PASS
-                reasoning = (
-                    f"Image classification matches reported hazard. "
-                    f"Detected: {expected_vision_class} (confidence: {match_confidence:.1%}, threshold: {threshold:.1%})."
-                )
-            elif preds[-1] == 1:  # Clean detected
-                # Image shows no hazard
-                score = 0.0
-                status = LayerStatus.FAIL
-                reasoning = (
-                    f"Image shows clean/normal conditions, not {reported_hazard_type}. "
-                    f"No hazard detected in the image."
-                )
+        # Find the expected Vision Model class for the reported hazard
+        expected_vision_class = self.HAZARD_TO_VISION_MAP.get(reported_hazard_type, None)
+
+        # Determine if prediction matches reported hazard
+        if expected_vision_class:
+            # Check if the expected class was detected
+            is_match = preds[self.LABEL_COLS.index(expected_vision_class)] == 1
+            match_confidence = float(probs[self.LABEL_COLS.index(expected_vision_class)])
+
+            # Find what was actually predicted (highest probability hazard)
+            hazard_probs = {
+                label: float(probs[i])
+                for i, label in enumerate(self.LABEL_COLS)
+                if label != 'clean'
+            }
+            predicted_class = max(hazard_probs, key=hazard_probs.get)
+            predicted_confidence = hazard_probs[predicted_class]
+
+        else:
+            is_match = False
+            match_confidence = 0.0
+            predicted_class = "unknown"
+            predicted_confidence = 0.0
+
+        # Calculate score
+        if is_match:
+            # Match found - hazard type was correctly detected
+            # Score is based on the detection being successful, not raw probability
+            # Since the model's thresholds are already calibrated, passing the threshold
+            # means the detection is valid. We scale the score to reflect confidence levels:
+            # - Above 2x threshold: high confidence (0.9-1.0)
+            # - At threshold: medium confidence (0.7)
+            # - Just above threshold: lower confidence (0.5-0.7)
+            threshold = self._thresholds.get(expected_vision_class, 0.5)
+            if threshold > 0:
+                # How many times above threshold is the probability?
+                ratio = match_confidence / threshold
+                if ratio >= 2.0:
+                    score = 0.9 + min(0.1, (ratio - 2.0) * 0.05)  # 0.9-1.0
+                elif ratio >= 1.5:
+                    score = 0.8 + (ratio - 1.5) * 0.2  # 0.8-0.9
+                else:
+                    score = 0.6 + (ratio - 1.0) * 0.4  # 0.6-0.8
             else:
-                # Hazard detected but doesn't match reported type
-                # Higher confidence in wrong hazard = lower score (more suspicious)
-                score = max(0.0, 0.3 * (1.0 - predicted_confidence))  # Low score for high-confidence mismatch
-                status = LayerStatus.FAIL
-                reasoning = (
-                    f"Image shows {predicted_class} ({predicted_confidence:.1%}), "
-                    f"but {reported_hazard_type} was reported. Possible wrong image or misclassification."
-                )
+                score = 0.7  # Default if no threshold
 
-            # Build layer data
-            layer_data = ImageLayerData(
-                image_path=image_path,
-                reported_hazard_type=reported_hazard_type,
-                predicted_class=predicted_class,
-                prediction_confidence=predicted_confidence,
-                is_match=is_match,
-                all_predictions={
-                    label: float(probs[i])
-                    for i, label in enumerate(self.LABEL_COLS)
-                }
+            status = LayerStatus.PASS
+            reasoning = (
+                f"Image classification matches reported hazard. "
+                f"Detected: {expected_vision_class} (confidence: {match_confidence:.1%}, threshold: {threshold:.1%})."
             )
-
-            return LayerResult(
-                layer_name=LayerName.IMAGE,
-                status=status,
-                score=max(0.0, min(1.0, score)),
-                confidence=match_confidence if is_match else predicted_confidence,
-                weight=0.20,
-                reasoning=reasoning,
-                data=layer_data.model_dump(),
-                processed_at=datetime.now(timezone.utc)
+        elif preds[-1] == 1:  # Clean detected
+            # Image shows no hazard
+            score = 0.0
+            status = LayerStatus.FAIL
+            reasoning = (
+                f"Image shows clean/normal conditions, not {reported_hazard_type}. "
+                f"No hazard detected in the image."
+            )
+        else:
+            # Hazard detected but doesn't match reported type
+            # Higher confidence in wrong hazard = lower score (more suspicious)
+            score = max(0.0, 0.3 * (1.0 - predicted_confidence))  # Low score for high-confidence mismatch
+            status = LayerStatus.FAIL
+            reasoning = (
+                f"Image shows {predicted_class} ({predicted_confidence:.1%}), "
+                f"but {reported_hazard_type} was reported. Possible wrong image or misclassification."
             )
 
-        except Exception as e:
-            logger.error(f"Vision classification error: {e}")
+        # Build layer data
+        layer_data = ImageLayerData(
+            image_path=image_path,
+            reported_hazard_type=reported_hazard_type,
+            predicted_class=predicted_class,
+            prediction_confidence=predicted_confidence,
+            is_match=is_match,
+            all_predictions={
+                label: float(probs[i])
+                for i, label in enumerate(self.LABEL_COLS)
+            }
+        )
+
+        return LayerResult(
+            layer_name=LayerName.IMAGE,
+            status=status,
+            score=max(0.0, min(1.0, score)),
+            confidence=match_confidence if is_match else predicted_confidence,
+            weight=0.20,
+            reasoning=reasoning,
+            data=layer_data.model_dump(),
+            processed_at=datetime.now(timezone.utc)
+        )
+
+    def _reuse_duplicate_result(
+        self,
+        match: DuplicateMatch,
+        image_path: str,
+        reported_hazard_type: str
+    ) -> Optional[LayerResult]:
+        """
+        Result of an earlier copy of this image, or None if it must be classified again.
+
+        Stored CNN probabilities are rescored against the new hazard type; other
+        stored results only apply to the same hazard type.
+        """
+        earlier = match.image
+        if earlier.probabilities is not None and self.is_applicable_hazard(reported_hazard_type):
+            if not self._load_thresholds_if_needed():
+                return None
+            return self._score_probabilities(earlier.probabilities, image_path, reported_hazard_type)
+
+        if earlier.result is not None and earlier.hazard_type == reported_hazard_type:
             return LayerResult(
                 layer_name=LayerName.IMAGE,
-                status=LayerStatus.FAIL,
-                score=0.5,  # Partial score for system error
-                confidence=0.0,
                 weight=0.20,
-                reasoning=f"Image classification failed: {str(e)}",
-                data={"error": str(e), "image_path": image_path},
-                processed_at=datetime.now(timezone.utc)
+                processed_at=datetime.now(timezone.utc),
+                **earlier.result
             )
+        return None
+
+    def _flag_duplicate(
+        self,
+        result: LayerResult,
+        match: DuplicateMatch,
+        report_id: Optional[str],
+        user_id: Optional[str]
+    ) -> LayerResult:
+        """Attach duplicate details; penalise a photo recycled from someone else."""
+        earlier = match.image
+        if earlier.source == SOURCE_REPORT and report_id is not None and earlier.ref_id == report_id:
+            return result  # Re-verification of the same report
+
+        from_social_media = earlier.source == SOURCE_SOCIAL_MEDIA
+        recycled = from_social_media or (
+            earlier.user_id is not None and user_id is not None and earlier.user_id != user_id
+        )
+        update = {"data": {**(result.data or {}), "duplicate_of": match.to_dict(), "recycled_image": recycled}}
+
+        if recycled:
+            origin = "a social media post" if from_social_media else f"report {earlier.ref_id} from another reporter"
+            update["score"] = result.score * settings.IMAGE_RECYCLED_SCORE_FACTOR
+            update["reasoning"] = f"{result.reasoning} Recycled image: near-duplicate of {origin}."
+
+        return result.model_copy(update=update)
+
+    async def _index_image(
+        self,
+        hashes: ImageHashes,
+        result: LayerResult,
+        report_id: Optional[str],
+        user_id: Optional[str],
+        hazard_type: str
+    ):
+        """Record an image and its result in the duplicate index (errors are not reused)."""
+        data = result.data or {}
+        reusable = "error" not in data
+
+        probabilities = None
+        if reusable and "all_predictions" in data:
+            probabilities = [float(data["all_predictions"][label]) for label in self.LABEL_COLS]
+
+        await self._hash_index.add(
+            hashes,
+            report_id=report_id,
+            user_id=user_id,
+            hazard_type=hazard_type,
+            probabilities=probabilities,
+            result=result.model_dump(
+                mode="json", include={"status", "score", "confidence", "reasoning", "data"}
+            ) if reusable else None
+        )
 
     async def get_classification(self, image_path: str) -> Optional[VisionClassificationResult]:
         """
@@ -736,7 +779,6 @@ class VisionService:
         Returns:
             VisionClassificationResult or None if classification fails
         """
-        import tensorflow as tf
         import numpy as np
 
         try:
@@ -748,8 +790,7 @@ class VisionService:
 
             # Preprocess and predict
             img = self._preprocess_image(image_path)
-            batch = tf.expand_dims(img, axis=0)
-            probs = self._model.predict(batch, verbose=0).squeeze(0)
+            probs = await self._model.predict(img)
 
             # Apply thresholds
             threshold_array = np.array([
@@ -804,7 +845,8 @@ class VisionService:
     async def _fallback_image_analysis(
         self,
         image_path: str,
-        reported_hazard_type: str
+        reported_hazard_type: str,
+        image: Optional[ImageContext] = None
     ) -> LayerResult:
         """
         Fallback image analysis when TensorFlow is not available.
@@ -813,6 +855,7 @@ class VisionService:
         Args:
             image_path: Path to the image file
             reported_hazard_type: The hazard type reported by the user
+            image: Decoded image context, if already loaded
 
         Returns:
             LayerResult with analysis outcome
@@ -822,8 +865,10 @@ class VisionService:
 
         # ALWAYS run pre-classification checks first (face detection, etc.)
         # This catches selfies even when TensorFlow is not available
+        if image is None:
+            image = ImageContext.load(image_path)
         logger.info(f"Running pre-classification checks (fallback mode) for: {image_path}")
-        pre_check_result = self._perform_pre_classification_checks(image_path, reported_hazard_type)
+        pre_check_result = self._perform_pre_classification_checks(image, reported_hazard_type)
         if pre_check_result is not None:
             pre_check_result.data["fallback"] = True
             logger.info(f"Image rejected by pre-classification (fallback): {pre_check_result.reasoning}")
@@ -962,13 +1007,12 @@ DESCRIPTION: [brief description of what you see]"""
 
         # Final fallback: Basic image validation (file exists, reasonable size, valid format)
         try:
-            from PIL import Image
-
-            # Open and validate image
-            img = Image.open(image_path)
-            width, height = img.size
-            file_size = os.path.getsize(image_path)
-            format_type = img.format
+            # Validate the decoded image
+            if image is None:
+                raise ValueError(f"Could not decode image: {image_path}")
+            width, height = image.width, image.height
+            file_size = image.file_size
+            format_type = image.format
 
             # Basic quality checks
             checks_passed = 0
@@ -994,10 +1038,10 @@ DESCRIPTION: [brief description of what you see]"""
                 issues.append(f"Unusual file size: {file_size} bytes")
 
             # Check 4: Color image (not grayscale for most hazards)
-            if img.mode in ["RGB", "RGBA"]:
+            if image.mode in ["RGB", "RGBA"]:
                 checks_passed += 1
             else:
-                issues.append(f"Not RGB: {img.mode}")
+                issues.append(f"Not RGB: {image.mode}")
 
             score = 0.5 + (checks_passed / total_checks) * 0.3  # 0.5 to 0.8
 
@@ -0,0 +1,259 @@
+"""
+Weather Cache
+Shared cache for weather, marine and astronomy lookups.
+
+Entries are keyed by namespace (provider + data type) and the geohash cell of
+the location (WEATHER_CACHE_GEOHASH_PRECISION), so reports from the same
+stretch of coast share one upstream call. The first caller's coordinates are
+used for the fetch.
+
+Tier 1: In-process LRU with per-entry expiry (WEATHER_CACHE_MAX_ITEMS)
+Tier 2: Redis, when connected and a codec is given, shared across workers
+
+Concurrent misses for the same key are coalesced into a single fetch.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.database import get_redis
+from app.utils.geo import geohash_encode
+
+logger = logging.getLogger(__name__)
+
+_REDIS_PREFIX = "weather_cache:"
+
+
+class Codec(NamedTuple):
+    """Converts cached values to and from JSON-serializable data for Redis."""
+    encode: Callable[[Any], Any]
+    decode: Callable[[Any], Any]
+
+
+JSON_CODEC = Codec(lambda value: value, lambda data: data)
+
+
+def _is_present(value: Any) -> bool:
+    return value is not None
+
+
+class WeatherCache:
+    """LRU + TTL cache with single-flight fetches and optional Redis backing."""
+
+    def __init__(
+        self,
+        max_items: int = 2048,
+        ttl_seconds: float = 300,
+        precision: int = 5,
+        redis_enabled: bool = True
+    ):
+        self.max_items = max(1, max_items)
+        self.ttl_seconds = ttl_seconds
+        self.precision = precision
+        self.redis_enabled = redis_enabled
+
+        # key -> (expires_at, value)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        self._hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+        self._namespaces: Dict[str, Dict[str, int]] = {}
+
+    def key(self, namespace: str, lat: float, lon: float) -> str:
+        """Cache key for a location within a namespace."""
+        return f"{namespace}:{geohash_encode(lat, lon, self.precision)}"
+
+    # -------------------------------------------------------------------------
+    # Local tier
+    # -------------------------------------------------------------------------
+
+    def _get_local(self, key: str) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _put_local(self, key: str, value: Any, expires_at: float):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_items:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    # -------------------------------------------------------------------------
+    # Redis tier
+    # -------------------------------------------------------------------------
+
+    async def _redis(self):
+        return await get_redis() if self.redis_enabled else None
+
+    async def _get_remote(self, key: str, codec: Codec) -> Tuple[bool, Any, float]:
+        redis = await self._redis()
+        if redis is None:
+            return False, None, 0.0
+        try:
+            raw = await redis.get(_REDIS_PREFIX + key)
+            if raw:
+                payload = json.loads(raw)
+                if payload["expires_at"] > time.time():
+                    return True, codec.decode(payload["value"]), payload["expires_at"]
+        except Exception as e:
+            logger.debug(f"Weather cache Redis read failed for {key}: {e}")
+        return False, None, 0.0
+
+    async def _put_remote(self, key: str, value: Any, expires_at: float, codec: Codec):
+        redis = await self._redis()
+        if redis is None:
+            return
+        try:
+            payload = json.dumps({"expires_at": expires_at, "value": codec.encode(value)})
+            await redis.set(_REDIS_PREFIX + key, payload, ex=max(1, int(expires_at - time.time())))
+        except Exception as e:
+            logger.debug(f"Weather cache Redis write failed for {key}: {e}")
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    def _count(self, namespace: str, outcome: str):
+        counts = self._namespaces.setdefault(namespace, {"hits": 0, "misses": 0})
+        counts[outcome] += 1
+
+    async def get_or_fetch(
+        self,
+        namespace: str,
+        lat: float,
+        lon: float,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+        codec: Optional[Codec] = None,
+        cacheable: Callable[[Any], bool] = _is_present,
+        refresh: bool = False
+    ) -> Any:
+        """
+        Return the cached value for (lat, lon), fetching it on a miss.
+
+        Args:
+            namespace: Provider/data type, e.g. "weatherapi:current"
+            lat, lon: Location; bucketed by geohash
+            fetch: Coroutine function producing the value
+            ttl: Entry lifetime in seconds (default WEATHER_CACHE_TTL_SECONDS)
+            codec: Enables the Redis tier for this namespace
+            cacheable: Predicate deciding whether a fetched value is stored
+            refresh: Skip cached values and fetch again
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        key = self.key(namespace, lat, lon)
+
+        if not refresh:
+            found, value = self._get_local(key)
+            if found:
+                self._hits += 1
+                self._count(namespace, "hits")
+                return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._coalesced += 1
+            self._count(namespace, "hits")
+            return await asyncio.shield(task)
+
+        self._misses += 1
+        self._count(namespace, "misses")
+        task = asyncio.ensure_future(
+            self._load(key, fetch, self.ttl_seconds if ttl is None else ttl, codec, cacheable, refresh)
+        )
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._finish(key, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved if every waiter was cancelled
+            task.exception()
+
+    async def _load(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float,
+        codec: Optional[Codec],
+        cacheable: Callable[[Any], bool],
+        refresh: bool
+    ) -> Any:
+        if codec is not None and not refresh:
+            found, value, expires_at = await self._get_remote(key, codec)
+            if found:
+                self._redis_hits += 1
+                self._put_local(key, value, expires_at)
+                return value
+
+        value = await fetch()
+        if cacheable(value):
+            expires_at = time.time() + ttl
+            self._put_local(key, value, expires_at)
+            if codec is not None:
+                await self._put_remote(key, value, expires_at, codec)
+        return value
+
+    def clear(self, namespace: Optional[str] = None):
+        """Drop local entries, optionally only those of one namespace."""
+        if namespace is None:
+            self._entries.clear()
+        else:
+            prefix = f"{namespace}:"
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss statistics."""
+        lookups = self._hits + self._coalesced + self._misses
+        return {
+            "items": len(self._entries),
+            "max_items": self.max_items,
+            "ttl_seconds": self.ttl_seconds,
+            "geohash_precision": self.precision,
+            "hits": self._hits,
+            "coalesced": self._coalesced,
+            "redis_hits": self._redis_hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "inflight": len(self._inflight),
+            "hit_rate": round((self._hits + self._coalesced + self._redis_hits) / lookups, 4) if lookups else 0.0,
+            "namespaces": {name: dict(counts) for name, counts in self._namespaces.items()},
+        }
+
+
+# Singleton instance
+_weather_cache: Optional[WeatherCache] = None
+
+
+def get_weather_cache() -> WeatherCache:
+    """Get or create the shared weather cache."""
+    global _weather_cache
+    if _weather_cache is None:
+        _weather_cache = WeatherCache(
+            max_items=settings.WEATHER_CACHE_MAX_ITEMS,
+            ttl_seconds=settings.WEATHER_CACHE_TTL_SECONDS,
+            precision=settings.WEATHER_CACHE_GEOHASH_PRECISION,
+            redis_enabled=settings.WEATHER_CACHE_REDIS_ENABLED
+        )
+    return _weather_cache
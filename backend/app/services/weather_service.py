@@ -8,6 +8,8 @@ from typing import Optional, Dict
 from functools import lru_cache
 import asyncio
 
+from app.services.weather_cache import JSON_CODEC, get_weather_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -31,9 +33,8 @@ class WeatherService:
         self.weather_base_url = "https://api.weatherapi.com/v1"
         self.openweather_base_url = "https://api.openweathermap.org/data/2.5"
 
-        # Cache configuration
-        self.cache = {}
-        self.cache_ttl = int(os.getenv("WEATHER_CACHE_TTL_SECONDS", "300"))
+        # Cache configuration (shared weather cache)
+        self.cache = get_weather_cache()
 
         # Rate limiting
         self.last_request_time = {}
@@ -45,33 +46,6 @@ class WeatherService:
         if not self.openweather_api_key:
             logger.warning("⚠️ OPENWEATHER_API_KEY not configured - fallback provider unavailable")
 
-    def _get_cache_key(self, lat: float, lon: float, data_type: str) -> str:
-        """Generate cache key for location and data type."""
-        return f"{data_type}:{lat:.4f}:{lon:.4f}"
-
-    def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid."""
-        if cache_key not in self.cache:
-            return False
-
-        cached_data, timestamp = self.cache[cache_key]
-        age = (datetime.now(timezone.utc) - timestamp).total_seconds()
-
-        return age < self.cache_ttl
-
-    def _get_from_cache(self, cache_key: str) -> Optional[Dict]:
-        """Get data from cache if valid."""
-        if self._is_cache_valid(cache_key):
-            data, _ = self.cache[cache_key]
-            logger.debug(f"Cache hit: {cache_key}")
-            return data
-        return None
-
-    def _save_to_cache(self, cache_key: str, data: Dict):
-        """Save data to cache with timestamp."""
-        self.cache[cache_key] = (data, datetime.now(timezone.utc))
-        logger.debug(f"Cached: {cache_key}")
-
     async def _rate_limit(self, provider: str):
         """Implement rate limiting per provider."""
         if provider in self.last_request_time:
@@ -103,13 +77,21 @@ class WeatherService:
             logger.debug("Weather API keys not configured, skipping weather fetch")
             return None
 
-        cache_key = self._get_cache_key(lat, lon, "weather")
-
-        # Check cache first
-        cached_data = self._get_from_cache(cache_key)
-        if cached_data:
-            return cached_data
+        return await self.cache.get_or_fetch(
+            "weather:current",
+            lat,
+            lon,
+            lambda: self._fetch_current_weather(lat, lon, retry_count),
+            codec=JSON_CODEC
+        )
 
+    async def _fetch_current_weather(
+        self,
+        lat: float,
+        lon: float,
+        retry_count: int
+    ) -> Optional[Dict]:
+        """Fetch current weather from WeatherAPI, falling back to OpenWeatherMap."""
         # Try primary provider (WeatherAPI) if key is available
         if self.weather_api_key:
             for attempt in range(retry_count):
@@ -147,9 +129,6 @@ class WeatherService:
                                 "timestamp": datetime.now(timezone.utc).isoformat()
                             }
 
-                            # Cache successful response
-                            self._save_to_cache(cache_key, weather_data)
-
                             logger.info(f"✓ Fetched weather for ({lat}, {lon})")
                             return weather_data
 
@@ -244,13 +223,16 @@ class WeatherService:
             logger.debug("Weather API key not configured, skipping marine data fetch")
             return None
 
-        cache_key = self._get_cache_key(lat, lon, "marine")
-
-        # Check cache
-        cached_data = self._get_from_cache(cache_key)
-        if cached_data:
-            return cached_data
+        return await self.cache.get_or_fetch(
+            "weather:marine",
+            lat,
+            lon,
+            lambda: self._fetch_marine_data(lat, lon),
+            codec=JSON_CODEC
+        )
 
+    async def _fetch_marine_data(self, lat: float, lon: float) -> Optional[Dict]:
+        """Fetch marine/tide data from the WeatherAPI marine endpoint."""
         try:
             await self._rate_limit("weatherapi")
 
@@ -304,9 +286,6 @@ class WeatherService:
                             "timestamp": datetime.now(timezone.utc).isoformat()
                         }
 
-                        # Cache successful response
-                        self._save_to_cache(cache_key, marine_data)
-
                         logger.info(f"✓ Fetched marine data for ({lat}, {lon})")
                         return marine_data
 
@@ -324,18 +303,13 @@ class WeatherService:
 
     def clear_cache(self):
         """Clear all cached data."""
-        self.cache = {}
+        self.cache.clear("weather:current")
+        self.cache.clear("weather:marine")
         logger.info("Weather cache cleared")
 
     def get_cache_stats(self) -> Dict:
         """Get cache statistics."""
-        valid_entries = sum(1 for key in self.cache.keys() if self._is_cache_valid(key))
-        return {
-            "total_entries": len(self.cache),
-            "valid_entries": valid_entries,
-            "expired_entries": len(self.cache) - valid_entries,
-            "cache_ttl_seconds": self.cache_ttl
-        }
+        return self.cache.get_stats()
 
 
 # Create singleton instance
@@ -0,0 +1,160 @@
+"""
+Request Batching Utilities
+Coalesces concurrent single-item calls into one batched call.
+
+Used by ML services (VectorDB text classification) where the fixed
+per-call model overhead dominates: concurrent requests arriving within a
+few milliseconds are gathered, processed with a single forward pass, and
+the per-item results are fanned back out to the awaiting callers.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+BatchFunction = Callable[[List[Any]], Union[List[Any], Awaitable[List[Any]]]]
+
+
+class MicroBatcher:
+    """
+    Async request coalescer.
+
+    Callers ``await submit(item)``. Items are buffered until either
+    ``max_batch_size`` items are pending or ``max_wait_ms`` has elapsed since
+    the first pending item, then ``batch_fn`` is invoked once with the whole
+    list. ``batch_fn`` must return one result per item, in order; it may be a
+    plain function or a coroutine function.
+    """
+
+    def __init__(
+        self,
+        batch_fn: BatchFunction,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "batcher"
+    ):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000
+        self.name = name
+
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Statistics
+        self._batches = 0
+        self._items = 0
+        self._largest_batch = 0
+        self._total_batch_ms = 0.0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue a single item and wait for its result from the next batch."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Pending futures belong to a previous loop (e.g. test runners)
+            self._pending = []
+            self._flush_task = None
+            self._running = set()
+            self._loop = loop
+
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._cancel_timer()
+            # Run the batch in its own task: cancelling this caller (client
+            # disconnect, timeout) must not tear down the batch others wait on
+            task = loop.create_task(self._run_batch(self._take_batch()))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+        elif self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_after_wait())
+
+        return await future
+
+    def _cancel_timer(self):
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+
+    async def _flush_after_wait(self):
+        try:
+            await asyncio.sleep(self.max_wait_seconds)
+        except asyncio.CancelledError:
+            return
+        self._flush_task = None
+        await self._flush()
+
+    async def _flush(self):
+        """Run batch_fn over everything pending and resolve the futures."""
+        await self._run_batch(self._take_batch())
+
+    def _take_batch(self) -> List[Tuple[Any, asyncio.Future]]:
+        """Claim the next batch of pending items."""
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+
+        # Anything left over gets its own timer
+        if self._pending and self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_after_wait())
+        return batch
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """Run batch_fn over a claimed batch and resolve its futures."""
+        if not batch:
+            return
+
+        items = [item for item, _ in batch]
+        start_time = time.time()
+
+        try:
+            results = self.batch_fn(items)
+            if asyncio.iscoroutine(results) or isinstance(results, asyncio.Future):
+                results = await results
+
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"{self.name}: batch function returned {len(results)} results for {len(items)} items"
+                )
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+        except Exception as e:
+            logger.error(f"{self.name}: batch of {len(items)} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+        except BaseException:
+            # Cancelled (e.g. loop shutdown): don't leave any caller waiting
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+            raise
+
+        finally:
+            self._batches += 1
+            self._items += len(items)
+            self._largest_batch = max(self._largest_batch, len(items))
+            self._total_batch_ms += (time.time() - start_time) * 1000
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics."""
+        return {
+            "name": self.name,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+            "batches": self._batches,
+            "items": self._items,
+            "pending": len(self._pending),
+            "largest_batch": self._largest_batch,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "avg_batch_ms": round(self._total_batch_ms / self._batches, 2) if self._batches else 0.0,
+        }
@@ -0,0 +1,154 @@
+"""
+Geodesic utilities.
+
+NumPy-vectorized great-circle (haversine) distances shared by the geofence,
+hazard monitoring, alerting and SOS services. Scalar inputs return a float;
+array inputs broadcast and return arrays.
+"""
+
+import math
+from typing import Tuple, Union
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180.0
+
+ArrayLike = Union[float, np.ndarray, list, tuple]
+
+
+def haversine_km(lat1: ArrayLike, lon1: ArrayLike, lat2: ArrayLike, lon2: ArrayLike) -> Union[float, np.ndarray]:
+    """
+    Great-circle distance in kilometers.
+
+    Args:
+        lat1, lon1: First point(s) in degrees
+        lat2, lon2: Second point(s) in degrees (broadcast against the first)
+
+    Returns:
+        float for scalar inputs, otherwise an array of distances
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+    return float(distance) if distance.ndim == 0 else distance
+
+
+def distances_km(lat: float, lon: float, lats: ArrayLike, lons: ArrayLike) -> np.ndarray:
+    """One-to-many distances from (lat, lon) to every point in lats/lons."""
+    return np.atleast_1d(haversine_km(lat, lon, lats, lons))
+
+
+def distance_matrix_km(lats1: ArrayLike, lons1: ArrayLike, lats2: ArrayLike, lons2: ArrayLike) -> np.ndarray:
+    """Many-to-many distances; result[i, j] is from point i of set 1 to point j of set 2."""
+    lats1 = np.asarray(lats1, dtype=float).reshape(-1, 1)
+    lons1 = np.asarray(lons1, dtype=float).reshape(-1, 1)
+    lats2 = np.asarray(lats2, dtype=float).reshape(1, -1)
+    lons2 = np.asarray(lons2, dtype=float).reshape(1, -1)
+    return np.atleast_2d(haversine_km(lats1, lons1, lats2, lons2))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Lat/lon box containing every point within radius_km of (lat, lon).
+
+    Returns:
+        (min_lat, max_lat, min_lon, max_lon); min_lon > max_lon when the box
+        crosses the antimeridian
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        # Box reaches a pole: every longitude is in range
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+
+    dlon = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat)))))
+    if dlon >= 180:
+        return min_lat, max_lat, -180.0, 180.0
+
+    min_lon = (lon - dlon + 180) % 360 - 180
+    max_lon = (lon + dlon + 180) % 360 - 180
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def in_bounding_box(lats: ArrayLike, lons: ArrayLike, box: Tuple[float, float, float, float]) -> np.ndarray:
+    """Boolean mask of points inside a bounding_box()."""
+    min_lat, max_lat, min_lon, max_lon = box
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    in_lat = (lats >= min_lat) & (lats <= max_lat)
+    if min_lon <= max_lon:
+        return in_lat & (lons >= min_lon) & (lons <= max_lon)
+    return in_lat & ((lons >= min_lon) | (lons <= max_lon))
+
+
+def within_radius(
+    lat: float,
+    lon: float,
+    lats: ArrayLike,
+    lons: ArrayLike,
+    radius_km: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Points within radius_km of (lat, lon), nearest first.
+
+    A bounding-box prefilter limits the haversine evaluation to candidates.
+
+    Returns:
+        (indices into lats/lons, distances in km)
+    """
+    lats = np.asarray(lats, dtype=float).ravel()
+    lons = np.asarray(lons, dtype=float).ravel()
+    candidates = np.flatnonzero(in_bounding_box(lats, lons, bounding_box(lat, lon, radius_km)))
+    if len(candidates) == 0:
+        return candidates, np.empty(0)
+
+    distance = distances_km(lat, lon, lats[candidates], lons[candidates])
+    keep = distance <= radius_km
+    order = np.argsort(distance[keep], kind="stable")
+    return candidates[keep][order], distance[keep][order]
+
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(lat: float, lon: float, precision: int = 5) -> str:
+    """
+    Geohash of (lat, lon) with `precision` characters.
+
+    Nearby points share a prefix; precision 5 cells are about 4.9 x 4.9 km.
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        rng, coord = (lon_range, lon) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def nearest_point(lat: float, lon: float, lats: ArrayLike, lons: ArrayLike) -> Tuple[int, float]:
+    """Index of and distance to the point nearest (lat, lon); (-1, inf) if empty."""
+    distance = distances_km(lat, lon, lats, lons)
+    if len(distance) == 0:
+        return -1, math.inf
+    index = int(np.argmin(distance))
+    return index, float(distance[index])
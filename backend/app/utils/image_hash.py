@@ -0,0 +1,150 @@
+"""
+Perceptual Image Hashing
+64-bit dHash/pHash and a BK-tree for near-duplicate lookup.
+
+Shared with BlueRadar (blueradar_intelligence/vision/pipeline.py loads this
+file directly), so it must only depend on numpy and Pillow - no app imports.
+Hashes from both sides are therefore comparable bit for bit.
+"""
+
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+ImageInput = Union[Image.Image, np.ndarray]
+
+HASH_BITS = 64
+
+# Orthonormal DCT-II basis for the 32x32 pHash input
+_DCT_SIZE = 32
+_k = np.arange(_DCT_SIZE)
+_DCT = np.sqrt(2.0 / _DCT_SIZE) * np.cos(np.pi * (2 * _k[None, :] + 1) * _k[:, None] / (2 * _DCT_SIZE))
+_DCT[0] /= np.sqrt(2.0)
+
+
+@dataclass(frozen=True)
+class ImageHashes:
+    """dHash (indexed) and pHash (confirmation) of one image."""
+    dhash: int
+    phash: int
+
+    def to_dict(self) -> dict:
+        return {"dhash": to_hex(self.dhash), "phash": to_hex(self.phash)}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ImageHashes":
+        return cls(dhash=from_hex(data["dhash"]), phash=from_hex(data["phash"]))
+
+
+def _grayscale(image: ImageInput) -> Image.Image:
+    if isinstance(image, np.ndarray):
+        image = Image.fromarray(image)
+    return image if image.mode == "L" else image.convert("L")
+
+
+def _pack_bits(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.astype(np.uint8)).tobytes(), "big")
+
+
+def dhash(image: ImageInput) -> int:
+    """Difference hash: sign of horizontal gradients on a 9x8 thumbnail."""
+    small = np.asarray(_grayscale(image).resize((9, 8), Image.Resampling.LANCZOS), dtype=np.int16)
+    return _pack_bits(small[:, 1:] > small[:, :-1])
+
+
+def phash(image: ImageInput) -> int:
+    """DCT hash: low 8x8 frequencies of a 32x32 thumbnail against their median."""
+    small = np.asarray(
+        _grayscale(image).resize((_DCT_SIZE, _DCT_SIZE), Image.Resampling.LANCZOS), dtype=np.float64
+    )
+    low = (_DCT @ small @ _DCT.T)[:8, :8].flatten()
+    # Exclude the DC term from the median; it only encodes overall brightness
+    return _pack_bits(low > np.median(low[1:]))
+
+
+def compute_hashes(image: ImageInput) -> ImageHashes:
+    """
+    Both hashes for an image.
+
+    Args:
+        image: PIL image or uint8 array (RGB or grayscale), any size
+
+    Returns:
+        ImageHashes
+    """
+    gray = _grayscale(image)
+    return ImageHashes(dhash=dhash(gray), phash=phash(gray))
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def to_hex(value: int) -> str:
+    return f"{value:016x}"
+
+
+def from_hex(value: str) -> int:
+    return int(value, 16)
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over 64-bit hashes with Hamming distance.
+
+    A radius-r search only descends into children whose edge distance lies
+    within [d - r, d + r], so small radii touch a small fraction of the tree.
+    """
+
+    def __init__(self):
+        # Node: [hash, values, {distance: child}]
+        self._root: Optional[list] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, key: int, value: Any):
+        """Insert a value under a hash (several values may share one hash)."""
+        self._size += 1
+        if self._root is None:
+            self._root = [key, [value], {}]
+            return
+
+        node = self._root
+        while True:
+            distance = hamming_distance(key, node[0])
+            if distance == 0:
+                node[1].append(value)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [key, [value], {}]
+                return
+            node = child
+
+    def search(self, key: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """
+        All values within max_distance of a hash.
+
+        Returns:
+            (distance, value) pairs sorted by distance
+        """
+        if self._root is None:
+            return []
+
+        matches = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(key, node[0])
+            if distance <= max_distance:
+                matches.extend((distance, value) for value in node[1])
+            for edge, child in node[2].items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+
+        matches.sort(key=lambda match: match[0])
+        return matches
@@ -6,7 +6,7 @@ Token generation and validation with refresh token support
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Optional
 from jose import jwt, JWTError
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, status
 
 from app.config import settings
 from app.utils.security import generate_token_id
@@ -160,6 +160,66 @@ def verify_token(token: str, expected_type: str = "access") -> Dict[str, Any]:
         )
 
 
+def get_request_token_claims(request: Request, token: str) -> Dict[str, Any]:
+    """
+    Decode a request's bearer token once and share the claims for the request
+
+    The rate limiter and the auth dependencies both need the token's claims;
+    the first caller decodes it (signature checked, expiry not) and later
+    callers in the same request reuse the result from request.state.
+
+    Args:
+        request: Current request
+        token: JWT token string from the Authorization header
+
+    Returns:
+        Token payload dictionary
+
+    Raises:
+        HTTPException: If token is invalid
+    """
+    cached = getattr(request.state, "token_claims", None)
+    if cached is not None and cached[0] == token:
+        return cached[1]
+
+    payload = decode_token(token)
+    request.state.token_claims = (token, payload)
+    return payload
+
+
+def check_token_claims(payload: Dict[str, Any], expected_type: str = "access") -> Dict[str, Any]:
+    """
+    Check expiry and type of already decoded claims (see verify_token)
+
+    Args:
+        payload: Token payload from decode_token
+        expected_type: Expected token type ('access' or 'refresh')
+
+    Returns:
+        Token payload dictionary
+
+    Raises:
+        HTTPException: If token is expired or of the wrong type
+    """
+    exp = payload.get("exp")
+    if exp is not None and datetime.now(timezone.utc).timestamp() > exp:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    token_type = payload.get("type")
+    if token_type != expected_type:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid token type. Expected {expected_type}, got {token_type}",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    return payload
+
+
 def get_token_expiry(token: str) -> Optional[datetime]:
     """
     Get token expiration time
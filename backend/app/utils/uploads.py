@@ -0,0 +1,93 @@
+"""
+Upload Helpers
+Stream multipart uploads to disk without holding them in memory.
+
+Starlette already spools the request body to a temporary file; copying that
+file in fixed-size chunks on a worker thread keeps peak memory at one chunk
+per upload and keeps disk writes off the event loop.
+"""
+
+import asyncio
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import BinaryIO, Tuple
+
+from fastapi import UploadFile
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds its size limit."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"File too large. Maximum size: {max_size / 1024 / 1024}MB")
+
+
+@dataclass
+class StoredUpload:
+    """An upload written to disk."""
+    path: str
+    size: int
+    sha256: str
+
+
+def _copy_limited(
+    source: BinaryIO,
+    dest_path: str,
+    max_size: int,
+    chunk_size: int
+) -> Tuple[int, str]:
+    """Copy source to dest_path chunk by chunk, hashing as it goes; abort past max_size."""
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(dest_path, "wb") as out:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(max_size)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        # Never leave a partial file behind
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+    return size, digest.hexdigest()
+
+
+async def save_upload_stream(
+    upload_file: UploadFile,
+    dest_path: str,
+    max_size: int,
+    chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> StoredUpload:
+    """
+    Write an uploaded file to disk in chunks.
+
+    Args:
+        upload_file: FastAPI upload
+        dest_path: Destination file path
+        max_size: Maximum size in bytes
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        StoredUpload with the size and SHA-256 of the content
+
+    Raises:
+        UploadTooLargeError: If the upload exceeds max_size (nothing is left on disk)
+    """
+    # Reject from the declared size before reading the body
+    if upload_file.size is not None and upload_file.size > max_size:
+        raise UploadTooLargeError(max_size)
+
+    size, sha256 = await asyncio.to_thread(
+        _copy_limited, upload_file.file, dest_path, max_size, chunk_size
+    )
+    return StoredUpload(path=dest_path, size=size, sha256=sha256)
@@ -0,0 +1,81 @@
+"""
+Vision Inference Server
+Sidecar process that owns the Keras vision model for every API worker.
+
+Run alongside the API (one worker: the point is a single model copy):
+
+    uvicorn app.vision_server:app --host 127.0.0.1 --port 8100 --workers 1
+
+and point the API at it with VISION_INFERENCE_URL=http://127.0.0.1:8100.
+Requests from all API workers share one micro-batcher, so bursts of report
+photos are scored in batches of up to VISION_BATCH_MAX_SIZE.
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request, status
+
+from app.services.inference_executor import (
+    InferenceOverloadedError, get_inference_executor, shutdown_inference_executor
+)
+from app.services.vision_inference import INPUT_SHAPE, create_vision_runner
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+runner = create_vision_runner()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the model before accepting requests."""
+    loaded = await get_inference_executor().run(runner.load, timeout=None)
+    logger.info(f"Vision inference server ready (model loaded: {loaded})")
+    yield
+    shutdown_inference_executor()
+
+
+app = FastAPI(title="CoastGuardian Vision Inference", lifespan=lifespan)
+
+
+@app.post("/predict")
+async def predict(request: Request):
+    """
+    Score one preprocessed image.
+
+    Body: raw float32 bytes of a (224, 224, 3) tensor, shape in X-Tensor-Shape.
+    """
+    shape = tuple(int(d) for d in request.headers.get("X-Tensor-Shape", "").split(",") if d)
+    if shape != INPUT_SHAPE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Expected shape {INPUT_SHAPE}")
+
+    body = await request.body()
+    if len(body) != int(np.prod(INPUT_SHAPE)) * 4:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body size does not match shape")
+
+    if not runner.is_loaded:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Vision Model not loaded")
+
+    tensor = np.frombuffer(body, dtype=np.float32).reshape(INPUT_SHAPE)
+    try:
+        probs = await runner.predict(tensor)
+    except (InferenceOverloadedError, asyncio.TimeoutError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Vision inference busy, retry shortly: {e or 'timed out'}"
+        )
+    return {"probabilities": [float(p) for p in probs]}
+
+
+@app.get("/health")
+async def health():
+    return {"status": "healthy" if runner.is_loaded else "model_not_loaded"}
+
+
+@app.get("/metrics")
+async def metrics():
+    """Throughput, latency and queue metrics."""
+    return runner.get_stats()
@@ -0,0 +1,53 @@
+"""
+Report Rollup Backfill
+
+Rebuilds the hourly/daily report counters (report_rollups) behind the admin and
+analyst dashboards from hazard_reports. The API builds them automatically on
+first start (REPORT_ROLLUP_AUTO_BACKFILL); run this after restoring or bulk
+editing hazard_reports, or when automatic backfill is disabled.
+
+The dashboards read hazard_reports directly while the rebuild runs. If an API
+process currently holds the rollup maintenance lease, the script exits; retry
+after REPORT_ROLLUP_LEASE_SECONDS or with the API stopped.
+
+Usage:
+    cd backend
+    python scripts/backfill_report_rollups.py [--batch-size 1000]
+"""
+
+import sys
+import asyncio
+import argparse
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config import settings
+from app.services.report_rollup_service import ReportRollupService
+
+
+async def main():
+    parser = argparse.ArgumentParser(description='Rebuild report rollups from hazard_reports')
+    parser.add_argument('--batch-size', type=int, default=settings.REPORT_ROLLUP_BATCH_SIZE,
+                        help='Reports applied per bulk write')
+    args = parser.parse_args()
+    settings.REPORT_ROLLUP_BATCH_SIZE = args.batch_size
+
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    try:
+        db = client[settings.MONGODB_DB_NAME]
+        try:
+            count = await ReportRollupService(db).backfill()
+        except RuntimeError as e:
+            print(f"Backfill not started: {e}")
+            sys.exit(1)
+        print(f"Rebuilt report rollups from {count} reports")
+    finally:
+        client.close()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+"""
+VectorDB Artifact Build Script
+
+Precomputes the VectorDB training-set embeddings and flat FAISS index so
+API workers can memory-map them at startup instead of re-encoding the
+training data on every boot. Run at deploy/build time.
+
+The artifact is named by a fingerprint of the model and training data, so
+nothing is rebuilt unless one of those changed.
+
+Usage:
+    cd backend
+    python scripts/build_vectordb_artifact.py [--force]
+
+Options:
+    --force    Rebuild even if an artifact for the current fingerprint exists
+"""
+
+import sys
+import argparse
+import logging
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sentence_transformers import SentenceTransformer
+
+from app.services.vectordb_service import VectorDBService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the VectorDB training artifact")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if up to date")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    service = VectorDBService()
+    print(f"Loading model {service.model_name}...")
+    service.model = SentenceTransformer(service.model_name)
+
+    prefix, built = service.build_training_artifact(force=args.force)
+    if built:
+        print(f"Built artifact: {prefix}")
+    else:
+        print(f"Artifact up to date: {prefix}")
+
+
+if __name__ == "__main__":
+    main()
@@ -658,6 +658,29 @@ def cleanup_test_files():
             pass
 
 
+@pytest.fixture(autouse=True)
+def reset_trust_aggregator():
+    """Drop buffered trust events and cached reporter stats between tests."""
+    yield
+    from app.services import trust_aggregator
+    if trust_aggregator._trust_aggregator is not None:
+        loop_task = trust_aggregator._trust_aggregator._loop_task
+        if loop_task is not None and not loop_task.done():
+            loop_task.cancel()
+        trust_aggregator._trust_aggregator = None
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_caches():
+    """Start every test with empty response and principal caches and rate limits."""
+    yield
+    from app.middleware import rate_limit
+    from app.services import principal_cache, response_cache
+    response_cache._response_cache = None
+    principal_cache._principal_cache = None
+    rate_limit._rate_limiter = None
+
+
 # =============================================================================
 # PERFORMANCE TRACKING
 # =============================================================================
@@ -0,0 +1,230 @@
+"""
+In-memory subset of the Motor API for service tests.
+
+Supports the query operators ($or, $in, $gt, $gte, $lt, $lte), update
+operators ($set, $inc), upserts, find_one_and_update with sort, bulk_write
+of UpdateOne operations, and aggregate pipelines of $match, $group and $sort
+(with $sum/$min/$max accumulators and $cond/$eq/$gte/$and/$or expressions).
+Projections are ignored. Collections are created on first access:
+
+    db = FakeDB()
+    db.hazard_reports.docs.extend(reports)
+    db.verification_queue = FakeCollection(unique_key="report_id")
+"""
+
+import copy
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+
+def matches(doc: Dict[str, Any], query: Optional[Dict[str, Any]]) -> bool:
+    """Whether doc satisfies a find() filter."""
+    for key, cond in (query or {}).items():
+        if key == "$or":
+            if not any(matches(doc, sub) for sub in cond):
+                return False
+            continue
+        value = doc.get(key)
+        if isinstance(cond, dict):
+            for op, arg in cond.items():
+                if op == "$in" and value not in arg:
+                    return False
+                if op == "$gt" and not (value is not None and value > arg):
+                    return False
+                if op == "$gte" and not (value is not None and value >= arg):
+                    return False
+                if op == "$lt" and not (value is not None and value < arg):
+                    return False
+                if op == "$lte" and not (value is not None and value <= arg):
+                    return False
+        elif value != cond:
+            return False
+    return True
+
+
+def evaluate(expr: Any, doc: Dict[str, Any]) -> Any:
+    """Evaluate an aggregation expression against doc."""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc.get(expr[1:])
+    if isinstance(expr, dict):
+        op = next(iter(expr), "")
+        if not op.startswith("$"):
+            # Document expression, e.g. a compound group _id
+            return {key: evaluate(value, doc) for key, value in expr.items()}
+        args = expr[op]
+        if op == "$cond":
+            return evaluate(args[1], doc) if evaluate(args[0], doc) else evaluate(args[2], doc)
+        values = [evaluate(arg, doc) for arg in args]
+        return {
+            "$eq": lambda: values[0] == values[1],
+            "$gte": lambda: values[0] >= values[1],
+            "$and": lambda: all(values),
+            "$or": lambda: any(values),
+        }[op]()
+    return expr
+
+
+def _sort_key(field: str):
+    # Missing/None sort first, as in MongoDB
+    return lambda d: (d.get(field) is not None, d.get(field))
+
+
+def _hashable(value: Any) -> Any:
+    return tuple(sorted(value.items())) if isinstance(value, dict) else value
+
+
+class FakeCursor:
+    def __init__(self, docs: List[Dict[str, Any]]):
+        self.docs = docs
+
+    def sort(self, key, direction=1):
+        self.docs.sort(key=_sort_key(key), reverse=direction == -1)
+        return self
+
+    def skip(self, n):
+        self.docs = self.docs[n:]
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    def __init__(self, docs: Optional[List[Dict[str, Any]]] = None, unique_key: Optional[str] = None):
+        self.docs = docs if docs is not None else []
+        self.unique_key = unique_key
+
+    # -- reads ----------------------------------------------------------------
+
+    def find(self, query=None, projection=None):
+        return FakeCursor([copy.deepcopy(d) for d in self.docs if matches(d, query)])
+
+    async def find_one(self, query=None, projection=None):
+        return next((copy.deepcopy(d) for d in self.docs if matches(d, query)), None)
+
+    async def count_documents(self, query):
+        return sum(1 for d in self.docs if matches(d, query))
+
+    def aggregate(self, pipeline):
+        docs = [copy.deepcopy(d) for d in self.docs]
+        for stage in pipeline:
+            if "$match" in stage:
+                docs = [d for d in docs if matches(d, stage["$match"])]
+            elif "$group" in stage:
+                docs = self._group(docs, stage["$group"])
+            elif "$sort" in stage:
+                for field, direction in reversed(list(stage["$sort"].items())):
+                    docs.sort(key=_sort_key(field), reverse=direction == -1)
+        return FakeCursor(docs)
+
+    @staticmethod
+    def _group(docs, group):
+        rows: Dict[Any, Dict[str, Any]] = {}
+        for doc in docs:
+            group_id = evaluate(group["_id"], doc)
+            row = rows.setdefault(_hashable(group_id), {"_id": group_id})
+            for field, accumulator in group.items():
+                if field == "_id":
+                    continue
+                op, arg = next(iter(accumulator.items()))
+                value = evaluate(arg, doc)
+                if op == "$sum":
+                    row[field] = row.get(field, 0) + value
+                elif op == "$min":
+                    row[field] = value if field not in row else min(row[field], value)
+                elif op == "$max":
+                    row[field] = value if field not in row else max(row[field], value)
+        return list(rows.values())
+
+    # -- writes ---------------------------------------------------------------
+
+    def _check_unique(self, doc):
+        for key in ("_id", self.unique_key):
+            if key and key in doc and any(d.get(key) == doc[key] for d in self.docs):
+                raise DuplicateKeyError(f"duplicate {key}")
+
+    async def insert_one(self, doc):
+        self._check_unique(doc)
+        self.docs.append(copy.deepcopy(doc))
+        return SimpleNamespace(inserted_id=doc.get("_id"))
+
+    @staticmethod
+    def _apply(doc, update):
+        doc.update(copy.deepcopy(update.get("$set", {})))
+        for key, amount in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + amount
+
+    def _upsert(self, query, update):
+        doc = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+        self._check_unique(doc)
+        self._apply(doc, update)
+        self.docs.append(doc)
+        return doc
+
+    async def update_one(self, query, update, upsert=False):
+        doc = next((d for d in self.docs if matches(d, query)), None)
+        if doc is not None:
+            self._apply(doc, update)
+        elif upsert:
+            self._upsert(query, update)
+        found = int(doc is not None)
+        return SimpleNamespace(matched_count=found, modified_count=found)
+
+    async def find_one_and_update(
+        self, query, update, sort=None, projection=None, upsert=False, return_document=ReturnDocument.BEFORE
+    ):
+        candidates = [d for d in self.docs if matches(d, query)]
+        for field, direction in reversed(sort or []):
+            candidates.sort(key=_sort_key(field), reverse=direction == -1)
+        if not candidates:
+            if not upsert:
+                return None
+            doc = self._upsert(query, update)
+            return copy.deepcopy(doc) if return_document == ReturnDocument.AFTER else None
+
+        doc = candidates[0]
+        before = copy.deepcopy(doc)
+        self._apply(doc, update)
+        return copy.deepcopy(doc) if return_document == ReturnDocument.AFTER else before
+
+    async def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            await self.update_one(op._filter, op._doc, upsert=op._upsert)
+
+    async def delete_many(self, query):
+        before = len(self.docs)
+        self.docs[:] = [d for d in self.docs if not matches(d, query)]
+        return SimpleNamespace(deleted_count=before - len(self.docs))
+
+
+class FakeDB(dict):
+    """Database whose collections are created on first access."""
+
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __setattr__(self, name, value):
+        self[name] = value
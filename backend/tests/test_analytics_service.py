@@ -0,0 +1,115 @@
+"""
+Tests for the single-scan analytics aggregations.
+
+Run with: pytest tests/test_analytics_service.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.analytics_service import AnalyticsService
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+class FakeReports:
+    """Records pipelines and returns canned aggregation output."""
+
+    def __init__(self, aggregate_result, regions=None):
+        self.aggregate_result = aggregate_result
+        self.regions = regions or []
+        self.pipelines = []
+        self.distinct_calls = 0
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return FakeCursor(self.aggregate_result)
+
+    async def distinct(self, field):
+        self.distinct_calls += 1
+        return self.regions if field == "location.state" else []
+
+    async def count_documents(self, query):
+        raise AssertionError("analytics should not issue separate counts")
+
+
+class FakeDB:
+    def __init__(self, reports):
+        self.hazard_reports = reports
+
+
+class TestAnalyticsFacets:
+    """Each analytics call is one aggregation over hazard_reports."""
+
+    @pytest.mark.asyncio
+    async def test_report_analytics_single_facet_scan(self):
+        reports = FakeReports([{
+            "by_status": [{"_id": "verified", "count": 6}, {"_id": "pending", "count": 3}, {"_id": None, "count": 1}],
+            "by_hazard_type": [{"_id": "Oil Spill", "count": 7}, {"_id": "High Waves", "count": 3}],
+            "by_region": [{"_id": "Kerala", "count": 10}],
+            "high_severity": [{"count": 4}],
+            "previous_total": [{"count": 8}],
+        }], regions=["Tamil Nadu", "Kerala", None])
+        service = AnalyticsService(FakeDB(reports))
+
+        result = await service.get_report_analytics("7days", region="Kerala", status="verified")
+
+        assert len(reports.pipelines) == 1
+        scan, facet = reports.pipelines[0]
+        # Current period (region and status filters both applied) or previous period
+        assert len(scan["$match"]["$or"][0]["$and"]) == 2
+        assert set(facet["$facet"]) == {"by_status", "by_hazard_type", "by_region", "high_severity", "previous_total"}
+
+        assert result["total_reports"] == 10
+        assert result["verified_reports"] == 6
+        assert result["by_status"]["unknown"] == 1
+        assert result["high_severity_count"] == 4
+        assert result["change_from_previous"]["total"] == 25.0
+        assert result["available_regions"] == ["Kerala", "Tamil Nadu"]
+
+        # Region list is cached between dashboard refreshes
+        await service.get_report_analytics("all")
+        assert reports.distinct_calls == 1
+        assert "previous_total" not in reports.pipelines[1][1]["$facet"]
+
+    @pytest.mark.asyncio
+    async def test_verification_metrics_single_facet_scan(self):
+        reports = FakeReports([{
+            "counts": [{"_id": None, "total": 20, "verified": 12, "rejected": 3}],
+            "response": [{"_id": None, "avg_response_ms": 2 * 3600 * 1000}],
+            "verifiers": [{"_id": "USR_A", "count": 9}],
+            "reporters": [{"total": 11}],
+        }])
+        result = await AnalyticsService(FakeDB(reports)).get_verification_metrics("30days")
+
+        assert len(reports.pipelines) == 1
+        assert result["pending_reports"] == 5
+        assert result["verification_rate"] == 60.0
+        assert result["avg_response_time_hours"] == 2.0
+        assert result["active_reporters"] == 11
+        assert result["top_verifiers"] == [{"id": "USR_A", "count": 9}]
+
+    @pytest.mark.asyncio
+    async def test_period_comparison_groups_both_periods_in_one_scan(self):
+        reports = FakeReports([
+            {"_id": "current", "total": 15, "verified": 9, "high_priority": 2},
+            {"_id": "previous", "total": 10, "verified": 9, "high_priority": 0},
+        ])
+        result = await AnalyticsService(FakeDB(reports)).get_period_comparison("7days", hazard_type="Oil Spill")
+
+        assert len(reports.pipelines) == 1
+        assert reports.pipelines[0][0]["$match"]["hazard_type"] == "Oil Spill"
+        assert result["current_period"]["stats"]["verification_rate"] == 60.0
+        assert result["changes"]["total"] == 50.0
+        assert result["changes"]["verified"] == 0.0
+        assert result["changes"]["high_priority"] == 100
@@ -0,0 +1,131 @@
+"""
+Tests for the MicroBatcher request coalescer and the InferenceExecutor
+worker pool used by VectorDB classification.
+
+Run with: pytest tests/test_batching.py -v
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.inference_executor import InferenceExecutor, InferenceOverloadedError
+from app.utils.batching import MicroBatcher
+
+
+class TestMicroBatcher:
+    """Coalescing behaviour of MicroBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_batch(self):
+        calls = []
+
+        def batch_fn(items):
+            calls.append(list(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=16, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        assert results == [0, 2, 4, 6, 8]
+        assert calls == [[0, 1, 2, 3, 4]]
+        assert batcher.get_stats()["batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_max_batch_size_splits_batches(self):
+        calls = []
+
+        async def batch_fn(items):
+            calls.append(len(items))
+            return items
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=3, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(7)))
+
+        assert results == list(range(7))
+        assert sum(calls) == 7
+        assert max(calls) <= 3
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_propagates_to_every_caller(self):
+        def batch_fn(items):
+            raise ValueError("model unavailable")
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=1)
+        results = await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelling_the_filling_caller_does_not_strand_others(self):
+        started = asyncio.Event()
+
+        async def batch_fn(items):
+            started.set()
+            await asyncio.sleep(0.05)
+            return [item.upper() for item in items]
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=3, max_wait_ms=1000)
+        waiters = [asyncio.ensure_future(batcher.submit(item)) for item in ("a", "b")]
+        await asyncio.sleep(0)
+
+        # The third submit fills the batch; its caller goes away mid-batch
+        filler = asyncio.ensure_future(batcher.submit("c"))
+        await asyncio.wait_for(started.wait(), timeout=1)
+        filler.cancel()
+
+        assert await asyncio.wait_for(asyncio.gather(*waiters), timeout=1) == ["A", "B"]
+        assert filler.cancelled()
+
+
+class TestInferenceExecutor:
+    """Backpressure and timeouts of the inference worker pool."""
+
+    @pytest.mark.asyncio
+    async def test_runs_blocking_call_off_loop(self):
+        executor = InferenceExecutor(max_workers=1, max_queue=4, timeout_seconds=5)
+        try:
+            assert await executor.run(sum, [1, 2, 3]) == 6
+            assert executor.get_stats()["completed"] == 1
+        finally:
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects(self):
+        executor = InferenceExecutor(max_workers=1, max_queue=1, timeout_seconds=5)
+        release = threading.Event()
+        try:
+            running = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+            await asyncio.sleep(0)
+
+            with pytest.raises(InferenceOverloadedError):
+                await executor.run(lambda: "rejected")
+
+            release.set()
+            assert await queued == "queued"
+            await running
+            assert executor.get_stats()["rejected"] == 1
+        finally:
+            release.set()
+            executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        executor = InferenceExecutor(max_workers=1, max_queue=4, timeout_seconds=0.05)
+        release = threading.Event()
+        try:
+            with pytest.raises(asyncio.TimeoutError):
+                await executor.run(release.wait)
+            assert executor.get_stats()["timeouts"] == 1
+        finally:
+            release.set()
+            executor.shutdown()
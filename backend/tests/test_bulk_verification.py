@@ -0,0 +1,151 @@
+"""
+Tests for bulk re-verification jobs (checkpointing, diffs, dry runs).
+
+Run with: pytest tests/test_bulk_verification.py -v
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.verification import (
+    BulkVerificationRequest, LayerName, LayerResult, LayerStatus,
+    VerificationDecision, VerificationResult
+)
+from app.services.bulk_verification_service import BulkVerificationRunner
+from fake_mongo import FakeDB
+
+
+# =============================================================================
+# FAKES
+# =============================================================================
+
+class FakeVerificationService:
+    """Re-scores every report to a fixed decision."""
+
+    _initialized = True
+
+    def __init__(self, decision: VerificationDecision, score: float):
+        self.decision = decision
+        self.score = score
+        self.calls = []
+
+    async def verify_report(self, report, image_path=None, db=None, use_cache=True, update_trust=True):
+        self.calls.append((report.report_id, use_cache, update_trust))
+        return VerificationResult(
+            verification_id=f"VRF_{report.report_id}",
+            report_id=report.report_id,
+            composite_score=self.score,
+            decision=self.decision,
+            decision_reason="test",
+            layer_results=[LayerResult(
+                layer_name=LayerName.GEOFENCE, status=LayerStatus.PASS,
+                score=1.0, weight=0.1, reasoning="ok"
+            )],
+            weights_used={},
+            applicable_layers=[LayerName.GEOFENCE],
+            skipped_layers=[],
+            processing_time_ms=1,
+            verified_at=datetime.now(timezone.utc)
+        )
+
+
+def make_db(count: int = 5) -> FakeDB:
+    db = FakeDB()
+    for i in range(count):
+        db.hazard_reports.docs.append({
+            "_id": i,
+            "report_id": f"RPT_{i}",
+            "user_id": "U1",
+            "hazard_type": "High Waves",
+            "category": "natural",
+            "image_url": "",
+            "description": "Waves crossing the promenade",
+            "location": {"latitude": 13.05, "longitude": 80.28, "address": "Chennai"},
+            "verification_status": "needs_manual_review",
+            "verification_score": 70.0,
+            # Even reports were already auto-approved; odd ones were sent to review
+            "verification_result": {"decision": "auto_approved" if i % 2 == 0 else "manual_review"},
+        })
+    return db
+
+
+async def wait_for_job(runner: BulkVerificationRunner, job_id: str):
+    while job_id in runner._tasks:
+        await asyncio.sleep(0.01)
+    return await runner.get_job(job_id)
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestBulkVerificationRunner:
+    """Dry runs, diffs and checkpoint resume."""
+
+    @pytest.mark.asyncio
+    async def test_dry_run_records_changed_decisions_only(self):
+        db = make_db(5)
+        service = FakeVerificationService(VerificationDecision.MANUAL_REVIEW, 72.0)
+        runner = BulkVerificationRunner(db=db, service=service)
+
+        job = await runner.create_job(BulkVerificationRequest(batch_size=2, max_rate=1000), created_by="admin")
+        job = await wait_for_job(runner, job["job_id"])
+        changes = db.verification_job_diffs.docs
+
+        assert job["status"] == "completed"
+        assert (job["total"], job["processed"], job["changed"], job["applied"]) == (5, 5, 3, 0)
+        assert sorted(c["report_id"] for c in changes) == ["RPT_0", "RPT_2", "RPT_4"]
+        assert {(c["old_decision"], c["new_decision"], c["applied"]) for c in changes} == {
+            ("auto_approved", "manual_review", False)
+        }
+        # Dry run: reports untouched, trust never adjusted
+        assert all(d["verification_score"] == 70.0 for d in db.hazard_reports.docs)
+        assert all(update_trust is False for _, _, update_trust in service.calls)
+
+    @pytest.mark.asyncio
+    async def test_resume_continues_after_checkpoint_and_keeps_analyst_decisions(self):
+        db = make_db(6)
+        db.hazard_reports.docs[5]["verified_by"] = "ANALYST_1"
+        service = FakeVerificationService(VerificationDecision.REJECTED, 30.0)
+        runner = BulkVerificationRunner(db=db, service=service)
+        request = BulkVerificationRequest(dry_run=False, fresh=True, batch_size=2, max_rate=1000)
+
+        # A job interrupted after its first batch (lease released on shutdown)
+        await db.verification_jobs.insert_one({
+            "job_id": "BVJ_1", "status": "running", "request": request.model_dump(mode="json"),
+            "total": 6, "processed": 2, "changed": 2, "applied": 2, "failed": 0,
+            "last_id": 1, "owner": "old-worker", "lease_until": None,
+        })
+
+        assert await runner.resume_interrupted() == 1
+        job = await wait_for_job(runner, "BVJ_1")
+
+        assert [report_id for report_id, _, _ in service.calls] == ["RPT_2", "RPT_3", "RPT_4", "RPT_5"]
+        assert all(use_cache is False for _, use_cache, _ in service.calls)
+        assert (job["status"], job["processed"], job["applied"]) == ("completed", 6, 5)
+        statuses = {d["report_id"]: d["verification_status"] for d in db.hazard_reports.docs}
+        assert statuses["RPT_2"] == "rejected"
+        assert statuses["RPT_0"] == "needs_manual_review"  # Before the checkpoint
+        assert statuses["RPT_5"] == "needs_manual_review"  # Analyst decision stands
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_job(self):
+        db = make_db(6)
+        runner = BulkVerificationRunner(db=db, service=FakeVerificationService(VerificationDecision.REJECTED, 30.0))
+
+        # 1 report/s with batches of 2: the job sleeps after its first batch
+        job = await runner.create_job(BulkVerificationRequest(batch_size=2, max_rate=1), created_by="admin")
+        await asyncio.sleep(0.2)
+        assert await runner.cancel_job(job["job_id"])
+        job = await wait_for_job(runner, job["job_id"])
+
+        assert job["status"] == "cancelled"
+        assert job["processed"] == 2
+        assert await runner.resume_job(job["job_id"])
+        await runner.shutdown()
@@ -0,0 +1,68 @@
+"""
+Tests for the coastline spatial index behind the geofence layer.
+
+Run with: pytest tests/test_coastline_index.py -v
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.coastline_index import CoastlineIndex, SIDE_LAND, SIDE_WATER
+from app.services.geofence_service import GeofenceService
+
+
+@pytest.fixture
+def east_coast(tmp_path):
+    """Straight coastline along lon 80, drawn northwards (water to the east)."""
+    lats = np.linspace(10.0, 20.0, 2001)
+    path = tmp_path / "coast.geojson"
+    path.write_text(json.dumps({
+        "type": "FeatureCollection",
+        "features": [{
+            "type": "Feature",
+            "properties": {"name": "Test Coast", "region": "Tamil Nadu"},
+            "geometry": {"type": "LineString", "coordinates": [[80.0, lat] for lat in lats]}
+        }]
+    }))
+    return CoastlineIndex.from_geojson(str(path))
+
+
+class TestCoastlineIndex:
+    """Point-to-segment distance and land/water side."""
+
+    def test_distance_is_to_segment_not_vertex(self, east_coast):
+        result = east_coast.nearest([15.0012], [80.1])
+
+        assert result["distance_km"][0] == pytest.approx(10.74, abs=0.05)
+        assert result["lat"][0] == pytest.approx(15.0012, abs=1e-6)
+
+    def test_side_follows_line_orientation(self, east_coast):
+        result = east_coast.nearest([15.0, 15.0], [80.1, 79.9])
+
+        assert list(result["side"]) == [SIDE_WATER, SIDE_LAND]
+
+    def test_far_point_falls_back_to_full_scan(self, east_coast):
+        result = east_coast.nearest([15.0], [88.0])
+
+        assert result["distance_km"][0] == pytest.approx(859.0, rel=0.01)
+
+
+class TestGeofenceBatch:
+    """validate_locations matches validate_location."""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single(self):
+        service = GeofenceService()
+        locations = [(13.05, 80.28), (28.6, 77.2), (11.6, 92.7)]
+
+        batch = await service.validate_locations(locations)
+        single = [await service.validate_location(lat, lon) for lat, lon in locations]
+
+        assert [r.status for r in batch] == [r.status for r in single]
+        assert [r.data["distance_to_coast_km"] for r in batch] == [r.data["distance_to_coast_km"] for r in single]
@@ -0,0 +1,63 @@
+"""
+Tests for the two-tier embedding cache shared by VectorDB and SMI.
+
+Run with: pytest tests/test_embedding_cache.py -v
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.embedding_cache import EmbeddingCache, embedding_key
+
+
+def fake_encoder(calls):
+    def encode(texts):
+        calls.append(list(texts))
+        return np.array([[len(t), 1.0, 0.0] for t in texts], dtype='float32')
+    return encode
+
+
+class TestEmbeddingCache:
+    """Hit/miss behaviour of EmbeddingCache."""
+
+    def test_normalized_duplicates_share_one_encode(self):
+        calls = []
+        cache = EmbeddingCache("test-model", 3, max_memory_items=10)
+
+        vectors = cache.encode(
+            ["Oil spill  near port", "Oil spill near port ", "High waves"],
+            fake_encoder(calls)
+        )
+
+        assert vectors.shape == (3, 3)
+        assert calls == [["Oil spill near port", "High waves"]]
+        np.testing.assert_array_equal(vectors[0], vectors[1])
+
+        cache.encode(["High waves"], fake_encoder(calls))
+        assert len(calls) == 1
+        assert cache.get_stats()["memory_hits"] == 1
+
+    def test_disk_tier_survives_restart(self, tmp_path):
+        db_path = str(tmp_path / "embeddings.sqlite3")
+        calls = []
+
+        EmbeddingCache("test-model", 3, db_path=db_path).encode(["Tsunami warning"], fake_encoder(calls))
+        restarted = EmbeddingCache("test-model", 3, db_path=db_path)
+        restarted.encode(["Tsunami warning"], fake_encoder(calls))
+
+        assert len(calls) == 1
+        assert restarted.get_stats()["disk_hits"] == 1
+
+    def test_lru_is_bounded(self):
+        cache = EmbeddingCache("test-model", 3, max_memory_items=2)
+        cache.encode(["a", "b", "c"], fake_encoder([]))
+
+        assert cache.get_stats()["memory_items"] == 2
+
+    def test_key_depends_on_model(self):
+        assert embedding_key("model-a", "text") != embedding_key("model-b", "text")
@@ -0,0 +1,46 @@
+"""
+Tests for the shared geodesic utilities.
+
+Run with: pytest tests/test_geo.py -v
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.utils.geo import distance_matrix_km, haversine_km, nearest_point, within_radius
+
+
+class TestGeo:
+    """Vectorized haversine helpers."""
+
+    def test_scalar_distance(self):
+        # Chennai -> Mumbai
+        assert haversine_km(13.0827, 80.2707, 19.0760, 72.8777) == pytest.approx(1033.4, abs=0.5)
+
+    def test_matrix_matches_pairwise(self):
+        lats1, lons1 = [13.0, 19.0], [80.0, 72.8]
+        lats2, lons2 = [9.9, 22.5, 11.6], [76.2, 88.3, 92.7]
+
+        matrix = distance_matrix_km(lats1, lons1, lats2, lons2)
+
+        assert matrix.shape == (2, 3)
+        assert matrix[1, 2] == pytest.approx(haversine_km(19.0, 72.8, 11.6, 92.7))
+
+    def test_within_radius_sorted_and_filtered(self):
+        indices, distances = within_radius(13.0, 80.0, [13.2, 20.0, 13.05, 13.0], [80.0, 80.0, 80.0, -100.0], 50)
+
+        assert list(indices) == [2, 0]
+        assert np.all(np.diff(distances) >= 0)
+
+    def test_within_radius_across_antimeridian(self):
+        indices, _ = within_radius(0.0, 179.9, [0.0], [-179.9], 50)
+
+        assert list(indices) == [0]
+
+    def test_nearest_point_empty(self):
+        assert nearest_point(0.0, 0.0, [], [])[0] == -1
@@ -0,0 +1,54 @@
+"""
+Tests for the decode-once image context used by the vision layer.
+
+Run with: pytest tests/test_image_context.py -v
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.image_context import ImageContext, get_face_cascade
+
+
+@pytest.fixture
+def rotated_photo(tmp_path):
+    """Landscape JPEG whose EXIF says it should be shown rotated 90 degrees."""
+    path = tmp_path / "photo.jpg"
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: rotate 90 CW
+    Image.new("RGB", (2400, 1200), (30, 90, 200)).save(path, exif=exif)
+    return str(path)
+
+
+class TestImageContext:
+    """EXIF orientation and shared analysis planes."""
+
+    def test_exif_orientation_applied(self, rotated_photo):
+        image = ImageContext.load(rotated_photo)
+
+        assert (image.width, image.height) == (1200, 2400)
+        assert image.format == "JPEG"
+
+    def test_analysis_planes_are_downscaled(self, rotated_photo):
+        image = ImageContext.load(rotated_photo)
+
+        assert max(image.gray.shape) == ImageContext.ANALYSIS_MAX_SIDE
+        assert image.hsv.shape[:2] == image.gray.shape
+        assert image.analysis_pixels == image.gray.size
+        # Blue sky stays blue in OpenCV hue units
+        assert 100 <= int(np.median(image.hsv[..., 0])) <= 130
+
+    def test_undecodable_file_returns_none(self, tmp_path):
+        path = tmp_path / "broken.jpg"
+        path.write_bytes(b"not an image")
+
+        assert ImageContext.load(str(path)) is None
+
+    def test_face_cascade_loaded_once(self):
+        assert get_face_cascade() is get_face_cascade()
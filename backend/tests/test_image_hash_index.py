@@ -0,0 +1,86 @@
+"""
+Tests for perceptual hashing and the duplicate image index.
+
+Run with: pytest tests/test_image_hash_index.py -v
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.image_hash_index import SOURCE_SOCIAL_MEDIA, ImageHashIndex
+from app.utils.image_hash import BKTree, compute_hashes, hamming_distance
+
+
+def make_photo(seed: int, size=(800, 600)) -> Image.Image:
+    """Smooth synthetic scene; different seeds give unrelated images."""
+    rng = np.random.default_rng(seed)
+    fx, fy, phase = rng.uniform(30, 150, 3)
+    y, x = np.mgrid[0:size[1], 0:size[0]]
+    rgb = np.stack([
+        128 + 100 * np.sin(x / fx + phase) * np.cos(y / fy),
+        100 + 80 * np.cos(x / fy + y / fx),
+        150 + 90 * np.sin(y / phase),
+    ], axis=-1)
+    return Image.fromarray(np.clip(rgb + rng.normal(0, 8, rgb.shape), 0, 255).astype(np.uint8))
+
+
+class TestImageHash:
+    """Hash stability and the BK-tree."""
+
+    def test_resized_copy_is_near(self):
+        photo = make_photo(1)
+        original, copy = compute_hashes(photo), compute_hashes(photo.resize((400, 300)))
+        unrelated = compute_hashes(make_photo(2))
+
+        assert hamming_distance(original.dhash, copy.dhash) <= 2
+        assert hamming_distance(original.phash, copy.phash) <= 2
+        assert hamming_distance(original.dhash, unrelated.dhash) > 10
+
+    def test_bk_tree_matches_linear_scan(self):
+        rng = np.random.default_rng(0)
+        keys = [int(k) for k in rng.integers(0, 2**63, 500, dtype=np.int64)]
+        tree = BKTree()
+        for i, key in enumerate(keys):
+            tree.add(key, i)
+
+        query = keys[42] ^ 0b1011  # 3 bits away
+        expected = sorted(i for i, key in enumerate(keys) if hamming_distance(query, key) <= 12)
+
+        assert sorted(i for _, i in tree.search(query, 12)) == expected
+        assert tree.search(query, 3)[0] == (3, 42)
+
+
+class TestImageHashIndex:
+    """Lookups across reports and BlueRadar's log (no database connected)."""
+
+    @pytest.mark.asyncio
+    async def test_report_duplicate_found(self):
+        index = ImageHashIndex()
+        photo = make_photo(3)
+        await index.add(compute_hashes(photo), report_id="R1", user_id="U1", probabilities=[0.1] * 5)
+
+        match = await index.lookup(compute_hashes(photo.resize((500, 375))))
+        assert match.image.ref_id == "R1"
+        assert match.image.probabilities == [0.1] * 5
+        assert await index.lookup(compute_hashes(make_photo(4))) is None
+
+    @pytest.mark.asyncio
+    async def test_blueradar_log_tailed(self, tmp_path):
+        log = tmp_path / "image_hashes.jsonl"
+        index = ImageHashIndex(sync_seconds=0, blueradar_log=log)
+        viral = make_photo(5)
+        assert await index.lookup(compute_hashes(viral)) is None
+
+        with open(log, "a") as f:
+            f.write(json.dumps({**compute_hashes(viral).to_dict(), "post_id": "tw_1"}) + "\n")
+
+        match = await index.lookup(compute_hashes(viral))
+        assert match.image.source == SOURCE_SOCIAL_MEDIA
+        assert match.image.ref_id == "tw_1"
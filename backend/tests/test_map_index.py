@@ -0,0 +1,134 @@
+"""
+Tests for the map index behind /hazards/map-data (clustering, incremental updates).
+
+Run with: pytest tests/test_map_index.py -v
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.services.map_index_service import MapIndex
+
+
+def make_doc(report_id, lat, lon, severity="medium", hours_ago=1, status="verified", **extra):
+    now = datetime.now(timezone.utc)
+    return {
+        "report_id": report_id,
+        "hazard_type": "High Waves",
+        "severity": severity,
+        "description": "Waves over the promenade",
+        "location": {"latitude": lat, "longitude": lon, "region": "Tamil Nadu"},
+        "verification_status": status,
+        "created_at": now - timedelta(hours=hours_ago),
+        "updated_at": now,
+        "is_deleted": False,
+        "is_active": True,
+        **extra,
+    }
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+class FakeReports:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        if "updated_at" in query:
+            return FakeCursor([d for d in self.docs if d["updated_at"] >= query["updated_at"]["$gte"]])
+        return FakeCursor(list(self.docs))
+
+
+class FakeDB:
+    def __init__(self, docs):
+        self.hazard_reports = FakeReports(docs)
+
+
+# Chennai (two reports a few hundred metres apart) and Kochi
+CHENNAI_A = (13.0500, 80.2820)
+CHENNAI_B = (13.0520, 80.2840)
+KOCHI = (9.9312, 76.2673)
+
+
+class TestMapIndex:
+    """Clusters, filters and incremental maintenance."""
+
+    def test_clusters_per_zoom_and_bbox(self):
+        index = MapIndex(max_zoom=15)
+        index.upsert(make_doc("R1", *CHENNAI_A, severity="critical"))
+        index.upsert(make_doc("R2", *CHENNAI_B, severity="high", hours_ago=2))
+        index.upsert(make_doc("R3", *KOCHI))
+
+        data = index.query(24, zoom=5)
+        assert len(data["clusters"]) == 1
+        cluster = data["clusters"][0]
+        assert cluster["count"] == 2
+        assert cluster["severity_counts"]["critical"] == 1
+        assert [r["id"] for r in data["reports"]] == ["R3"]
+        assert data["statistics"]["total_reports"] == 3
+        assert len(data["heatmap_points"]) == 2
+
+        # Zoomed in, the Chennai reports separate; the bbox drops Kochi
+        data = index.query(24, zoom=15, bbox=(80.0, 12.8, 80.5, 13.3))
+        assert data["clusters"] == []
+        assert sorted(r["id"] for r in data["reports"]) == ["R1", "R2"]
+        assert data["statistics"]["total_reports"] == 2
+
+        # Without a zoom the original response shape is kept
+        data = index.query(24, min_severity="high")
+        assert [r["id"] for r in data["reports"]] == ["R1", "R2"]
+        assert data["heatmap_points"][0] == [CHENNAI_A[0], CHENNAI_A[1], 1.0]
+        with pytest.raises(ValueError):
+            index.query(24, min_severity="extreme")
+
+    def test_upsert_moves_and_drops_reports(self):
+        index = MapIndex(max_zoom=10)
+        index.upsert(make_doc("R1", *CHENNAI_A))
+        index.upsert(make_doc("R2", *KOCHI, hours_ago=30))
+
+        first = index.query(24, zoom=8)
+        assert index.query(24, zoom=8) is first  # memoized until the index changes
+        assert first["statistics"]["total_reports"] == 1
+        assert index.query(48, zoom=8)["statistics"]["total_reports"] == 2
+
+        index.upsert(make_doc("R1", *CHENNAI_A, status="needs_manual_review"))
+        index.upsert(make_doc("R2", *KOCHI, hours_ago=30, is_deleted=True))
+        assert index.query(48, zoom=8)["statistics"]["total_reports"] == 0
+        assert index.get_stats()["reports"] == 0
+        assert index.get_stats()["cells"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sync_loads_once_then_pulls_changes(self, monkeypatch):
+        monkeypatch.setattr(settings, "MAP_INDEX_REFRESH_SECONDS", 0.0)
+        monkeypatch.setattr(settings, "MAP_INDEX_FULL_RELOAD_SECONDS", 3600.0)
+        old = make_doc("R1", *CHENNAI_A)
+        old["updated_at"] = datetime.now(timezone.utc) - timedelta(hours=1)
+        db = FakeDB([old])
+        index = MapIndex(max_zoom=10)
+
+        await index.sync(db)
+        assert index.get_stats()["full_loads"] == 1
+        assert index.query(24)["statistics"]["total_reports"] == 1
+
+        db.hazard_reports.docs.append(make_doc("R2", *KOCHI))
+        await index.sync(db)
+        stats = index.get_stats()
+        assert stats["full_loads"] == 1
+        assert stats["incremental_syncs"] == 1
+        assert stats["docs_synced"] == 1
+        assert "updated_at" in db.hazard_reports.queries[-1]
+        assert index.query(24)["statistics"]["total_reports"] == 2
@@ -0,0 +1,46 @@
+"""
+Tests for the concurrent MultiHazard detection cycle.
+
+Run with: pytest tests/test_multi_hazard_cycle.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.services.multi_hazard_service import MultiHazardService
+
+
+class TestDetectionCycle:
+    """Bounded fan-out with per-location timeouts."""
+
+    @pytest.mark.asyncio
+    async def test_slow_location_times_out_others_complete(self, monkeypatch):
+        monkeypatch.setattr(settings, "MULTIHAZARD_LOCATION_TIMEOUT_SECONDS", 0.2)
+        service = MultiHazardService()
+        location_ids = list(service.MONITORED_LOCATIONS.keys())[:3]
+        slow = location_ids[0]
+
+        async def fetch_earthquakes():
+            service.recent_earthquakes = []
+
+        async def fetch_weather(location):
+            await asyncio.sleep(1.0 if location.location_id == slow else 0.01)
+            return None, None
+
+        monkeypatch.setattr(service, "_fetch_earthquake_data", fetch_earthquakes)
+        monkeypatch.setattr(service, "_fetch_weather_data", fetch_weather)
+
+        result = await service.run_detection_cycle(location_ids)
+
+        assert not result.success
+        assert result.locations_processed == 2
+        assert result.locations_failed == 1
+        assert result.errors == [f"{slow}: timed out after 0.2s"]
+        assert "earthquake_fetch" in result.stage_timings_ms
+        assert "detection" in result.location_timings_ms[location_ids[1]]
@@ -0,0 +1,193 @@
+"""
+Tests for the principal cache behind get_current_user and the shared request token.
+
+Run with: pytest tests/test_principal_cache.py -v
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from starlette.requests import Request
+
+from app.config import settings
+from app.services import principal_cache
+from app.services.principal_cache import PrincipalCache
+
+
+class FakeUsers:
+    def __init__(self, docs):
+        self.docs = {doc["user_id"]: doc for doc in docs}
+        self.reads = 0
+
+    async def find_one(self, query, projection=None):
+        self.reads += 1
+        await asyncio.sleep(0.01)
+        doc = self.docs.get(query["user_id"])
+        return dict(doc) if doc else None
+
+
+class FakeDB:
+    def __init__(self, docs):
+        self.users = FakeUsers(docs)
+
+
+class FakeRedis:
+    """The handful of Redis commands the cache uses."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        return True
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+    async def expire(self, key, seconds):
+        return True
+
+
+def make_user(user_id="USR-1", **extra):
+    return {
+        "user_id": user_id,
+        "email": f"{user_id.lower()}@example.com",
+        "name": "Test User",
+        "role": "citizen",
+        "hashed_password": "$2b$12$secret-hash",
+        "created_at": datetime(2024, 1, 1),
+        **extra,
+    }
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    async def get_redis():
+        return None
+
+    monkeypatch.setattr(principal_cache, "get_redis", get_redis)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+
+    async def get_redis():
+        return fake
+
+    monkeypatch.setattr(principal_cache, "get_redis", get_redis)
+    monkeypatch.setattr(settings, "PRINCIPAL_CACHE_VERSION_CHECK_SECONDS", 0.0)
+    return fake
+
+
+class TestPrincipalCache:
+    """Lookups, coalescing and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_cached_lookups_and_local_invalidation(self, no_redis):
+        db = FakeDB([make_user()])
+        cache = PrincipalCache()
+
+        # A page load firing parallel API calls reads the user once
+        users = await asyncio.gather(*[cache.get_user(db, "USR-1") for _ in range(20)])
+        assert db.users.reads == 1
+        assert all(user is users[0] for user in users)
+        assert await cache.get_user(db, "USR-1") is users[0]
+        assert db.users.reads == 1
+
+        # A ban takes effect on the next request
+        db.users.docs["USR-1"]["is_banned"] = True
+        await cache.invalidate("USR-1")
+        user = await cache.get_user(db, "USR-1")
+        assert user.is_banned
+        assert db.users.reads == 2
+
+        # Unknown users are not cached
+        assert await cache.get_user(db, "USR-404") is None
+        assert await cache.get_user(db, "USR-404") is None
+        assert db.users.reads == 4
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_shares_users_and_invalidations(self, redis):
+        db = FakeDB([make_user(role="analyst")])
+        worker_a, worker_b = PrincipalCache(), PrincipalCache()
+
+        user = await worker_a.get_user(db, "USR-1")
+        assert user.hashed_password
+        assert not any("secret-hash" in value for value in redis.values.values())
+
+        # Another worker is served from Redis, without the password hash
+        shared = await worker_b.get_user(db, "USR-1")
+        assert db.users.reads == 1
+        assert shared.role == user.role
+        assert shared.created_at == user.created_at
+        assert shared.hashed_password is None
+
+        # A role change on worker A is seen by worker B on its next version check
+        db.users.docs["USR-1"]["role"] = "citizen"
+        await worker_a.invalidate("USR-1")
+        assert (await worker_b.get_user(db, "USR-1")).role.value == "citizen"
+        assert db.users.reads == 2
+
+
+class TestCurrentUserDependency:
+    """get_current_user shares the rate limiter's decoded token and uses the cache."""
+
+    @pytest.mark.asyncio
+    async def test_token_decoded_once_per_request(self, no_redis, monkeypatch):
+        from app.middleware import rbac
+        from app.middleware.rate_limit import RateLimitMiddleware
+        from app.utils import jwt
+        from app.utils.jwt import create_access_token
+
+        decoded = []
+        decode_token = jwt.decode_token
+
+        def counting_decode(token):
+            decoded.append(token)
+            return decode_token(token)
+
+        monkeypatch.setattr(jwt, "decode_token", counting_decode)
+
+        db = FakeDB([make_user()])
+        token = create_access_token("USR-1", "citizen")
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        def new_request():
+            return Request({
+                "type": "http",
+                "method": "GET",
+                "path": "/api/v1/auth/me",
+                "headers": [(b"authorization", f"Bearer {token}".encode())],
+                "client": ("10.0.0.1", 5000),
+            })
+
+        request = new_request()
+        assert RateLimitMiddleware(app=None)._get_identifier(request) == "user:USR-1"
+        user = await rbac.get_current_user(request, credentials, db)
+        assert user.user_id == "USR-1"
+        assert len(decoded) == 1
+
+        # The next request decodes its own token but reuses the cached user
+        await rbac.get_current_user(new_request(), credentials, db)
+        assert len(decoded) == 2
+        assert db.users.reads == 1
+
+        # Banned users are rejected as soon as the ban is invalidated
+        db.users.docs["USR-1"].update(is_banned=True, banned_at=datetime.now(timezone.utc))
+        await principal_cache.invalidate_principal("USR-1")
+        with pytest.raises(HTTPException) as exc:
+            await rbac.get_current_user(new_request(), credentials, db)
+        assert exc.value.status_code == 403
@@ -0,0 +1,136 @@
+"""
+Tests for the rate limiter (Redis GCRA script, local token-bucket fallback, limit classes).
+
+Run with: pytest tests/test_rate_limit.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError as RedisConnectionError, NoScriptError
+
+from app.config import settings
+from app.middleware import rate_limit
+from app.middleware.rate_limit import LocalTokenBucket, RateLimiter, RateLimitMiddleware, get_rate_limit_rule
+
+
+class FakeRedis:
+    """Replays script results; the script is loaded on first use."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = []
+        self.loaded = False
+
+    async def evalsha(self, sha, numkeys, *keys_and_args):
+        self.calls.append(("evalsha", keys_and_args))
+        if not self.loaded:
+            raise NoScriptError("NOSCRIPT")
+        return self._next()
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        self.calls.append(("eval", keys_and_args))
+        self.loaded = True
+        return self._next()
+
+    def _next(self):
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def use_redis(monkeypatch, redis):
+    async def get_redis():
+        return redis
+
+    monkeypatch.setattr(rate_limit, "get_redis", get_redis)
+
+
+class TestLimiter:
+    """Redis script and local fallback."""
+
+    def test_local_token_bucket_burst_and_refill(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock[0])
+        bucket = LocalTokenBucket(max_keys=2)
+
+        assert [bucket.hit("a", 3, 60) for _ in range(4)] == [
+            (True, 2, 0), (True, 1, 0), (True, 0, 0), (False, 0, 20)
+        ]
+
+        # One token back every window / max_requests
+        clock[0] += 20
+        assert bucket.hit("a", 3, 60) == (True, 0, 0)
+        assert bucket.hit("a", 3, 60)[0] is False
+
+        # Least recently used keys are dropped beyond max_keys
+        bucket.hit("b", 3, 60)
+        bucket.hit("c", 3, 60)
+        assert list(bucket._buckets) == ["b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_redis_script_single_call_with_local_fallback(self, monkeypatch):
+        redis = FakeRedis([[1, 4, 0], [0, 0, 1500], RedisConnectionError("down"), [1, 2, 0]])
+        use_redis(monkeypatch, redis)
+        limiter = RateLimiter()
+
+        # Script loaded once, then one EVALSHA per check
+        assert await limiter.hit("rate_limit:ip:1.2.3.4:polling", 5, 60) == (True, 4, 0)
+        assert await limiter.hit("rate_limit:ip:1.2.3.4:polling", 5, 60) == (False, 0, 2)
+        assert [name for name, _ in redis.calls] == ["evalsha", "eval", "evalsha"]
+        assert redis.calls[-1][1] == ("rate_limit:ip:1.2.3.4:polling", 5, 60000)
+
+        # Redis failing: the local bucket keeps limiting, then Redis takes over again
+        assert await limiter.hit("rate_limit:ip:1.2.3.4:polling", 1, 60) == (True, 0, 0)
+        assert (await limiter.hit("rate_limit:ip:1.2.3.4:polling", 1, 60))[0] is True
+        stats = limiter.get_stats()
+        assert stats["redis_checks"] == 3
+        assert stats["local_checks"] == 1
+        assert stats["rejected"] == 1
+
+
+class TestRateLimitMiddleware:
+    """Limit classes keep separate budgets while Redis is down."""
+
+    def test_polling_exhaustion_does_not_block_sos(self, monkeypatch):
+        use_redis(monkeypatch, None)
+        monkeypatch.setattr(settings, "RATE_LIMIT_POLLING_MAX_REQUESTS", 2)
+        monkeypatch.setattr(settings, "RATE_LIMIT_SOS_MAX_REQUESTS", 1)
+
+        app = FastAPI()
+        app.add_middleware(RateLimitMiddleware)
+
+        @app.get("/api/v1/hazards/map-data")
+        async def map_data():
+            return {"ok": True}
+
+        @app.post("/api/v1/sos/trigger")
+        async def trigger():
+            return {"ok": True}
+
+        assert get_rate_limit_rule("/api/v1/hazards/map-data").name == "polling"
+        assert get_rate_limit_rule("/api/v1/hazards/HZ-1").name == "default"
+
+        client = TestClient(app)
+        first = client.get("/api/v1/hazards/map-data")
+        assert first.status_code == 200
+        assert first.headers["X-RateLimit-Remaining"] == "1"
+        assert client.get("/api/v1/hazards/map-data").status_code == 200
+
+        blocked = client.get("/api/v1/hazards/map-data")
+        assert blocked.status_code == 429
+        assert int(blocked.headers["Retry-After"]) > 0
+        assert blocked.json()["error"]["code"] == 429
+
+        # SOS has its own budget, and other clients their own buckets
+        assert client.post("/api/v1/sos/trigger").status_code == 200
+        assert client.post("/api/v1/sos/trigger").status_code == 429
+        other = client.get("/api/v1/hazards/map-data", headers={"X-Forwarded-For": "10.0.0.9"})
+        assert other.status_code == 200
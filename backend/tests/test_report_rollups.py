@@ -0,0 +1,152 @@
+"""
+Tests for the report rollups behind the admin and analyst dashboards.
+
+Run with: pytest tests/test_report_rollups.py -v
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.analytics_service import AnalyticsService
+from app.services.report_rollup_service import ReportRollupService, floor_day, floor_hour
+from fake_mongo import FakeCollection, FakeDB
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def make_db(reports):
+    db = FakeDB()
+    db.hazard_reports = FakeCollection(reports)
+    return db
+
+
+NOW = datetime.now(timezone.utc)
+
+
+def make_report(report_id, created_at, status="pending", hazard_type="High Waves", region="Kerala", **extra):
+    return {
+        "report_id": report_id,
+        "hazard_type": hazard_type,
+        "location": {"region": region},
+        "verification_status": status,
+        "severity": "medium",
+        "created_at": created_at,
+        "updated_at": NOW - timedelta(days=30),
+        **extra,
+    }
+
+
+def rollup_counts(db, granularity):
+    """(bucket, status, count) summed over the other dimensions."""
+    counts = {}
+    for doc in db.report_rollups.docs:
+        if doc["granularity"] == granularity:
+            key = (doc["bucket"], doc["status"])
+            counts[key] = counts.get(key, 0) + doc["count"]
+    return sorted(key + (count,) for key, count in counts.items() if count)
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestRollupMaintenance:
+    """Counters follow report changes by deltas."""
+
+    @pytest.mark.asyncio
+    async def test_apply_counts_moves_and_ignores_replays(self):
+        created = datetime(2024, 3, 5, 14, 25, tzinfo=timezone.utc)
+        reports = [make_report("R1", created), make_report("R2", created + timedelta(hours=2), risk_level="critical")]
+        db = make_db(reports)
+        service = ReportRollupService(db)
+
+        assert await service.apply(reports) == 2
+        day = floor_day(created)
+        assert rollup_counts(db, "day") == [(day, "pending", 2)]
+        assert rollup_counts(db, "hour") == [
+            (floor_hour(created), "pending", 1), (floor_hour(created) + timedelta(hours=2), "pending", 1)
+        ]
+        assert [d["count"] for d in db.report_rollups.docs if d["priority"] == "high"] == [1, 1]
+
+        # Verification moves the report between counters; re-reading it changes nothing
+        reports[0]["verification_status"] = "verified"
+        assert await service.apply(reports) == 1
+        assert await service.apply(reports) == 0
+        assert rollup_counts(db, "day") == [(day, "pending", 1), (day, "verified", 1)]
+
+    @pytest.mark.asyncio
+    async def test_backfill_then_tail_sync_under_lease(self):
+        reports = [
+            make_report("R1", NOW - timedelta(days=10), status="verified"),
+            make_report("R2", NOW - timedelta(days=3)),
+            make_report("R3", NOW - timedelta(days=3), hazard_type="Oil Spill", region="Goa"),
+        ]
+        db = make_db(reports)
+        service = ReportRollupService(db)
+
+        assert await service.sync() == 0  # nothing until the first backfill
+        assert not await service.is_ready()
+        assert await service.backfill() == 3
+        assert await service.is_ready()
+
+        overview = await service.get_overview(NOW - timedelta(days=7))
+        assert overview["total"] == 3
+        assert overview["since"] == 2
+        assert overview["by_status"] == {"verified": 1, "pending": 2}
+
+        # Reports written after the backfill reach the rollups through the tail job
+        reports.append(make_report("R4", NOW, updated_at=NOW))
+        reports[1].update(verification_status="verified", updated_at=NOW)
+        assert await service.sync() == 2
+
+        overview = await service.get_overview(NOW - timedelta(days=7))
+        assert overview["total"] == 4
+        assert overview["today"] == 1
+        assert overview["by_status"] == {"verified": 2, "pending": 2}
+
+        # Another process holding the lease keeps this one from maintaining the rollups
+        other = ReportRollupService(db)
+        other._owner = "other-host:1"
+        assert await other.sync() == 0
+        with pytest.raises(RuntimeError):
+            await other.backfill()
+
+
+class TestDashboardReads:
+    """Analyst endpoints read the rollups once they are built."""
+
+    @pytest.mark.asyncio
+    async def test_trend_data_from_rollups(self):
+        day1 = floor_day(NOW - timedelta(days=4))
+        day2 = floor_day(NOW - timedelta(days=2))
+        reports = [
+            make_report("R1", day1 + timedelta(hours=3), status="verified"),
+            make_report("R2", day1 + timedelta(hours=9), urgency="immediate"),
+            make_report("R3", day2 + timedelta(hours=1)),
+            make_report("R4", day2 + timedelta(hours=2), hazard_type="Oil Spill"),
+            make_report("OLD", NOW - timedelta(days=40)),
+        ]
+        db = make_db(reports)
+        await ReportRollupService(db).backfill()
+
+        def raw_scan(*args, **kwargs):
+            raise AssertionError("trend data should not scan hazard_reports")
+
+        db.hazard_reports.aggregate = raw_scan
+        analytics = AnalyticsService(db)
+
+        trend = await analytics.get_trend_data("7days", group_by="day", hazard_type="High Waves")
+        assert trend["timeline"] == [
+            {"date": day1.strftime("%Y-%m-%d"), "total": 2, "verified": 1, "pending": 1, "high_priority": 1},
+            {"date": day2.strftime("%Y-%m-%d"), "total": 1, "verified": 0, "pending": 1, "high_priority": 0},
+        ]
+
+        trend = await analytics.get_trend_data("90days", group_by="month")
+        assert sum(item["total"] for item in trend["timeline"]) == 5
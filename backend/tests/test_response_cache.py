@@ -0,0 +1,195 @@
+"""
+Tests for the response cache (keys, single-flight, Redis tier, invalidation).
+
+Run with: pytest tests/test_response_cache.py -v
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.services import response_cache
+from app.services.response_cache import TAG_ALERTS, TAG_REPORTS, ResponseCache
+
+
+class FakeRedis:
+    """The handful of Redis commands the cache uses."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = FakeRedis()
+
+    async def get_redis():
+        return fake
+
+    monkeypatch.setattr(response_cache, "get_redis", get_redis)
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_VERSION_CHECK_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_LOCK_SECONDS", 1.0)
+    return fake
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    async def get_redis():
+        return None
+
+    monkeypatch.setattr(response_cache, "get_redis", get_redis)
+
+
+class TestResponseCache:
+    """Keys, coalescing and invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_local_single_flight_keys_and_invalidation(self, no_redis):
+        cache = ResponseCache()
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return {"total": len(calls), "at": time.time()}
+
+        # A burst of identical requests computes once
+        results = await asyncio.gather(*[
+            cache.get_or_compute("alerts:summary", compute, params={"region": "Kerala", "page": None},
+                                 tags=(TAG_ALERTS,))
+            for _ in range(50)
+        ])
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+        assert cache.get_stats()["coalesced"] == 49
+
+        # Unset parameters are ignored; role and other parameters get their own entries
+        same = await cache.get_or_compute("alerts:summary", compute, params={"region": "Kerala"}, tags=(TAG_ALERTS,))
+        assert same is results[0]
+        await cache.get_or_compute("alerts:summary", compute, params={"region": "Goa"}, tags=(TAG_ALERTS,))
+        await cache.get_or_compute("alerts:summary", compute, params={"region": "Kerala"}, role="analyst",
+                                   tags=(TAG_ALERTS,))
+        assert len(calls) == 3
+
+        # Invalidating another tag keeps the entry; invalidating its own tag retires it
+        await cache.invalidate(TAG_REPORTS)
+        assert await cache.get_or_compute("alerts:summary", compute, params={"region": "Kerala"},
+                                          tags=(TAG_ALERTS,)) is same
+        await cache.invalidate(TAG_ALERTS)
+        fresh = await cache.get_or_compute("alerts:summary", compute, params={"region": "Kerala"}, tags=(TAG_ALERTS,))
+        assert fresh["total"] == 4
+
+        # Failures are not cached
+        async def failing():
+            raise RuntimeError("db down")
+
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute("alerts:other", failing)
+        assert (await cache.get_or_compute("alerts:other", compute))["total"] == 5
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_shares_responses_locks_and_invalidations(self, redis):
+        worker_a, worker_b = ResponseCache(), ResponseCache()
+        calls = []
+
+        async def slow_compute():
+            calls.append(1)
+            await asyncio.sleep(0.1)
+            return {"reports": len(calls)}
+
+        # Both workers miss at once: B waits for A's result instead of recomputing
+        first, second = await asyncio.gather(
+            worker_a.get_or_compute("hazards:map-data", slow_compute, params={"hours": 24}, tags=(TAG_REPORTS,)),
+            worker_b.get_or_compute("hazards:map-data", slow_compute, params={"hours": 24}, tags=(TAG_REPORTS,)),
+        )
+        assert len(calls) == 1
+        assert first == second == {"reports": 1}
+        assert worker_b.get_stats()["lock_waits"] == 1
+        assert not [key for key in redis.values if key.startswith("response_cache_lock:")]
+
+        # An invalidation on A reaches B through the shared tag version
+        await worker_a.invalidate(TAG_REPORTS)
+        assert await worker_b.get_or_compute(
+            "hazards:map-data", slow_compute, params={"hours": 24}, tags=(TAG_REPORTS,)
+        ) == {"reports": 2}
+        assert await worker_a.get_or_compute(
+            "hazards:map-data", slow_compute, params={"hours": 24}, tags=(TAG_REPORTS,)
+        ) == {"reports": 2}
+        assert len(calls) == 2
+
+        # Per-process responses stay out of Redis
+        stored = len(redis.values)
+        await worker_a.get_or_compute("monitoring:current", slow_compute, shared=False)
+        assert len(redis.values) == stored
+
+
+class TestCachedEndpoints:
+    """Public alert summary is served from the cache until alerts change."""
+
+    @pytest.mark.asyncio
+    async def test_alert_summary_cached_until_alert_change(self, no_redis):
+        from app.api.v1.alerts import get_active_alerts_summary
+
+        class FakeCursor:
+            def __init__(self, rows):
+                self.rows = iter(rows)
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                try:
+                    return next(self.rows)
+                except StopIteration:
+                    raise StopAsyncIteration
+
+        class FakeAlerts:
+            def __init__(self):
+                self.rows = [{"_id": "critical", "count": 2}, {"_id": "low", "count": 1}]
+                self.aggregations = 0
+
+            def aggregate(self, pipeline):
+                self.aggregations += 1
+                return FakeCursor(list(self.rows))
+
+        class FakeDB:
+            alerts = FakeAlerts()
+
+        db = FakeDB()
+        summary = await get_active_alerts_summary(db=db)
+        assert summary["total_active"] == 3
+        assert summary["by_severity"]["critical"] == 2
+
+        assert await get_active_alerts_summary(db=db) == summary
+        assert db.alerts.aggregations == 1
+
+        db.alerts.rows.append({"_id": "high", "count": 1})
+        await response_cache.invalidate_responses(TAG_ALERTS)
+        summary = await get_active_alerts_summary(db=db)
+        assert summary["total_active"] == 4
+        assert db.alerts.aggregations == 2
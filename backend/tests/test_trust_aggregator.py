@@ -0,0 +1,141 @@
+"""
+Tests for the write-behind trust score aggregator.
+
+Run with: pytest tests/test_trust_aggregator.py -v
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.user import TrustEventType, calculate_trust_score
+from app.services.trust_aggregator import TrustScoreAggregator
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length=None):
+        return self.docs
+
+
+class FakeUsers:
+    """Minimal users collection: find/find_one by user_id and bulk_write of UpdateOne."""
+
+    def __init__(self, docs):
+        self.docs = {doc["user_id"]: dict(doc) for doc in docs}
+        self.find_one_calls = 0
+        self.bulk_writes = 0
+        self.before_write = None
+
+    def find(self, query, projection=None):
+        wanted = query["user_id"]["$in"]
+        return FakeCursor([dict(self.docs[u]) for u in wanted if u in self.docs])
+
+    async def find_one(self, query, projection=None):
+        self.find_one_calls += 1
+        doc = self.docs.get(query["user_id"])
+        return dict(doc) if doc else None
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk_writes += 1
+        if self.before_write:
+            self.before_write()
+        matched = modified = 0
+        for op in operations:
+            doc = self.docs.get(op._filter["user_id"])
+            if doc is None or doc.get("credibility_score") != op._filter["credibility_score"]:
+                continue
+            matched += 1
+            doc.update(op._doc["$set"])
+            modified += 1
+        return SimpleNamespace(matched_count=matched, modified_count=modified)
+
+
+def serial_score(score, verifications):
+    for events in verifications:
+        new_score = float(score)
+        for event_type in events:
+            new_score = calculate_trust_score(new_score, event_type)
+        score = int(new_score)
+    return score
+
+
+VERIFICATIONS = [
+    [TrustEventType.AI_TEXT_PASS, TrustEventType.AI_IMAGE_PASS],
+    [TrustEventType.AI_TEXT_FAIL],
+    [TrustEventType.AI_TEXT_PASS, TrustEventType.AI_IMAGE_FAIL],
+    [TrustEventType.AI_IMAGE_PASS],
+]
+
+
+class TestTrustScoreAggregator:
+    """Buffered trust updates match per-verification writes."""
+
+    @pytest.mark.asyncio
+    async def test_flush_matches_serial_updates_in_one_bulk_write(self):
+        users = FakeUsers([
+            {"user_id": "U1", "credibility_score": 50},
+            {"user_id": "U2", "credibility_score": 72},
+        ])
+        aggregator = TrustScoreAggregator(db=SimpleNamespace(users=users), max_pending=100)
+
+        for events in VERIFICATIONS:
+            aggregator.record("U1", events)
+            aggregator.record("U2", events)
+
+        assert await aggregator.flush() == 2
+        assert users.bulk_writes == 1
+        assert users.docs["U1"]["credibility_score"] == serial_score(50, VERIFICATIONS)
+        assert users.docs["U2"]["credibility_score"] == serial_score(72, VERIFICATIONS)
+        assert aggregator.get_stats()["pending_verifications"] == 0
+        await aggregator.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_user_stats_cached_with_pending_projection(self):
+        users = FakeUsers([{"user_id": "U1", "credibility_score": 50, "total_reports": 3}])
+        aggregator = TrustScoreAggregator(db=SimpleNamespace(users=users), max_pending=100)
+
+        stats = await aggregator.get_user_stats("U1")
+        assert stats["credibility_score"] == 50
+        aggregator.record("U1", VERIFICATIONS[0])
+
+        stats = await aggregator.get_user_stats("U1")
+        assert users.find_one_calls == 1
+        assert stats["credibility_score"] == serial_score(50, VERIFICATIONS[:1])
+        assert stats["total_reports"] == 3
+
+        # Flush invalidates the cached entry; the next read sees the stored score
+        await aggregator.flush()
+        stats = await aggregator.get_user_stats("U1")
+        assert users.find_one_calls == 2
+        assert stats["credibility_score"] == serial_score(50, VERIFICATIONS[:1])
+        assert await aggregator.get_user_stats("missing") is None
+        await aggregator.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_update_requeues_user(self):
+        users = FakeUsers([{"user_id": "U1", "credibility_score": 50}])
+        aggregator = TrustScoreAggregator(db=SimpleNamespace(users=users), max_pending=100)
+
+        def analyst_decision():
+            users.docs["U1"]["credibility_score"] = 60
+            users.before_write = None
+
+        users.before_write = analyst_decision
+        aggregator.record("U1", VERIFICATIONS[0])
+
+        assert await aggregator.flush() == 0
+        assert users.docs["U1"]["credibility_score"] == 60
+        assert aggregator.get_stats()["conflicts_requeued"] == 1
+        assert aggregator.get_stats()["pending_verifications"] == 1
+
+        # Next flush applies the events on top of the analyst's score
+        assert await aggregator.flush() == 1
+        assert users.docs["U1"]["credibility_score"] == serial_score(60, VERIFICATIONS[:1])
+        await aggregator.shutdown()
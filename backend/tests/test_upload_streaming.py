@@ -0,0 +1,104 @@
+"""
+Tests for streamed uploads and on-disk image processing.
+
+Run with: pytest tests/test_upload_streaming.py -v
+"""
+
+import hashlib
+import io
+import os
+import sys
+
+import pytest
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.api.v1 import hazards
+from app.services.image_processor import ImageProcessor
+from app.utils.uploads import UploadTooLargeError, save_upload_stream
+
+
+def make_upload(content: bytes, declare_size: bool = True) -> UploadFile:
+    return UploadFile(
+        io.BytesIO(content),
+        size=len(content) if declare_size else None,
+        filename="photo.jpg"
+    )
+
+
+class TestSaveUploadStream:
+    """Chunked copy with size limit and hashing."""
+
+    @pytest.mark.asyncio
+    async def test_content_and_hash(self, tmp_path):
+        content = os.urandom(300_000)
+        dest = tmp_path / "out.bin"
+
+        stored = await save_upload_stream(make_upload(content), str(dest), max_size=1_000_000, chunk_size=64_000)
+
+        assert dest.read_bytes() == content
+        assert stored.size == len(content)
+        assert stored.sha256 == hashlib.sha256(content).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_oversized_stream_aborts_without_partial_file(self, tmp_path):
+        dest = tmp_path / "out.bin"
+
+        # No declared size: the limit is enforced while copying
+        with pytest.raises(UploadTooLargeError):
+            await save_upload_stream(
+                make_upload(b"x" * 500_000, declare_size=False), str(dest), max_size=200_000, chunk_size=64_000
+            )
+
+        assert not dest.exists()
+
+
+class TestProcessFile:
+    """EXIF handling straight from disk."""
+
+    def test_rotates_resizes_and_strips_in_place(self, tmp_path):
+        path = tmp_path / "photo.jpg"
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 CW
+        Image.new("RGB", (4000, 3000), (20, 90, 180)).save(path, exif=exif)
+
+        result = ImageProcessor().process_file(str(path))
+
+        with Image.open(path) as processed:
+            assert processed.size == (1440, 1920)
+            assert 0x0112 not in processed.getexif()
+        assert result.was_rotated
+        assert (result.metadata.original_width, result.metadata.original_height) == (4000, 3000)
+        assert result.image_bytes is None and result.path == str(path)
+        assert not (tmp_path / "photo.jpg.tmp").exists()
+
+
+class TestSaveUploadFile:
+    """What the hazard upload route keeps from a stored image."""
+
+    @pytest.mark.asyncio
+    async def test_returns_sha256_of_received_bytes_and_exif_metadata(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(hazards, "UPLOAD_DIR", str(tmp_path))
+        exif = Image.Exif()
+        exif[0x0110] = "Pixel 8"  # Model
+        buffer = io.BytesIO()
+        Image.new("RGB", (2400, 1200), (200, 120, 40)).save(buffer, format="JPEG", exif=exif)
+        content = buffer.getvalue()
+        upload = UploadFile(
+            io.BytesIO(content), size=len(content), filename="photo.jpg",
+            headers=Headers({"content-type": "image/jpeg"})
+        )
+
+        path, stored, processed = await hazards.save_upload_file(
+            upload, hazards.MAX_IMAGE_SIZE, hazards.ALLOWED_IMAGE_TYPES, process_image=True
+        )
+
+        # The hash is of the upload as received, not of the resized file
+        assert path == f"/{stored.path}"
+        assert stored.sha256 == hashlib.sha256(content).hexdigest()
+        assert hashlib.sha256((tmp_path / os.path.basename(stored.path)).read_bytes()).hexdigest() != stored.sha256
+        assert processed.metadata.device_model == "Pixel 8"
+        assert (processed.metadata.original_width, processed.final_width) == (2400, 1920)
@@ -0,0 +1,57 @@
+"""
+Tests for VectorDB artifacts (precomputed, memory-mapped corpus files).
+
+Run with: pytest tests/test_vectordb_artifact.py -v
+"""
+
+import os
+import sys
+
+import faiss
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.vectordb_artifact import read_artifact, read_artifact_index, write_artifact
+from app.services.vectordb_index import VectorStore
+
+
+class TestVectorDBArtifact:
+    """Round-trip and mmap behaviour of artifacts."""
+
+    def test_round_trip_is_memory_mapped(self, tmp_path):
+        prefix = str(tmp_path / "corpus")
+        vectors = np.eye(3, dtype='float32')
+        index = faiss.IndexFlatIP(3)
+        index.add(vectors)
+
+        write_artifact(
+            prefix, vectors,
+            ["oil spill", "high waves", "dead fish"],
+            ["oil_spill", "high_waves", "oil_spill"],
+            [{"id": i, "source": "training_data"} for i in range(3)],
+            index=index
+        )
+        loaded, texts, labels, metadata, manifest = read_artifact(prefix)
+
+        assert isinstance(loaded, np.memmap)
+        np.testing.assert_array_equal(loaded, vectors)
+        assert labels == ["oil_spill", "high_waves", "oil_spill"]
+        assert metadata[1] == {"id": 1, "source": "training_data", "text": "high waves", "label": "high_waves"}
+        assert manifest["count"] == 3
+        assert read_artifact_index(prefix).ntotal == 3
+
+    def test_missing_artifact_returns_none(self, tmp_path):
+        assert read_artifact(str(tmp_path / "missing")) is None
+
+    def test_wrapped_store_copies_on_append(self, tmp_path):
+        prefix = str(tmp_path / "corpus")
+        write_artifact(prefix, np.ones((2, 3), dtype='float32'), ["a", "b"], ["x", "x"], [{}, {}])
+        mapped = read_artifact(prefix)[0]
+
+        store = VectorStore(3)
+        store.wrap(mapped)
+        store.append(np.zeros((1, 3), dtype='float32'))
+
+        assert len(store) == 3
+        np.testing.assert_array_equal(mapped, np.ones((2, 3), dtype='float32'))
@@ -0,0 +1,116 @@
+"""
+Tests for VectorDB index rebuilds running off the request path.
+
+Run with: pytest tests/test_vectordb_index.py -v
+"""
+
+import asyncio
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.services import vectordb_service
+from app.services.vectordb_artifact import write_artifact
+from app.services.vectordb_index import VectorStore, build_index
+from app.services.vectordb_service import VectorDBService
+
+DIM = 8
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "VECTORDB_INDEX_TYPE", "hnsw")
+    monkeypatch.setattr(settings, "VECTORDB_ANN_MIN_VECTORS", 4)
+
+    service = VectorDBService(db=None)
+    service.embed_dim = DIM
+    service._store = VectorStore(DIM)
+    service.index = build_index(service._store.vectors, "flat")
+    rng = np.random.default_rng(7)
+    monkeypatch.setattr(
+        service, "encode_texts",
+        lambda texts: rng.standard_normal((len(texts), DIM)).astype('float32')
+    )
+    return service
+
+
+class TestBackgroundRebuild:
+    """Adding the sample that makes a rebuild due does not wait for it."""
+
+    @pytest.mark.asyncio
+    async def test_add_sample_schedules_single_background_rebuild(self, service, monkeypatch):
+        release = threading.Event()
+        rebuilds = []
+        rebuild_index = service.rebuild_index
+
+        def slow_rebuild():
+            rebuilds.append(len(service._store))
+            release.wait(timeout=5)
+            rebuild_index()
+
+        monkeypatch.setattr(service, "rebuild_index", slow_rebuild)
+
+        for i in range(4):
+            await asyncio.wait_for(service.add_sample_async(f"sample {i}", "high_waves"), timeout=1)
+
+        # The 4th sample crossed the ANN threshold; the rebuild runs in the background
+        assert service._rebuild_running()
+        assert service._index_type == "flat"
+
+        # More samples and an explicit rebuild join the running one
+        await asyncio.wait_for(service.add_sample_async("sample 4", "high_waves"), timeout=1)
+        explicit = asyncio.ensure_future(service.rebuild_index_async())
+        await asyncio.sleep(0.05)
+        assert rebuilds == [4]
+
+        release.set()
+        await asyncio.wait_for(explicit, timeout=5)
+        assert service._index_type == "hnsw"
+        assert service.index.ntotal == 5
+        assert rebuilds == [4]
+
+    @pytest.mark.asyncio
+    async def test_snapshot_load_during_rebuild_is_not_overwritten(self, service, monkeypatch, tmp_path):
+        rng = np.random.default_rng(11)
+
+        def unit_vectors(n):
+            vectors = rng.standard_normal((n, DIM)).astype('float32')
+            return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        service._apply_samples(
+            unit_vectors(6), [f"old {i}" for i in range(6)], [f"old_{i}" for i in range(6)], [{}] * 6
+        )
+
+        # The first (ANN) build blocks until the snapshot has replaced the rows
+        blocked, release = threading.Event(), threading.Event()
+        real_build_index = vectordb_service.build_index
+
+        def gated_build_index(vectors, index_type):
+            if index_type != "flat" and not blocked.is_set():
+                blocked.set()
+                release.wait(timeout=5)
+            return real_build_index(vectors, index_type)
+
+        monkeypatch.setattr(vectordb_service, "build_index", gated_build_index)
+        rebuild = asyncio.ensure_future(asyncio.to_thread(service.rebuild_index))
+        assert await asyncio.to_thread(blocked.wait, 5)
+
+        snapshot_vectors = unit_vectors(5)
+        path = str(tmp_path / "snapshot-5")
+        write_artifact(path, snapshot_vectors, [f"new {i}" for i in range(5)], [f"new_{i}" for i in range(5)],
+                       [{} for _ in range(5)])
+        await asyncio.to_thread(service._load_snapshot, {"path": path, "seq": 5})
+        release.set()
+        await asyncio.wait_for(rebuild, timeout=5)
+
+        # The stale build was discarded: index rows line up with the labels again
+        assert service._index_type == "hnsw"
+        assert service.index.ntotal == len(service.labels) == 5
+        _, ids = service.index.search(snapshot_vectors, 1)
+        assert [service.labels[i] for i in ids[:, 0]] == [f"new_{i}" for i in range(5)]
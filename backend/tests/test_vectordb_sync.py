@@ -0,0 +1,31 @@
+"""
+Tests for VectorDB sample-log replay ordering.
+
+Run with: pytest tests/test_vectordb_sync.py -v
+"""
+
+import os
+import sys
+from datetime import datetime, timezone, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.vectordb_sync import take_contiguous
+
+
+def entry(seq, age_seconds=0):
+    return {"seq": seq, "created_at": datetime.now(timezone.utc) - timedelta(seconds=age_seconds)}
+
+
+class TestTakeContiguous:
+    """Gap handling when replaying the sample log."""
+
+    def test_contiguous_entries_are_applied(self):
+        assert [e["seq"] for e in take_contiguous([entry(4), entry(5)], 3)] == [4, 5]
+
+    def test_recent_gap_waits_for_inflight_insert(self):
+        # seq 5 allocated but not yet visible
+        assert [e["seq"] for e in take_contiguous([entry(4), entry(6)], 3)] == [4]
+
+    def test_stale_gap_is_skipped(self):
+        assert [e["seq"] for e in take_contiguous([entry(6, age_seconds=300)], 3)] == [6]
@@ -0,0 +1,114 @@
+"""
+Tests for per-layer verification result memoization.
+
+Run with: pytest tests/test_verification_cache.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.hazard import HazardCategory, HazardReport, HazardType, Location
+from app.models.verification import LayerName, LayerResult, LayerStatus
+from app.services.verification_cache import LayerResultCache
+from app.services.verification_service import VerificationService
+
+
+def layer_result(layer: LayerName, score: float = 0.8, data=None) -> LayerResult:
+    return LayerResult(
+        layer_name=layer, status=LayerStatus.PASS, score=score,
+        weight=0.25, reasoning="ok", data=data or {}
+    )
+
+
+class CountingLayer:
+    """Async layer stub that counts its runs."""
+
+    def __init__(self, layer: LayerName, delay: float = 0.0, data=None):
+        self.layer = layer
+        self.delay = delay
+        self.data = data
+        self.calls = 0
+
+    async def __call__(self, *args, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return layer_result(self.layer, data=self.data)
+
+
+class TestLayerResultCache:
+    """Hits, coalescing, refresh and non-cacheable results."""
+
+    @pytest.mark.asyncio
+    async def test_second_run_served_from_cache(self):
+        cache = LayerResultCache({LayerName.TEXT: 60}, redis_enabled=False)
+        run = CountingLayer(LayerName.TEXT)
+
+        first, first_cached = await cache.get_or_run(LayerName.TEXT, "k", run)
+        second, second_cached = await cache.get_or_run(LayerName.TEXT, "k", run)
+        first.weight = 0.5  # Callers get independent copies
+
+        assert run.calls == 1
+        assert (first_cached, second_cached) == (False, True)
+        assert second.weight == 0.25
+        await cache.get_or_run(LayerName.TEXT, "k", run, refresh=True)
+        assert run.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_inputs_run_once(self):
+        cache = LayerResultCache({LayerName.IMAGE: 60}, redis_enabled=False)
+        run = CountingLayer(LayerName.IMAGE, delay=0.05)
+
+        results = await asyncio.gather(*[cache.get_or_run(LayerName.IMAGE, "k", run) for _ in range(5)])
+
+        assert run.calls == 1
+        assert sorted(cached for _, cached in results) == [False, True, True, True, True]
+
+    @pytest.mark.asyncio
+    async def test_errors_and_disabled_layers_not_cached(self):
+        cache = LayerResultCache({LayerName.TEXT: 60, LayerName.REPORTER: 0}, redis_enabled=False)
+        failing = CountingLayer(LayerName.TEXT, data={"error": "vectordb down"})
+        reporter = CountingLayer(LayerName.REPORTER)
+
+        for _ in range(2):
+            await cache.get_or_run(LayerName.TEXT, "k", failing)
+            await cache.get_or_run(LayerName.REPORTER, "u1", reporter)
+
+        assert failing.calls == 2
+        assert reporter.calls == 2
+
+
+class TestVerifyReportCaching:
+    """Re-verification reuses unchanged layers and records them."""
+
+    @pytest.mark.asyncio
+    async def test_reverification_reports_cached_layers(self):
+        service = VerificationService()
+        service.layer_cache = LayerResultCache(
+            {LayerName.GEOFENCE: 60, LayerName.WEATHER: 60, LayerName.TEXT: 60}, redis_enabled=False
+        )
+        service._initialized = True
+        geofence = CountingLayer(LayerName.GEOFENCE)
+        text = CountingLayer(LayerName.TEXT)
+        service._run_geofence_layer = geofence
+        service._run_text_layer = text
+
+        report = HazardReport(
+            report_id="RPT_1", user_id="U1", hazard_type=HazardType.HIGH_WAVES,
+            category=HazardCategory.NATURAL, image_url="", description="Huge waves over the sea wall",
+            location=Location(latitude=13.05, longitude=80.28, address="Marina Beach, Chennai")
+        )
+
+        first = await service.verify_report(report)
+        second = await service.verify_report(report)
+        fresh = await service.verify_report(report, use_cache=False)
+
+        assert first.cached_layers == []
+        assert set(second.cached_layers) == {LayerName.GEOFENCE, LayerName.WEATHER, LayerName.TEXT}
+        assert fresh.cached_layers == []
+        assert (geofence.calls, text.calls) == (2, 2)
+        assert second.composite_score == first.composite_score
@@ -0,0 +1,98 @@
+"""
+Tests for per-stage verification timings and pipeline metrics.
+
+Run with: pytest tests/test_verification_metrics.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.hazard import HazardCategory, HazardReport, HazardType, Location
+from app.models.verification import LayerName, LayerResult, LayerStatus
+from app.services.verification_cache import LayerResultCache
+from app.services.verification_metrics import LatencyHistogram, VerificationMetrics
+from app.services.verification_service import VerificationService
+
+
+def make_report() -> HazardReport:
+    return HazardReport(
+        report_id="RPT_1", user_id="U1", hazard_type=HazardType.HIGH_WAVES,
+        category=HazardCategory.NATURAL, image_url="", description="Huge waves over the sea wall",
+        location=Location(latitude=13.05, longitude=80.28, address="Marina Beach, Chennai")
+    )
+
+
+def make_layer(layer: LayerName, delay: float = 0.0, data=None):
+    async def run(*args, **kwargs):
+        await asyncio.sleep(delay)
+        return LayerResult(
+            layer_name=layer, status=LayerStatus.PASS, score=0.9,
+            weight=0.25, reasoning="ok", data=data or {}
+        )
+    return run
+
+
+class TestLatencyHistogram:
+    """Bucketed percentile estimates."""
+
+    def test_percentiles_within_bucket_bounds(self):
+        histogram = LatencyHistogram()
+        for ms in [3] * 90 + [400] * 10:
+            histogram.observe(ms)
+
+        snapshot = histogram.snapshot()
+        assert 2.5 <= snapshot["p50_ms"] <= 5
+        assert 250 <= snapshot["p95_ms"] <= 400
+        assert snapshot["max_ms"] == 400
+        assert snapshot["count"] == 100
+
+
+class TestVerificationTimings:
+    """verify_report attaches stage timings and feeds the metrics."""
+
+    @pytest.mark.asyncio
+    async def test_stage_timings_with_cache_and_fallback_flags(self, monkeypatch):
+        metrics = VerificationMetrics()
+        monkeypatch.setattr("app.services.verification_service.get_verification_metrics", lambda: metrics)
+        service = VerificationService()
+        service.layer_cache = LayerResultCache({LayerName.TEXT: 60}, redis_enabled=False)
+        service._initialized = True
+        service._run_geofence_layer = make_layer(LayerName.GEOFENCE)
+        service._run_text_layer = make_layer(LayerName.TEXT, delay=0.05)
+
+        await service.verify_report(make_report())
+        result = await service.verify_report(make_report())
+
+        timings = {t.stage: t for t in result.timings}
+        assert set(timings) == {"geofence", "weather", "text", "image", "reporter", "decision"}
+        assert timings["text"].cache_hit and timings["text"].duration_ms < 50
+        assert timings["reporter"].fallback  # No database: default credibility
+        assert not timings["geofence"].cache_hit and timings["geofence"].status == LayerStatus.PASS
+
+        stats = metrics.get_stats()
+        assert stats["verifications"] == 2
+        assert stats["stages"]["text"]["count"] == 2
+        assert stats["stages"]["text"]["cache_hits"] == 1
+        assert stats["stages"]["text"]["max_ms"] >= 50
+
+    @pytest.mark.asyncio
+    async def test_prometheus_export(self, monkeypatch):
+        metrics = VerificationMetrics()
+        monkeypatch.setattr("app.services.verification_service.get_verification_metrics", lambda: metrics)
+        service = VerificationService()
+        service._initialized = True
+        service._run_geofence_layer = make_layer(LayerName.GEOFENCE)
+        service._run_text_layer = make_layer(LayerName.TEXT)
+
+        await service.verify_report(make_report())
+        text = metrics.to_prometheus()
+
+        assert "# TYPE coastguardian_verification_stage_duration_seconds histogram" in text
+        assert 'coastguardian_verification_stage_duration_seconds_bucket{stage="text",le="+Inf"} 1' in text
+        assert 'coastguardian_verification_stage_duration_seconds_count{stage="total"} 1' in text
+        assert 'coastguardian_verification_stage_fallbacks_total{stage="reporter"} 1' in text
@@ -0,0 +1,194 @@
+"""
+Tests for the verification work queue (priority lanes, retries, dead-letter).
+
+Run with: pytest tests/test_verification_queue.py -v
+"""
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.config import settings
+from app.models.hazard import HazardType
+from app.models.verification import VerificationLane
+from app.services import verification_queue
+from app.services.verification_queue import VerificationQueue, classify_lane
+from fake_mongo import FakeCollection, FakeDB
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def make_db(reports):
+    db = FakeDB()
+    # Stands in for the unique index on verification_queue.report_id
+    db.verification_queue = FakeCollection(unique_key="report_id")
+    db.hazard_reports = FakeCollection(reports)
+    return db
+
+
+def make_report(report_id, hazard_type=HazardType.PLASTIC_POLLUTION, classification=None, user_id="U1"):
+    return {
+        "report_id": report_id,
+        "user_id": user_id,
+        "hazard_type": hazard_type.value,
+        "hazard_classification": classification,
+        "verification_status": "pending",
+    }
+
+
+@pytest.fixture
+def fast_queue_settings(monkeypatch):
+    monkeypatch.setattr(settings, "VERIFICATION_QUEUE_POLL_SECONDS", 0.05)
+    monkeypatch.setattr(settings, "VERIFICATION_QUEUE_IDLE_SECONDS", 0.5)
+    monkeypatch.setattr(settings, "VERIFICATION_QUEUE_RETRY_BASE_SECONDS", 0.01)
+    monkeypatch.setattr(settings, "VERIFICATION_QUEUE_MAX_ATTEMPTS", 2)
+
+
+# =============================================================================
+# TESTS
+# =============================================================================
+
+class TestLaneClassification:
+    """Reports are routed to lanes by threat and hazard type."""
+
+    def test_lanes(self):
+        assert classify_lane(make_report("R1")) == VerificationLane.LOW
+        assert classify_lane(make_report("R2", HazardType.OIL_SPILL)) == VerificationLane.HIGH
+        assert classify_lane(make_report("R3", HazardType.RIP_CURRENT)) == VerificationLane.NORMAL
+        assert classify_lane(make_report(
+            "R4", HazardType.HIGH_WAVES, {"threat_level": "watch", "tsunami_threat": "alert"}
+        )) == VerificationLane.CRITICAL
+        assert classify_lane(make_report("R5"), has_open_sos=True) == VerificationLane.CRITICAL
+
+
+class TestVerificationQueue:
+    """Priority, retries and dead-lettering."""
+
+    @pytest.mark.asyncio
+    async def test_critical_report_overtakes_backlog(self, monkeypatch, fast_queue_settings):
+        reports = [make_report(f"LOW_{i}") for i in range(20)]
+        reports.append(make_report("TSUNAMI", HazardType.HIGH_WAVES, {"threat_level": "warning"}))
+        db = make_db(reports)
+        finished = []
+
+        async def fake_verify(db, doc, service=None):
+            await asyncio.sleep(0.05)
+            doc_ref = next(d for d in db.hazard_reports.docs if d["report_id"] == doc["report_id"])
+            doc_ref["verification_status"] = "needs_manual_review"
+            finished.append(doc["report_id"])
+
+        monkeypatch.setattr(verification_queue, "verify_and_apply_report", fake_verify)
+        queue = VerificationQueue(
+            db=db, service=SimpleNamespace(_initialized=True),
+            worker_limits={lane: 1 for lane in VerificationLane}
+        )
+
+        for doc in reports[:-1]:
+            await queue.enqueue(doc)
+        await asyncio.sleep(0.02)
+        await queue.enqueue(reports[-1])
+
+        for _ in range(100):
+            if "TSUNAMI" in finished:
+                break
+            await asyncio.sleep(0.01)
+
+        assert "TSUNAMI" in finished
+        assert finished.index("TSUNAMI") <= 2
+
+        status = await queue.get_status()
+        assert status["lanes"]["critical"]["wait_ms"]["count"] == 1
+        assert status["lanes"]["low"]["queued"] > 10
+        await queue.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failed_job_retried_then_dead_lettered_and_requeued(self, monkeypatch, fast_queue_settings):
+        db = make_db([make_report("R1")])
+        attempts = []
+
+        async def failing_verify(db, doc, service=None):
+            attempts.append(doc["report_id"])
+            raise RuntimeError("vision model unavailable")
+
+        monkeypatch.setattr(verification_queue, "verify_and_apply_report", failing_verify)
+        queue = VerificationQueue(db=db, service=SimpleNamespace(_initialized=True))
+
+        job = await queue.enqueue(db.hazard_reports.docs[0])
+        assert (await queue.enqueue(db.hazard_reports.docs[0]))["enqueued_at"] == job["enqueued_at"]
+
+        for _ in range(100):
+            if await queue.list_dead_letters():
+                break
+            await asyncio.sleep(0.01)
+
+        dead = await queue.list_dead_letters()
+        assert len(attempts) == 2
+        assert dead[0]["attempts"] == 2
+        assert dead[0]["last_error"] == "vision model unavailable"
+
+        monkeypatch.setattr(settings, "VERIFICATION_QUEUE_MAX_ATTEMPTS", 1)
+        assert await queue.requeue("R1") is True
+        for _ in range(100):
+            if len(attempts) == 3:
+                break
+            await asyncio.sleep(0.01)
+        assert len(attempts) == 3
+        assert await queue.requeue("missing") is False
+        await queue.shutdown()
+
+
+class TestQueueRoutes:
+    """Queue status and dead-letter endpoints, called through the router."""
+
+    @pytest.mark.asyncio
+    async def test_status_dead_letter_and_requeue_routes(self, monkeypatch, fast_queue_settings):
+        import httpx
+        from fastapi import FastAPI
+        from app.api.v1 import verification as verification_api
+        from app.middleware.rbac import require_admin, require_analyst
+
+        db = make_db([make_report("R1")])
+
+        async def failing_verify(db, doc, service=None):
+            raise RuntimeError("vision model unavailable")
+
+        monkeypatch.setattr(verification_queue, "verify_and_apply_report", failing_verify)
+        queue = VerificationQueue(db=db, service=SimpleNamespace(_initialized=True))
+        monkeypatch.setattr(verification_api, "get_priority_queue", lambda: queue)
+
+        app = FastAPI()
+        app.include_router(verification_api.router)
+        app.dependency_overrides[require_analyst] = lambda: SimpleNamespace(user_id="ANALYST")
+        app.dependency_overrides[require_admin] = lambda: SimpleNamespace(user_id="ADMIN")
+
+        await queue.enqueue(db.hazard_reports.docs[0])
+        for _ in range(100):
+            if await queue.list_dead_letters():
+                break
+            await asyncio.sleep(0.01)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/verification/queue/status")
+            assert response.status_code == 200
+            assert set(response.json()["lanes"]) == {lane.value for lane in VerificationLane}
+
+            response = await client.get("/verification/queue/dead-letter", params={"limit": 10})
+            assert response.status_code == 200
+            assert [job["report_id"] for job in response.json()["jobs"]] == ["R1"]
+
+            response = await client.post("/verification/queue/dead-letter/R1/requeue")
+            assert response.status_code == 200
+            assert response.json() == {"success": True, "report_id": "R1"}
+
+            response = await client.post("/verification/queue/dead-letter/missing/requeue")
+            assert response.status_code == 404
+
+        await queue.shutdown()
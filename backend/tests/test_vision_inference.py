@@ -0,0 +1,61 @@
+"""
+Tests for batched vision model inference.
+
+Run with: pytest tests/test_vision_inference.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.vision_inference import INPUT_SHAPE, VisionModelRunner, preprocess_image
+
+
+class FakeModel:
+    """Returns the mean pixel of each image as every class probability."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_on_batch(self, batch):
+        self.batch_sizes.append(len(batch))
+        return np.repeat(batch.mean(axis=(1, 2, 3))[:, None], 5, axis=1)
+
+
+class TestVisionModelRunner:
+    """Dynamic batching of concurrent predictions."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_images_share_predict_calls(self):
+        model = FakeModel()
+        runner = VisionModelRunner(model=model, max_batch_size=8, max_wait_ms=20)
+        tensors = [np.full(INPUT_SHAPE, i / 100, dtype=np.float32) for i in range(20)]
+
+        results = await asyncio.gather(*[runner.predict(t) for t in tensors])
+
+        assert model.batch_sizes == [8, 8, 4]
+        # Each caller gets its own row back
+        assert [round(float(r[0]), 2) for r in results] == [i / 100 for i in range(20)]
+        assert runner.get_stats()["images"] == 20
+
+    @pytest.mark.asyncio
+    async def test_wrong_shape_rejected(self):
+        runner = VisionModelRunner(model=FakeModel())
+
+        with pytest.raises(ValueError):
+            await runner.predict(np.zeros((10, 10, 3), dtype=np.float32))
+
+    def test_preprocess_scales_to_unit_range(self):
+        rgb = np.zeros((600, 800, 3), dtype=np.uint8)
+        rgb[:, 400:] = 255
+
+        tensor = preprocess_image(rgb)
+
+        assert tensor.shape == INPUT_SHAPE
+        assert tensor.dtype == np.float32
+        assert tensor.min() == -1.0 and tensor.max() == 1.0
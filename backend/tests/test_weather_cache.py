@@ -0,0 +1,75 @@
+"""
+Tests for the shared weather cache.
+
+Run with: pytest tests/test_weather_cache.py -v
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.services.weather_cache import WeatherCache
+from app.utils.geo import geohash_encode
+
+
+class TestWeatherCache:
+    """LRU + TTL eviction, geohash keys and single-flight fetches."""
+
+    def test_geohash_reference_value(self):
+        assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_nearby_requests_share_one_fetch(self):
+        cache = WeatherCache(redis_enabled=False)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"wind_kph": 42}
+
+        # Points ~100 m apart on Marina Beach fall in the same cell
+        results = await asyncio.gather(*[
+            cache.get_or_fetch("test", 13.0500 + i * 0.0001, 80.2824, fetch) for i in range(10)
+        ])
+
+        assert calls == 1
+        assert all(r == {"wind_kph": 42} for r in results)
+        assert cache.get_stats()["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self):
+        cache = WeatherCache(redis_enabled=False)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return None
+
+        await cache.get_or_fetch("test", 13.05, 80.28, fetch)
+        await cache.get_or_fetch("test", 13.05, 80.28, fetch)
+
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_and_evicted_entries_are_refetched(self):
+        cache = WeatherCache(max_items=1, ttl_seconds=0, redis_enabled=False)
+
+        async def fetch():
+            return 1
+
+        await cache.get_or_fetch("test", 13.05, 80.28, fetch)
+        await cache.get_or_fetch("test", 13.05, 80.28, fetch)
+        await cache.get_or_fetch("test", 19.07, 72.87, fetch, ttl=60)
+        await cache.get_or_fetch("test", 9.93, 76.26, fetch, ttl=60)
+
+        stats = cache.get_stats()
+        assert stats["misses"] == 4
+        assert stats["evictions"] == 2
+        assert stats["items"] == 1
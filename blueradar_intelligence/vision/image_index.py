@@ -0,0 +1,138 @@
+"""
+BlueRadar - Scraped Image Index
+Near-duplicate lookup for scraped images, shared with the CoastGuardian backend
+"""
+
+import importlib.util
+import json
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from utils.logging_config import setup_logging
+from config import BASE_DIR, CACHE_DIR
+
+logger = setup_logging("image_index")
+
+# The hash code lives in the backend so both sides produce identical hashes.
+# Load that one file directly; importing the backend's app package would pull
+# in its settings and database clients.
+IMAGE_HASH_PATH = BASE_DIR.parent / "backend" / "app" / "utils" / "image_hash.py"
+INDEX_PATH = CACHE_DIR / "image_hashes.jsonl"
+
+
+def _load_image_hash():
+    spec = importlib.util.spec_from_file_location("coastguardian_image_hash", IMAGE_HASH_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+try:
+    image_hash = _load_image_hash()
+except Exception as e:
+    image_hash = None
+    logger.warning(f"Shared image hashing not available ({IMAGE_HASH_PATH}): {e}")
+
+
+class ScrapedImageIndex:
+    """
+    Perceptual-hash index of scraped images:
+    - dHash BK-tree lookup, confirmed by pHash
+    - Persisted as an append-only JSONL log, reloaded on start
+    - The backend tails the same log to flag recycled report photos
+    """
+
+    def __init__(
+        self,
+        path: Path = INDEX_PATH,
+        max_distance: int = 8,
+        phash_max_distance: int = 10
+    ):
+        self.path = path
+        self.max_distance = max_distance
+        self.phash_max_distance = phash_max_distance
+        self.enabled = image_hash is not None
+
+        self._tree = image_hash.BKTree() if self.enabled else None
+        self._lock = threading.Lock()
+        self.stats = {"indexed": 0, "duplicates": 0}
+
+        if self.enabled:
+            self._load()
+
+    def _load(self):
+        """Rebuild the tree from the log"""
+        if not self.path.exists():
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self._tree.add(image_hash.from_hex(record["dhash"]), record)
+                except (KeyError, ValueError):
+                    continue
+
+        logger.info(f"Loaded {len(self._tree)} image hashes from {self.path}")
+
+    def hash_image(self, image) -> Optional["image_hash.ImageHashes"]:
+        """dHash + pHash of a PIL image"""
+        if not self.enabled:
+            return None
+        try:
+            return image_hash.compute_hashes(image)
+        except Exception as e:
+            logger.debug(f"Error hashing image: {e}")
+            return None
+
+    def find(self, hashes) -> Optional[Dict]:
+        """Closest indexed near-duplicate (record plus distance), if any"""
+        if not self.enabled or hashes is None:
+            return None
+
+        with self._lock:
+            candidates = self._tree.search(hashes.dhash, self.max_distance)
+
+        for distance, record in candidates:
+            phash_distance = image_hash.hamming_distance(hashes.phash, image_hash.from_hex(record["phash"]))
+            if phash_distance <= self.phash_max_distance:
+                self.stats["duplicates"] += 1
+                return {**record, "distance": distance}
+        return None
+
+    def add(
+        self,
+        hashes,
+        post_id: Optional[str] = None,
+        platform: Optional[str] = None,
+        image_path: Optional[str] = None,
+        classifications: Optional[List[Dict]] = None,
+        hazard_score: int = 0
+    ):
+        """Index a scraped image and append it to the log"""
+        if not self.enabled or hashes is None:
+            return
+
+        record = {
+            **hashes.to_dict(),
+            "post_id": post_id,
+            "platform": platform,
+            "image_path": image_path,
+            "classifications": classifications or [],
+            "hazard_score": hazard_score,
+            "seen_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        with self._lock:
+            self._tree.add(hashes.dhash, record)
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                logger.warning(f"Could not persist image hash: {e}")
+
+        self.stats["indexed"] += 1
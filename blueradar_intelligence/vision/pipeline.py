@@ -12,6 +12,7 @@ from dataclasses import dataclass
 
 from utils.logging_config import setup_logging
 from config import vision_config, IMAGES_DIR, IMAGE_CLASSIFICATION_LABELS
+from vision.image_index import ScrapedImageIndex
 
 logger = setup_logging("vision_pipeline")
 
@@ -84,6 +85,9 @@ class VisionPipeline:
     4. Hazard relevance scoring
     5. Damage assessment
     6. Authenticity checking
+
+    Images already seen (near-duplicate perceptual hash) reuse their earlier
+    classification instead of running the model again.
     """
     
     # ImageNet classes related to hazards
@@ -130,6 +134,7 @@ class VisionPipeline:
         self.model = None
         self.processor = None
         self.models_loaded = False
+        self.image_index = ScrapedImageIndex()
         
         # Image transforms
         self.transform = None
@@ -182,7 +187,7 @@ class VisionPipeline:
                 # Process each image
                 image_results = []
                 for path in local_paths[:5]:  # Max 5 images
-                    result = self._analyze_image(path)
+                    result = self._analyze_image(path, post)
                     if result:
                         image_results.append(result)
                 
@@ -197,7 +202,7 @@ class VisionPipeline:
         logger.info(f"✓ Processed {processed_count} posts with images")
         return posts
     
-    def _analyze_image(self, image_path: str) -> Optional[Dict]:
+    def _analyze_image(self, image_path: str, post: Optional[Dict] = None) -> Optional[Dict]:
         """Analyze a single image"""
         try:
             path = Path(image_path)
@@ -217,7 +222,9 @@ class VisionPipeline:
             
             # Generate hashes
             md5_hash = self._get_md5_hash(path)
-            perceptual_hash = self._get_perceptual_hash(image)
+            hashes = self.image_index.hash_image(image)
+            perceptual_hash = hashes.to_dict()["dhash"] if hashes else self._get_perceptual_hash(image)
+            duplicate = self.image_index.find(hashes)
             
             # Color analysis
             color_analysis = self._analyze_colors(image)
@@ -229,7 +236,11 @@ class VisionPipeline:
             classifications = []
             hazard_score = 0
             
-            if self.use_ml and self.models_loaded:
+            if duplicate:
+                # Reposted image - reuse the earlier classification
+                classifications = duplicate.get("classifications", [])
+                hazard_score = duplicate.get("hazard_score", 0)
+            elif self.use_ml and self.models_loaded:
                 classifications = self._ml_classify(image)
                 hazard_score = self._calculate_hazard_score(classifications)
             else:
@@ -237,6 +248,16 @@ class VisionPipeline:
                 classifications = self._rule_based_classify(color_analysis)
                 hazard_score = self._calculate_hazard_score(classifications)
             
+            if not duplicate:
+                self.image_index.add(
+                    hashes,
+                    post_id=(post or {}).get("id"),
+                    platform=(post or {}).get("platform"),
+                    image_path=str(path),
+                    classifications=classifications,
+                    hazard_score=hazard_score
+                )
+            
             # Authenticity check
             authenticity_flags = self._check_authenticity(image, exif_data)
             
@@ -250,6 +271,11 @@ class VisionPipeline:
                 "format": image.format or path.suffix.upper(),
                 "hash_md5": md5_hash,
                 "hash_perceptual": perceptual_hash,
+                "duplicate_of": {
+                    "post_id": duplicate.get("post_id"),
+                    "platform": duplicate.get("platform"),
+                    "distance": duplicate["distance"]
+                } if duplicate else None,
                 "classifications": classifications,
                 "hazard_score": hazard_score,
                 "damage_level": damage_level,
@@ -466,7 +492,7 @@ class VisionPipeline:
             return ""
     
     def _get_perceptual_hash(self, image: Image.Image) -> str:
-        """Generate perceptual hash"""
+        """Average hash, used when the shared dHash is unavailable"""
         try:
             small = image.resize((8, 8), Image.Resampling.LANCZOS).convert("L")
             pixels = list(small.getdata())